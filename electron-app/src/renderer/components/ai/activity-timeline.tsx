@@ -18,6 +18,7 @@ import type { ActivityItem } from './types'
 
 const TOOL_LABELS: Record<string, { label: string; icon: string }> = {
   search_knowledge: { label: 'Searched knowledge base', icon: '\uD83D\uDD0D' },
+  search_knowledge_many: { label: 'Searched knowledge base', icon: '\uD83D\uDD0D' },
   sql_query: { label: 'Ran database query', icon: '\uD83D\uDCCA' },
   list_projects: { label: 'Checked projects', icon: '\uD83D\uDCC1' },
   list_tasks: { label: 'Searched tasks', icon: '\u2705' },
@@ -43,6 +43,7 @@ import {
   useTaskUpdates,
   useTaskMoved,
   useWebSocket,
+  applyEntityUpdate,
   type TaskUpdateEventData,
   type TaskMovedEventData,
 } from '@/hooks/use-websocket'
@@ -325,14 +326,15 @@ export function KanbanBoard({
             return [...currentTasks, data.task as unknown as Task]
           }
           return currentTasks
-        } else if (data.action === 'updated' && data.task) {
+        } else if (data.action === 'updated') {
           const index = currentTasks.findIndex((t) => t.id === data.task_id)
-          if (index !== -1) {
+          const updated = index !== -1 ? applyEntityUpdate(currentTasks[index], data.task, data) : null
+          if (updated) {
             if (!isSelf) {
               toast.info('Task updated', { duration: 3000 })
             }
             const newTasks = [...currentTasks]
-            newTasks[index] = data.task as unknown as Task
+            newTasks[index] = updated
             return newTasks
           }
           return currentTasks
@@ -45,6 +45,7 @@ import {
 import {
   useTaskUpdates,
   useWebSocket,
+  applyEntityUpdate,
   type TaskUpdateEventData,
 } from '@/hooks/use-websocket'
 import type { TaskViewer } from '@/hooks/use-task-viewers'
@@ -612,14 +613,15 @@ export function ProjectBoard({
           return [...currentTasks, data.task as unknown as Task]
         }
         return currentTasks
-      } else if (data.action === 'updated' && data.task) {
-        // Update existing task
+      } else if (data.action === 'updated') {
+        // Update existing task (full payload or field delta)
         const index = currentTasks.findIndex((t) => t.id === data.task_id)
-        if (index !== -1) {
+        const updated = index !== -1 ? applyEntityUpdate(currentTasks[index], data.task, data) : null
+        if (updated) {
           setRealtimeNotice('Task updated')
           setTimeout(() => setRealtimeNotice(null), 3000)
           const newTasks = [...currentTasks]
-          newTasks[index] = data.task as unknown as Task
+          newTasks[index] = updated
           return newTasks
         }
         return currentTasks
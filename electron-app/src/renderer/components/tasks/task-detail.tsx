@@ -62,6 +62,7 @@ import {
   useWebSocket,
   MessageType,
   WebSocketClient,
+  applyEntityUpdate,
   type TaskUpdateEventData,
 } from '@/hooks/use-websocket'
 import { useAuthUserId } from '@/contexts/auth-context'
@@ -557,12 +558,18 @@ export function TaskDetail({
   // WebSocket connection for real-time updates
   const { status, subscribe, joinRoom, leaveRoom } = useWebSocket()
   const callbackRefs = useRef({ onExternalUpdate, onExternalDelete })
+  // Latest task, so field deltas patch the current copy rather than the one captured at subscribe time
+  const taskRef = useRef(task)
 
   // Keep callback refs up to date
   useEffect(() => {
     callbackRefs.current = { onExternalUpdate, onExternalDelete }
   }, [onExternalUpdate, onExternalDelete])
 
+  useEffect(() => {
+    taskRef.current = task
+  }, [task])
+
   // Join task room and subscribe to updates when panel is open
   useEffect(() => {
     if (!isOpen || !enableRealtime || !status.isConnected || !task.project_id) {
@@ -577,8 +584,9 @@ export function TaskDetail({
       MessageType.TASK_UPDATED,
       (data) => {
         if (data.task_id === task.id) {
-          if (callbackRefs.current.onExternalUpdate && data.task) {
-            callbackRefs.current.onExternalUpdate(data.task as unknown as Task)
+          const updated = applyEntityUpdate(taskRef.current, data.task, data)
+          if (callbackRefs.current.onExternalUpdate && updated) {
+            callbackRefs.current.onExternalUpdate(updated)
           }
           if (data.changed_by && data.changed_by === currentUserId) return
           toast.info('Task was updated by another user', { duration: 3000 })
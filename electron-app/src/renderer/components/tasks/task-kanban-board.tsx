@@ -38,6 +38,7 @@ import { SkeletonTaskCard, ProgressBar } from '@/components/ui/skeleton'
 import {
   useTaskUpdates,
   useWebSocket,
+  applyEntityUpdate,
   type TaskUpdateEventData,
 } from '@/hooks/use-websocket'
 import { TaskCard } from './task-card'
@@ -328,12 +329,13 @@ export function TaskKanbanBoard({
             return [...currentTasks, data.task as unknown as Task]
           }
           return currentTasks
-        } else if (data.action === 'updated' && data.task) {
+        } else if (data.action === 'updated') {
           const index = currentTasks.findIndex((t) => t.id === data.task_id)
-          if (index !== -1) {
+          const updated = index !== -1 ? applyEntityUpdate(currentTasks[index], data.task, data) : null
+          if (updated) {
             toast.info('Task updated', { duration: 3000 })
             const newTasks = [...currentTasks]
-            newTasks[index] = data.task as unknown as Task
+            newTasks[index] = updated
             return newTasks
           }
           return currentTasks
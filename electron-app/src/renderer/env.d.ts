@@ -6,6 +6,8 @@
 interface ImportMetaEnv {
   readonly VITE_API_URL: string
   readonly VITE_MINIO_URL: string
+  /** WebSocket gateway URL, e.g. ws://localhost:8002/ws (default: /ws on VITE_API_URL) */
+  readonly VITE_WS_URL?: string
 }
 
 interface ImportMeta {
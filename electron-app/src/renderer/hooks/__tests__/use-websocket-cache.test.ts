@@ -70,6 +70,7 @@ vi.mock('@/lib/websocket', () => ({
     IMPORT_COMPLETED: 'import_completed',
     IMPORT_FAILED: 'import_failed',
     REINDEX_PROGRESS: 'reindex_progress',
+    ROOM_REPLAY: 'room_replay',
   },
 }))
 
@@ -78,9 +79,11 @@ const mockRemoveQueries = vi.fn()
 const mockSetQueryData = vi.fn()
 const mockSetQueriesData = vi.fn()
 const mockRefetchQueries = vi.fn()
+const mockGetQueryData = vi.fn((_key: unknown[]): unknown => undefined)
 
 vi.mock('@tanstack/react-query', () => ({
   useQueryClient: () => ({
+    getQueryData: mockGetQueryData,
     invalidateQueries: mockInvalidateQueries,
     removeQueries: mockRemoveQueries,
     setQueryData: mockSetQueryData,
@@ -177,6 +180,7 @@ describe('useWebSocketCacheInvalidation', () => {
     unsubFns.length = 0
     clearEventDedup()
     mockUseAuthUserId.mockReturnValue('current-user-id')
+    mockGetQueryData.mockImplementation(() => undefined)
   })
 
   afterEach(() => {
@@ -384,6 +388,55 @@ describe('useWebSocketCacheInvalidation', () => {
       expect(invalidatedKeys()).toContainEqual(['tasks', 'p-1'])
     })
 
+    it('TASK_UPDATED full payload older than the cached task is ignored', () => {
+      const cached = { id: 't-1', title: 'Newer', row_version: 5 }
+      mockGetQueryData.mockImplementation((key) => (key[0] === 'task' ? cached : [cached]))
+      mount()
+      triggerEvent('task_updated', {
+        task_id: 't-1',
+        project_id: 'p-1',
+        task: { id: 't-1', title: 'Older', row_version: 4 },
+      })
+
+      expect(mockSetQueryData).toHaveBeenCalledWith(['task', 't-1'], cached)
+    })
+
+    it('TASK_UPDATED field delta patches cached task at base_version', () => {
+      const cached = { id: 't-1', title: 'Task', assignee_id: null, row_version: 3 }
+      mockGetQueryData.mockImplementation((key) => (key[0] === 'task' ? cached : [cached]))
+      mount()
+      triggerEvent('task_updated', {
+        task_id: 't-1',
+        project_id: 'p-1',
+        changes: { assignee_id: 'current-user-id', row_version: 4 },
+        base_version: 3,
+        row_version: 4,
+      })
+
+      const patched = { ...cached, assignee_id: 'current-user-id', row_version: 4 }
+      expect(mockSetQueryData).toHaveBeenCalledWith(['task', 't-1'], patched)
+      expect(invalidatedKeys()).not.toContainEqual(['task', 't-1'])
+      expect(invalidatedKeys()).toContainEqual(['myTasks', 'cross-app'])
+    })
+
+    it('TASK_UPDATED field delta for another base_version falls back to invalidation', () => {
+      // The client missed the update to row_version 3, so it cannot apply 3 -> 4
+      const cached = { id: 't-1', title: 'Task', row_version: 2 }
+      mockGetQueryData.mockImplementation((key) => (key[0] === 'task' ? cached : [cached]))
+      mount()
+      triggerEvent('task_updated', {
+        task_id: 't-1',
+        project_id: 'p-1',
+        changes: { title: 'New', row_version: 4 },
+        base_version: 3,
+        row_version: 4,
+      })
+
+      expect(mockSetQueryData).not.toHaveBeenCalled()
+      expect(invalidatedKeys()).toContainEqual(['task', 't-1'])
+      expect(invalidatedKeys()).toContainEqual(['tasks', 'p-1'])
+    })
+
     it('TASK_DELETED removes task and filters from list', () => {
       mount()
       triggerEvent('task_deleted', { task_id: 't-1', project_id: 'p-1' })
@@ -1008,4 +1061,28 @@ describe('useWebSocketCacheInvalidation', () => {
       expect(invalidatedKeys()).toContainEqual(['ai', 'index-status', 'application', 'app-1'])
     })
   })
+
+  // ==========================================================================
+  // Room replay
+  // ==========================================================================
+
+  describe('room replay', () => {
+    it('incomplete replay refetches every query keyed by the room entity', () => {
+      mount()
+      triggerEvent('room_replay', { room_id: 'project:p-1', complete: false, replayed: 0 })
+
+      expect(mockInvalidateQueries).toHaveBeenCalledTimes(1)
+      const { predicate } = mockInvalidateQueries.mock.calls[0][0]
+      expect(predicate({ queryKey: ['tasks', 'p-1'] })).toBe(true)
+      expect(predicate({ queryKey: ['project', 'p-1'] })).toBe(true)
+      expect(predicate({ queryKey: ['tasks', 'p-2'] })).toBe(false)
+    })
+
+    it('complete replay leaves the cache alone', () => {
+      mount()
+      triggerEvent('room_replay', { room_id: 'project:p-1', complete: true, replayed: 3 })
+
+      expect(mockInvalidateQueries).not.toHaveBeenCalled()
+    })
+  })
 })
@@ -14,7 +14,8 @@
 import { useEffect, useRef } from 'react'
 import { useQueryClient } from '@tanstack/react-query'
 import { toast } from 'sonner'
-import { wsClient, MessageType, type Unsubscribe } from '@/lib/websocket'
+import { wsClient, MessageType, type RoomReplayEventData, type Unsubscribe } from '@/lib/websocket'
+import { applyEntityUpdate } from '@/lib/entity-update'
 import { queryKeys } from '@/lib/query-client'
 import type { Task } from '@/hooks/use-queries'
 import { showBrowserNotification } from '@/lib/notifications'
@@ -39,6 +40,9 @@ interface TaskEventData {
   task_id: string
   project_id: string
   task?: Record<string, unknown>
+  changes?: Record<string, unknown>
+  base_version?: number
+  row_version?: number
 }
 
 interface CommentEventData {
@@ -298,14 +302,36 @@ export function useWebSocketCacheInvalidation(options: WebSocketCacheOptions = {
     unsubscribers.push(
       wsClient.on<TaskEventData>(MessageType.TASK_UPDATED, (data) => {
         // WS payload: { task_id, project_id, task: { id, title, ... } }
-        const taskPayload = data.task
+        // or, for a field delta: { task_id, project_id, changes: {...}, base_version, row_version }
+        let taskPayload: Record<string, unknown> | undefined = data.task
         if (taskPayload?.id && taskPayload?.title) {
-          // Full task payload — update cache in-place, no refetch needed
-          const task = taskPayload as unknown as Task
-          queryClient.setQueryData<Task>(queryKeys.task(data.task_id), task)
+          // Full task payload — update cache in-place, no refetch needed.
+          // A payload older than the cached copy (out-of-order delivery) is ignored.
+          const full = taskPayload
+          const cachedTask = queryClient.getQueryData<Task>(queryKeys.task(data.task_id))
+          queryClient.setQueryData<Task>(queryKeys.task(data.task_id), applyEntityUpdate(cachedTask, full, data) as Task)
           queryClient.setQueryData<Task[]>(queryKeys.tasks(data.project_id), (old) =>
-            old?.map((t) => (t.id === data.task_id ? task : t))
+            old?.map((t) => (t.id === data.task_id ? (applyEntityUpdate(t, full, data) as Task) : t))
           )
+        } else if (data.changes) {
+          // Field delta — patch cached copies at base_version, refetch the rest
+          const cachedTask = queryClient.getQueryData<Task>(queryKeys.task(data.task_id))
+          const patchedTask = applyEntityUpdate(cachedTask, undefined, data)
+          if (patchedTask) {
+            queryClient.setQueryData<Task>(queryKeys.task(data.task_id), patchedTask)
+          } else {
+            queryClient.invalidateQueries({ queryKey: queryKeys.task(data.task_id) })
+          }
+          const cachedList = queryClient.getQueryData<Task[]>(queryKeys.tasks(data.project_id))
+          const patchedEntry = applyEntityUpdate(cachedList?.find((t) => t.id === data.task_id), undefined, data)
+          if (patchedEntry) {
+            queryClient.setQueryData<Task[]>(queryKeys.tasks(data.project_id), (old) =>
+              old?.map((t) => (t.id === data.task_id ? patchedEntry : t))
+            )
+          } else {
+            queryClient.invalidateQueries({ queryKey: queryKeys.tasks(data.project_id) })
+          }
+          taskPayload = { ...data.changes, ...(patchedTask ?? patchedEntry) }
         } else {
           // Partial payload — fall back to invalidation
           queryClient.invalidateQueries({ queryKey: queryKeys.task(data.task_id) })
@@ -1065,6 +1091,20 @@ export function useWebSocketCacheInvalidation(options: WebSocketCacheOptions = {
       })
     )
 
+    // ========================================================================
+    // Room Replay
+    // ========================================================================
+
+    unsubscribers.push(
+      wsClient.on<RoomReplayEventData>(MessageType.ROOM_REPLAY, (data) => {
+        // Events missed while disconnected were no longer retained, so patching
+        // cannot catch up: refetch every query keyed by the room's entity id
+        if (data.complete) return
+        const entityId = data.room_id.slice(data.room_id.indexOf(':') + 1)
+        queryClient.invalidateQueries({ predicate: (query) => query.queryKey.includes(entityId) })
+      })
+    )
+
     // ========================================================================
     // Infrastructure Status Events
     // ========================================================================
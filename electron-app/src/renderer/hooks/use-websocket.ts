@@ -19,6 +19,7 @@ import {
   WebSocketClient,
   WebSocketState,
   MessageType,
+  applyEntityUpdate,
   type WebSocketMessage,
   type WebSocketConfig,
   type WebSocketEventListener,
@@ -965,6 +966,7 @@ export {
   WebSocketState,
   MessageType,
   debounce,
+  applyEntityUpdate,
   type WebSocketMessage,
   type WebSocketConfig,
   type WebSocketEventListener,
@@ -60,6 +60,11 @@ class MockWebSocket {
     this.onmessage?.({ data: JSON.stringify(data) } as MessageEvent)
   }
 
+  /** Simulate receiving a binary (MessagePack) frame from the server */
+  simulateBinaryMessage(bytes: number[]) {
+    this.onmessage?.({ data: new Uint8Array(bytes).buffer } as MessageEvent)
+  }
+
   /** Simulate a connection error */
   simulateError() {
     this.onerror?.(new Event('error'))
@@ -426,6 +431,34 @@ describe('WebSocketClient', () => {
 
       expect(listener).toHaveBeenCalledTimes(2)
     })
+
+    it('unpacks batch frames in order and dedups their events', async () => {
+      const ws = await connectAndOpen()
+      const listener = vi.fn()
+      client.on(MessageType.TASK_UPDATED, listener)
+
+      const first = { type: MessageType.TASK_UPDATED, data: { n: 1 }, room_id: 'r1', event_id: '1-0' }
+      const second = { type: MessageType.TASK_UPDATED, data: { n: 2 }, room_id: 'r1', event_id: '2-0' }
+      ws.simulateMessage({ type: MessageType.BATCH, events: [first, second] })
+      ws.simulateMessage(second)
+
+      expect(listener.mock.calls.map(([data]) => data)).toEqual([{ n: 1 }, { n: 2 }])
+    })
+
+    it('decodes MessagePack binary frames', async () => {
+      const ws = await connectAndOpen()
+      const listener = vi.fn()
+      client.on(MessageType.TASK_UPDATED, listener)
+
+      expect(new URL(ws.url).searchParams.get('encoding')).toBe('msgpack')
+      // {"type": "task_updated", "data": {"n": -1, "ok": true}}
+      ws.simulateBinaryMessage([
+        0x82, 0xa4, 0x74, 0x79, 0x70, 0x65, 0xac, 0x74, 0x61, 0x73, 0x6b, 0x5f, 0x75, 0x70, 0x64, 0x61,
+        0x74, 0x65, 0x64, 0xa4, 0x64, 0x61, 0x74, 0x61, 0x82, 0xa1, 0x6e, 0xff, 0xa2, 0x6f, 0x6b, 0xc3,
+      ])
+
+      expect(listener).toHaveBeenCalledWith({ n: -1, ok: true })
+    })
   })
 
   // ==========================================================================
@@ -514,11 +547,83 @@ describe('WebSocketClient', () => {
       const ws2 = MockWebSocket.instances[MockWebSocket.instances.length - 1]
       ws2.simulateOpen()
 
-      // After reconnect, rooms should be rejoined
-      const joinCalls = ws2.send.mock.calls.filter(
-        (c: string[]) => c[0].includes('join_room'),
-      )
-      expect(joinCalls.length).toBe(2) // room-A and room-B
+      // After reconnect, rooms should be rejoined in one batched message
+      const joins = ws2.send.mock.calls
+        .map((c: string[]) => JSON.parse(c[0]))
+        .filter((m: { type: string }) => m.type === 'join_rooms')
+      expect(joins).toHaveLength(1)
+      expect(joins[0].data.rooms).toEqual([{ room_id: 'room-A' }, { room_id: 'room-B' }])
+    })
+
+    it('rejoin sends the last seen event_id for replay', async () => {
+      const ws1 = await connectAndOpen()
+      client.joinRoom('room-A')
+      ws1.simulateMessage({
+        type: MessageType.ROOM_JOINED,
+        data: { room_id: 'room-A', user_count: 1, latest_event_id: '100-0' },
+      })
+      ws1.simulateMessage({ type: MessageType.TASK_UPDATED, data: {}, room_id: 'room-A', event_id: '105-2' })
+      ws1.simulateMessage({ type: MessageType.TASK_UPDATED, data: {}, room_id: 'room-A', event_id: '105-1' })
+
+      ws1.simulateClose(1006)
+      await vi.advanceTimersByTimeAsync(1000)
+      await vi.advanceTimersByTimeAsync(0)
+
+      const ws2 = MockWebSocket.instances[MockWebSocket.instances.length - 1]
+      ws2.simulateOpen()
+
+      const join = ws2.send.mock.calls
+        .map((c: string[]) => JSON.parse(c[0]))
+        .find((m: { type: string }) => m.type === 'join_rooms')
+      expect(join.data.rooms).toEqual([{ room_id: 'room-A', last_event_id: '105-2' }])
+    })
+
+    it('rejoin keeps its cursor until an incomplete replay reports the tip', async () => {
+      const ws1 = await connectAndOpen()
+      client.joinRoom('room-A')
+      ws1.simulateMessage({ type: MessageType.TASK_UPDATED, data: {}, room_id: 'room-A', event_id: '105-2' })
+
+      const reconnect = async (ws: MockWebSocket) => {
+        ws.simulateClose(1006)
+        await vi.advanceTimersByTimeAsync(1000)
+        await vi.advanceTimersByTimeAsync(0)
+        const next = MockWebSocket.instances[MockWebSocket.instances.length - 1]
+        next.simulateOpen()
+        const join = next.send.mock.calls
+          .map((c: string[]) => JSON.parse(c[0]))
+          .find((m: { type: string }) => m.type === 'join_rooms')
+        return { ws: next, cursor: join.data.rooms[0].last_event_id }
+      }
+
+      // ROOM_JOINED reports the stream tip, past a gap the replay may not cover
+      const second = await reconnect(ws1)
+      expect(second.cursor).toBe('105-2')
+      second.ws.simulateMessage({
+        type: MessageType.ROOM_JOINED,
+        data: { room_id: 'room-A', user_count: 1, latest_event_id: '300-0' },
+      })
+      const third = await reconnect(second.ws)
+      expect(third.cursor).toBe('105-2')
+
+      third.ws.simulateMessage({
+        type: MessageType.ROOM_REPLAY,
+        data: { room_id: 'room-A', complete: false, replayed: 0, latest_event_id: '300-0' },
+      })
+      const fourth = await reconnect(third.ws)
+      expect(fourth.cursor).toBe('300-0')
+    })
+
+    it('drops a replayed event already received live', async () => {
+      const ws = await connectAndOpen()
+      client.joinRoom('room-A')
+      const listener = vi.fn()
+      client.on(MessageType.TASK_UPDATED, listener)
+
+      const event = { type: MessageType.TASK_UPDATED, data: {}, room_id: 'room-A', event_id: '7-0' }
+      ws.simulateMessage(event)
+      ws.simulateMessage(event)
+
+      expect(listener).toHaveBeenCalledTimes(1)
     })
   })
 
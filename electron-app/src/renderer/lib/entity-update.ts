@@ -0,0 +1,34 @@
+/**
+ * Apply task/project update events to locally cached entities.
+ *
+ * The server sends updates either with the full entity or, when the update
+ * directly follows the entity's last broadcast, with only the fields that
+ * changed (`changes`), the version they apply to (`base_version`) and the
+ * resulting `row_version`. Every edit bumps `row_version`.
+ */
+
+/**
+ * Resolve an update event against a locally cached entity.
+ *
+ * Returns the full entity when sent (unless the cached copy is already
+ * newer), the cached copy patched with `changes` when it is at
+ * `base_version`, or null when the cached copy is missing or at another
+ * version (refetch instead).
+ */
+export function applyEntityUpdate<T extends { row_version?: number }>(
+  cached: T | undefined,
+  full: Record<string, unknown> | undefined,
+  delta: { changes?: Record<string, unknown>; base_version?: number; row_version?: number }
+): T | null {
+  if (full) {
+    const version = full.row_version
+    if (cached?.row_version != null && typeof version === 'number' && version < cached.row_version) {
+      return cached
+    }
+    return full as unknown as T
+  }
+  if (cached && delta.changes && delta.base_version != null && cached.row_version === delta.base_version) {
+    return { ...cached, ...delta.changes, row_version: delta.row_version }
+  }
+  return null
+}
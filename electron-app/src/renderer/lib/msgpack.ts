@@ -0,0 +1,119 @@
+/**
+ * Minimal MessagePack decoder for binary WebSocket frames.
+ *
+ * The server sends MessagePack when the client connects with
+ * `encoding=msgpack`. Only decoding is needed (outbound messages stay JSON),
+ * and only the types the backend emits: nil, booleans, integers, floats,
+ * strings, binary, arrays and maps. Extension types are rejected.
+ */
+
+const textDecoder = new TextDecoder()
+
+class Reader {
+  private offset = 0
+  private readonly view: DataView
+
+  constructor(private readonly bytes: Uint8Array) {
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+  }
+
+  get done(): boolean {
+    return this.offset >= this.bytes.byteLength
+  }
+
+  private advance(size: number): number {
+    const start = this.offset
+    if (start + size > this.bytes.byteLength) {
+      throw new RangeError('MessagePack: unexpected end of data')
+    }
+    this.offset += size
+    return start
+  }
+
+  private u8(): number {
+    return this.view.getUint8(this.advance(1))
+  }
+
+  private u16(): number {
+    return this.view.getUint16(this.advance(2))
+  }
+
+  private u32(): number {
+    return this.view.getUint32(this.advance(4))
+  }
+
+  private str(length: number): string {
+    const start = this.advance(length)
+    return textDecoder.decode(this.bytes.subarray(start, start + length))
+  }
+
+  private bin(length: number): Uint8Array {
+    const start = this.advance(length)
+    return this.bytes.slice(start, start + length)
+  }
+
+  private array(length: number): unknown[] {
+    const out = new Array<unknown>(length)
+    for (let i = 0; i < length; i++) out[i] = this.value()
+    return out
+  }
+
+  private map(length: number): Record<string, unknown> {
+    const out: Record<string, unknown> = {}
+    for (let i = 0; i < length; i++) {
+      const key = this.value()
+      out[String(key)] = this.value()
+    }
+    return out
+  }
+
+  value(): unknown {
+    const byte = this.u8()
+
+    if (byte <= 0x7f) return byte
+    if (byte >= 0xe0) return byte - 0x100
+    if ((byte & 0xf0) === 0x80) return this.map(byte & 0x0f)
+    if ((byte & 0xf0) === 0x90) return this.array(byte & 0x0f)
+    if ((byte & 0xe0) === 0xa0) return this.str(byte & 0x1f)
+
+    switch (byte) {
+      case 0xc0: return null
+      case 0xc2: return false
+      case 0xc3: return true
+      case 0xc4: return this.bin(this.u8())
+      case 0xc5: return this.bin(this.u16())
+      case 0xc6: return this.bin(this.u32())
+      case 0xca: return this.view.getFloat32(this.advance(4))
+      case 0xcb: return this.view.getFloat64(this.advance(8))
+      case 0xcc: return this.u8()
+      case 0xcd: return this.u16()
+      case 0xce: return this.u32()
+      case 0xcf: return Number(this.view.getBigUint64(this.advance(8)))
+      case 0xd0: return this.view.getInt8(this.advance(1))
+      case 0xd1: return this.view.getInt16(this.advance(2))
+      case 0xd2: return this.view.getInt32(this.advance(4))
+      case 0xd3: return Number(this.view.getBigInt64(this.advance(8)))
+      case 0xd9: return this.str(this.u8())
+      case 0xda: return this.str(this.u16())
+      case 0xdb: return this.str(this.u32())
+      case 0xdc: return this.array(this.u16())
+      case 0xdd: return this.array(this.u32())
+      case 0xde: return this.map(this.u16())
+      case 0xdf: return this.map(this.u32())
+      default:
+        throw new TypeError(`MessagePack: unsupported type 0x${byte.toString(16)}`)
+    }
+  }
+}
+
+/**
+ * Decode a single MessagePack value.
+ */
+export function decodeMsgpack(data: ArrayBuffer | Uint8Array): unknown {
+  const reader = new Reader(data instanceof Uint8Array ? data : new Uint8Array(data))
+  const value = reader.value()
+  if (!reader.done) {
+    throw new RangeError('MessagePack: trailing data')
+  }
+  return value
+}
@@ -14,6 +14,9 @@
  */
 
 import { getAccessToken, refreshTokens } from '@/lib/api-client'
+import { decodeMsgpack } from '@/lib/msgpack'
+
+export { applyEntityUpdate } from '@/lib/entity-update'
 
 // ============================================================================
 // Types
@@ -42,9 +45,14 @@ export enum MessageType {
 
   // Room events
   JOIN_ROOM = 'join_room',
+  JOIN_ROOMS = 'join_rooms',
   LEAVE_ROOM = 'leave_room',
   ROOM_JOINED = 'room_joined',
   ROOM_LEFT = 'room_left',
+  ROOM_REPLAY = 'room_replay',
+
+  // Several queued messages delivered in one frame
+  BATCH = 'batch',
 
   // Task events
   TASK_CREATED = 'task_created',
@@ -161,6 +169,12 @@ export enum MessageType {
 export interface WebSocketMessage<T = unknown> {
   type: MessageType | string
   data: T
+  /** Room of a streamed room event (set together with event_id) */
+  room_id?: string
+  /** Per-room stream id, used to resume after a reconnect */
+  event_id?: string
+  /** Messages packed into a `batch` frame, in delivery order */
+  events?: WebSocketMessage[]
 }
 
 /**
@@ -178,6 +192,20 @@ export interface ConnectedEventData {
 export interface RoomJoinedEventData {
   room_id: string
   user_count: number
+  /** Newest event id in the room's replay stream (null if none) */
+  latest_event_id?: string | null
+}
+
+/**
+ * Summary sent after the events replayed on a rejoin
+ */
+export interface RoomReplayEventData {
+  room_id: string
+  /** False when missed events were no longer retained: refetch the room */
+  complete: boolean
+  replayed: number
+  /** Newest event id in the room's replay stream (null if none) */
+  latest_event_id?: string | null
 }
 
 /**
@@ -187,6 +215,16 @@ export interface RoomLeftEventData {
   room_id: string
 }
 
+/**
+ * Sent after missed events were replayed on rejoin. When `complete` is false
+ * the gap exceeded server retention and room data must be refetched.
+ */
+export interface RoomReplayEventData {
+  room_id: string
+  complete: boolean
+  replayed: number
+}
+
 /**
  * User presence event data
  */
@@ -214,7 +252,12 @@ export interface TaskUpdateEventData {
   task_id: string
   project_id: string
   action: string
-  task: Record<string, unknown>
+  /** Full task; absent on updates sent as a field delta */
+  task?: Record<string, unknown>
+  /** Changed fields, relative to the task at `base_version` */
+  changes?: Record<string, unknown>
+  base_version?: number
+  row_version?: number
   timestamp: string
   changed_by?: string
   old_status?: string
@@ -332,7 +375,7 @@ export interface NotificationReadEventData {
  * WebSocket client configuration
  */
 export interface WebSocketConfig {
-  /** WebSocket server URL (default: derived from VITE_API_URL) */
+  /** WebSocket server URL (default: VITE_WS_URL, else derived from VITE_API_URL) */
   url?: string
   /** JWT token for authentication */
   token?: string
@@ -350,6 +393,8 @@ export interface WebSocketConfig {
   pongTimeout?: number
   /** Message queue max size (default: 100) */
   maxQueueSize?: number
+  /** Server-to-client wire encoding (default: 'msgpack'); pings and errors always arrive as JSON text */
+  encoding?: 'json' | 'msgpack'
 }
 
 /**
@@ -369,10 +414,17 @@ export type Unsubscribe = () => void
 /** Base API URL — single source of truth for WebSocket URL construction */
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8001'
 
+/** Most rooms per join_rooms message (server limit) */
+const MAX_JOIN_ROOMS = 100
+
 /**
- * Get WebSocket URL from API URL environment variable
+ * Get WebSocket URL: the dedicated gateway when VITE_WS_URL is set,
+ * otherwise the /ws endpoint of the API server
  */
 function getWebSocketUrl(): string {
+  if (import.meta.env.VITE_WS_URL) {
+    return import.meta.env.VITE_WS_URL
+  }
   // Convert http(s):// to ws(s)://
   const wsUrl = API_BASE_URL.replace(/^http/, 'ws')
   return `${wsUrl}/ws`
@@ -388,12 +440,22 @@ const DEFAULT_CONFIG: Required<WebSocketConfig> = {
   pingInterval: 30000,  // 30 seconds keepalive interval
   pongTimeout: 10000,   // 10 seconds pong timeout
   maxQueueSize: 100,
+  encoding: 'msgpack',
 }
 
 // ============================================================================
 // WebSocket Client Class
 // ============================================================================
 
+/**
+ * Compare two Redis stream ids ("<ms>-<seq>"); negative if a < b
+ */
+function compareEventIds(a: string, b: string): number {
+  const [aMs, aSeq] = a.split('-').map(Number)
+  const [bMs, bSeq] = b.split('-').map(Number)
+  return aMs !== bMs ? aMs - bMs : aSeq - bSeq
+}
+
 /**
  * WebSocket client with reconnection and message queuing support
  */
@@ -408,6 +470,7 @@ export class WebSocketClient {
   private messageQueue: WebSocketMessage[] = []
   private rooms: Set<string> = new Set()
   private roomRefs: Map<string, number> = new Map() // Reference counting for rooms
+  private roomCursors: Map<string, string> = new Map() // Last seen event_id per room (for replay)
   private listeners: Map<string, Set<WebSocketEventListener>> = new Map()
   private stateListeners: Set<WebSocketEventListener<WebSocketState>> = new Set()
 
@@ -648,9 +711,13 @@ export class WebSocketClient {
       try {
         const url = new URL(this.config.url)
         url.searchParams.set('token', connToken)
+        // Accept several queued messages per frame during bursts
+        url.searchParams.set('batch', '1')
+        url.searchParams.set('encoding', this.config.encoding)
         if (import.meta.env.DEV) console.log('[WebSocket] Connecting to:', url.origin + url.pathname)
 
         this.ws = new WebSocket(url.toString())
+        this.ws.binaryType = 'arraybuffer'
 
         this.ws.onopen = this.handleOpen.bind(this)
         this.ws.onclose = this.handleClose.bind(this)
@@ -690,6 +757,7 @@ export class WebSocketClient {
     if (clearRooms) {
       this.rooms.clear()
       this.roomRefs.clear()
+      this.roomCursors.clear()
     }
 
     // Restore autoReconnect setting so future connections work
@@ -760,6 +828,7 @@ export class WebSocketClient {
     if (newRefs === 0) {
       this.roomRefs.delete(roomId)
       this.rooms.delete(roomId)
+      this.roomCursors.delete(roomId)
       if (this.isConnected()) {
         this.send(MessageType.LEAVE_ROOM, { room_id: roomId })
       }
@@ -950,8 +1019,28 @@ export class WebSocketClient {
 
   private handleMessage(event: MessageEvent): void {
     try {
-      const message: WebSocketMessage = JSON.parse(event.data)
+      // Binary frames are MessagePack; text frames (pings, errors, json encoding) are JSON
+      const message = (
+        typeof event.data === 'string' ? JSON.parse(event.data) : decodeMsgpack(event.data as ArrayBuffer)
+      ) as WebSocketMessage
+
+      if (message.type === MessageType.BATCH) {
+        for (const inner of message.events ?? []) {
+          this.dispatchMessage(inner)
+        }
+        return
+      }
+
+      this.dispatchMessage(message)
+    } catch (err) {
+      if (import.meta.env.DEV) {
+        console.warn('[WebSocket] Failed to parse message:', err)
+      }
+    }
+  }
 
+  private dispatchMessage(message: WebSocketMessage): void {
+    try {
       // Handle pong response (from our ping)
       if (message.type === MessageType.PONG) {
         this.handlePong()
@@ -971,6 +1060,24 @@ export class WebSocketClient {
         return // Skip duplicate message
       }
 
+      // Track the resume point per room
+      if (message.room_id && message.event_id) {
+        this.advanceRoomCursor(message.room_id, message.event_id)
+      } else if (message.type === MessageType.ROOM_JOINED) {
+        // A rejoin that sent its cursor moves only with the replayed events;
+        // jumping to the tip here would skip a gap the replay could not fill
+        const joined = message.data as RoomJoinedEventData
+        if (joined?.latest_event_id && !this.roomCursors.has(joined.room_id)) {
+          this.advanceRoomCursor(joined.room_id, joined.latest_event_id)
+        }
+      } else if (message.type === MessageType.ROOM_REPLAY) {
+        // Incomplete replay: listeners refetch the room, so resume from the tip
+        const replay = message.data as RoomReplayEventData
+        if (replay && !replay.complete && replay.latest_event_id) {
+          this.advanceRoomCursor(replay.room_id, replay.latest_event_id)
+        }
+      }
+
       // Emit to specific type listeners
       this.emit(message.type, message.data)
 
@@ -978,7 +1085,7 @@ export class WebSocketClient {
       this.emit('*', message)
     } catch (err) {
       if (import.meta.env.DEV) {
-        console.warn('[WebSocket] Failed to parse message:', err)
+        console.warn('[WebSocket] Failed to handle message:', err)
       }
     }
   }
@@ -987,6 +1094,11 @@ export class WebSocketClient {
    * Extract a unique message ID from a message for deduplication
    */
   private getMessageId(message: WebSocketMessage): string | null {
+    // Streamed room events: replay and live delivery may overlap after a rejoin
+    if (message.room_id && message.event_id) {
+      return `${message.room_id}:${message.event_id}`
+    }
+
     const data = message.data as Record<string, unknown>
 
     // First, check if the message has an explicit message_id
@@ -1129,9 +1241,28 @@ export class WebSocketClient {
       return true
     })
 
-    this.rooms.forEach((roomId) => {
-      this.send(MessageType.JOIN_ROOM, { room_id: roomId })
+    // One join_rooms message per chunk so the server authorizes the rooms
+    // in a single batch; the last seen event id lets it replay only missed events
+    const rooms = Array.from(this.rooms).map((roomId) => {
+      const lastEventId = this.roomCursors.get(roomId)
+      return lastEventId ? { room_id: roomId, last_event_id: lastEventId } : { room_id: roomId }
     })
+    for (let i = 0; i < rooms.length; i += MAX_JOIN_ROOMS) {
+      this.send(MessageType.JOIN_ROOMS, { rooms: rooms.slice(i, i + MAX_JOIN_ROOMS) })
+    }
+  }
+
+  /**
+   * Move a room's resume point forward (stream ids are "<ms>-<seq>")
+   */
+  private advanceRoomCursor(roomId: string, eventId: string): void {
+    if (!this.rooms.has(roomId)) {
+      return
+    }
+    const current = this.roomCursors.get(roomId)
+    if (!current || compareEventIds(eventId, current) > 0) {
+      this.roomCursors.set(roomId, eventId)
+    }
   }
 
   private scheduleReconnect(): void {
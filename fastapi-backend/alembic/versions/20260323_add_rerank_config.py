@@ -0,0 +1,53 @@
+"""Add retrieval re-ranking weight configuration seeds.
+
+Seeds AgentConfigurations with the linear-model weights used by the
+post-RRF lightweight reranker (RRF score, BM25, term proximity,
+heading match, title match).
+
+Revision ID: 20260323_rerank_config
+Revises: 20260322_team_activity_indexes
+Create Date: 2026-03-23
+"""
+
+from alembic import op
+
+revision = "20260323_rerank_config"
+down_revision = "20260322_team_activity_indexes"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "search.rerank_rrf_weight",
+    "search.rerank_bm25_weight",
+    "search.rerank_proximity_weight",
+    "search.rerank_heading_weight",
+    "search.rerank_title_weight",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('search.rerank_rrf_weight', '1.0', 'float', 'search',
+             'Re-rank weight for the fused RRF score', '0.0', '5.0'),
+            ('search.rerank_bm25_weight', '0.6', 'float', 'search',
+             'Re-rank weight for BM25 over candidate chunk text', '0.0', '5.0'),
+            ('search.rerank_proximity_weight', '0.25', 'float', 'search',
+             'Re-rank weight for query-term proximity', '0.0', '5.0'),
+            ('search.rerank_heading_weight', '0.3', 'float', 'search',
+             'Re-rank weight for query terms in the chunk heading', '0.0', '5.0'),
+            ('search.rerank_title_weight', '0.15', 'float', 'search',
+             'Re-rank weight for query terms in the document title', '0.0', '5.0')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,34 @@
+"""Add retrieval result cache TTL configuration seed.
+
+Seeds AgentConfigurations with the TTL for cached hybrid retrieval
+results. Entries are invalidated early by per-scope knowledge
+generation counters; a TTL of 0 disables the cache.
+
+Revision ID: 20260324_retrieval_cache_config
+Revises: 20260323_rerank_config
+Create Date: 2026-03-24
+"""
+
+from alembic import op
+
+revision = "20260324_retrieval_cache_config"
+down_revision = "20260323_rerank_config"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('cache.retrieval_ttl', '120', 'int', 'cache',
+             'Retrieval result cache TTL (0 disables)', '0', '3600')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("""DELETE FROM "AgentConfigurations" WHERE key = 'cache.retrieval_ttl'""")
@@ -0,0 +1,46 @@
+"""Add chunk-neighbor context expansion configuration seeds.
+
+Seeds AgentConfigurations with the window and token budgets used when
+retrieval attaches adjacent chunks to each hit.
+
+Revision ID: 20260325_neighbor_context_config
+Revises: 20260324_retrieval_cache_config
+Create Date: 2026-03-25
+"""
+
+from alembic import op
+
+revision = "20260325_neighbor_context_config"
+down_revision = "20260324_retrieval_cache_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "search.neighbor_window",
+    "search.neighbor_token_budget",
+    "search.neighbor_total_token_budget",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('search.neighbor_window', '1', 'int', 'search',
+             'Adjacent chunks fetched on each side of a hit (0 disables)', '0', '3'),
+            ('search.neighbor_token_budget', '256', 'int', 'search',
+             'Max adjacent-chunk tokens attached to a single hit', '0', '2000'),
+            ('search.neighbor_total_token_budget', '2048', 'int', 'search',
+             'Max adjacent-chunk tokens attached across all hits', '0', '8000')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
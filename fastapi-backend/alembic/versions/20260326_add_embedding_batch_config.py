@@ -0,0 +1,46 @@
+"""Add embedding micro-batcher configuration seeds.
+
+Seeds AgentConfigurations with the coalescing window and per-call limits
+used by the worker's cross-document embedding batcher.
+
+Revision ID: 20260326_embedding_batch_config
+Revises: 20260325_neighbor_context_config
+Create Date: 2026-03-26
+"""
+
+from alembic import op
+
+revision = "20260326_embedding_batch_config"
+down_revision = "20260325_neighbor_context_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "embedding.batch_window_ms",
+    "embedding.batch_max_texts",
+    "embedding.batch_max_tokens",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('embedding.batch_window_ms', '20', 'int', 'embedding',
+             'Worker wait (ms) to coalesce concurrent embedding requests (0 disables)', '0', '500'),
+            ('embedding.batch_max_texts', '256', 'int', 'embedding',
+             'Max chunk texts per coalesced embedding provider call', '1', '2048'),
+            ('embedding.batch_max_tokens', '100000', 'int', 'embedding',
+             'Max input tokens per coalesced embedding provider call', '1000', '300000')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,76 @@
+"""Add provider throttle configuration seeds.
+
+Seeds AgentConfigurations with the shared requests/tokens-per-minute
+budgets and AIMD bounds used by ProviderThrottle, and removes the
+nightly re-embed pacing keys it replaces.
+
+Revision ID: 20260327_provider_throttle_config
+Revises: 20260326_embedding_batch_config
+Create Date: 2026-03-27
+"""
+
+from alembic import op
+
+revision = "20260327_provider_throttle_config"
+down_revision = "20260326_embedding_batch_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "throttle.embedding_rpm",
+    "throttle.embedding_tpm",
+    "throttle.vision_rpm",
+    "throttle.vision_tpm",
+    "throttle.max_concurrency",
+    "throttle.target_latency_ms",
+]
+
+# Pacing keys superseded by the throttle (restored on downgrade).
+_REMOVED_KEYS = [
+    "worker.nightly_embed_batch_size",
+    "worker.nightly_embed_batch_delay_s",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('throttle.embedding_rpm', '3000', 'int', 'throttle',
+             'Embedding provider requests per minute shared by all workers (0 = unlimited)', '0', '100000'),
+            ('throttle.embedding_tpm', '1000000', 'int', 'throttle',
+             'Embedding provider input tokens per minute shared by all workers (0 = unlimited)', '0', '50000000'),
+            ('throttle.vision_rpm', '500', 'int', 'throttle',
+             'Vision provider requests per minute shared by all workers (0 = unlimited)', '0', '100000'),
+            ('throttle.vision_tpm', '200000', 'int', 'throttle',
+             'Vision provider tokens per minute shared by all workers (0 = unlimited)', '0', '50000000'),
+            ('throttle.max_concurrency', '16', 'int', 'throttle',
+             'Max concurrent provider calls per worker process (AIMD upper bound)', '1', '200'),
+            ('throttle.target_latency_ms', '10000', 'int', 'throttle',
+             'Provider calls slower than this reduce concurrency (0 disables)', '0', '120000')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+    removed_csv = ", ".join(f"'{k}'" for k in _REMOVED_KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({removed_csv})')
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('worker.nightly_embed_batch_size', '10', 'int', 'worker',
+             'Nightly embedding batch size', '1', '100'),
+            ('worker.nightly_embed_batch_delay_s', '5', 'int', 'worker',
+             'Delay between batches', '1', '60')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
@@ -0,0 +1,40 @@
+"""Add TipTap IR cache configuration seed.
+
+Seeds AgentConfigurations with the Redis TTL for single-pass TipTap walk
+results, which document saves write and the embed job reuses.
+
+Revision ID: 20260328_tiptap_ir_cache_config
+Revises: 20260327_provider_throttle_config
+Create Date: 2026-03-28
+"""
+
+from alembic import op
+
+revision = "20260328_tiptap_ir_cache_config"
+down_revision = "20260327_provider_throttle_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "content.ir_cache_ttl_seconds",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('content.ir_cache_ttl_seconds', '3600', 'int', 'content',
+             'Redis TTL for cached TipTap walks reused by the embed job (0 disables)', '0', '86400')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
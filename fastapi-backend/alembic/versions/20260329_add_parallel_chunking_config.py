@@ -0,0 +1,43 @@
+"""Add parallel chunking configuration seeds.
+
+Seeds AgentConfigurations with the size threshold and process pool size
+used when large documents and file extractions are chunked across cores.
+
+Revision ID: 20260329_parallel_chunking_config
+Revises: 20260328_tiptap_ir_cache_config
+Create Date: 2026-03-29
+"""
+
+from alembic import op
+
+revision = "20260329_parallel_chunking_config"
+down_revision = "20260328_tiptap_ir_cache_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "embedding.parallel_chunk_min_chars",
+    "embedding.chunk_workers",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('embedding.parallel_chunk_min_chars', '200000', 'int', 'embedding',
+             'Min document size (chars) before chunking runs in the process pool', '10000', '50000000'),
+            ('embedding.chunk_workers', '4', 'int', 'embedding',
+             'Chunking process pool size (0 or 1 keeps chunking in-process; restart to resize)', '0', '32')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,43 @@
+"""Add embed-on-idle debounce configuration seeds.
+
+Seeds AgentConfigurations with the idle window and max-wait cap used to
+schedule one re-embed per editing burst.
+
+Revision ID: 20260330_embed_debounce_config
+Revises: 20260329_parallel_chunking_config
+Create Date: 2026-03-30
+"""
+
+from alembic import op
+
+revision = "20260330_embed_debounce_config"
+down_revision = "20260329_parallel_chunking_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "embedding.debounce_idle_s",
+    "embedding.debounce_max_wait_s",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('embedding.debounce_idle_s', '0', 'int', 'embedding',
+             'Seconds without edits before a document is re-embedded (0 = autosave never embeds)', '0', '86400'),
+            ('embedding.debounce_max_wait_s', '1800', 'int', 'embedding',
+             'Max seconds a continuously edited document waits for a re-embed', '60', '86400')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,40 @@
+"""Add streaming file embedding configuration seed.
+
+Seeds AgentConfigurations with the batch size at which streamed file
+chunks are embedded and committed.
+
+Revision ID: 20260331_stream_embed_config
+Revises: 20260330_embed_debounce_config
+Create Date: 2026-03-31
+"""
+
+from alembic import op
+
+revision = "20260331_stream_embed_config"
+down_revision = "20260330_embed_debounce_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "embedding.stream_flush_chunks",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('embedding.stream_flush_chunks', '256', 'int', 'embedding',
+             'Chunks embedded and committed per batch while a file is streamed', '16', '4096')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,99 @@
+"""Add content-addressed extraction cache tables and configuration seeds.
+
+Creates ExtractionCache (one row per sha256 + extractor version + embedding
+model) and ExtractionCacheChunks (cached chunk texts and pgvector
+embeddings), and seeds AgentConfigurations with the cache size budget and
+idle TTL.
+
+Revision ID: 20260401_extraction_cache
+Revises: 20260331_stream_embed_config
+Create Date: 2026-04-01
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision = "20260401_extraction_cache"
+down_revision = "20260331_stream_embed_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "file.extraction_cache_max_mb",
+    "file.extraction_cache_ttl_days",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ExtractionCache",
+        sa.Column("id", sa.UUID(), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("sha256_hash", sa.String(length=64), nullable=False),
+        sa.Column("extractor_version", sa.String(length=100), nullable=False),
+        sa.Column("embedding_model", sa.String(length=255), nullable=False),
+        sa.Column("content_plain", sa.Text(), nullable=False, server_default=""),
+        sa.Column("extracted_metadata", JSONB(), nullable=True),
+        sa.Column("chunk_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("token_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_extraction_cache_key",
+        "ExtractionCache",
+        ["sha256_hash", "extractor_version", "embedding_model"],
+        unique=True,
+    )
+    op.create_index("ix_extraction_cache_last_used", "ExtractionCache", ["last_used_at"])
+
+    op.create_table(
+        "ExtractionCacheChunks",
+        sa.Column("id", sa.UUID(), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("entry_id", sa.UUID(), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("chunk_text", sa.Text(), nullable=False),
+        sa.Column("chunk_type", sa.String(length=20), nullable=False, server_default="text"),
+        sa.Column("heading_context", sa.String(length=500), nullable=True),
+        # embedding column added via raw SQL (pgvector type not in SA core)
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["entry_id"], ["ExtractionCache.id"], ondelete="CASCADE"),
+    )
+    op.execute('ALTER TABLE "ExtractionCacheChunks" ADD COLUMN embedding vector(1536)')
+    op.create_index(
+        "ix_extraction_cache_chunks_entry",
+        "ExtractionCacheChunks",
+        ["entry_id", "chunk_index"],
+        unique=True,
+    )
+
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('file.extraction_cache_max_mb', '2048', 'int', 'file',
+             'Extraction cache size budget in MB, LRU-evicted (0 disables the cache)', '0', '1048576'),
+            ('file.extraction_cache_ttl_days', '90', 'int', 'file',
+             'Days an unused extraction cache entry is kept', '1', '3650')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
+
+    op.drop_index("ix_extraction_cache_chunks_entry", table_name="ExtractionCacheChunks")
+    op.drop_table("ExtractionCacheChunks")
+    op.drop_index("ix_extraction_cache_last_used", table_name="ExtractionCache")
+    op.drop_index("uq_extraction_cache_key", table_name="ExtractionCache")
+    op.drop_table("ExtractionCache")
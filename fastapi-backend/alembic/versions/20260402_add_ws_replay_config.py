@@ -0,0 +1,43 @@
+"""Add WebSocket event replay configuration seeds.
+
+Seeds AgentConfigurations with the length cap and idle TTL of the per-room
+Redis Streams that reconnecting WebSocket clients replay missed events from.
+
+Revision ID: 20260402_ws_replay_config
+Revises: 20260401_extraction_cache
+Create Date: 2026-04-02
+"""
+
+from alembic import op
+
+revision = "20260402_ws_replay_config"
+down_revision = "20260401_extraction_cache"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "websocket.replay_max_events",
+    "websocket.replay_ttl_s",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('websocket.replay_max_events', '200', 'int', 'websocket',
+             'Events kept per room for reconnect replay (larger gaps trigger a refetch)', '10', '10000'),
+            ('websocket.replay_ttl_s', '21600', 'int', 'websocket',
+             'Seconds a room event stream is kept after its last event', '60', '604800')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,58 @@
+"""Add WebSocket send queue configuration seed.
+
+Seeds AgentConfigurations with the per-connection outbound queue size past
+which a WebSocket client is evicted as a slow consumer, and removes the
+broadcast batch size it replaces.
+
+Revision ID: 20260403_ws_send_queue_config
+Revises: 20260402_ws_replay_config
+Create Date: 2026-04-03
+"""
+
+from alembic import op
+
+revision = "20260403_ws_send_queue_config"
+down_revision = "20260402_ws_replay_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "websocket.send_queue_max",
+]
+
+# Batching key superseded by per-connection send queues (restored on downgrade).
+_REMOVED_KEYS = [
+    "websocket.batch_size",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('websocket.send_queue_max', '256', 'int', 'websocket',
+             'Messages queued per connection before it is evicted as a slow consumer', '16', '10000')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+    removed_csv = ", ".join(f"'{k}'" for k in _REMOVED_KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({removed_csv})')
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('websocket.batch_size', '50', 'int', 'websocket',
+             'Messages per broadcast batch', '10', '200')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
@@ -0,0 +1,42 @@
+"""Add WebSocket coalescing window configuration seed.
+
+Seeds AgentConfigurations with the window in which repeated high-frequency
+room events (task moves and updates, checklist toggles, presence and typing
+indicators) collapse to the latest state per entity.
+
+Revision ID: 20260404_ws_coalesce_config
+Revises: 20260403_ws_send_queue_config
+Create Date: 2026-04-04
+"""
+
+from alembic import op
+
+revision = "20260404_ws_coalesce_config"
+down_revision = "20260403_ws_send_queue_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "websocket.coalesce_window_ms",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('websocket.coalesce_window_ms', '75', 'int', 'websocket',
+             'Window in which repeated task/checklist/indicator events collapse to the latest (0 disables)',
+             '0', '1000')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,41 @@
+"""Add presence heartbeat flush interval configuration seed.
+
+Seeds AgentConfigurations with the interval at which each worker writes its
+buffered presence heartbeats to Redis in a single pipeline.
+
+Revision ID: 20260405_ws_presence_flush_config
+Revises: 20260404_ws_coalesce_config
+Create Date: 2026-04-05
+"""
+
+from alembic import op
+
+revision = "20260405_ws_presence_flush_config"
+down_revision = "20260404_ws_coalesce_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "websocket.presence_flush_ms",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('websocket.presence_flush_ms', '1000', 'int', 'websocket',
+             'Interval at which buffered presence heartbeats are written to Redis',
+             '50', '10000')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,41 @@
+"""Add batched knowledge search query limit configuration seed.
+
+Seeds AgentConfigurations with the maximum number of queries the agent's
+search_knowledge_many tool accepts in one call.
+
+Revision ID: 20260406_search_many_config
+Revises: 20260405_ws_presence_flush_config
+Create Date: 2026-04-06
+"""
+
+from alembic import op
+
+revision = "20260406_search_many_config"
+down_revision = "20260405_ws_presence_flush_config"
+branch_labels = None
+depends_on = None
+
+# Keys inserted by this migration (used by both upgrade and downgrade).
+_KEYS = [
+    "agent.search_many_max_queries",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO "AgentConfigurations"
+            (key, value, value_type, category, description, min_value, max_value)
+        VALUES
+            ('agent.search_many_max_queries', '6', 'int', 'agent',
+             'Maximum queries per batched knowledge search tool call',
+             '1', '20')
+        ON CONFLICT (key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    # Build a comma-separated list of quoted keys for the IN clause.
+    keys_csv = ", ".join(f"'{k}'" for k in _KEYS)
+    op.execute(f'DELETE FROM "AgentConfigurations" WHERE key IN ({keys_csv})')
@@ -0,0 +1,31 @@
+"""Index live FolderFiles by content hash.
+
+The extraction cache purges an entry once no live FolderFile has its
+sha256_hash; this partial index keeps that lookup off a sequential scan.
+
+Revision ID: 20260407_folder_files_sha256
+Revises: 20260406_search_many_config
+Create Date: 2026-04-07
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20260407_folder_files_sha256"
+down_revision = "20260406_search_many_config"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_folder_files_sha256_live",
+        "FolderFiles",
+        ["sha256_hash"],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_folder_files_sha256_live", table_name="FolderFiles")
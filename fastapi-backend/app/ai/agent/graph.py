@@ -108,6 +108,7 @@ async def _get_langchain_chat_model(
 _KNOWLEDGE_TOOLS_TO_KEEP = frozenset(
     {
         "search_knowledge",
+        "search_knowledge_many",
         "read_document",
         "get_document_details",
     }
@@ -131,7 +132,7 @@ def _strip_completed_tool_messages(messages: list[BaseMessage]) -> list[BaseMess
     Keep HumanMessages + final AIMessage(content). SystemMessages always kept.
     The current (in-progress) turn is preserved entirely.
 
-    Knowledge tool results (search_knowledge, read_document, get_document_details)
+    Knowledge tool results (search_knowledge[_many], read_document, get_document_details)
     are preserved by appending a condensed summary to the closing AIMessage,
     since these results are useful context for follow-up questions.
     """
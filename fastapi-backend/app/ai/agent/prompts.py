@@ -120,6 +120,8 @@ from most preferred to least preferred within each category.
 
 ### Knowledge base
 - search_knowledge(query, application?, project?) — semantic + keyword search
+- search_knowledge_many(queries, application?, project?) — several searches in one call; \
+prefer over repeated search_knowledge calls for distinct topics
 - browse_folders(scope, scope_id?, folder_id?) — folder/doc structure
 - get_document_details(doc) — metadata about a document
 - list_recent_documents(scope?, limit?) — recently modified docs
@@ -76,6 +76,7 @@ from .knowledge_tools import (
     list_recent_documents,
     read_document,
     search_knowledge,
+    search_knowledge_many,
 )
 
 # -- Utility tools -----------------------------------------------------------
@@ -163,8 +164,9 @@ ALL_READ_TOOLS = [
     get_task_detail,
     get_task_comments,
     get_blocked_tasks,
-    # Knowledge (6)
+    # Knowledge (7)
     search_knowledge,
+    search_knowledge_many,
     browse_folders,
     get_document_details,
     read_document,
@@ -218,6 +220,7 @@ __all__ = [
     "get_task_comments",
     "get_blocked_tasks",
     "search_knowledge",
+    "search_knowledge_many",
     "browse_folders",
     "get_document_details",
     "read_document",
@@ -227,6 +227,84 @@ async def search_knowledge(
         return "Error searching knowledge base. Please try again."
 
 
+@tool
+async def search_knowledge_many(
+    queries: list[str],
+    application: str = "",
+    project: str = "",
+) -> str:
+    """Run several knowledge-base searches at once.
+
+    Use this instead of calling search_knowledge repeatedly when you need
+    to look up multiple distinct topics in the same step (e.g. "deployment
+    checklist" and "rollback procedure"). All queries share the same scope.
+    Results are grouped per query; no selection UI is shown.
+
+    Args:
+        queries: List of search queries in natural language (max 6).
+        application: Optional application UUID or name (partial match supported).
+        project: Optional project UUID or name (partial match supported).
+    """
+    from ...agent_tools import rag_search_many_tool
+    from ...config_service import get_agent_config
+    from ..source_references import ToolResultWithSources, push_sources
+
+    user_id = _get_user_id()
+
+    cleaned = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if not cleaned:
+        return "Error: Provide at least one non-empty query."
+    max_queries = get_agent_config().get_int("agent.search_many_max_queries", 6)
+    if len(cleaned) > max_queries:
+        return f"Error: At most {max_queries} queries per call. Split the lookups or merge related queries."
+
+    try:
+        async with _get_tool_session() as db:
+            application_id: str | None = None
+            project_id: str | None = None
+
+            if application and application.strip():
+                resolved_app, err = await _resolve_application(application, db)
+                if err:
+                    return err
+                application_id = resolved_app
+            if project and project.strip():
+                resolved_proj, err = await _resolve_project(project, db)
+                if err:
+                    return err
+                project_id = resolved_proj
+
+            ctx = _get_ctx()
+            provider_registry = ctx.get("provider_registry")
+
+            result = await rag_search_many_tool(
+                queries=cleaned,
+                user_id=user_id,
+                db=db,
+                provider_registry=provider_registry,
+                application_id=UUID(application_id) if application_id else None,
+                project_id=UUID(project_id) if project_id else None,
+            )
+
+        if not result.success:
+            logger.warning("rag_search_many_tool error: %s", result.error)
+            return "Knowledge search returned no results. Please try again."
+
+        formatted_text = result.data or "No results found."
+        docs_meta = (result.metadata or {}).get("documents", [])
+        if docs_meta:
+            sources = _build_sources(docs_meta)
+            tool_result = ToolResultWithSources(text=formatted_text, sources=sources)
+            push_sources(sources)
+            return _truncate(tool_result.format_for_llm(), max_len=16000)
+
+        return _truncate(formatted_text, max_len=16000)
+
+    except Exception as exc:
+        logger.warning("search_knowledge_many failed: %s: %s", type(exc).__name__, exc)
+        return "Error searching knowledge base. Please try again."
+
+
 @tool
 async def read_document(document_id: str) -> str:
     """Read the full content of a specific document.
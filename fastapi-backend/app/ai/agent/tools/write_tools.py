@@ -66,9 +66,13 @@ from .helpers import (
 )
 
 from ....utils.tasks import fire_and_forget
+from ...retrieval_cache import bump_knowledge_generation
 
 logger = logging.getLogger(__name__)
 
+# Deferral of the direct re-embed after update_document when debouncing is off
+_EMBED_DEFER_S = 120
+
 
 async def _broadcast_doc_event(
     message_type: MessageType,
@@ -478,6 +482,7 @@ async def update_task_status(
                 task_obj.completed_at = _utc_now()
             elif old_was_done and not new_is_done:
                 task_obj.completed_at = None
+            task_obj.row_version = (task_obj.row_version or 0) + 1
 
             await db.flush()
 
@@ -641,6 +646,7 @@ async def assign_task(
                 return f"Error: Task '{task}' no longer exists."
 
             task_obj.assignee_id = assignee_uuid
+            task_obj.row_version = (task_obj.row_version or 0) + 1
             await db.flush()
 
             _broadcast_data = {
@@ -879,7 +885,7 @@ async def create_document(
             try:
                 from datetime import timedelta
 
-                from ....services.arq_helper import get_arq_redis
+                from ....services.arq_helper import get_arq_redis, lane_queue
 
                 arq_redis = await get_arq_redis()
                 await arq_redis.enqueue_job(
@@ -887,6 +893,7 @@ async def create_document(
                     doc_id,
                     _job_id=f"embed:{doc_id}",
                     _defer_by=timedelta(seconds=120),
+                    _queue_name=lane_queue("embed_document_job"),
                 )
             except Exception:
                 logger.warning(
@@ -1306,26 +1313,12 @@ async def update_document(
             doc_id = str(document.id)
             final_title = document.title
 
-            # Trigger re-embedding job if content changed
+            # Re-embed if content changed: debounced when enabled, so a run
+            # of agent edits embeds once; otherwise deferred as before
             if has_content:
-                try:
-                    from datetime import timedelta
+                from ....services.embed_debounce import schedule_document_embed
 
-                    from ....services.arq_helper import get_arq_redis
-
-                    arq_redis = await get_arq_redis()
-                    await arq_redis.enqueue_job(
-                        "embed_document_job",
-                        doc_id,
-                        _job_id=f"embed:{doc_id}",
-                        _defer_by=timedelta(seconds=120),
-                    )
-                except Exception:
-                    logger.warning(
-                        "Failed to enqueue embedding job for document %s",
-                        doc_id,
-                        exc_info=True,
-                    )
+                await schedule_document_embed(doc_id, fallback_defer_s=_EMBED_DEFER_S)
 
             _doc_broadcast = {
                 "doc_id": doc_id,
@@ -1489,6 +1482,14 @@ async def delete_document(
 
     # Broadcast AFTER commit (block exit committed)
     if _doc_broadcast:
+        owner_app_id = _doc_broadcast["application_id"]
+        if owner_app_id is None and _doc_broadcast["project_id"]:
+            async with _get_tool_session() as db:
+                owner_app_id = (
+                    await db.execute(select(Project.application_id).where(Project.id == _doc_broadcast["project_id"]))
+                ).scalar_one_or_none()
+        await bump_knowledge_generation(owner_app_id, _doc_broadcast["user_id"])
+
         fire_and_forget(
             _broadcast_doc_event(
                 message_type=MessageType.DOCUMENT_DELETED,
@@ -1737,6 +1738,7 @@ async def update_task(
                 task_obj.due_date = date_type.fromisoformat(due_date)
             if task_type:
                 task_obj.task_type = task_type.lower()
+            task_obj.row_version = (task_obj.row_version or 0) + 1
 
             await db.flush()
 
@@ -1,9 +1,10 @@
 """Agent tools interface for Phase 4 LangGraph agent.
 
-Provides three tools:
+Provides four tools:
 1. sql_query_tool -- NL question -> SQL generation -> validation -> execution
 2. rag_search_tool -- Wraps Phase 2 HybridRetrievalService
-3. export_to_excel_tool -- Query results -> Excel file -> download URL
+3. rag_search_many_tool -- Batched rag_search_tool for several queries
+4. export_to_excel_tool -- Query results -> Excel file -> download URL
 """
 
 from __future__ import annotations
@@ -17,7 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas.sql_query import ToolResult
 from .embedding_normalizer import EmbeddingNormalizer
 from .provider_registry import ProviderRegistry
-from .retrieval_service import HybridRetrievalService
+from .retrieval_service import HybridRetrievalService, RetrievalResult
 
 from .config_service import get_agent_config
 
@@ -146,6 +147,7 @@ async def rag_search_tool(
             application_id=application_id,
             project_id=project_id,
             query_embedding=cached_embedding,
+            expand_neighbors=_neighbor_expansion_enabled(),
         )
 
         if not results:
@@ -155,22 +157,7 @@ async def rag_search_tool(
                 metadata={"result_count": 0},
             )
 
-        # Format results as text for LLM consumption
-        # Use full chunk_text (not truncated snippet) so the agent can answer
-        # questions from the actual document content.
-        lines: list[str] = []
-        for i, r in enumerate(results, 1):
-            heading = f" [{r.heading_context}]" if r.heading_context else ""
-            type_tag = " [image description]" if r.chunk_type == "image" else ""
-            # Tag file results so the agent knows the source is an uploaded file
-            source_tag = " [file]" if r.source_type == "file" else ""
-            lines.append(
-                f"[{i}] {r.document_title}{heading} (score: {r.score:.4f}, source: {r.source}){type_tag}{source_tag}"
-            )
-            lines.append(r.chunk_text.strip())
-            lines.append("")
-
-        formatted = "\n".join(lines)
+        formatted = _format_rag_results(results)
         if len(formatted) > MAX_KNOWLEDGE_OUTPUT_CHARS:
             formatted = formatted[:MAX_KNOWLEDGE_OUTPUT_CHARS] + "\n\n... (output truncated)"
 
@@ -179,21 +166,7 @@ async def rag_search_tool(
             data=formatted,
             metadata={
                 "result_count": len(results),
-                "documents": [
-                    {
-                        "document_id": str(r.document_id),
-                        "title": r.document_title,
-                        "score": r.score,
-                        "source": r.source,
-                        "heading_context": r.heading_context or "",
-                        "chunk_text": r.chunk_text[:200] if r.chunk_text else "",
-                        "application_id": str(r.application_id) if r.application_id else "",
-                        "chunk_index": r.chunk_index if r.chunk_index is not None else 0,
-                        "source_type": r.source_type,
-                        "file_id": str(r.file_id) if r.file_id else None,
-                    }
-                    for r in results
-                ],
+                "documents": [_rag_result_metadata(r) for r in results],
             },
         )
 
@@ -202,6 +175,127 @@ async def rag_search_tool(
         return ToolResult(success=False, error=str(e))
 
 
+async def rag_search_many_tool(
+    queries: list[str],
+    user_id: UUID,
+    db: AsyncSession,
+    provider_registry: ProviderRegistry,
+    application_id: UUID | None = None,
+    project_id: UUID | None = None,
+) -> ToolResult:
+    """Run several knowledge-base searches in one batched retrieval.
+
+    Uses ``HybridRetrievalService.retrieve_many`` so RBAC scope resolution,
+    query embedding, vector search and Meilisearch each happen once for
+    the whole batch.
+
+    Args:
+        queries: Search query strings.
+        user_id: UUID of the requesting user (for RBAC scoping).
+        db: Async database session.
+        provider_registry: For generating query embeddings.
+        application_id: Optional scope filter.
+        project_id: Optional scope filter.
+
+    Returns:
+        ToolResult with results grouped per query. ``metadata["documents"]``
+        is the de-duplicated union across queries; ``metadata["queries"]``
+        holds per-query result counts.
+    """
+    try:
+        service = HybridRetrievalService(
+            provider_registry=provider_registry,
+            normalizer=_embedding_normalizer,
+            db=db,
+        )
+
+        per_query = await service.retrieve_many(
+            queries=queries,
+            user_id=user_id,
+            limit=20,
+            application_id=application_id,
+            project_id=project_id,
+            expand_neighbors=_neighbor_expansion_enabled(),
+        )
+
+        # Split the output budget evenly so one broad query cannot starve the rest
+        budget = MAX_KNOWLEDGE_OUTPUT_CHARS // max(len(queries), 1)
+        sections: list[str] = []
+        documents: list[dict[str, Any]] = []
+        seen: set[tuple[str, int]] = set()
+        for query, results in zip(queries, per_query):
+            body = _format_rag_results(results) if results else "No relevant documents found.\n"
+            if len(body) > budget:
+                body = body[:budget] + "\n\n... (output truncated)"
+            sections.append(f"## Results for: {query}\n{body}")
+            for r in results:
+                key = (str(r.document_id), r.chunk_index if r.chunk_index is not None else 0)
+                if key not in seen:
+                    seen.add(key)
+                    documents.append(_rag_result_metadata(r))
+
+        return ToolResult(
+            success=True,
+            data="\n".join(sections),
+            metadata={
+                "result_count": len(documents),
+                "queries": [{"query": q, "result_count": len(r)} for q, r in zip(queries, per_query)],
+                "documents": documents,
+            },
+        )
+
+    except Exception as e:
+        logger.warning("rag_search_many_tool failed: %s: %s", type(e).__name__, e)
+        return ToolResult(success=False, error=str(e))
+
+
+def _format_rag_results(results: list[RetrievalResult]) -> str:
+    """Format retrieval results as numbered text for LLM consumption.
+
+    Uses full chunk_text (not truncated snippet) so the agent can answer
+    questions from the actual document content.
+    """
+    lines: list[str] = []
+    for i, r in enumerate(results, 1):
+        heading = f" [{r.heading_context}]" if r.heading_context else ""
+        type_tag = " [image description]" if r.chunk_type == "image" else ""
+        # Tag file results so the agent knows the source is an uploaded file
+        source_tag = " [file]" if r.source_type == "file" else ""
+        lines.append(
+            f"[{i}] {r.document_title}{heading} (score: {r.score:.4f}, source: {r.source}){type_tag}{source_tag}"
+        )
+        # Adjacent chunks (when expanded) frame the hit so the agent rarely
+        # needs a follow-up read_document for surrounding context
+        if r.context_before:
+            lines.append(r.context_before)
+        lines.append(r.chunk_text.strip())
+        if r.context_after:
+            lines.append(r.context_after)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _neighbor_expansion_enabled() -> bool:
+    """Adjacent-chunk expansion is on unless ``search.neighbor_window`` is 0."""
+    return get_agent_config().get_int("search.neighbor_window", 1) > 0
+
+
+def _rag_result_metadata(r: RetrievalResult) -> dict[str, Any]:
+    """Structured per-result metadata used to build source references."""
+    return {
+        "document_id": str(r.document_id),
+        "title": r.document_title,
+        "score": r.score,
+        "source": r.source,
+        "heading_context": r.heading_context or "",
+        "chunk_text": r.chunk_text[:200] if r.chunk_text else "",
+        "application_id": str(r.application_id) if r.application_id else "",
+        "chunk_index": r.chunk_index if r.chunk_index is not None else 0,
+        "source_type": r.source_type,
+        "file_id": str(r.file_id) if r.file_id else None,
+    }
+
+
 async def export_to_excel_tool(
     columns: list[str],
     rows: list[dict[str, Any]],
@@ -0,0 +1,186 @@
+"""Bulk DocumentChunk writer.
+
+Inserting chunks through the ORM (``add_all`` + ``flush``) issues one
+INSERT per row, each carrying a 1536-float vector literal, which made
+chunk storage the slowest DB step of the embedding pipeline for large
+files.
+
+``write_chunks`` instead sends every chunk of a source in a single
+``INSERT ... SELECT FROM unnest(...)`` statement. Column values are bound as
+typed arrays, and all embeddings go as one flat ``real[]`` (asyncpg's binary
+wire format) that is sliced per row and cast to ``vector`` server-side.
+With ``replace=True`` the same statement first deletes the source's existing
+chunks through a data-modifying CTE, so re-embedding swaps chunk sets
+atomically in one round trip.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..utils.timezone import utc_now
+
+
+@dataclass
+class ChunkRow:
+    """One chunk to store; scope and parent come from ``write_chunks``."""
+
+    chunk_index: int
+    chunk_text: str
+    token_count: int
+    heading_context: str | None = None
+    chunk_type: str = "text"
+
+
+_INSERT_COLUMNS = """(
+    id, document_id, file_id, source_type, chunk_index, chunk_text, chunk_type,
+    heading_context, embedding, token_count, application_id, project_id, user_id,
+    created_at, updated_at
+)"""
+
+_SELECT_ROWS = """SELECT
+    c.id,
+    CAST(:document_id AS uuid),
+    CAST(:file_id AS uuid),
+    CAST(:source_type AS varchar),
+    c.chunk_index,
+    c.chunk_text,
+    c.chunk_type,
+    c.heading_context,
+    CASE WHEN c.has_embedding
+         THEN CAST((CAST(:embeddings AS real[]))[(c.ord - 1) * :dims + 1 : c.ord * :dims] AS vector)
+    END,
+    c.token_count,
+    CAST(:application_id AS uuid),
+    CAST(:project_id AS uuid),
+    CAST(:user_id AS uuid),
+    CAST(:now AS timestamptz),
+    CAST(:now AS timestamptz)
+FROM {source}unnest(
+    CAST(:ids AS uuid[]),
+    CAST(:chunk_indexes AS integer[]),
+    CAST(:chunk_texts AS text[]),
+    CAST(:chunk_types AS varchar[]),
+    CAST(:headings AS varchar[]),
+    CAST(:token_counts AS integer[]),
+    CAST(:has_embedding AS boolean[])
+) WITH ORDINALITY AS c(id, chunk_index, chunk_text, chunk_type, heading_context, token_count, has_embedding, ord)"""
+
+# The INSERT reads count(*) from the DELETE so every old row is removed
+# before any new row is produced (unreferenced data-modifying CTEs run after
+# the main statement, which would trip the (parent, chunk_index) unique index).
+_REPLACE_SQL = f"""
+WITH deleted AS (
+    DELETE FROM "DocumentChunks" WHERE {{parent_column}} = CAST(:parent_id AS uuid) RETURNING 1
+), cleared AS (
+    SELECT count(*) AS n FROM deleted
+)
+INSERT INTO "DocumentChunks" {_INSERT_COLUMNS}
+{_SELECT_ROWS.format(source="cleared, ")}
+"""
+
+_APPEND_SQL = f"""
+INSERT INTO "DocumentChunks" {_INSERT_COLUMNS}
+{_SELECT_ROWS.format(source="")}
+"""
+
+
+def _flatten_embeddings(
+    embeddings: np.ndarray | Sequence[Sequence[float] | None],
+    count: int,
+) -> tuple[list[float], list[bool], int]:
+    """Pack embeddings into one flat float32 list plus a per-row presence mask.
+
+    Missing embeddings (``None``) are zero-filled and masked out so the row
+    is stored with a NULL vector.
+    """
+    if isinstance(embeddings, np.ndarray):
+        matrix = embeddings.astype(np.float32, copy=False).reshape(count, -1)
+        return matrix.ravel().tolist(), [True] * count, matrix.shape[1]
+
+    present = [e is not None for e in embeddings]
+    dims = next((len(e) for e in embeddings if e is not None), 0)
+    matrix = np.zeros((count, dims), dtype=np.float32)
+    for i, e in enumerate(embeddings):
+        if e is not None:
+            matrix[i] = e
+    return matrix.ravel().tolist(), present, dims
+
+
+async def write_chunks(
+    db: AsyncSession,
+    rows: Sequence[ChunkRow],
+    embeddings: np.ndarray | Sequence[Sequence[float] | None],
+    scope_ids: dict[str, Any],
+    document_id: UUID | None = None,
+    file_id: UUID | None = None,
+    replace: bool = True,
+) -> int:
+    """Store chunks for one document or file in a single statement.
+
+    Args:
+        db: Active session; the statement joins its transaction.
+        rows: Chunks to insert.
+        embeddings: ``(len(rows), dims)`` array, or a list parallel to
+            ``rows`` where ``None`` stores the chunk without a vector.
+        scope_ids: Dict with application_id, project_id, user_id.
+        document_id: Parent document (exactly one of document_id/file_id).
+        file_id: Parent folder file.
+        replace: Delete the parent's existing chunks in the same statement.
+
+    Returns:
+        Number of chunks inserted.
+    """
+    if (document_id is None) == (file_id is None):
+        raise ValueError("write_chunks requires exactly one of document_id or file_id")
+
+    parent_column = "document_id" if document_id is not None else "file_id"
+    parent_id = str(document_id if document_id is not None else file_id)
+
+    if not rows:
+        if replace:
+            await db.execute(
+                text(f'DELETE FROM "DocumentChunks" WHERE {parent_column} = CAST(:parent_id AS uuid)'),
+                {"parent_id": parent_id},
+            )
+        return 0
+
+    if len(embeddings) != len(rows):
+        raise ValueError(f"Got {len(embeddings)} embeddings for {len(rows)} chunks")
+
+    flat, present, dims = _flatten_embeddings(embeddings, len(rows))
+
+    def _opt(value: Any) -> str | None:
+        return str(value) if value is not None else None
+
+    params: dict[str, Any] = {
+        "parent_id": parent_id,
+        "document_id": _opt(document_id),
+        "file_id": _opt(file_id),
+        "source_type": "file" if file_id is not None else "document",
+        "application_id": _opt(scope_ids.get("application_id")),
+        "project_id": _opt(scope_ids.get("project_id")),
+        "user_id": _opt(scope_ids.get("user_id")),
+        "now": utc_now(),
+        "embeddings": flat,
+        "dims": dims,
+        "ids": [str(uuid.uuid4()) for _ in rows],
+        "chunk_indexes": [r.chunk_index for r in rows],
+        "chunk_texts": [r.chunk_text for r in rows],
+        "chunk_types": [r.chunk_type for r in rows],
+        "headings": [r.heading_context for r in rows],
+        "token_counts": [r.token_count for r in rows],
+        "has_embedding": present,
+    }
+
+    sql = _REPLACE_SQL.format(parent_column=parent_column) if replace else _APPEND_SQL
+    await db.execute(text(sql), params)
+    return len(rows)
@@ -5,13 +5,21 @@ types: regular TipTap documents (rich text) and CANVAS documents (freeform
 spatial canvases with elements, connectors, and spatial clustering).
 
 TipTap Strategy:
-  - Walk TipTap JSON tree (reuses pattern from content_converter.py)
+  - Text blocks come from the shared single-pass walk (services/tiptap_walker.py)
   - Split at heading boundaries (h1, h2, h3)
   - Target: 500-800 tokens per chunk
   - Overlap: ~100 tokens between adjacent chunks for context continuity
   - Each chunk keeps heading_context (ancestor headings) for retrieval quality
   - Handles: paragraphs, lists, code blocks, tables, blockquotes, drawio
   - Strips: image nodes (handled by image understanding in Phase 6)
+  - Each block is encoded once; its token ids travel with it so chunk counts
+    and overlap slices reuse them instead of re-encoding merged text
+
+Large inputs (``achunk_document`` / ``achunk_markdown``):
+  - Blocks are cut into sections at top-level headings where merging state
+    is guaranteed to reset, and sections are merged in a process pool
+  - Sections are stitched in order before overlap and chunk_index, so the
+    output is identical to the in-process path
 
 Canvas Strategy:
   - Parse canvas JSON elements array
@@ -24,12 +32,18 @@ Canvas Strategy:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
+import multiprocessing
 import re
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from typing import Any
 
+from ..services.tiptap_walker import TiptapIR, walk_tiptap
+
 logger = logging.getLogger(__name__)
 
 import tiktoken
@@ -39,6 +53,22 @@ import tiktoken
 _tiktoken_encoder = tiktoken.get_encoding("cl100k_base")
 
 
+def _piece_boundary(text: str, last: bool = False) -> int:
+    """First (or last) offset where cl100k_base pre-tokenization always splits.
+
+    The split pattern never carries a pre-token across a newline followed by
+    a non-space char, nor across a non-space char followed by a space or
+    tab, so at such an offset ``encode(text) == encode(text[:i]) +
+    encode(text[i:])``. Returns 0 when the text has no such offset.
+    """
+    offsets = range(len(text) - 1, 0, -1) if last else range(1, len(text))
+    for i in offsets:
+        prev, ch = text[i - 1], text[i]
+        if (prev == "\n" and not ch.isspace()) or (ch in " \t" and not prev.isspace()):
+            return i
+    return 0
+
+
 @dataclass
 class ChunkResult:
     """A single chunk ready for embedding."""
@@ -47,6 +77,9 @@ class ChunkResult:
     heading_context: str | None
     token_count: int
     chunk_index: int
+    # Exact encoding of ``text`` when the chunker already has it, so overlap
+    # can slice it instead of re-encoding the previous chunk.
+    token_ids: list[int] | None = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -58,6 +91,7 @@ class _TextBlock:
     token_count: int = 0
     is_table: bool = False
     table_columns: list[str] | None = None
+    token_ids: list[int] | None = field(default=None, repr=False)
 
 
 @dataclass
@@ -90,6 +124,8 @@ class SemanticChunker:
     Args:
         target_tokens: Target chunk size in tokens (default 600).
         overlap_tokens: Token overlap between adjacent chunks (default 100).
+        max_tokens: Fixed chunk ceiling; defaults to the live
+            ``embedding.max_chunk_tokens`` config.
     """
 
     # M3: Getter functions read from config at call time so admin changes
@@ -121,22 +157,72 @@ class SemanticChunker:
     CANVAS_PROXIMITY_THRESHOLD = _chunker_cfg.get_float("embedding.canvas_proximity_threshold", 300.0)
     del _chunker_cfg, _get_cfg
 
-    def __init__(self, target_tokens: int = 600, overlap_tokens: int = 100) -> None:
+    def __init__(self, target_tokens: int = 600, overlap_tokens: int = 100, max_tokens: int | None = None) -> None:
         self.target_tokens = target_tokens
         self.overlap_tokens = overlap_tokens
+        self._max_tokens = max_tokens
         self._encoder = _tiktoken_encoder
 
+    def _max_chunk_tokens(self) -> int:
+        return self._max_tokens if self._max_tokens is not None else self._get_max_tokens()
+
     def count_tokens(self, text: str) -> int:
         """Count tokens using tiktoken cl100k_base encoding."""
         if not text:
             return 0
         return len(self._encoder.encode(text))
 
+    def _encode(self, text: str) -> list[int]:
+        return self._encoder.encode(text) if text else []
+
+    def _count_block(self, block: _TextBlock) -> None:
+        """Encode a block once, keeping its ids for the merge and overlap steps."""
+        block.token_ids = self._encode(block.text)
+        block.token_count = len(block.token_ids)
+
+    def _joined_ids(self, blocks: list[_TextBlock]) -> list[int] | None:
+        """Exact ids of ``"".join(b.text for b in blocks).strip()`` from the blocks' ids.
+
+        Only the last word of the final block is re-encoded (to drop its
+        trailing newline). Returns None when a join or the leading strip
+        would not split cleanly; callers then encode the chunk text.
+        """
+        if not blocks or any(b.token_ids is None for b in blocks):
+            return None
+        if blocks[0].text[:1].isspace():
+            return None
+        for prev, nxt in zip(blocks, blocks[1:]):
+            if not prev.text.endswith("\n") or not nxt.text[:1] or nxt.text[:1].isspace():
+                return None
+
+        last = blocks[-1]
+        stripped = last.text.rstrip()
+        if not stripped:
+            return None
+        ids = [t for b in blocks[:-1] for t in b.token_ids]
+        if stripped == last.text:
+            return ids + last.token_ids
+        cut = _piece_boundary(stripped, last=True)
+        tail_len = len(self._encode(last.text[cut:])) if cut else len(last.token_ids)
+        return ids + last.token_ids[: len(last.token_ids) - tail_len] + self._encode(stripped[cut:])
+
+    def _prefixed_ids(self, prefix: str, text: str, ids: list[int]) -> list[int]:
+        """Exact ids of ``prefix + text`` given ``ids == encode(text)``.
+
+        Only the prefix and the text's first pre-token are re-encoded.
+        """
+        cut = _piece_boundary(text)
+        if not cut:
+            return self._encode(prefix + text)
+        head = text[:cut]
+        return self._encode(prefix + head) + ids[len(self._encode(head)) :]
+
     def chunk_document(
         self,
         content_json: dict[str, Any],
         title: str,
         document_type: str = "document",
+        ir: TiptapIR | None = None,
     ) -> list[ChunkResult]:
         """Main entry point. Routes to appropriate chunking strategy.
 
@@ -144,25 +230,56 @@ class SemanticChunker:
             content_json: TipTap JSON (document) or Canvas JSON (canvas).
             title: Document title for heading context.
             document_type: "document" for TipTap, "canvas" for spatial canvas.
+            ir: Cached walk of ``content_json`` (TipTap only), e.g. from the save.
 
         Returns:
             Ordered list of chunks with sequential chunk_index values.
         """
         if document_type == "canvas":
             return self._chunk_canvas(content_json, title)
-        return self._chunk_tiptap(content_json, title)
+        return self._chunk_tiptap(content_json, title, ir)
+
+    async def achunk_document(
+        self,
+        content_json: dict[str, Any],
+        title: str,
+        document_type: str = "document",
+        ir: TiptapIR | None = None,
+    ) -> list[ChunkResult]:
+        """Async ``chunk_document`` that merges large TipTap docs in the chunk pool.
+
+        Canvas documents and TipTap documents below
+        ``embedding.parallel_chunk_min_chars`` are chunked in-process.
+        """
+        if document_type == "canvas":
+            return self._chunk_canvas(content_json, title)
+        return await self._achunk_blocks(self._tiptap_blocks(content_json, title, ir))
 
     # ---- TipTap Chunking ----
 
-    def _chunk_tiptap(self, content_json: dict[str, Any], title: str) -> list[ChunkResult]:
+    def _chunk_tiptap(
+        self,
+        content_json: dict[str, Any],
+        title: str,
+        ir: TiptapIR | None = None,
+    ) -> list[ChunkResult]:
         """TipTap document chunking pipeline.
 
-        1. Parse TipTap JSON content tree
+        1. Walk TipTap JSON content tree (or reuse a cached walk)
         2. Extract text blocks with heading context
         3. Merge small blocks, split large blocks
         4. Add overlap between adjacent chunks
         5. Assign sequential chunk_index
         """
+        return self._chunk_blocks(self._tiptap_blocks(content_json, title, ir))
+
+    def _tiptap_blocks(
+        self,
+        content_json: dict[str, Any],
+        title: str,
+        ir: TiptapIR | None = None,
+    ) -> list[_TextBlock]:
+        """Non-empty text blocks of a TipTap document, not yet counted."""
         if not content_json:
             return []
 
@@ -170,20 +287,26 @@ class SemanticChunker:
         if not nodes:
             return []
 
-        blocks = self._extract_blocks(nodes, current_heading=title)
-        if not blocks:
-            return []
+        blocks = self._extract_blocks(nodes, current_heading=title, ir=ir)
 
         # Filter out blocks with no meaningful text
-        blocks = [b for b in blocks if b.text.strip()]
+        return [b for b in blocks if b.text.strip()]
+
+    def _chunk_blocks(self, blocks: list[_TextBlock], rows_per_chunk: int = 50) -> list[ChunkResult]:
+        """Count, merge/split, overlap and index extracted blocks in-process."""
         if not blocks:
             return []
 
         # Count tokens for each block
         for block in blocks:
-            block.token_count = self.count_tokens(block.text)
+            self._count_block(block)
+
+        # MED-2: Thread rows_per_chunk to _merge_and_split -> _split_table_by_rows
+        merged = self._merge_and_split(blocks, rows_per_chunk=rows_per_chunk)
+        return self._finish_chunks(merged)
 
-        merged = self._merge_and_split(blocks)
+    def _finish_chunks(self, merged: list[ChunkResult]) -> list[ChunkResult]:
+        """Add overlap to merged chunks and assign sequential chunk_index."""
         if not merged:
             return []
 
@@ -195,337 +318,105 @@ class SemanticChunker:
 
         return with_overlap
 
-    def _extract_blocks(
-        self,
-        nodes: list[dict[str, Any]],
-        current_heading: str | None = None,
-    ) -> list[_TextBlock]:
-        """Walk TipTap nodes recursively, extract text blocks with heading hierarchy."""
-        blocks: list[_TextBlock] = []
-
-        for node in nodes:
-            node_type = node.get("type", "")
-
-            if node_type == "heading":
-                level = node.get("attrs", {}).get("level", 1)
-                heading_text = self._inline_text(node.get("content", []))
-                if heading_text.strip():
-                    current_heading = heading_text.strip()
-                    # Start a new block at heading boundary
-                    blocks.append(
-                        _TextBlock(
-                            text=f"{'#' * level} {heading_text}\n",
-                            heading_context=current_heading,
-                        )
-                    )
-
-            elif node_type == "paragraph":
-                text = self._inline_text(node.get("content", []))
-                if text.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=text + "\n",
-                            heading_context=current_heading,
-                        )
-                    )
-
-            elif node_type in ("bulletList", "orderedList", "taskList"):
-                text = self._extract_list_text(node)
-                if text.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=text,
-                            heading_context=current_heading,
-                        )
-                    )
-                # Extract non-text nodes (drawio, tables) nested at any depth
-                # inside list items. _extract_list_text only extracts plain text,
-                # so rich nodes must be found recursively.
-                self._extract_rich_nodes_from_tree(
-                    node,
-                    blocks,
-                    current_heading,
-                )
-
-            elif node_type == "codeBlock":
-                code = self._extract_text_recursive(node.get("content", []))
-                lang = node.get("attrs", {}).get("language", "") or ""
-                text = f"```{lang}\n{code}\n```\n"
-                if code.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=text,
-                            heading_context=current_heading,
-                        )
-                    )
+    # ---- Parallel Chunking (large imports) ----
 
-            elif node_type == "blockquote":
-                inner_blocks = self._extract_blocks(
-                    node.get("content", []),
-                    current_heading=current_heading,
-                )
-                for b in inner_blocks:
-                    b.text = "> " + b.text.replace("\n", "\n> ").removesuffix("> ") + "\n"
-                blocks.extend(inner_blocks)
-
-            elif node_type == "table":
-                text, header_cells = self._extract_table_text_with_headers(node)
-                if text.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=text,
-                            heading_context=current_heading,
-                            is_table=True,
-                            table_columns=header_cells,
-                        )
-                    )
+    @staticmethod
+    def _get_parallel_min_chars() -> int:
+        from .config_service import get_agent_config
 
-            elif node_type == "horizontalRule":
-                continue  # Skip presentation-only elements
+        return get_agent_config().get_int("embedding.parallel_chunk_min_chars", 200_000)
 
-            elif node_type == "image":
-                continue  # Skip images (handled by image understanding)
+    @staticmethod
+    def _get_chunk_workers() -> int:
+        from .config_service import get_agent_config
 
-            elif node_type == "drawio":
-                text = self._extract_drawio_text(node)
-                if text.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=text,
-                            heading_context=current_heading,
-                        )
-                    )
+        return get_agent_config().get_int("embedding.chunk_workers", 4)
 
-            else:
-                # Unknown node type -- recurse into children (graceful degradation)
-                if "content" in node:
-                    child_blocks = self._extract_blocks(
-                        node["content"],
-                        current_heading=current_heading,
-                    )
-                    blocks.extend(child_blocks)
+    @staticmethod
+    def _is_section_start(prev: _TextBlock, block: _TextBlock) -> bool:
+        """Whether ``_merge_and_split`` state is guaranteed to reset at ``block``.
+
+        ``block`` must be a top-level heading under a new heading context,
+        and ``prev`` must leave the merge buffer empty (a table of 10+
+        tokens) or above the 50-token carry-forward limit, so the buffer is
+        flushed rather than carried into ``block``. Whitespace-separated
+        words are a lower bound on tokens, so no encoding is needed here.
+        Slide headings and speaker-note blockquotes rewrite heading context
+        or token counts, so they never precede a cut.
+        """
+        if block.is_table or not block.text.startswith("# "):
+            return False
+        if block.heading_context == prev.heading_context:
+            return False
+        if SemanticChunker._is_slide_heading(prev) is not None or prev.text.lstrip().startswith(">"):
+            return False
+        words = len(prev.text.split())
+        return words >= 10 if prev.is_table else words > 50
+
+    def _split_sections(self, blocks: list[_TextBlock], workers: int) -> list[list[_TextBlock]]:
+        """Cut blocks into about ``workers`` sections at safe top-level headings."""
+        target = sum(len(b.text) for b in blocks) // max(workers, 1)
+        sections: list[list[_TextBlock]] = [[blocks[0]]]
+        size = len(blocks[0].text)
+        for prev, block in zip(blocks, blocks[1:]):
+            if size >= target and self._is_section_start(prev, block):
+                sections.append([])
+                size = 0
+            sections[-1].append(block)
+            size += len(block.text)
+        return sections
+
+    async def _achunk_blocks(self, blocks: list[_TextBlock], rows_per_chunk: int = 50) -> list[ChunkResult]:
+        """Chunk blocks, merging large inputs section-by-section in the chunk pool.
+
+        Overlap and chunk_index run here on the stitched sections, since
+        both depend on neighbouring chunks across section boundaries.
+        """
+        if not blocks:
+            return []
 
-        return blocks
+        workers = self._get_chunk_workers()
+        if workers <= 1 or sum(len(b.text) for b in blocks) < self._get_parallel_min_chars():
+            return self._chunk_blocks(blocks, rows_per_chunk)
+
+        sections = self._split_sections(blocks, workers)
+        if len(sections) == 1:
+            return self._chunk_blocks(blocks, rows_per_chunk)
+
+        pool = _get_chunk_pool(workers)
+        loop = asyncio.get_running_loop()
+        section_fn = partial(
+            _chunk_section,
+            target_tokens=self.target_tokens,
+            overlap_tokens=self.overlap_tokens,
+            max_tokens=self._max_chunk_tokens(),
+            rows_per_chunk=rows_per_chunk,
+        )
+        results = await asyncio.gather(*(loop.run_in_executor(pool, section_fn, section) for section in sections))
+        logger.debug("Chunked %d blocks in %d parallel sections", len(blocks), len(sections))
+        return self._finish_chunks([chunk for section_chunks in results for chunk in section_chunks])
 
-    def _inline_text(self, nodes: list[dict[str, Any]]) -> str:
-        """Extract inline text from text/hardBreak nodes."""
-        parts: list[str] = []
-        for node in nodes:
-            if node.get("type") == "text":
-                parts.append(node.get("text", ""))
-            elif node.get("type") == "hardBreak":
-                parts.append("\n")
-        return "".join(parts)
-
-    def _extract_text_recursive(self, nodes: list[dict[str, Any]]) -> str:
-        """Recursively extract all text from nodes."""
-        parts: list[str] = []
-        for node in nodes:
-            if node.get("type") == "text":
-                parts.append(node.get("text", ""))
-            elif node.get("type") == "hardBreak":
-                parts.append("\n")
-            elif node.get("type") in ("image", "table", "drawio"):
-                continue  # Skip: images handled by vision, tables/drawio extracted separately
-            elif "content" in node:
-                parts.append(self._extract_text_recursive(node["content"]))
-                if node.get("type") in (
-                    "paragraph",
-                    "heading",
-                    "listItem",
-                    "taskItem",
-                    "codeBlock",
-                    "blockquote",
-                ):
-                    parts.append("\n")
-        return "".join(parts)
-
-    def _extract_list_text(self, node: dict[str, Any]) -> str:
-        """Extract text from list nodes (bullet, ordered, task)."""
-        items = node.get("content", [])
-        parts: list[str] = []
-        for i, item in enumerate(items):
-            prefix = "- "
-            if node.get("type") == "orderedList":
-                prefix = f"{i + 1}. "
-            elif node.get("type") == "taskList":
-                checked = item.get("attrs", {}).get("checked", False)
-                prefix = "[x] " if checked else "[ ] "
-
-            text = self._extract_text_recursive(item.get("content", []))
-            parts.append(prefix + text.strip() + "\n")
-        return "".join(parts)
-
-    def _extract_table_text(self, node: dict[str, Any]) -> str:
-        """Extract text from table nodes."""
-        text, _ = self._extract_table_text_with_headers(node)
-        return text
-
-    def _extract_rich_nodes_from_tree(
+    def _extract_blocks(
         self,
-        node: dict[str, Any],
-        blocks: list[_TextBlock],
-        heading_context: str | None,
-        _depth: int = 0,
-    ) -> None:
-        """Recursively find drawio and table nodes at any depth in a subtree.
-
-        Used to extract rich content embedded inside list items, blockquotes,
-        or any other container where _extract_list_text/plain text extraction
-        would skip non-text nodes.
-        """
-        if _depth > 20:
-            return
-        for child in node.get("content", []):
-            child_type = child.get("type", "")
-            if child_type == "drawio":
-                drawio_text = self._extract_drawio_text(child)
-                if drawio_text.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=drawio_text,
-                            heading_context=heading_context,
-                        )
-                    )
-            elif child_type == "table":
-                table_text, header_cells = self._extract_table_text_with_headers(child)
-                if table_text.strip():
-                    blocks.append(
-                        _TextBlock(
-                            text=table_text,
-                            heading_context=heading_context,
-                            is_table=True,
-                            table_columns=header_cells,
-                        )
-                    )
-            elif "content" in child:
-                self._extract_rich_nodes_from_tree(
-                    child,
-                    blocks,
-                    heading_context,
-                    _depth + 1,
-                )
-
-    def _extract_table_text_with_headers(self, node: dict[str, Any]) -> tuple[str, list[str]]:
-        """Extract text from table nodes and return header row cells separately.
+        nodes: list[dict[str, Any]],
+        current_heading: str | None = None,
+        ir: TiptapIR | None = None,
+    ) -> list[_TextBlock]:
+        """Text blocks with heading hierarchy, from the shared TipTap walk.
 
-        Returns:
-            Tuple of (full_table_text, header_cell_texts).
-            header_cell_texts is the list of cell texts from the first row.
+        Blocks before the first heading get ``current_heading`` as context.
         """
-        rows = node.get("content", [])
-        parts: list[str] = []
-        header_cells: list[str] = []
-        for row_idx, row in enumerate(rows):
-            cells = row.get("content", [])
-            cell_texts: list[str] = []
-            for cell in cells:
-                text = self._extract_text_recursive(cell.get("content", []))
-                cell_texts.append(text.strip())
-            if row_idx == 0:
-                header_cells = cell_texts
-            parts.append(" | ".join(cell_texts) + "\n")
-        return "".join(parts), header_cells
-
-    def _extract_drawio_text(self, node: dict[str, Any]) -> str:
-        """Extract structured graph information from draw.io diagram nodes.
-
-        Parses the full draw.io XML graph structure (vertices, edges, and
-        containment hierarchy) to produce a rich textual representation.
-        Falls back to plain label extraction if no edges or containment are found.
-        """
-        import defusedxml.ElementTree as ET
-
-        attrs = node.get("attrs", {})
-        xml_data = attrs.get("data")
-        if not xml_data:
-            return ""
-
-        try:
-            root = ET.fromstring(xml_data)
-        except (ET.ParseError, Exception):
-            # Catches both malformed XML (ParseError) and defusedxml security
-            # rejections (DTDForbidden, EntitiesForbidden, ExternalReferenceForbidden)
-            return ""
-
-        def clean_html(text: str) -> str:
-            """Strip HTML tags and normalize whitespace."""
-            cleaned = re.sub(r"<[^>]+>", " ", text).strip()
-            return re.sub(r"\s+", " ", cleaned)
-
-        # Single pass -- collect vertices and edges
-        vertices: dict[str, dict[str, str]] = {}
-        edges: list[tuple[str, str, str]] = []
-        for cell in root.iter("mxCell"):
-            if cell.get("vertex") == "1":
-                cell_id = cell.get("id", "")
-                value = cell.get("value", "")
-                label = clean_html(value) if value else ""
-                parent_id = cell.get("parent", "")
-                if cell_id:
-                    vertices[cell_id] = {"label": label, "parent": parent_id}
-            elif cell.get("edge") == "1":
-                source = cell.get("source", "")
-                target = cell.get("target", "")
-                value = cell.get("value", "")
-                edge_label = clean_html(value) if value else ""
-                edges.append((source, target, edge_label))
-
-        # Filter edges to only include those with valid source/target vertices
-        edges = [(s, t, l) for s, t, l in edges if s in vertices and t in vertices]
-
-        # Pass 3 -- Containment: build parent->children map
-        # Only include parents that are actual vertices (not root "0" or layer "1")
-        children_map: dict[str, list[str]] = {}
-        for cell_id, info in vertices.items():
-            parent_id = info["parent"]
-            if parent_id and parent_id in vertices:
-                children_map.setdefault(parent_id, []).append(cell_id)
-
-        # If no structured graph data found, fall back to simple label list
-        if not edges and not children_map:
-            labels = [info["label"] for info in vertices.values() if info["label"]]
-            if labels:
-                return "[Diagram] " + " ".join(labels) + "\n"
-            # Final fallback: extract value from any mxCell (handles XML without
-            # vertex/edge attributes, e.g. simplified draw.io exports)
-            all_labels: list[str] = []
-            for cell in root.iter("mxCell"):
-                value = cell.get("value", "")
-                if value:
-                    clean = clean_html(value)
-                    if clean:
-                        all_labels.append(clean)
-            return "[Diagram] " + " ".join(all_labels) + "\n" if all_labels else ""
-
-        # Build structured output
-        parts: list[str] = ["[Diagram]"]
-
-        # Components line: all vertices with labels
-        labeled = [info["label"] for info in vertices.values() if info["label"]]
-        if labeled:
-            parts.append("Components: " + ", ".join(labeled))
-
-        # Relationships section
-        if edges:
-            parts.append("Relationships:")
-            for source_id, target_id, edge_label in edges:
-                src_label = vertices[source_id]["label"] or source_id
-                tgt_label = vertices[target_id]["label"] or target_id
-                if edge_label:
-                    parts.append(f"- {src_label} -> {edge_label} -> {tgt_label}")
-                else:
-                    parts.append(f"- {src_label} -> {tgt_label}")
-
-        # Structure section (containment)
-        if children_map:
-            parts.append("Structure:")
-            for parent_id, child_ids in children_map.items():
-                parent_label = vertices[parent_id]["label"] or parent_id
-                child_labels = [vertices[cid]["label"] or cid for cid in child_ids]
-                parts.append(f"- {parent_label} contains: {', '.join(child_labels)}")
-
-        return "\n".join(parts) + "\n"
+        if ir is None:
+            ir = walk_tiptap({"type": "doc", "content": nodes})
+        return [
+            _TextBlock(
+                text=b.text,
+                heading_context=b.heading_context if b.heading_context is not None else current_heading,
+                is_table=b.is_table,
+                table_columns=b.table_columns,
+            )
+            for b in ir.blocks
+        ]
 
     @staticmethod
     def _is_slide_heading(block: _TextBlock) -> str | None:
@@ -555,6 +446,7 @@ class SemanticChunker:
         """
         chunks: list[ChunkResult] = []
         current_text = ""
+        current_blocks: list[_TextBlock] = []
         current_heading: str | None = blocks[0].heading_context if blocks else None
         current_tokens = 0
 
@@ -566,6 +458,7 @@ class SemanticChunker:
                 # of emitting as standalone table chunks.
                 if block.token_count < 10:
                     current_text += block.text
+                    current_blocks.append(block)
                     current_tokens += block.token_count
                     continue
 
@@ -583,9 +476,11 @@ class SemanticChunker:
                                 heading_context=current_heading,
                                 token_count=current_tokens,
                                 chunk_index=0,
+                                token_ids=self._joined_ids(current_blocks),
                             )
                         )
                     current_text = ""
+                    current_blocks = []
                     current_tokens = 0
 
                 # Build preamble: "Table: {heading} — columns: col1, col2, ..."
@@ -603,9 +498,10 @@ class SemanticChunker:
                     preamble = f"{carry_forward}{preamble}"
 
                 table_text = f"{preamble}\n{block.text.strip()}"
-                table_tokens = self.count_tokens(table_text)
+                table_ids = self._encode(table_text)
+                table_tokens = len(table_ids)
 
-                if table_tokens > self._get_max_tokens():
+                if table_tokens > self._max_chunk_tokens():
                     # Split oversized table by row groups (MED-2: thread rows_per_chunk)
                     table_chunks = self._split_table_by_rows(
                         block.text.strip(),
@@ -621,6 +517,7 @@ class SemanticChunker:
                             heading_context=block.heading_context,
                             token_count=table_tokens,
                             chunk_index=0,
+                            token_ids=table_ids,
                         )
                     )
                 current_heading = block.heading_context
@@ -637,13 +534,16 @@ class SemanticChunker:
                             heading_context=current_heading,
                             token_count=current_tokens,
                             chunk_index=0,
+                            token_ids=self._joined_ids(current_blocks),
                         )
                     )
                     current_text = ""
+                    current_blocks = []
                     current_tokens = 0
                 # Use slide title as heading context for this and subsequent blocks
                 current_heading = slide_title
                 current_text = block.text
+                current_blocks = [block]
                 current_tokens = block.token_count
                 continue
 
@@ -655,11 +555,8 @@ class SemanticChunker:
                 for line in lines:
                     cleaned.append(re.sub(r"^>\s?", "", line))
                 speaker_text = "[Speaker Notes] " + "\n".join(cleaned).strip() + "\n"
-                block = _TextBlock(
-                    text=speaker_text,
-                    heading_context=block.heading_context,
-                    token_count=self.count_tokens(speaker_text),
-                )
+                block = _TextBlock(text=speaker_text, heading_context=block.heading_context)
+                self._count_block(block)
 
             # If heading changed and we have accumulated text, flush —
             # BUT if the buffer is tiny (e.g. just a heading line like
@@ -673,9 +570,11 @@ class SemanticChunker:
                             heading_context=current_heading,
                             token_count=current_tokens,
                             chunk_index=0,
+                            token_ids=self._joined_ids(current_blocks),
                         )
                     )
                     current_text = ""
+                    current_blocks = []
                     current_tokens = 0
                 current_heading = block.heading_context
 
@@ -683,7 +582,7 @@ class SemanticChunker:
             # BUT if the buffer is tiny (≤50 tokens, e.g. just a title or
             # heading line), keep it so it merges with the next content
             # instead of being emitted as a near-empty chunk.
-            if current_tokens + block.token_count > self._get_max_tokens() and current_text.strip():
+            if current_tokens + block.token_count > self._max_chunk_tokens() and current_text.strip():
                 if current_tokens > 50:
                     chunks.append(
                         ChunkResult(
@@ -691,13 +590,15 @@ class SemanticChunker:
                             heading_context=current_heading,
                             token_count=current_tokens,
                             chunk_index=0,
+                            token_ids=self._joined_ids(current_blocks),
                         )
                     )
                     current_text = ""
+                    current_blocks = []
                     current_tokens = 0
 
             # If single block exceeds MAX, split at sentence boundaries
-            if block.token_count > self._get_max_tokens():
+            if block.token_count > self._max_chunk_tokens():
                 if current_text.strip():
                     if current_tokens > 50:
                         # Buffer is large enough — emit as its own chunk
@@ -707,6 +608,7 @@ class SemanticChunker:
                                 heading_context=current_heading,
                                 token_count=current_tokens,
                                 chunk_index=0,
+                                token_ids=self._joined_ids(current_blocks),
                             )
                         )
                         text_to_split = block.text
@@ -717,6 +619,7 @@ class SemanticChunker:
                 else:
                     text_to_split = block.text
                 current_text = ""
+                current_blocks = []
                 current_tokens = 0
 
                 split_chunks = self._split_large_text(text_to_split, block.heading_context)
@@ -724,6 +627,7 @@ class SemanticChunker:
                 current_heading = block.heading_context
             else:
                 current_text += block.text
+                current_blocks.append(block)
                 current_tokens += block.token_count
                 current_heading = block.heading_context
 
@@ -735,6 +639,7 @@ class SemanticChunker:
                     heading_context=current_heading,
                     token_count=current_tokens,
                     chunk_index=0,
+                    token_ids=self._joined_ids(current_blocks),
                 )
             )
 
@@ -773,12 +678,14 @@ class SemanticChunker:
         if not data_lines:
             # Table with only a header — emit as single chunk
             full_text = f"{preamble}\n{header_line}"
+            full_ids = self._encode(full_text)
             return [
                 ChunkResult(
                     text=full_text,
                     heading_context=heading_context,
-                    token_count=self.count_tokens(full_text),
+                    token_count=len(full_ids),
                     chunk_index=0,
+                    token_ids=full_ids,
                 )
             ]
 
@@ -791,12 +698,14 @@ class SemanticChunker:
 
             chunk_preamble = f"{preamble} (rows {start + 1}-{end})"
             chunk_text = f"{chunk_preamble}\n{header_line}\n" + "\n".join(group)
+            chunk_ids = self._encode(chunk_text)
             chunks.append(
                 ChunkResult(
                     text=chunk_text,
                     heading_context=heading_context,
-                    token_count=self.count_tokens(chunk_text),
+                    token_count=len(chunk_ids),
                     chunk_index=0,
+                    token_ids=chunk_ids,
                 )
             )
 
@@ -816,17 +725,24 @@ class SemanticChunker:
         If a single sentence exceeds MAX_TOKENS (e.g., a long code block
         with no newlines, a giant URL, or CJK text without periods), it is
         hard-split at token boundaries as a fallback.
+
+        Chunk ids are assembled from the sentence encodings (each sentence
+        ends in a space after a non-space char, a pre-token boundary), so
+        overlap can slice them later without re-encoding the chunk.
         """
         sentences = self._split_into_sentences(text)
         chunks: list[ChunkResult] = []
         current_text = ""
+        current_ids: list[int] = []
         current_tokens = 0
+        space_tokens = len(self._encode(" "))
 
         for sentence in sentences:
-            sentence_tokens = self.count_tokens(sentence)
+            sentence_ids = self._encode(sentence)
+            sentence_tokens = len(sentence_ids)
 
             # Fallback: hard-split sentences that exceed MAX_TOKENS
-            if sentence_tokens > self._get_max_tokens():
+            if sentence_tokens > self._max_chunk_tokens():
                 # Flush any accumulated text first
                 if current_text.strip():
                     chunks.append(
@@ -835,15 +751,16 @@ class SemanticChunker:
                             heading_context=heading_context,
                             token_count=current_tokens,
                             chunk_index=0,
+                            token_ids=current_ids,
                         )
                     )
                     current_text = ""
+                    current_ids = []
                     current_tokens = 0
 
                 # Hard-split at token boundaries
-                tokens = self._encoder.encode(sentence)
-                for start in range(0, len(tokens), self._get_max_tokens()):
-                    sub_tokens = tokens[start : start + self._get_max_tokens()]
+                for start in range(0, sentence_tokens, self._max_chunk_tokens()):
+                    sub_tokens = sentence_ids[start : start + self._max_chunk_tokens()]
                     sub_text = self._encoder.decode(sub_tokens)
                     if sub_text.strip():
                         chunks.append(
@@ -856,18 +773,26 @@ class SemanticChunker:
                         )
                 continue
 
-            if current_tokens + sentence_tokens > self._get_max_tokens() and current_text.strip():
+            if current_tokens + sentence_tokens > self._max_chunk_tokens() and current_text.strip():
                 chunks.append(
                     ChunkResult(
                         text=current_text.strip(),
                         heading_context=heading_context,
                         token_count=current_tokens,
                         chunk_index=0,
+                        token_ids=current_ids,
                     )
                 )
                 current_text = ""
+                current_ids = []
                 current_tokens = 0
 
+            # ids of the sentence without its trailing space, then joined
+            # to the chunk with the space leading into its first word
+            stripped_ids = sentence_ids[: sentence_tokens - space_tokens]
+            if current_text:
+                stripped_ids = self._prefixed_ids(" ", sentence[:-1], stripped_ids)
+            current_ids += stripped_ids
             current_text += sentence
             current_tokens += sentence_tokens
 
@@ -878,6 +803,7 @@ class SemanticChunker:
                     heading_context=heading_context,
                     token_count=current_tokens,
                     chunk_index=0,
+                    token_ids=current_ids,
                 )
             )
 
@@ -919,9 +845,15 @@ class SemanticChunker:
                 result.append(chunks[i])
                 continue
 
+            # Encode each chunk at most once: ids carried from merging, or
+            # encoded here and kept for when this chunk becomes the previous one
+            for chunk in (chunks[i - 1], chunks[i]):
+                if chunk.token_ids is None:
+                    chunk.token_ids = self._encode(chunk.text)
+
             prev_text = chunks[i - 1].text
             # Get last ~overlap_tokens worth of text from previous chunk
-            prev_tokens = self._encoder.encode(prev_text)
+            prev_tokens = chunks[i - 1].token_ids
             if len(prev_tokens) > self.overlap_tokens:
                 overlap_tokens = prev_tokens[-self.overlap_tokens :]
                 overlap_text = self._encoder.decode(overlap_tokens)
@@ -929,8 +861,9 @@ class SemanticChunker:
                 overlap_text = prev_text
 
             # Prepend overlap to current chunk
-            new_text = overlap_text.strip() + " " + chunks[i].text
-            new_token_count = self.count_tokens(new_text)
+            prefix = overlap_text.strip() + " "
+            new_text = prefix + chunks[i].text
+            new_token_count = len(self._prefixed_ids(prefix, chunks[i].text, chunks[i].token_ids))
 
             result.append(
                 ChunkResult(
@@ -965,6 +898,23 @@ class SemanticChunker:
         Returns:
             Ordered list of ChunkResult with sequential chunk_index.
         """
+        return self._chunk_blocks(self._markdown_blocks(markdown, title), rows_per_chunk)
+
+    async def achunk_markdown(
+        self,
+        markdown: str,
+        title: str,
+        rows_per_chunk: int = 50,
+    ) -> list[ChunkResult]:
+        """Async ``chunk_markdown`` that merges large extractions in the chunk pool.
+
+        Markdown below ``embedding.parallel_chunk_min_chars`` is chunked
+        in-process; the result is identical either way.
+        """
+        return await self._achunk_blocks(self._markdown_blocks(markdown, title), rows_per_chunk)
+
+    def _markdown_blocks(self, markdown: str, title: str) -> list[_TextBlock]:
+        """Cleaned Markdown split into text blocks, not yet counted."""
         if not markdown or not markdown.strip():
             return []
 
@@ -973,25 +923,7 @@ class SemanticChunker:
         if not markdown or not markdown.strip():
             return []
 
-        blocks = self._extract_markdown_blocks(markdown, title)
-        if not blocks:
-            return []
-
-        # Count tokens
-        for block in blocks:
-            block.token_count = self.count_tokens(block.text)
-
-        # MED-2: Thread rows_per_chunk to _merge_and_split -> _split_table_by_rows
-        merged = self._merge_and_split(blocks, rows_per_chunk=rows_per_chunk)
-        if not merged:
-            return []
-
-        with_overlap = self._add_overlap(merged)
-
-        for i, chunk in enumerate(with_overlap):
-            chunk.chunk_index = i
-
-        return with_overlap
+        return self._extract_markdown_blocks(markdown, title)
 
     @staticmethod
     def _clean_docling_artifacts(markdown: str, title: str = "") -> str:
@@ -1188,7 +1120,7 @@ class SemanticChunker:
 
             token_count = self.count_tokens(chunk_text)
 
-            if token_count > self._get_max_tokens():
+            if token_count > self._max_chunk_tokens():
                 # Split oversized cluster at element boundaries
                 split_chunks = self._split_cluster(cluster, connectors)
                 chunks.extend(split_chunks)
@@ -1399,7 +1331,7 @@ class SemanticChunker:
             elem_tokens = self.count_tokens(elem_text)
 
             # Single element exceeds MAX_TOKENS — sub-split via _split_large_text
-            if elem_tokens > self._get_max_tokens():
+            if elem_tokens > self._max_chunk_tokens():
                 # Flush accumulated elements first
                 if current_elements:
                     text = self._build_cluster_text(current_elements, connectors)
@@ -1426,7 +1358,7 @@ class SemanticChunker:
                 chunks.extend(sub_chunks)
                 continue
 
-            if current_tokens + elem_tokens > self._get_max_tokens() and current_elements:
+            if current_tokens + elem_tokens > self._max_chunk_tokens() and current_elements:
                 text = self._build_cluster_text(current_elements, connectors)
                 heading = self._canvas_heading_context(current_elements[0])
                 chunks.append(
@@ -1456,3 +1388,48 @@ class SemanticChunker:
             )
 
         return chunks
+
+
+# ---- Chunk Process Pool ----
+
+_chunk_pool: ProcessPoolExecutor | None = None
+
+
+def _get_chunk_pool(workers: int) -> ProcessPoolExecutor:
+    """Lazily create the process pool used for large inputs.
+
+    Sized on first use; later ``embedding.chunk_workers`` changes apply
+    after a restart. Uses spawn so children never inherit the event loop
+    or open connections of the parent.
+    """
+    global _chunk_pool
+    if _chunk_pool is None:
+        _chunk_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _chunk_pool
+
+
+def shutdown_chunk_pool() -> None:
+    """Shut down the chunk process pool, if one was started."""
+    global _chunk_pool
+    if _chunk_pool is not None:
+        _chunk_pool.shutdown(wait=False, cancel_futures=True)
+        _chunk_pool = None
+
+
+def _chunk_section(
+    blocks: list[_TextBlock],
+    *,
+    target_tokens: int,
+    overlap_tokens: int,
+    max_tokens: int,
+    rows_per_chunk: int,
+) -> list[ChunkResult]:
+    """Pool entry point: count and merge one section's blocks.
+
+    The child has no loaded agent config, so the parent's current
+    ``embedding.max_chunk_tokens`` is passed in.
+    """
+    chunker = SemanticChunker(target_tokens=target_tokens, overlap_tokens=overlap_tokens, max_tokens=max_tokens)
+    for block in blocks:
+        chunker._count_block(block)
+    return chunker._merge_and_split(blocks, rows_per_chunk=rows_per_chunk)
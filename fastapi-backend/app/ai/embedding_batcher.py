@@ -0,0 +1,244 @@
+"""Cross-document embedding micro-batcher.
+
+Each ``embed_document_job`` only has its own chunks to embed, so with many
+concurrent ARQ jobs the worker issues lots of small provider requests and
+hits requests-per-minute limits long before tokens-per-request limits.
+
+``EmbeddingBatcher`` collects chunk texts from concurrent callers for a
+short window (``embedding.batch_window_ms``) and sends them to the provider
+in as few ``generate_embeddings_batch`` calls as the count and token limits
+allow (``embedding.batch_max_texts`` / ``embedding.batch_max_tokens``).
+Every caller awaits only its own slice of the combined response; a failed
+provider call fails just the callers whose texts were in that batch.
+
+Requests are grouped by provider adapter and model, so a provider
+reconfiguration mid-window never mixes models in one call. Each provider
+call goes through the shared ``ProviderThrottle`` for that model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from .config_service import get_agent_config
+from .provider_interface import LLMProvider
+from .provider_throttle import get_provider_throttle
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for callers that do not pass token counts.
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class _Request:
+    """One caller's texts and the future its embeddings are delivered to."""
+
+    texts: list[str]
+    token_counts: list[int]
+    future: asyncio.Future
+    embeddings: list[list[float] | None] = field(init=False)
+    remaining: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.embeddings = [None] * len(self.texts)
+        self.remaining = len(self.texts)
+
+    def deliver(self, index: int, embedding: list[float]) -> None:
+        if self.future.done():
+            return
+        self.embeddings[index] = embedding
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.future.set_result(self.embeddings)
+
+    def fail(self, exc: BaseException) -> None:
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+@dataclass
+class _Pending:
+    """Requests queued for one (provider, model) pair."""
+
+    provider: LLMProvider
+    model: str
+    requests: list[_Request] = field(default_factory=list)
+    texts: int = 0
+    tokens: int = 0
+    flush_task: asyncio.Task | None = None
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into maximal provider batches.
+
+    Args:
+        window_ms: How long the first request of a batch waits for others.
+            Defaults to ``embedding.batch_window_ms``.
+        max_texts: Max inputs per provider call. Defaults to
+            ``embedding.batch_max_texts``.
+        max_tokens: Max summed input tokens per provider call. Defaults to
+            ``embedding.batch_max_tokens``.
+    """
+
+    def __init__(
+        self,
+        window_ms: int | None = None,
+        max_texts: int | None = None,
+        max_tokens: int | None = None,
+    ) -> None:
+        self._window_ms = window_ms
+        self._max_texts = max_texts
+        self._max_tokens = max_tokens
+        self._pending: dict[tuple[int, str], _Pending] = {}
+        # Strong refs so in-flight dispatch tasks are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+        self.provider_calls = 0
+
+    @property
+    def window_ms(self) -> int:
+        if self._window_ms is not None:
+            return self._window_ms
+        return get_agent_config().get_int("embedding.batch_window_ms", 20)
+
+    @property
+    def max_texts(self) -> int:
+        if self._max_texts is not None:
+            return self._max_texts
+        return max(1, get_agent_config().get_int("embedding.batch_max_texts", 256))
+
+    @property
+    def max_tokens(self) -> int:
+        if self._max_tokens is not None:
+            return self._max_tokens
+        return max(1, get_agent_config().get_int("embedding.batch_max_tokens", 100000))
+
+    async def embed(
+        self,
+        provider: LLMProvider,
+        model: str,
+        texts: list[str],
+        token_counts: list[int] | None = None,
+    ) -> list[list[float]]:
+        """Embed ``texts``, sharing provider calls with concurrent callers.
+
+        Args:
+            provider: Embedding provider adapter.
+            model: Embedding model identifier.
+            texts: Input texts.
+            token_counts: Token count per text (estimated when omitted).
+
+        Returns:
+            Embedding vectors in the same order as ``texts``.
+
+        Raises:
+            Whatever the provider raised for a batch containing these texts.
+        """
+        if not texts:
+            return []
+        if token_counts is None:
+            token_counts = [max(1, len(t) // _CHARS_PER_TOKEN) for t in texts]
+
+        if self.window_ms <= 0:
+            self.provider_calls += 1
+            async with get_provider_throttle("embedding", provider, model).slot(tokens=sum(token_counts)):
+                return await provider.generate_embeddings_batch(texts, model)
+
+        loop = asyncio.get_running_loop()
+        request = _Request(texts=list(texts), token_counts=list(token_counts), future=loop.create_future())
+
+        key = (id(provider), model)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _Pending(provider=provider, model=model)
+            self._pending[key] = pending
+            pending.flush_task = self._spawn(self._flush_after_window(key))
+        pending.requests.append(request)
+        pending.texts += len(texts)
+        pending.tokens += sum(token_counts)
+
+        # A full batch need not wait out the window
+        if pending.texts >= self.max_texts or pending.tokens >= self.max_tokens:
+            self._take(key)
+            if pending.flush_task is not None:
+                pending.flush_task.cancel()
+            self._spawn(self._dispatch(pending))
+
+        return await request.future
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _take(self, key: tuple[int, str]) -> _Pending | None:
+        return self._pending.pop(key, None)
+
+    async def _flush_after_window(self, key: tuple[int, str]) -> None:
+        await asyncio.sleep(self.window_ms / 1000)
+        pending = self._take(key)
+        if pending is not None:
+            await self._dispatch(pending)
+
+    def _pack(self, requests: list[_Request]) -> list[list[tuple[_Request, int]]]:
+        """Greedily split queued texts into batches within the count/token limits.
+
+        A single oversized caller is split across batches; a single text
+        over the token limit gets a batch of its own.
+        """
+        max_texts, max_tokens = self.max_texts, self.max_tokens
+        batches: list[list[tuple[_Request, int]]] = []
+        current: list[tuple[_Request, int]] = []
+        current_tokens = 0
+        for request in requests:
+            for index, tokens in enumerate(request.token_counts):
+                if current and (len(current) >= max_texts or current_tokens + tokens > max_tokens):
+                    batches.append(current)
+                    current, current_tokens = [], 0
+                current.append((request, index))
+                current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _dispatch(self, pending: _Pending) -> None:
+        batches = self._pack(pending.requests)
+        await asyncio.gather(*(self._send(pending.provider, pending.model, batch) for batch in batches))
+        logger.debug(
+            "Embedding batcher: %d callers, %d texts, %d tokens in %d provider call(s)",
+            len(pending.requests),
+            pending.texts,
+            pending.tokens,
+            len(batches),
+        )
+
+    async def _send(self, provider: LLMProvider, model: str, batch: list[tuple[_Request, int]]) -> None:
+        self.provider_calls += 1
+        tokens = sum(request.token_counts[index] for request, index in batch)
+        try:
+            async with get_provider_throttle("embedding", provider, model).slot(tokens=tokens):
+                embeddings = await provider.generate_embeddings_batch(
+                    [request.texts[index] for request, index in batch], model
+                )
+            if len(embeddings) != len(batch):
+                raise ValueError(f"Provider returned {len(embeddings)} embeddings for {len(batch)} inputs")
+        except Exception as e:
+            for request, _ in batch:
+                request.fail(e)
+            return
+        for (request, index), embedding in zip(batch, embeddings):
+            request.deliver(index, embedding)
+
+
+_batcher: EmbeddingBatcher | None = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Process-wide batcher shared by every embedding job in this worker."""
+    global _batcher
+    if _batcher is None:
+        _batcher = EmbeddingBatcher()
+    return _batcher
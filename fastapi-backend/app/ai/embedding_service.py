@@ -7,9 +7,11 @@ cleanup on document deletion.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from uuid import UUID
 
@@ -19,15 +21,30 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.document import Document
 from ..models.document_chunk import DocumentChunk
 from ..models.folder_file import FolderFile
+from ..services.tiptap_walker import TiptapIR
 from ..utils.timezone import utc_now
-from .chunking_service import SemanticChunker
+from .chunk_writer import ChunkRow, write_chunks
+from .chunking_service import ChunkResult, SemanticChunker
+from .embedding_batcher import EmbeddingBatcher
 from .embedding_normalizer import EmbeddingNormalizer
-from .provider_interface import LLMProviderError
+from .provider_interface import LLMProvider, LLMProviderError
 from .provider_registry import ProviderRegistry
 
 logger = logging.getLogger(__name__)
 
 
+def _chunk_rows(chunks: list[ChunkResult]) -> list[ChunkRow]:
+    return [
+        ChunkRow(
+            chunk_index=chunk.chunk_index,
+            chunk_text=chunk.text,
+            token_count=chunk.token_count,
+            heading_context=chunk.heading_context,
+        )
+        for chunk in chunks
+    ]
+
+
 @dataclass
 class EmbedResult:
     """Result of embedding a single document."""
@@ -57,6 +74,8 @@ class EmbeddingService:
         chunker: Semantic chunking service instance.
         normalizer: Embedding vector normalizer.
         db: Async database session.
+        batcher: Optional shared batcher that coalesces provider calls with
+            other concurrent embeddings (used by the ARQ worker).
     """
 
     def __init__(
@@ -65,11 +84,22 @@ class EmbeddingService:
         chunker: SemanticChunker,
         normalizer: EmbeddingNormalizer,
         db: AsyncSession,
+        batcher: EmbeddingBatcher | None = None,
     ) -> None:
         self.provider_registry = provider_registry
         self.chunker = chunker
         self.normalizer = normalizer
         self.db = db
+        self.batcher = batcher
+
+    async def _generate_embeddings(
+        self, provider: LLMProvider, model_id: str, chunks: list[ChunkResult]
+    ) -> list[list[float]]:
+        """Embed chunk texts directly or through the shared batcher."""
+        texts = [chunk.text for chunk in chunks]
+        if self.batcher is None:
+            return await provider.generate_embeddings_batch(texts, model_id)
+        return await self.batcher.embed(provider, model_id, texts, [chunk.token_count for chunk in chunks])
 
     async def embed_document(
         self,
@@ -78,16 +108,16 @@ class EmbeddingService:
         title: str,
         scope_ids: dict,
         document_type: str = "document",
+        ir: TiptapIR | None = None,
     ) -> EmbedResult:
         """Full pipeline for one document.
 
         1. Chunk content using SemanticChunker
         2. Generate embeddings via provider (batch if possible)
         3. Normalize embeddings to target dimensions
-        4. Delete existing chunks for this document (re-embed)
-        5. Insert new DocumentChunk rows
-        6. Update Document.embedding_updated_at
-        7. Return EmbedResult
+        4. Replace the document's chunks in one bulk statement
+        5. Update Document.embedding_updated_at
+        6. Return EmbedResult
 
         Args:
             document_id: UUID of the document to embed.
@@ -95,6 +125,7 @@ class EmbeddingService:
             title: Document title for heading context.
             scope_ids: Dict with application_id, project_id, user_id for denormalization.
             document_type: "document" for TipTap, "canvas" for spatial canvas.
+            ir: Cached TipTap walk of ``content_json`` (skips re-walking it).
 
         Returns:
             EmbedResult with chunk_count, token_count, duration_ms.
@@ -105,7 +136,7 @@ class EmbeddingService:
         start_time = time.monotonic()
 
         # Step 1: Chunk content
-        chunks = self.chunker.chunk_document(content_json, title, document_type)
+        chunks = await self.chunker.achunk_document(content_json, title, document_type, ir=ir)
         if not chunks:
             # Empty document - clean up any existing chunks
             await self.delete_document_chunks(document_id)
@@ -115,10 +146,9 @@ class EmbeddingService:
 
         # Step 2: Generate embeddings via provider
         provider, model_id = await self.provider_registry.get_embedding_provider(self.db)
-        texts = [chunk.text for chunk in chunks]
 
         try:
-            raw_embeddings = await provider.generate_embeddings_batch(texts, model_id)
+            raw_embeddings = await self._generate_embeddings(provider, model_id, chunks)
         except LLMProviderError:
             raise
         except Exception as e:
@@ -129,34 +159,19 @@ class EmbeddingService:
             )
 
         # Step 3: Normalize embeddings
-        normalized_embeddings = [self.normalizer.normalize(emb) for emb in raw_embeddings]
-
-        # Step 4: Delete existing chunks (replace on re-embed)
-        await self.delete_document_chunks(document_id)
-
-        # Step 5: Insert new DocumentChunk rows
-        total_tokens = 0
-        new_chunks: list[DocumentChunk] = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, normalized_embeddings)):
-            total_tokens += chunk.token_count
-            db_chunk = DocumentChunk(
-                document_id=document_id,
-                chunk_index=chunk.chunk_index,
-                chunk_text=chunk.text,
-                chunk_type="text",
-                heading_context=chunk.heading_context,
-                embedding=embedding,
-                token_count=chunk.token_count,
-                application_id=scope_ids.get("application_id"),
-                project_id=scope_ids.get("project_id"),
-                user_id=scope_ids.get("user_id"),
-            )
-            new_chunks.append(db_chunk)
-
-        self.db.add_all(new_chunks)
-        await self.db.flush()
+        normalized_embeddings = self.normalizer.normalize_batch(raw_embeddings)
+
+        # Step 4: Replace existing chunks (delete + bulk insert, one round trip)
+        total_tokens = sum(chunk.token_count for chunk in chunks)
+        await write_chunks(
+            self.db,
+            _chunk_rows(chunks),
+            normalized_embeddings,
+            scope_ids,
+            document_id=document_id,
+        )
 
-        # Step 6: Update Document.embedding_updated_at
+        # Step 5: Update Document.embedding_updated_at
         await self._update_embedding_timestamp(document_id)
 
         elapsed = int((time.monotonic() - start_time) * 1000)
@@ -281,13 +296,12 @@ class EmbeddingService:
         """Full embedding pipeline for a FolderFile.
 
         Same pipeline as embed_document but for file-sourced content:
-        1. Chunk markdown using SemanticChunker.chunk_markdown
+        1. Chunk markdown using SemanticChunker.achunk_markdown (large files in the chunk pool)
         2. Generate embeddings via provider
         3. Normalize embeddings
-        4. Delete existing file chunks
-        5. Insert new DocumentChunk rows (with file_id, source_type="file")
-        6. Update FolderFile.embedding_updated_at
-        7. Return EmbedResult
+        4. Replace the file's chunks in one bulk statement (source_type="file")
+        5. Update FolderFile.embedding_updated_at
+        6. Return EmbedResult
 
         Args:
             file_id: UUID of the FolderFile.
@@ -304,7 +318,7 @@ class EmbeddingService:
         start_time = time.monotonic()
 
         # Step 1: Chunk markdown
-        chunks = self.chunker.chunk_markdown(markdown, title)
+        chunks = await self.chunker.achunk_markdown(markdown, title)
         if not chunks:
             await self.delete_file_chunks(file_id)
             await self._update_file_embedding_timestamp(file_id)
@@ -313,10 +327,9 @@ class EmbeddingService:
 
         # Step 2: Generate embeddings
         provider, model_id = await self.provider_registry.get_embedding_provider(self.db)
-        texts = [chunk.text for chunk in chunks]
 
         try:
-            raw_embeddings = await provider.generate_embeddings_batch(texts, model_id)
+            raw_embeddings = await self._generate_embeddings(provider, model_id, chunks)
         except LLMProviderError:
             raise
         except Exception as e:
@@ -327,35 +340,19 @@ class EmbeddingService:
             )
 
         # Step 3: Normalize
-        normalized_embeddings = [self.normalizer.normalize(emb) for emb in raw_embeddings]
-
-        # Step 4: Delete existing file chunks
-        await self.delete_file_chunks(file_id)
-
-        # Step 5: Insert new chunks
-        total_tokens = 0
-        new_chunks: list[DocumentChunk] = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, normalized_embeddings)):
-            total_tokens += chunk.token_count
-            db_chunk = DocumentChunk(
-                file_id=file_id,
-                source_type="file",
-                chunk_index=chunk.chunk_index,
-                chunk_text=chunk.text,
-                chunk_type="text",
-                heading_context=chunk.heading_context,
-                embedding=embedding,
-                token_count=chunk.token_count,
-                application_id=scope_ids.get("application_id"),
-                project_id=scope_ids.get("project_id"),
-                user_id=scope_ids.get("user_id"),
-            )
-            new_chunks.append(db_chunk)
-
-        self.db.add_all(new_chunks)
-        await self.db.flush()
+        normalized_embeddings = self.normalizer.normalize_batch(raw_embeddings)
+
+        # Step 4: Replace existing file chunks (delete + bulk insert, one round trip)
+        total_tokens = sum(chunk.token_count for chunk in chunks)
+        await write_chunks(
+            self.db,
+            _chunk_rows(chunks),
+            normalized_embeddings,
+            scope_ids,
+            file_id=file_id,
+        )
 
-        # Step 6: Update file embedding timestamp
+        # Step 5: Update file embedding timestamp
         await self._update_file_embedding_timestamp(file_id)
 
         elapsed = int((time.monotonic() - start_time) * 1000)
@@ -373,6 +370,115 @@ class EmbeddingService:
             duration_ms=elapsed,
         )
 
+    async def embed_file_stream(
+        self,
+        file_id: UUID,
+        sections: AsyncIterator[str],
+        title: str,
+        scope_ids: dict,
+        batch_timeout_s: float | None = None,
+    ) -> EmbedResult:
+        """Embedding pipeline for a FolderFile whose Markdown arrives in sections.
+
+        Each section is chunked as it arrives. Whenever
+        ``embedding.stream_flush_chunks`` chunks are pending they are
+        embedded, written and committed, so the first chunks are searchable
+        while later sections are still being extracted, and memory holds at
+        most one section plus one batch. The first write replaces the file's
+        previous chunks; later writes append. A stream that yields no chunks
+        deletes the previous chunks, like ``embed_file`` with empty content.
+        chunk_index runs on across sections.
+
+        Unlike ``embed_file`` this commits ``self.db`` after every batch. If
+        embedding fails part-way, the batches already committed are kept.
+
+        Args:
+            file_id: UUID of the FolderFile.
+            sections: Markdown sections in document order.
+            title: File display name for heading context.
+            scope_ids: Dict with application_id, project_id, user_id.
+            batch_timeout_s: Time limit for embedding each batch.
+
+        Returns:
+            EmbedResult with chunk_count, token_count, duration_ms.
+
+        Raises:
+            LLMProviderError: If embedding generation fails.
+            TimeoutError: If a batch takes longer than ``batch_timeout_s``.
+        """
+        from .config_service import get_agent_config
+
+        start_time = time.monotonic()
+        flush_at = max(1, get_agent_config().get_int("embedding.stream_flush_chunks", 256))
+
+        pending: list[ChunkResult] = []
+        chunk_count = 0
+        total_tokens = 0
+        replace = True
+        provider: tuple[LLMProvider, str] | None = None
+
+        async def _flush(batch: list[ChunkResult]) -> None:
+            nonlocal chunk_count, total_tokens, replace, provider
+            if provider is None:
+                provider = await self.provider_registry.get_embedding_provider(self.db)
+            embeddings = await asyncio.wait_for(
+                self._embed_file_batch(file_id, batch, *provider),
+                timeout=batch_timeout_s,
+            )
+            await write_chunks(self.db, _chunk_rows(batch), embeddings, scope_ids, file_id=file_id, replace=replace)
+            await self.db.commit()
+            replace = False
+            chunk_count += len(batch)
+            total_tokens += sum(chunk.token_count for chunk in batch)
+
+        async for section in sections:
+            offset = chunk_count + len(pending)
+            for chunk in await self.chunker.achunk_markdown(section, title):
+                chunk.chunk_index += offset
+                pending.append(chunk)
+            while len(pending) >= flush_at:
+                batch, pending = pending[:flush_at], pending[flush_at:]
+                await _flush(batch)
+
+        if pending:
+            await _flush(pending)
+        elif replace:
+            # Nothing was written: the file has no text now, so drop stale chunks
+            await self.delete_file_chunks(file_id)
+
+        await self._update_file_embedding_timestamp(file_id)
+        await self.db.commit()
+
+        elapsed = int((time.monotonic() - start_time) * 1000)
+        logger.info(
+            "Embedded file %s (streamed): %d chunks, %d tokens, %dms",
+            file_id,
+            chunk_count,
+            total_tokens,
+            elapsed,
+        )
+        return EmbedResult(chunk_count=chunk_count, token_count=total_tokens, duration_ms=elapsed)
+
+    async def _embed_file_batch(
+        self,
+        file_id: UUID,
+        chunks: list[ChunkResult],
+        provider: LLMProvider,
+        model_id: str,
+    ) -> list[list[float]]:
+        """Embed and normalize one batch of a streamed file."""
+        try:
+            raw_embeddings = await self._generate_embeddings(provider, model_id, chunks)
+        except LLMProviderError:
+            raise
+        except Exception as e:
+            raise LLMProviderError(
+                f"Embedding generation failed for file {file_id}: {e}",
+                provider="unknown",
+                original=e,
+            )
+        return self.normalizer.normalize_batch(raw_embeddings)
+
     async def delete_file_chunks(self, file_id: UUID) -> int:
         """Remove all chunks for a file.
 
@@ -0,0 +1,344 @@
+"""Content-addressed cache of file extraction and embedding results.
+
+Uploading the same bytes again (another folder, another scope, or a
+replace with an identical file) used to re-run Docling, vision and
+embedding from scratch. The cache keys a processed file by
+
+    (FolderFile.sha256_hash, extractor version, embedding model)
+
+and keeps its capped ``content_plain``, extractor metadata and every chunk
+(text, heading, vector) in ExtractionCache / ExtractionCacheChunks. On a
+hit the extraction job clones the cached chunks into DocumentChunks with the
+new file's scope columns in one ``INSERT ... SELECT`` (vectors never leave
+the database) and skips download, extraction and embedding entirely.
+
+The extractor version folds in ``EXTRACTOR_VERSION`` and the chunk token
+bounds, so a new extractor or different chunk sizes miss the old entries
+instead of reusing stale chunks. Entries are evicted least-recently-used
+once their total size passes ``file.extraction_cache_max_mb`` (0 disables
+the cache) and after ``file.extraction_cache_ttl_days`` without a hit.
+
+An entry holds the file's text and vectors, so it must not outlive the
+files it came from: deleting or replacing the last live FolderFile with a
+hash purges that hash's entries (``purge_unreferenced_extraction``), and
+eviction also drops entries no live file references, which covers files
+removed by cascade with their folder, project or application.
+
+All functions join the caller's transaction; the caller commits.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..utils.timezone import utc_now
+from .config_service import get_agent_config
+from .file_extraction_service import EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def _get_max_bytes() -> int:
+    return max(0, get_agent_config().get_int("file.extraction_cache_max_mb", 2048)) * 1024 * 1024
+
+
+def _get_ttl_days() -> int:
+    return max(1, get_agent_config().get_int("file.extraction_cache_ttl_days", 90))
+
+
+def extraction_cache_version() -> str:
+    """Version component of the cache key: extractor plus chunking settings."""
+    from .chunking_service import SemanticChunker
+
+    return f"{EXTRACTOR_VERSION}/chunks:{SemanticChunker._get_min_tokens()}-{SemanticChunker._get_max_tokens()}"
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Identity of one cached extraction."""
+
+    sha256_hash: str
+    extractor_version: str
+    embedding_model: str
+
+
+@dataclass
+class CachedExtraction:
+    """A cache hit whose chunks were cloned into the requesting file."""
+
+    entry_id: UUID
+    content_plain: str
+    extracted_metadata: dict
+    chunk_count: int
+    token_count: int
+
+
+async def resolve_cache_key(db: AsyncSession, sha256_hash: str | None) -> CacheKey | None:
+    """Build the cache key for a file, or None if the cache cannot be used.
+
+    Returns None when the file has no hash, the cache is disabled, or no
+    embedding provider is configured.
+    """
+    if not sha256_hash or _get_max_bytes() <= 0:
+        return None
+
+    from .provider_registry import ProviderRegistry
+
+    try:
+        _, model_id = await ProviderRegistry().get_embedding_provider(db)
+    except Exception as exc:
+        logger.debug("Extraction cache disabled for this run: %s", exc)
+        return None
+    return CacheKey(sha256_hash, extraction_cache_version(), model_id)
+
+
+_HIT_SQL = """
+UPDATE "ExtractionCache"
+SET hit_count = hit_count + 1, last_used_at = CAST(:now AS timestamptz)
+WHERE sha256_hash = :sha256_hash
+  AND extractor_version = :extractor_version
+  AND embedding_model = :embedding_model
+RETURNING id, content_plain, extracted_metadata, chunk_count, token_count
+"""
+
+# Same delete-then-insert shape as chunk_writer's replace: the INSERT reads
+# count(*) from the DELETE so old rows are gone before new ones are produced.
+_CLONE_SQL = """
+WITH deleted AS (
+    DELETE FROM "DocumentChunks" WHERE file_id = CAST(:file_id AS uuid) RETURNING 1
+), cleared AS (
+    SELECT count(*) AS n FROM deleted
+)
+INSERT INTO "DocumentChunks" (
+    id, document_id, file_id, source_type, chunk_index, chunk_text, chunk_type,
+    heading_context, embedding, token_count, application_id, project_id, user_id,
+    created_at, updated_at
+)
+SELECT
+    gen_random_uuid(), NULL, CAST(:file_id AS uuid), 'file', c.chunk_index, c.chunk_text, c.chunk_type,
+    c.heading_context, c.embedding, c.token_count,
+    CAST(:application_id AS uuid), CAST(:project_id AS uuid), CAST(:user_id AS uuid),
+    CAST(:now AS timestamptz), CAST(:now AS timestamptz)
+FROM cleared, "ExtractionCacheChunks" c
+WHERE c.entry_id = CAST(:entry_id AS uuid)
+"""
+
+
+def _opt(value: Any) -> str | None:
+    return str(value) if value is not None else None
+
+
+async def clone_cached_extraction(
+    db: AsyncSession,
+    key: CacheKey,
+    file_id: UUID,
+    scope_ids: dict[str, Any],
+) -> CachedExtraction | None:
+    """Serve a file from the cache by cloning the cached chunks into it.
+
+    Args:
+        db: Active session; the caller commits.
+        key: Cache key from ``resolve_cache_key``.
+        file_id: FolderFile receiving the chunks (its old chunks are replaced).
+        scope_ids: Dict with application_id, project_id, user_id for the clones.
+
+    Returns:
+        The cached extraction, or None on a miss.
+    """
+    now = utc_now()
+    row = (
+        await db.execute(
+            text(_HIT_SQL),
+            {
+                "now": now,
+                "sha256_hash": key.sha256_hash,
+                "extractor_version": key.extractor_version,
+                "embedding_model": key.embedding_model,
+            },
+        )
+    ).first()
+    if row is None:
+        return None
+
+    await db.execute(
+        text(_CLONE_SQL),
+        {
+            "file_id": str(file_id),
+            "entry_id": str(row.id),
+            "application_id": _opt(scope_ids.get("application_id")),
+            "project_id": _opt(scope_ids.get("project_id")),
+            "user_id": _opt(scope_ids.get("user_id")),
+            "now": now,
+        },
+    )
+
+    metadata = row.extracted_metadata
+    if isinstance(metadata, str):
+        metadata = json.loads(metadata)
+    return CachedExtraction(
+        entry_id=row.id,
+        content_plain=row.content_plain or "",
+        extracted_metadata=metadata or {},
+        chunk_count=row.chunk_count,
+        token_count=row.token_count,
+    )
+
+
+_STORE_ENTRY_SQL = """
+INSERT INTO "ExtractionCache" (
+    id, sha256_hash, extractor_version, embedding_model, content_plain, extracted_metadata,
+    chunk_count, token_count, size_bytes, hit_count, last_used_at, created_at
+)
+VALUES (
+    CAST(:id AS uuid), :sha256_hash, :extractor_version, :embedding_model, :content_plain,
+    CAST(:extracted_metadata AS jsonb), 0, 0, 0, 0, CAST(:now AS timestamptz), CAST(:now AS timestamptz)
+)
+ON CONFLICT (sha256_hash, extractor_version, embedding_model) DO NOTHING
+RETURNING id
+"""
+
+_STORE_CHUNKS_SQL = """
+INSERT INTO "ExtractionCacheChunks" (
+    id, entry_id, chunk_index, chunk_text, chunk_type, heading_context, embedding, token_count
+)
+SELECT gen_random_uuid(), CAST(:entry_id AS uuid), chunk_index, chunk_text, chunk_type,
+       heading_context, embedding, token_count
+FROM "DocumentChunks"
+WHERE file_id = CAST(:file_id AS uuid)
+"""
+
+# size_bytes approximates storage: text bytes plus 4 bytes per vector dimension
+_STORE_STATS_SQL = """
+UPDATE "ExtractionCache" e
+SET chunk_count = s.n,
+    token_count = s.tokens,
+    size_bytes = octet_length(e.content_plain) + s.bytes
+FROM (
+    SELECT count(*) AS n,
+           coalesce(sum(token_count) FILTER (WHERE chunk_type = 'text'), 0) AS tokens,
+           coalesce(sum(octet_length(chunk_text) + coalesce(vector_dims(embedding), 0) * 4), 0) AS bytes
+    FROM "ExtractionCacheChunks"
+    WHERE entry_id = CAST(:entry_id AS uuid)
+) s
+WHERE e.id = CAST(:entry_id AS uuid)
+"""
+
+
+async def store_extraction(
+    db: AsyncSession,
+    key: CacheKey,
+    file_id: UUID,
+    content_plain: str,
+    extracted_metadata: dict,
+) -> bool:
+    """Copy a freshly processed file's result into the cache, then evict.
+
+    Chunks are copied server-side from the file's DocumentChunks (text and
+    image chunks alike). An entry that already exists for the key is left
+    as is.
+
+    Args:
+        db: Active session; the caller commits.
+        key: Cache key from ``resolve_cache_key``.
+        file_id: FolderFile whose chunks were just written.
+        content_plain: The file's stored (capped) content_plain.
+        extracted_metadata: The file's extracted_metadata.
+
+    Returns:
+        True if a new entry was stored.
+    """
+    entry_id = (
+        await db.execute(
+            text(_STORE_ENTRY_SQL),
+            {
+                "id": str(uuid.uuid4()),
+                "sha256_hash": key.sha256_hash,
+                "extractor_version": key.extractor_version,
+                "embedding_model": key.embedding_model,
+                "content_plain": content_plain,
+                "extracted_metadata": json.dumps(extracted_metadata or {}),
+                "now": utc_now(),
+            },
+        )
+    ).scalar_one_or_none()
+    if entry_id is None:
+        return False
+
+    params = {"entry_id": str(entry_id), "file_id": str(file_id)}
+    await db.execute(text(_STORE_CHUNKS_SQL), params)
+    await db.execute(text(_STORE_STATS_SQL), params)
+    await evict_extraction_cache(db)
+    return True
+
+
+# Entries whose hash no live FolderFile has (partial index on FolderFiles.sha256_hash)
+_UNREFERENCED = """NOT EXISTS (
+    SELECT 1 FROM "FolderFiles" f WHERE f.sha256_hash = e.sha256_hash AND f.deleted_at IS NULL
+)"""
+
+# Keep the most recently used entries whose running total fits the budget
+_EVICT_SQL = f"""
+DELETE FROM "ExtractionCache"
+WHERE id IN (
+    SELECT id FROM (
+        SELECT e.id, e.last_used_at, {_UNREFERENCED} AS unreferenced,
+               sum(e.size_bytes) OVER (ORDER BY e.last_used_at DESC, e.id) AS running_bytes
+        FROM "ExtractionCache" e
+    ) ranked
+    WHERE running_bytes > :max_bytes OR last_used_at < CAST(:cutoff AS timestamptz) OR unreferenced
+)
+"""
+
+_PURGE_SQL = f"""
+DELETE FROM "ExtractionCache" e
+WHERE e.sha256_hash = :sha256_hash AND {_UNREFERENCED}
+"""
+
+
+async def evict_extraction_cache(db: AsyncSession) -> int:
+    """Drop entries past the size budget (LRU), unused for the TTL, or no
+    longer referenced by a live FolderFile.
+
+    Cached chunks go with their entry (ON DELETE CASCADE).
+
+    Returns:
+        Number of entries evicted.
+    """
+    result = await db.execute(
+        text(_EVICT_SQL),
+        {
+            "max_bytes": _get_max_bytes(),
+            "cutoff": utc_now() - timedelta(days=_get_ttl_days()),
+        },
+    )
+    evicted = result.rowcount or 0
+    if evicted:
+        logger.info("Evicted %d extraction cache entries", evicted)
+    return evicted
+
+
+async def purge_unreferenced_extraction(db: AsyncSession, sha256_hash: str | None) -> int:
+    """Drop the cached extractions for a hash once no live FolderFile has it.
+
+    Call after a file is deleted or its content replaced, in the same
+    transaction, so the cached text and vectors go with the last copy.
+
+    Returns:
+        Number of entries purged.
+    """
+    if not sha256_hash:
+        return 0
+    result = await db.execute(text(_PURGE_SQL), {"sha256_hash": sha256_hash})
+    purged = result.rowcount or 0
+    if purged:
+        logger.info("Purged %d extraction cache entries for a deleted file", purged)
+    return purged
@@ -8,12 +8,18 @@ Routes file extraction to the appropriate service based on file extension:
 Provides a unified ExtractionResult interface regardless of the underlying
 extractor. All extraction is run via asyncio.to_thread() to avoid blocking
 the event loop.
+
+``extract_stream`` is the bounded-memory variant used by the file
+embedding job: it returns an ExtractionStream that yields Markdown sections
+as the extractor produces them. Spreadsheets are read a few thousand rows at
+a time; Docling and Visio output arrives as a single section.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -31,6 +37,18 @@ SUPPORTED_EXTENSIONS = _DOCLING_EXTENSIONS | _SPREADSHEET_EXTENSIONS | _VISIO_EX
 MAX_DOCLING_SIZE = 200 * 1024 * 1024  # 200 MB
 MAX_SPREADSHEET_SIZE = 100 * 1024 * 1024  # 100 MB
 MAX_VISIO_SIZE = 50 * 1024 * 1024  # 50 MB
+# CSV/TSV are read row by row when streamed, so they can be much larger.
+# Excel keeps MAX_SPREADSHEET_SIZE: calamine decodes a whole sheet at once.
+MAX_STREAMED_CSV_SIZE = 500 * 1024 * 1024  # 500 MB
+
+_CSV_EXTENSIONS = {".csv", ".tsv"}
+
+# Data rows per streamed spreadsheet section
+STREAM_SECTION_ROWS = 2_000
+
+# Bump whenever any extractor's Markdown output changes, so the extraction
+# cache (extraction_cache.py) stops serving results from the old version.
+EXTRACTOR_VERSION = "2026.03.1"
 
 
 @dataclass
@@ -45,6 +63,129 @@ class ExtractionResult:
     error: str | None = None
 
 
+_DONE = object()
+
+
+class ExtractionStream:
+    """Markdown sections of one file, produced on demand.
+
+    Iterate with ``async for``; each section is pulled from the underlying
+    (blocking) extractor in a worker thread, so at most one section is held
+    at a time. A failure during iteration ends the stream instead of
+    raising. Once exhausted, ``result`` carries success/error, metadata,
+    warnings, images and the first ``max_markdown_chars`` characters of the
+    Markdown (the full text is never accumulated).
+
+    Iteration may be resumed after the consumer raised, e.g. to finish
+    extraction when embedding failed part-way.
+    """
+
+    def __init__(
+        self,
+        sections: Iterator[str] | None = None,
+        load: Callable[[], Awaitable[ExtractionResult]] | None = None,
+        finish: Callable[[], dict] | None = None,
+        max_markdown_chars: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        self._sections = sections if sections is not None else iter(())
+        self._load = load
+        self._finish = finish
+        self._max_chars = max_markdown_chars
+        self._parts: list[str] = []
+        self._length = 0
+        self.section_count = 0
+        self.done = error is not None
+        self.result = ExtractionResult(markdown="", success=error is None, error=error)
+
+    @classmethod
+    def failed(cls, error: str) -> ExtractionStream:
+        """A stream that yields nothing and reports ``error``."""
+        return cls(error=error)
+
+    def __aiter__(self) -> ExtractionStream:
+        return self
+
+    async def __anext__(self) -> str:
+        if self.done:
+            raise StopAsyncIteration
+        try:
+            if self._load is not None:
+                # Single-shot extractor: the whole result is one section
+                whole = await self._load()
+                self._load = None
+                self._absorb(whole)
+                if whole.success:
+                    self._sections = iter((whole.markdown,))
+            section = await asyncio.to_thread(next, self._sections, _DONE)
+        except Exception as exc:
+            self._fail(exc)
+            raise StopAsyncIteration
+        if section is _DONE:
+            self._complete()
+            raise StopAsyncIteration
+        self._keep(section)
+        return section
+
+    def _keep(self, section: str) -> None:
+        """Append to the bounded Markdown prefix."""
+        if self.section_count:
+            section = "\n\n" + section
+        self.section_count += 1
+        if self._max_chars is not None:
+            section = section[: max(0, self._max_chars - self._length)]
+        if section:
+            self._parts.append(section)
+            self._length += len(section)
+
+    def _absorb(self, whole: ExtractionResult) -> None:
+        self.result.metadata = whole.metadata
+        self.result.warnings = whole.warnings
+        self.result.images = whole.images
+        if not whole.success:
+            self.result.success = False
+            self.result.error = whole.error
+
+    def _complete(self) -> None:
+        self.done = True
+        self.result.markdown = "".join(self._parts)
+        if self._finish is not None:
+            self.result.metadata = self._finish()
+
+    def _fail(self, exc: Exception) -> None:
+        self.done = True
+        self.result.markdown = "".join(self._parts)
+        self.result.success = False
+        if isinstance(exc, (ImportError, ValueError)):
+            self.result.error = str(exc)
+        else:
+            logger.error("Streaming extraction failed: %s: %s", type(exc).__name__, exc)
+            self.result.error = f"Extraction failed: {type(exc).__name__}: {exc}"
+
+
+def _normalize_extension(extension: str) -> str:
+    ext = extension.lower()
+    return ext if ext.startswith(".") else f".{ext}"
+
+
+def _check_extractable(ext: str, file_size: int, streamed: bool = False) -> str | None:
+    """Return an error message if the file type or size cannot be extracted."""
+    if ext not in SUPPORTED_EXTENSIONS:
+        return f"Unsupported file extension: {ext}"
+
+    if ext in _DOCLING_EXTENSIONS:
+        max_size = MAX_DOCLING_SIZE
+    elif streamed and ext in _CSV_EXTENSIONS:
+        max_size = MAX_STREAMED_CSV_SIZE
+    elif ext in _SPREADSHEET_EXTENSIONS:
+        max_size = MAX_SPREADSHEET_SIZE
+    else:
+        max_size = MAX_VISIO_SIZE
+    if file_size > max_size:
+        return f"File too large for extraction ({file_size} bytes, max {max_size})"
+    return None
+
+
 class FileExtractionService:
     """Orchestrates file content extraction by routing to the right extractor.
 
@@ -68,36 +209,10 @@ class FileExtractionService:
         Returns:
             ExtractionResult with markdown content or error details.
         """
-        ext = extension.lower()
-        if not ext.startswith("."):
-            ext = f".{ext}"
-
-        if ext not in SUPPORTED_EXTENSIONS:
-            return ExtractionResult(
-                markdown="",
-                success=False,
-                error=f"Unsupported file extension: {ext}",
-            )
-
-        # Size guards
-        if ext in _DOCLING_EXTENSIONS and file_size > MAX_DOCLING_SIZE:
-            return ExtractionResult(
-                markdown="",
-                success=False,
-                error=f"File too large for extraction ({file_size} bytes, max {MAX_DOCLING_SIZE})",
-            )
-        if ext in _SPREADSHEET_EXTENSIONS and file_size > MAX_SPREADSHEET_SIZE:
-            return ExtractionResult(
-                markdown="",
-                success=False,
-                error=f"File too large for extraction ({file_size} bytes, max {MAX_SPREADSHEET_SIZE})",
-            )
-        if ext in _VISIO_EXTENSIONS and file_size > MAX_VISIO_SIZE:
-            return ExtractionResult(
-                markdown="",
-                success=False,
-                error=f"File too large for extraction ({file_size} bytes, max {MAX_VISIO_SIZE})",
-            )
+        ext = _normalize_extension(extension)
+        error = _check_extractable(ext, file_size)
+        if error:
+            return ExtractionResult(markdown="", success=False, error=error)
 
         try:
             if ext in _DOCLING_EXTENSIONS:
@@ -131,6 +246,62 @@ class FileExtractionService:
                 error=f"Extraction failed: {type(exc).__name__}: {exc}",
             )
 
+    def extract_stream(
+        self,
+        file_path: str | Path,
+        extension: str,
+        file_size: int = 0,
+        max_markdown_chars: int | None = None,
+        rows_per_section: int = STREAM_SECTION_ROWS,
+    ) -> ExtractionStream:
+        """Extract content from a file as a stream of Markdown sections.
+
+        Spreadsheets yield one section per ``rows_per_section`` rows of a
+        sheet; other formats yield their whole Markdown as one section.
+        Errors (unsupported type, size guard, extractor failure) end the
+        stream and are reported on ``stream.result``.
+
+        Args:
+            file_path: Path to the file on disk; must outlive the iteration.
+            extension: File extension including the dot (e.g., ".csv").
+            file_size: File size in bytes for guard checks.
+            max_markdown_chars: Cap on the Markdown kept in ``stream.result``.
+            rows_per_section: Max data rows per spreadsheet section.
+
+        Returns:
+            ExtractionStream to iterate with ``async for``.
+        """
+        ext = _normalize_extension(extension)
+        error = _check_extractable(ext, file_size, streamed=True)
+        if error:
+            return ExtractionStream.failed(error)
+
+        if ext not in _SPREADSHEET_EXTENSIONS:
+            return ExtractionStream(
+                load=lambda: self.extract(file_path, ext, file_size),
+                max_markdown_chars=max_markdown_chars,
+            )
+
+        from .spreadsheet_extractor import SpreadsheetExtractor, SpreadsheetResult
+
+        extractor = SpreadsheetExtractor()
+        sheet_result = SpreadsheetResult(markdown="")
+        if ext in _CSV_EXTENSIONS:
+            sections = extractor.iter_csv_sections(file_path, sheet_result, rows_per_section=rows_per_section)
+        else:
+            sections = extractor.iter_excel_sections(file_path, sheet_result, rows_per_section=rows_per_section)
+
+        stream = ExtractionStream(
+            sections,
+            finish=lambda: {
+                "sheet_count": sheet_result.sheet_count,
+                "total_rows": sheet_result.total_rows,
+            },
+            max_markdown_chars=max_markdown_chars,
+        )
+        stream.result.warnings = sheet_result.warnings
+        return stream
+
     async def _extract_docling(self, file_path: str | Path, ext: str) -> ExtractionResult:
         """Extract content using DoclingService."""
         from .docling_service import DoclingService
@@ -161,7 +332,7 @@ class FileExtractionService:
 
         extractor = SpreadsheetExtractor()
 
-        if ext in {".csv", ".tsv"}:
+        if ext in _CSV_EXTENSIONS:
             result = await asyncio.to_thread(extractor.extract_csv, file_path)
         else:
             result = await asyncio.to_thread(extractor.extract_excel, file_path)
@@ -32,10 +32,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.attachment import Attachment
 from ..models.document_chunk import DocumentChunk
 from ..services.minio_service import MinIOService
+from ..services.tiptap_walker import TiptapIR, walk_tiptap
+from .chunk_writer import ChunkRow, write_chunks
 from .embedding_normalizer import EmbeddingNormalizer
 from .embedding_service import EmbeddingService
 from .provider_interface import VisionProvider
 from .provider_registry import ConfigurationError, ProviderRegistry
+from .provider_throttle import get_provider_throttle
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,9 @@ _VISION_PROMPT = (
     "Do not add commentary, suggestions, or offers to help."
 )
 
+# Rough per-image token charge against the vision tokens-per-minute budget
+_VISION_TOKENS_PER_IMAGE = 1000
+
 # Processing limits — runtime getters, NOT frozen module-level constants
 from .config_service import get_agent_config as _get_agent_config
 
@@ -149,11 +155,12 @@ class ImageUnderstandingService:
         self,
         document_id: UUID,
         content_json: dict[str, Any],
+        ir: TiptapIR | None = None,
     ) -> list[ImageDescription]:
         """Process images embedded in a TipTap document.
 
         Pipeline:
-        1. Walk TipTap JSON content tree.
+        1. Walk TipTap JSON content tree (or reuse ``ir``).
         2. Find nodes with ``type='image'`` and ``attrs.attachmentId``.
         3. For each image (max 10, position order):
            a. Look up Attachment record in DB.
@@ -167,6 +174,7 @@ class ImageUnderstandingService:
         Args:
             document_id: UUID of the parent document.
             content_json: Parsed TipTap JSON content dict.
+            ir: Cached walk of ``content_json``, e.g. from the save.
 
         Returns:
             List of ImageDescription for successfully processed images.
@@ -174,7 +182,7 @@ class ImageUnderstandingService:
         start_time = time.monotonic()
 
         # Step 1-2: Extract image nodes from TipTap tree
-        image_nodes = self._extract_image_nodes(content_json)
+        image_nodes = self._extract_image_nodes(content_json, ir)
         total_found = len(image_nodes)
 
         if not image_nodes:
@@ -602,95 +610,38 @@ class ImageUnderstandingService:
     def _extract_image_nodes(
         self,
         content_json: dict[str, Any],
+        ir: TiptapIR | None = None,
     ) -> list[dict[str, Any]]:
-        """Walk TipTap JSON tree and extract image nodes.
+        """Extract image nodes from the TipTap walk.
 
         Returns a list of dicts, each containing:
         - ``attachment_id``: UUID of the linked Attachment.
-        - ``heading_context``: Nearest ancestor heading text (or None).
+        - ``heading_context``: Nearest preceding heading text (or None).
         - ``alt``: Alt text from the node attrs.
         - ``title``: Title from the node attrs.
 
         Nodes are returned in document order (position order).
         """
-        results: list[dict[str, Any]] = []
-        nodes = content_json.get("content", [])
-        if not nodes:
-            return results
+        if ir is None:
+            ir = walk_tiptap(content_json)
 
-        self._walk_tiptap_nodes(nodes, current_heading=None, results=results)
+        results: list[dict[str, Any]] = []
+        for image in ir.images:
+            try:
+                attachment_id = UUID(image.attachment_id)
+            except ValueError:
+                logger.warning("Invalid attachmentId in image node: %s", image.attachment_id)
+                continue
+            results.append(
+                {
+                    "attachment_id": attachment_id,
+                    "heading_context": image.heading_context,
+                    "alt": image.alt,
+                    "title": image.title,
+                }
+            )
         return results
 
-    def _walk_tiptap_nodes(
-        self,
-        nodes: list[dict[str, Any]],
-        current_heading: str | None,
-        results: list[dict[str, Any]],
-        _depth: int = 0,
-    ) -> str | None:
-        """Recursively walk TipTap nodes to find image nodes.
-
-        Updates ``results`` in-place with found image nodes.
-        Returns the current heading context after processing all nodes.
-
-        Args:
-            nodes: List of TipTap child nodes.
-            current_heading: Current heading context from ancestors.
-            results: Accumulator list (mutated in place).
-            _depth: Recursion depth guard (max 20).
-
-        Returns:
-            Updated heading context string.
-        """
-        if _depth > 20:
-            return current_heading
-        for node in nodes:
-            node_type = node.get("type", "")
-
-            if node_type == "heading":
-                # Update heading context for subsequent nodes
-                heading_text = self._inline_text(node.get("content", []))
-                if heading_text.strip():
-                    current_heading = heading_text.strip()
-
-            elif node_type == "image":
-                attrs = node.get("attrs", {})
-                attachment_id_str = attrs.get("attachmentId")
-                if attachment_id_str:
-                    try:
-                        attachment_id = UUID(str(attachment_id_str))
-                        results.append(
-                            {
-                                "attachment_id": attachment_id,
-                                "heading_context": current_heading,
-                                "alt": attrs.get("alt", "") or "",
-                                "title": attrs.get("title", "") or "",
-                            }
-                        )
-                    except (ValueError, AttributeError):
-                        logger.warning(
-                            "Invalid attachmentId in image node: %s",
-                            attachment_id_str,
-                        )
-
-            # Recurse into children
-            children = node.get("content", [])
-            if children:
-                current_heading = self._walk_tiptap_nodes(children, current_heading, results, _depth + 1)
-
-        return current_heading
-
-    @staticmethod
-    def _inline_text(nodes: list[dict[str, Any]]) -> str:
-        """Extract inline text from TipTap text/hardBreak nodes."""
-        parts: list[str] = []
-        for node in nodes:
-            if node.get("type") == "text":
-                parts.append(node.get("text", ""))
-            elif node.get("type") == "hardBreak":
-                parts.append("\n")
-        return "".join(parts)
-
     # ------------------------------------------------------------------
     # Image download & description
     # ------------------------------------------------------------------
@@ -756,11 +707,12 @@ class ImageUnderstandingService:
             Description text from the vision LLM, or empty string on failure.
         """
         try:
-            return await provider.describe_image(
-                image_bytes=image_bytes,
-                prompt=_VISION_PROMPT,
-                model=model,
-            )
+            async with get_provider_throttle("vision", provider, model).slot(tokens=_VISION_TOKENS_PER_IMAGE):
+                return await provider.describe_image(
+                    image_bytes=image_bytes,
+                    prompt=_VISION_PROMPT,
+                    model=model,
+                )
         except Exception:
             logger.exception("Vision LLM describe_image call failed")
             return ""
@@ -840,34 +792,27 @@ class ImageUnderstandingService:
 
         embeddings = await self._generate_embeddings(chunk_texts)
 
-        # Create DocumentChunk records
-        new_chunks: list[DocumentChunk] = []
-        for idx, desc in enumerate(descriptions):
-            node_info = image_nodes[idx] if idx < len(image_nodes) else {}
-            heading_context = node_info.get("heading_context")
-            caption = node_info.get("alt") or node_info.get("title") or ""
-            chunk_text = self._build_chunk_text(caption, desc.description)
-
-            embedding = embeddings[idx] if idx < len(embeddings) else None
-
-            chunk = DocumentChunk(
-                document_id=document_id,
-                file_id=file_id,
-                source_type="file" if file_id else "document",
+        # Append image chunks after the text chunks in one bulk statement
+        new_chunks = [
+            ChunkRow(
                 chunk_index=offset + idx,
-                chunk_text=chunk_text,
-                chunk_type="image",
-                heading_context=heading_context,
-                embedding=embedding,
+                chunk_text=chunk_texts[idx],
                 token_count=desc.token_count,
-                application_id=scope_ids.get("application_id"),
-                project_id=scope_ids.get("project_id"),
-                user_id=scope_ids.get("user_id"),
+                heading_context=(image_nodes[idx] if idx < len(image_nodes) else {}).get("heading_context"),
+                chunk_type="image",
             )
-            new_chunks.append(chunk)
-
-        self.db.add_all(new_chunks)
-        await self.db.flush()
+            for idx, desc in enumerate(descriptions)
+        ]
+        chunk_embeddings = [embeddings[idx] if idx < len(embeddings) else None for idx in range(len(new_chunks))]
+        await write_chunks(
+            self.db,
+            new_chunks,
+            chunk_embeddings,
+            scope_ids,
+            document_id=None if file_id else document_id,
+            file_id=file_id,
+            replace=False,
+        )
 
         parent_label = f"file {file_id}" if file_id else f"document {document_id}"
         logger.info(
@@ -914,9 +859,11 @@ class ImageUnderstandingService:
 
         try:
             provider, model_id = await self.provider_registry.get_embedding_provider(self.db)
-            raw_embeddings = await provider.generate_embeddings_batch(texts, model_id)
+            tokens = sum(self._count_tokens(t) for t in texts)
+            async with get_provider_throttle("embedding", provider, model_id).slot(tokens=tokens):
+                raw_embeddings = await provider.generate_embeddings_batch(texts, model_id)
             normalizer = EmbeddingNormalizer()
-            return [normalizer.normalize(emb) for emb in raw_embeddings]
+            return normalizer.normalize_batch(raw_embeddings).tolist()
         except Exception:
             logger.exception(
                 "Failed to generate embeddings for %d image chunks, storing chunks without embeddings",
@@ -0,0 +1,336 @@
+"""Provider-aware throughput control for embedding and vision calls.
+
+Background jobs used to pace provider traffic with fixed sleeps, which is
+either too slow (the provider had headroom) or too fast (429s). This module
+gives every (kind, provider, model) a :class:`ProviderThrottle` combining:
+
+1. A shared token bucket in Redis for requests-per-minute and
+   tokens-per-minute. All worker processes draw from the same bucket, so
+   the configured limits hold across the fleet. Limits come from
+   ``throttle.{kind}_rpm`` / ``throttle.{kind}_tpm`` (0 = unlimited).
+2. A per-process AIMD concurrency limit: each success under
+   ``throttle.target_latency_ms`` grows the limit by ~1 per window of
+   in-flight calls, a slow call shrinks it by ``_LATENCY_DECREASE`` and a
+   429 halves it. The limit is capped by ``throttle.max_concurrency``.
+3. A shared cooldown: a 429 pauses every process for the provider's
+   ``Retry-After`` (or ``_DEFAULT_COOLDOWN_MS``).
+
+Usage::
+
+    throttle = get_provider_throttle("embedding", provider, model_id)
+    async with throttle.slot(tokens=estimated_tokens):
+        vectors = await provider.generate_embeddings_batch(texts, model_id)
+
+Fallback: when Redis is unavailable the bucket is kept in memory per
+process, which keeps the limits per worker instead of fleet-wide.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .config_service import get_agent_config
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Redis Lua script (executed atomically on the server)
+# ---------------------------------------------------------------------------
+
+# Dual token bucket (requests + tokens) with a shared cooldown key.
+# KEYS[1] = request bucket hash, KEYS[2] = token bucket hash, KEYS[3] = cooldown
+# ARGV = now_ms, rpm_limit, tpm_limit, tokens (a limit <= 0 disables that bucket)
+# Buckets hold up to one minute of budget and refill continuously.
+# Returns 0 when the request was admitted, otherwise milliseconds to wait.
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rpm = tonumber(ARGV[2])
+local tpm = tonumber(ARGV[3])
+local tokens = tonumber(ARGV[4])
+
+local cooldown = redis.call('PTTL', KEYS[3])
+if cooldown > 0 then
+    return cooldown
+end
+
+local function level(key, limit)
+    local lvl = tonumber(redis.call('HGET', key, 'level') or limit)
+    local ts = tonumber(redis.call('HGET', key, 'ts') or now)
+    return math.min(limit, lvl + math.max(0, now - ts) * limit / 60000)
+end
+
+local r = 0
+local t = 0
+local wait = 0
+if rpm > 0 then
+    r = level(KEYS[1], rpm)
+    if r < 1 then wait = math.max(wait, (1 - r) * 60000 / rpm) end
+end
+if tpm > 0 then
+    tokens = math.min(tokens, tpm)
+    t = level(KEYS[2], tpm)
+    if t < tokens then wait = math.max(wait, (tokens - t) * 60000 / tpm) end
+end
+if wait > 0 then
+    return math.ceil(wait)
+end
+
+if rpm > 0 then
+    redis.call('HSET', KEYS[1], 'level', tostring(r - 1), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], 120000)
+end
+if tpm > 0 then
+    redis.call('HSET', KEYS[2], 'level', tostring(t - tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[2], 120000)
+end
+return 0
+"""
+
+_DEFAULT_LIMITS = {
+    "embedding": (3000, 1_000_000),
+    "vision": (500, 200_000),
+}
+
+# AIMD tuning
+_MIN_CONCURRENCY = 1
+_RATE_LIMIT_DECREASE = 0.5
+_LATENCY_DECREASE = 0.8
+# Ignore further decrease signals for this long after one, so a burst of
+# 429s from calls that were already in flight counts as a single event.
+_DECREASE_HOLDOFF_S = 1.0
+
+_DEFAULT_COOLDOWN_MS = 2000
+_MAX_WAIT_MS = 60_000
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True when ``exc`` (or the provider error it wraps) is an HTTP 429."""
+    return _status_code(exc) == 429
+
+
+def _walk(exc: BaseException | None):
+    seen: set[int] = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = getattr(exc, "original", None) or exc.__cause__
+
+
+def _status_code(exc: BaseException) -> int | None:
+    for e in _walk(exc):
+        status = getattr(e, "status_code", None)
+        if status is None:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _retry_after_ms(exc: BaseException) -> int:
+    """Retry-After from the provider response, in milliseconds."""
+    for e in _walk(exc):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if not headers:
+            continue
+        value = headers.get("retry-after-ms") or headers.get("retry-after")
+        if value is None:
+            continue
+        try:
+            seconds = float(value) / 1000 if headers.get("retry-after-ms") else float(value)
+        except (TypeError, ValueError):
+            continue
+        return min(_MAX_WAIT_MS, max(0, int(seconds * 1000)))
+    return _DEFAULT_COOLDOWN_MS
+
+
+def _redis():
+    from ..services.redis_service import redis_service
+
+    return redis_service if redis_service.is_connected else None
+
+
+class AdaptiveConcurrency:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    Args:
+        maximum: Upper bound for the limit (and its starting value).
+        target_latency_ms: Calls slower than this shrink the limit.
+    """
+
+    def __init__(self, maximum: int, target_latency_ms: int) -> None:
+        self.maximum = max(_MIN_CONCURRENCY, maximum)
+        self.target_latency_ms = target_latency_ms
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._last_decrease = 0.0
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency_ms: float | None, rate_limited: bool = False) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self._decrease(_RATE_LIMIT_DECREASE)
+            elif latency_ms is not None:
+                if self.target_latency_ms > 0 and latency_ms > self.target_latency_ms:
+                    self._decrease(_LATENCY_DECREASE)
+                else:
+                    self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < _DECREASE_HOLDOFF_S:
+            return
+        self._last_decrease = now
+        self.limit = max(float(_MIN_CONCURRENCY), self.limit * factor)
+
+
+class _LocalBucket:
+    """In-memory fallback mirroring ``_ACQUIRE_SCRIPT`` for one process."""
+
+    def __init__(self) -> None:
+        self.levels: dict[str, tuple[float, float]] = {}
+        self.cooldown_until = 0.0
+
+    def acquire(self, rpm: int, tpm: int, tokens: int) -> int:
+        now = time.monotonic() * 1000
+        if self.cooldown_until > now:
+            return int(self.cooldown_until - now) + 1
+
+        def level(name: str, limit: int) -> float:
+            lvl, ts = self.levels.get(name, (float(limit), now))
+            return min(float(limit), lvl + max(0.0, now - ts) * limit / 60000)
+
+        r = t = 0.0
+        wait = 0.0
+        if rpm > 0:
+            r = level("rpm", rpm)
+            if r < 1:
+                wait = max(wait, (1 - r) * 60000 / rpm)
+        if tpm > 0:
+            tokens = min(tokens, tpm)
+            t = level("tpm", tpm)
+            if t < tokens:
+                wait = max(wait, (tokens - t) * 60000 / tpm)
+        if wait > 0:
+            return int(wait) + 1
+        if rpm > 0:
+            self.levels["rpm"] = (r - 1, now)
+        if tpm > 0:
+            self.levels["tpm"] = (t - tokens, now)
+        return 0
+
+
+class ProviderThrottle:
+    """Rate and concurrency control for one (kind, provider, model).
+
+    Args:
+        kind: ``"embedding"`` or ``"vision"``; selects the config keys.
+        provider_name: Provider identifier used in the Redis keys.
+        model: Model identifier used in the Redis keys.
+    """
+
+    def __init__(self, kind: str, provider_name: str, model: str) -> None:
+        self.kind = kind
+        prefix = f"throttle:{kind}:{provider_name}:{model}"
+        self._keys = [f"{prefix}:rpm", f"{prefix}:tpm", f"{prefix}:cooldown"]
+        cfg = get_agent_config()
+        self.concurrency = AdaptiveConcurrency(
+            maximum=cfg.get_int("throttle.max_concurrency", 16),
+            target_latency_ms=cfg.get_int("throttle.target_latency_ms", 10000),
+        )
+        self._local = _LocalBucket()
+        self.rate_limited_count = 0
+
+    def _limits(self) -> tuple[int, int]:
+        cfg = get_agent_config()
+        default_rpm, default_tpm = _DEFAULT_LIMITS.get(self.kind, (0, 0))
+        return (
+            cfg.get_int(f"throttle.{self.kind}_rpm", default_rpm),
+            cfg.get_int(f"throttle.{self.kind}_tpm", default_tpm),
+        )
+
+    async def _try_acquire(self, tokens: int) -> int:
+        rpm, tpm = self._limits()
+        rs = _redis()
+        if rs is not None:
+            try:
+                now_ms = int(time.time() * 1000)
+                return int(await rs.client.eval(_ACQUIRE_SCRIPT, 3, *self._keys, now_ms, rpm, tpm, tokens))
+            except Exception as e:
+                logger.debug("Provider throttle Redis acquire failed, using local bucket: %s", type(e).__name__)
+        return self._local.acquire(rpm, tpm, tokens)
+
+    async def wait_for_budget(self, tokens: int = 0) -> None:
+        """Block until the shared bucket admits one request of ``tokens``."""
+        while True:
+            wait_ms = await self._try_acquire(tokens)
+            if wait_ms <= 0:
+                return
+            await asyncio.sleep(min(wait_ms, _MAX_WAIT_MS) / 1000)
+
+    async def _start_cooldown(self, ms: int) -> None:
+        self._local.cooldown_until = max(self._local.cooldown_until, time.monotonic() * 1000 + ms)
+        rs = _redis()
+        if rs is None or ms <= 0:
+            return
+        try:
+            await rs.client.set(self._keys[2], "1", px=ms)
+        except Exception as e:
+            logger.debug("Provider throttle cooldown write failed: %s", type(e).__name__)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Hold a concurrency slot and rate budget for one provider call.
+
+        A 429 raised inside the block shrinks concurrency and starts the
+        shared cooldown before propagating.
+        """
+        await self.concurrency.acquire()
+        latency_ms: float | None = None
+        rate_limited = False
+        try:
+            await self.wait_for_budget(tokens)
+            start = time.monotonic()
+            try:
+                yield
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    rate_limited = True
+                    self.rate_limited_count += 1
+                    cooldown = _retry_after_ms(e)
+                    logger.warning(
+                        "%s provider rate limited; cooling down %dms (concurrency %.1f)",
+                        self.kind,
+                        cooldown,
+                        self.concurrency.limit,
+                    )
+                    await self._start_cooldown(cooldown)
+                raise
+            latency_ms = (time.monotonic() - start) * 1000
+        finally:
+            await self.concurrency.release(latency_ms, rate_limited)
+
+
+_throttles: dict[tuple[str, str, str], ProviderThrottle] = {}
+
+
+def get_provider_throttle(kind: str, provider: Any, model: str) -> ProviderThrottle:
+    """Process-wide throttle for a provider adapter and model."""
+    provider_name = getattr(provider, "provider_name", None) or type(provider).__name__
+    key = (kind, provider_name, model)
+    throttle = _throttles.get(key)
+    if throttle is None:
+        throttle = ProviderThrottle(kind, provider_name, model)
+        _throttles[key] = throttle
+    return throttle
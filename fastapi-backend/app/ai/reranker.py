@@ -0,0 +1,318 @@
+"""Lightweight in-process re-ranking for hybrid retrieval results.
+
+RRF fuses semantic, keyword and fuzzy lists purely by rank, so the chunk
+that actually answers the query is often not the first one returned.
+This module re-scores the fused candidate set with cheap lexical
+features computed locally (no GPU, no network, no extra provider calls):
+
+1. RRF score (the fused rank signal, max-normalized)
+2. BM25 over candidate chunk text (IDF computed over the candidate set)
+3. Term proximity — tightest window covering the matched query terms
+4. Heading match — query-term coverage of the chunk's heading context
+5. Title match — query-term coverage of the document title
+
+Features are combined with a tunable linear model whose weights are read
+from AgentConfigurations (``search.rerank_*_weight``).  Setting every
+lexical weight to 0 reproduces the plain RRF order.
+
+An offline evaluation harness (``evaluate_reranker``) scores the reranked
+order against labeled queries so weights can be tuned without touching
+production traffic.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from .config_service import get_agent_config
+
+if TYPE_CHECKING:
+    from .retrieval_service import RetrievalResult
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Function words that carry no retrieval signal; kept small on purpose so
+# short technical queries ("how to set up CI") retain their content terms.
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how i in is it of on or the this to was what when where which "
+    "who why with".split()
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase word tokens with stopwords removed."""
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class RerankWeights:
+    """Linear model weights for the re-ranking features."""
+
+    rrf: float = 1.0
+    bm25: float = 0.6
+    proximity: float = 0.25
+    heading: float = 0.3
+    title: float = 0.15
+
+    @classmethod
+    def from_config(cls) -> RerankWeights:
+        """Load weights from the runtime agent configuration cache."""
+        cfg = get_agent_config()
+        defaults = cls()
+        return cls(
+            rrf=cfg.get_float("search.rerank_rrf_weight", defaults.rrf),
+            bm25=cfg.get_float("search.rerank_bm25_weight", defaults.bm25),
+            proximity=cfg.get_float("search.rerank_proximity_weight", defaults.proximity),
+            heading=cfg.get_float("search.rerank_heading_weight", defaults.heading),
+            title=cfg.get_float("search.rerank_title_weight", defaults.title),
+        )
+
+
+@dataclass(frozen=True)
+class RerankFeatures:
+    """Per-candidate feature vector (each feature in [0, 1])."""
+
+    rrf: float
+    bm25: float
+    proximity: float
+    heading: float
+    title: float
+
+    def dot(self, weights: RerankWeights) -> float:
+        return (
+            weights.rrf * self.rrf
+            + weights.bm25 * self.bm25
+            + weights.proximity * self.proximity
+            + weights.heading * self.heading
+            + weights.title * self.title
+        )
+
+
+class LightweightReranker:
+    """Re-scores fused retrieval candidates with local lexical features.
+
+    Args:
+        weights: Linear model weights. Defaults to values from config.
+        k1: BM25 term-frequency saturation.
+        b: BM25 length normalization.
+    """
+
+    def __init__(
+        self,
+        weights: RerankWeights | None = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.weights = weights if weights is not None else RerankWeights.from_config()
+        self.k1 = k1
+        self.b = b
+
+    def rerank(self, query: str, results: list[RetrievalResult]) -> list[RetrievalResult]:
+        """Return ``results`` re-ordered by the linear re-ranking score.
+
+        Each returned result carries its combined score in ``rerank_score``;
+        the original RRF ``score`` is left untouched. Ties keep RRF order.
+        """
+        if len(results) < 2:
+            return [replace(r, rerank_score=r.score) for r in results]
+
+        features = self.compute_features(query, results)
+        scored = [replace(r, rerank_score=feat.dot(self.weights)) for r, feat in zip(results, features)]
+        # list.sort is stable, so equal scores keep their RRF order
+        scored.sort(key=lambda r: r.rerank_score, reverse=True)
+        return scored
+
+    def compute_features(self, query: str, results: list[RetrievalResult]) -> list[RerankFeatures]:
+        """Compute the normalized feature vector for every candidate."""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        docs = [tokenize(r.chunk_text) for r in results]
+
+        bm25 = self._bm25_scores(query_terms, docs)
+        max_bm25 = max(bm25) if bm25 else 0.0
+        max_rrf = max((r.score for r in results), default=0.0)
+
+        features: list[RerankFeatures] = []
+        for r, doc_tokens, bm25_score in zip(results, docs, bm25):
+            features.append(
+                RerankFeatures(
+                    rrf=r.score / max_rrf if max_rrf > 0 else 0.0,
+                    bm25=bm25_score / max_bm25 if max_bm25 > 0 else 0.0,
+                    proximity=_proximity(query_terms, doc_tokens),
+                    heading=_coverage(query_terms, r.heading_context),
+                    title=_coverage(query_terms, r.document_title),
+                )
+            )
+        return features
+
+    def _bm25_scores(self, query_terms: list[str], docs: list[list[str]]) -> list[float]:
+        """Okapi BM25 with IDF estimated over the candidate set itself."""
+        if not query_terms or not docs:
+            return [0.0] * len(docs)
+
+        n_docs = len(docs)
+        avg_len = (sum(len(d) for d in docs) / n_docs) or 1.0
+        doc_freq: Counter[str] = Counter()
+        for doc in docs:
+            doc_freq.update(set(doc) & set(query_terms))
+
+        idf = {t: math.log(1.0 + (n_docs - doc_freq[t] + 0.5) / (doc_freq[t] + 0.5)) for t in query_terms}
+
+        scores: list[float] = []
+        for doc in docs:
+            tf = Counter(doc)
+            norm = self.k1 * (1.0 - self.b + self.b * len(doc) / avg_len)
+            score = 0.0
+            for term in query_terms:
+                freq = tf.get(term, 0)
+                if freq:
+                    score += idf[term] * freq * (self.k1 + 1.0) / (freq + norm)
+            scores.append(score)
+        return scores
+
+
+def _coverage(query_terms: list[str], text: str | None) -> float:
+    """Fraction of distinct query terms present in ``text``."""
+    if not query_terms or not text:
+        return 0.0
+    tokens = set(tokenize(text))
+    return sum(1 for t in query_terms if t in tokens) / len(query_terms)
+
+
+def _proximity(query_terms: list[str], doc_tokens: list[str]) -> float:
+    """Score how tightly the matched query terms cluster in the chunk.
+
+    Finds the shortest token window containing every distinct query term
+    that occurs in the chunk, then returns
+    ``coverage * (matched_terms / window_length)``. A single matched term
+    scores its coverage alone; no matches score 0.
+    """
+    if not query_terms or not doc_tokens:
+        return 0.0
+
+    wanted = set(query_terms)
+    positions = [(i, tok) for i, tok in enumerate(doc_tokens) if tok in wanted]
+    present = {tok for _, tok in positions}
+    if not present:
+        return 0.0
+    coverage = len(present) / len(query_terms)
+    if len(present) == 1:
+        return coverage
+
+    # Sliding window over match positions (classic minimum-window cover)
+    best = len(doc_tokens)
+    counts: Counter[str] = Counter()
+    covered = 0
+    left = 0
+    for right, (pos_r, tok_r) in enumerate(positions):
+        counts[tok_r] += 1
+        if counts[tok_r] == 1:
+            covered += 1
+        while covered == len(present):
+            pos_l, tok_l = positions[left]
+            best = min(best, pos_r - pos_l + 1)
+            counts[tok_l] -= 1
+            if counts[tok_l] == 0:
+                covered -= 1
+            left += 1
+
+    return coverage * min(1.0, len(present) / best)
+
+
+# ---------------------------------------------------------------------------
+# Offline evaluation harness
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class LabeledQuery:
+    """A query, its fused candidate list, and the chunks judged relevant.
+
+    Relevance keys are ``(document_id, chunk_index)``; a ``chunk_index`` of
+    None marks the whole document relevant.
+    """
+
+    query: str
+    candidates: list[RetrievalResult]
+    relevant: set[tuple[UUID, int | None]] = field(default_factory=set)
+
+    def is_relevant(self, result: RetrievalResult) -> bool:
+        return (result.document_id, result.chunk_index) in self.relevant or (
+            result.document_id,
+            None,
+        ) in self.relevant
+
+
+@dataclass
+class RankingMetrics:
+    """Mean ranking metrics over a labeled query set."""
+
+    mrr: float
+    ndcg: float
+    recall: float
+    queries: int
+
+
+@dataclass
+class RerankEvaluation:
+    """Baseline (RRF order) vs reranked metrics for the same query set."""
+
+    k: int
+    baseline: RankingMetrics
+    reranked: RankingMetrics
+
+
+def _ranking_metrics(runs: list[tuple[LabeledQuery, list[RetrievalResult]]], k: int) -> RankingMetrics:
+    if not runs:
+        return RankingMetrics(mrr=0.0, ndcg=0.0, recall=0.0, queries=0)
+
+    mrr_sum = ndcg_sum = recall_sum = 0.0
+    for labeled, ranking in runs:
+        top = ranking[:k]
+        hits = [labeled.is_relevant(r) for r in top]
+
+        first_hit = next((i for i, hit in enumerate(hits, 1) if hit), None)
+        mrr_sum += 1.0 / first_hit if first_hit else 0.0
+
+        dcg = sum(1.0 / math.log2(i + 1) for i, hit in enumerate(hits, 1) if hit)
+        n_relevant = sum(1 for r in labeled.candidates if labeled.is_relevant(r))
+        ideal = sum(1.0 / math.log2(i + 1) for i in range(1, min(n_relevant, k) + 1))
+        ndcg_sum += dcg / ideal if ideal > 0 else 0.0
+
+        recall_sum += sum(hits) / n_relevant if n_relevant else 0.0
+
+    n = len(runs)
+    return RankingMetrics(mrr=mrr_sum / n, ndcg=ndcg_sum / n, recall=recall_sum / n, queries=n)
+
+
+def evaluate_reranker(
+    labeled_queries: list[LabeledQuery],
+    reranker: LightweightReranker,
+    k: int = 10,
+) -> RerankEvaluation:
+    """Compare RRF order against reranked order over labeled queries.
+
+    Candidates are expected in RRF order (as returned by
+    ``HybridRetrievalService._reciprocal_rank_fusion`` after sorting).
+
+    Args:
+        labeled_queries: Queries with candidate lists and relevance labels.
+        reranker: The reranker (and weights) under evaluation.
+        k: Cutoff for MRR@k, nDCG@k and recall@k.
+
+    Returns:
+        RerankEvaluation with baseline and reranked metrics.
+    """
+    baseline_runs = [(lq, list(lq.candidates)) for lq in labeled_queries]
+    reranked_runs = [(lq, reranker.rerank(lq.query, lq.candidates)) for lq in labeled_queries]
+    return RerankEvaluation(
+        k=k,
+        baseline=_ranking_metrics(baseline_runs, k),
+        reranked=_ranking_metrics(reranked_runs, k),
+    )
@@ -0,0 +1,200 @@
+"""Redis-backed cache for hybrid retrieval results.
+
+The agent often repeats the same ``search_knowledge`` query within a
+conversation, and users of the same application ask overlapping questions.
+``HybridRetrievalService.retrieve`` results are cached under a key derived
+from (query, resolved RBAC scope, limit) plus the current *knowledge
+generation* of every scope the search covers.
+
+Knowledge generations are plain Redis counters:
+
+    knowledge_gen:app:{application_id}   application + project documents/files
+    knowledge_gen:user:{user_id}         personal documents/files
+
+Any embed, index, delete or restore event bumps the counter for the owning
+scope (project content bumps its parent application). Because the counters
+are part of the cache key, a bump makes every older entry unreachable
+without scanning or deleting keys; stale entries simply expire via TTL.
+
+All operations are best-effort: Redis failures fall through to an uncached
+retrieval and never surface to callers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, fields
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from .config_service import get_agent_config
+
+if TYPE_CHECKING:
+    from .retrieval_service import RetrievalResult
+
+logger = logging.getLogger(__name__)
+
+_GEN_PREFIX = "knowledge_gen"
+_RESULT_PREFIX = "retrieval_cache"
+
+# Generation counters outlive any cached result by a wide margin so an
+# expired counter can never collide with a still-live cache entry.
+_GEN_TTL_SECONDS = 7 * 24 * 3600
+
+_UUID_FIELDS = ("document_id", "application_id", "project_id", "file_id")
+
+
+def app_generation_key(application_id: UUID | str) -> str:
+    return f"{_GEN_PREFIX}:app:{application_id}"
+
+
+def user_generation_key(user_id: UUID | str) -> str:
+    return f"{_GEN_PREFIX}:user:{user_id}"
+
+
+def _redis():
+    from ..services.redis_service import redis_service
+
+    return redis_service if redis_service.is_connected else None
+
+
+async def bump_knowledge_generation(
+    application_id: UUID | str | None = None,
+    user_id: UUID | str | None = None,
+) -> None:
+    """Invalidate cached retrievals that cover the given scope.
+
+    Pass the owning application for application- and project-scoped
+    content, or the owning user for personal content. Never raises.
+    """
+    keys = []
+    if application_id:
+        keys.append(app_generation_key(application_id))
+    if user_id:
+        keys.append(user_generation_key(user_id))
+    if not keys:
+        return
+
+    rs = _redis()
+    if rs is None:
+        return
+    try:
+        pipe = rs.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+            pipe.expire(key, _GEN_TTL_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to bump knowledge generation %s: %s", keys, type(e).__name__)
+
+
+def _ttl() -> int:
+    return get_agent_config().get_int("cache.retrieval_ttl", 120)
+
+
+def _serialize(results: list[RetrievalResult]) -> str:
+    rows = []
+    for r in results:
+        row = asdict(r)
+        for name in _UUID_FIELDS:
+            if row[name] is not None:
+                row[name] = str(row[name])
+        rows.append(row)
+    return json.dumps(rows)
+
+
+def _deserialize(raw: str) -> list[RetrievalResult]:
+    from .retrieval_service import RetrievalResult
+
+    known = {f.name for f in fields(RetrievalResult)}
+    results = []
+    for row in json.loads(raw):
+        kwargs: dict[str, Any] = {k: v for k, v in row.items() if k in known}
+        for name in _UUID_FIELDS:
+            if kwargs.get(name) is not None:
+                kwargs[name] = UUID(kwargs[name])
+        results.append(RetrievalResult(**kwargs))
+    return results
+
+
+class RetrievalCache:
+    """Looks up and stores retrieval results for one resolved scope.
+
+    Build one per ``retrieve`` call after RBAC resolution; ``get`` reads the
+    scope's generation counters once and ``set`` reuses them, so a bump that
+    lands mid-search is never masked by storing results under the new
+    generation.
+
+    Args:
+        query: Sanitized search query.
+        app_ids: Resolved application IDs the search covers.
+        project_ids: Resolved project IDs the search covers.
+        user_id: Searching user (personal scope).
+        limit: Result limit requested by the caller.
+        expand_neighbors: Whether results carry adjacent-chunk context.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        app_ids: list[UUID],
+        project_ids: list[UUID],
+        user_id: UUID,
+        limit: int,
+        expand_neighbors: bool = False,
+    ) -> None:
+        self.query = query
+        self.app_ids = sorted(str(a) for a in app_ids)
+        self.project_ids = sorted(str(p) for p in project_ids)
+        self.user_id = str(user_id)
+        self.limit = limit
+        self.expand_neighbors = expand_neighbors
+        self._key: str | None = None
+
+    def _build_key(self, generations: list[Any]) -> str:
+        material = json.dumps(
+            {
+                "q": self.query,
+                "apps": self.app_ids,
+                "projects": self.project_ids,
+                "user": self.user_id,
+                "limit": self.limit,
+                "neighbors": self.expand_neighbors,
+                "gens": [int(g) if g is not None else 0 for g in generations],
+            },
+            separators=(",", ":"),
+        )
+        return f"{_RESULT_PREFIX}:{hashlib.sha256(material.encode()).hexdigest()}"
+
+    async def get(self) -> list[RetrievalResult] | None:
+        """Return cached results, or None on miss / cache disabled."""
+        if _ttl() <= 0:
+            return None
+        rs = _redis()
+        if rs is None:
+            return None
+        try:
+            gen_keys = [app_generation_key(a) for a in self.app_ids]
+            gen_keys.append(user_generation_key(self.user_id))
+            generations = await rs.client.mget(gen_keys)
+            self._key = self._build_key(generations)
+            raw = await rs.get(self._key)
+            return _deserialize(raw) if raw else None
+        except Exception as e:
+            logger.debug("Retrieval cache lookup failed: %s", type(e).__name__)
+            self._key = None
+            return None
+
+    async def set(self, results: list[RetrievalResult]) -> None:
+        """Store results under the generation vector read by ``get``."""
+        if self._key is None:
+            return
+        rs = _redis()
+        if rs is None:
+            return
+        try:
+            await rs.set(self._key, _serialize(results), ttl=_ttl())
+        except Exception as e:
+            logger.debug("Retrieval cache store failed: %s", type(e).__name__)
@@ -6,27 +6,34 @@ Multi-source retrieval combining:
 3. pg_trgm fuzzy title matching
 
 All sources filtered by user's RBAC scope. Results merged and deduplicated
-using Reciprocal Rank Fusion (RRF).
+using Reciprocal Rank Fusion (RRF), then re-scored in-process by the
+lightweight lexical reranker (see reranker.py).
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from uuid import UUID
 
+from meilisearch_python_sdk.models.search import SearchParams
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..services.search_service import (
     _get_projects_in_applications,
     _get_user_application_ids,
+    get_meili_client,
     get_meili_index,
     sanitize_search_query,
 )
-from .embedding_normalizer import EmbeddingNormalizer
+from .config_service import get_agent_config
+from .embedding_normalizer import EmbeddingNormalizer, to_vector_param
 from .provider_registry import ProviderRegistry
+from .reranker import LightweightReranker
+from .retrieval_cache import RetrievalCache
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +55,10 @@ class RetrievalResult:
     chunk_index: int | None = None
     source_type: str = "document"  # "document" or "file"
     file_id: UUID | None = None
+    rerank_score: float | None = None  # Set by LightweightReranker
+    # Adjacent chunk text when retrieved with expand_neighbors=True
+    context_before: str = ""
+    context_after: str = ""
 
 
 @dataclass
@@ -67,6 +78,248 @@ class _RankedResult:
     chunk_type: str = "text"
     source_type: str = "document"  # "document" or "file"
     file_id: UUID | None = None
+    # Adjacent chunks [{chunk_index, chunk_text, token_count}] (semantic only)
+    neighbors: list[dict] | None = None
+
+
+# Shared pieces of the pgvector query used by single and batched search.
+# LEFT JOIN both Documents and FolderFiles to support both source types.
+_SEMANTIC_COLUMNS = """dc.document_id,
+                dc.file_id,
+                dc.source_type,
+                dc.chunk_text,
+                dc.heading_context,
+                dc.chunk_index,
+                dc.chunk_type,
+                dc.application_id,
+                dc.project_id,
+                COALESCE(d.title, ff.display_name) AS document_title"""
+_SEMANTIC_FROM = """FROM "DocumentChunks" dc
+            LEFT JOIN "Documents" d ON d.id = dc.document_id
+            LEFT JOIN "FolderFiles" ff ON ff.id = dc.file_id"""
+_SEMANTIC_LIVE_FILTER = """(
+                (dc.document_id IS NOT NULL AND d.deleted_at IS NULL)
+                OR (dc.file_id IS NOT NULL AND ff.deleted_at IS NULL)
+              )"""
+
+
+def _chunk_scope_filter(scope_ids: dict, params: dict) -> str:
+    """Build the DocumentChunks RBAC filter, adding its bind params to ``params``.
+
+    Conditions are hardcoded strings; IDs are bound as :app_ids,
+    :project_ids and :user_id.
+    """
+    conditions: list[str] = []
+    if scope_ids["app_ids"]:
+        conditions.append("dc.application_id = ANY(:app_ids)")
+        params["app_ids"] = [str(aid) for aid in scope_ids["app_ids"]]
+
+    if scope_ids.get("project_ids"):
+        conditions.append("dc.project_id = ANY(:project_ids)")
+        params["project_ids"] = [str(pid) for pid in scope_ids["project_ids"]]
+
+    # Personal-scope: only match docs where application_id AND project_id
+    # are NULL (truly personal docs), not all docs created by this user.
+    conditions.append("dc.application_id IS NULL AND dc.project_id IS NULL AND dc.user_id = :user_id")
+    params["user_id"] = str(scope_ids["user_id"])
+
+    return " OR ".join(f"({c})" for c in conditions)
+
+
+def _neighbor_join(hit: str) -> str:
+    """LEFT JOIN LATERAL fetching a hit's adjacent text chunks as JSON.
+
+    ``hit`` is the alias of the (already LIMITed) semantic hit rows, so the
+    neighbor lookups run only for returned hits and use the unique
+    (document_id, chunk_index) / (file_id, chunk_index) indexes.
+    """
+    return f"""
+            LEFT JOIN LATERAL (
+                SELECT json_agg(
+                    json_build_object(
+                        'chunk_index', nb.chunk_index,
+                        'chunk_text', nb.chunk_text,
+                        'token_count', nb.token_count
+                    ) ORDER BY nb.chunk_index
+                ) AS neighbors
+                FROM (
+                    SELECT chunk_index, chunk_text, token_count, chunk_type
+                    FROM "DocumentChunks"
+                    WHERE document_id = {hit}.document_id
+                      AND chunk_index BETWEEN {hit}.chunk_index - :neighbor_window
+                                          AND {hit}.chunk_index + :neighbor_window
+                    UNION ALL
+                    SELECT chunk_index, chunk_text, token_count, chunk_type
+                    FROM "DocumentChunks"
+                    WHERE file_id = {hit}.file_id
+                      AND chunk_index BETWEEN {hit}.chunk_index - :neighbor_window
+                                          AND {hit}.chunk_index + :neighbor_window
+                ) nb
+                WHERE nb.chunk_index <> {hit}.chunk_index
+                  AND nb.chunk_type = 'text'
+            ) nbr ON TRUE"""
+
+
+def _semantic_rows_to_ranked(rows) -> list[_RankedResult]:
+    ranked: list[_RankedResult] = []
+    for rank_pos, row in enumerate(rows, 1):
+        # Determine the effective ID for dedup
+        effective_id = row.document_id or row.file_id
+        neighbors = getattr(row, "neighbors", None)
+        if isinstance(neighbors, str):
+            neighbors = json.loads(neighbors)
+        ranked.append(
+            _RankedResult(
+                document_id=effective_id,
+                document_title=row.document_title or "",
+                chunk_text=row.chunk_text or "",
+                heading_context=row.heading_context,
+                chunk_index=row.chunk_index,
+                rank=rank_pos,
+                raw_score=float(row.similarity),
+                source="semantic",
+                application_id=row.application_id,
+                project_id=row.project_id,
+                chunk_type=row.chunk_type or "text",
+                source_type=row.source_type or "document",
+                file_id=row.file_id,
+                neighbors=neighbors,
+            )
+        )
+    return ranked
+
+
+def _get_token_encoder():
+    """The tiktoken encoder shared with the chunker (loaded on first use)."""
+    from .chunking_service import _tiktoken_encoder
+
+    return _tiktoken_encoder
+
+
+# Below this many tokens of remaining budget a partial neighbor is not worth
+# trimming in; the fragment would carry little usable context.
+_MIN_NEIGHBOR_TRIM_TOKENS = 32
+
+
+def _trim_to_tokens(text: str, max_tokens: int, keep_tail: bool) -> str:
+    """Trim ``text`` to ``max_tokens`` tokens, keeping the end nearest the hit."""
+    encoder = _get_token_encoder()
+    tokens = encoder.encode(text)
+    kept = tokens[-max_tokens:] if keep_tail else tokens[:max_tokens]
+    trimmed = encoder.decode(kept).strip()
+    return f"...{trimmed}" if keep_tail else f"{trimmed}..."
+
+
+def _expand_with_neighbors(
+    results: list[RetrievalResult],
+    neighbors_by_key: dict[tuple[str, UUID, int | None], list[dict]],
+    per_hit_budget: int,
+    total_budget: int,
+) -> list[RetrievalResult]:
+    """Attach adjacent chunk text to results within token budgets.
+
+    Neighbors are taken nearest-first (the preceding chunk wins ties).
+    A chunk is never repeated: chunks that are themselves results, or were
+    already attached to a higher-ranked result, are skipped. Budgets use
+    the tiktoken counts stored on each chunk at embed time; only the final
+    partial neighbor is re-encoded to trim it.
+    """
+    covered: set[tuple[str, UUID, int | None]] = {
+        (r.source_type, r.document_id, r.chunk_index) for r in results if r.chunk_index is not None
+    }
+    remaining_total = total_budget
+    expanded: list[RetrievalResult] = []
+
+    for r in results:
+        neighbors = neighbors_by_key.get((r.source_type, r.document_id, r.chunk_index))
+        if not neighbors or r.chunk_index is None or remaining_total <= 0:
+            expanded.append(r)
+            continue
+
+        budget = min(per_hit_budget, remaining_total)
+        ordered = sorted(
+            neighbors,
+            key=lambda n: (abs(n["chunk_index"] - r.chunk_index), n["chunk_index"] > r.chunk_index),
+        )
+        picked: dict[int, str] = {}
+        used = 0
+        for nb in ordered:
+            key = (r.source_type, r.document_id, nb["chunk_index"])
+            text = (nb.get("chunk_text") or "").strip()
+            if key in covered or not text:
+                continue
+            tokens = int(nb.get("token_count") or 0)
+            if used + tokens <= budget:
+                picked[nb["chunk_index"]] = text
+                used += tokens
+                covered.add(key)
+            elif budget - used >= _MIN_NEIGHBOR_TRIM_TOKENS:
+                picked[nb["chunk_index"]] = _trim_to_tokens(
+                    text, budget - used, keep_tail=nb["chunk_index"] < r.chunk_index
+                )
+                used = budget
+                covered.add(key)
+                break
+            else:
+                break
+
+        remaining_total -= used
+        before = "\n".join(picked[i] for i in sorted(picked) if i < r.chunk_index)
+        after = "\n".join(picked[i] for i in sorted(picked) if i > r.chunk_index)
+        expanded.append(replace(r, context_before=before, context_after=after) if picked else r)
+
+    return expanded
+
+
+def _meili_scope_filter(scope_ids: dict) -> list:
+    """Build the Meilisearch RBAC filter matching the search_service.py pattern."""
+    scope_filters: list[str] = []
+    if scope_ids["app_ids"]:
+        app_id_list = ", ".join(f"'{UUID(str(aid))}'" for aid in scope_ids["app_ids"])
+        scope_filters.append(f"application_id IN [{app_id_list}]")
+    if scope_ids.get("project_ids"):
+        proj_id_list = ", ".join(f"'{UUID(str(pid))}'" for pid in scope_ids["project_ids"])
+        scope_filters.append(f"project_id IN [{proj_id_list}]")
+    scope_filters.append(f"user_id = '{UUID(str(scope_ids['user_id']))}'")
+
+    return [scope_filters, "deleted_at IS NULL"]
+
+
+def _meili_hits_to_ranked(hits: list[dict]) -> list[_RankedResult]:
+    ranked: list[_RankedResult] = []
+    for rank_pos, hit in enumerate(hits, 1):
+        doc_id = hit.get("id", "")
+        if not doc_id:
+            continue
+
+        # Handle file_ prefixed IDs from Meilisearch
+        is_file = isinstance(doc_id, str) and doc_id.startswith("file_")
+        if is_file:
+            real_id = UUID(doc_id[5:])  # Strip "file_" prefix
+            source_type = "file"
+            file_id = real_id
+        else:
+            real_id = UUID(doc_id)
+            source_type = "document"
+            file_id = None
+
+        ranked.append(
+            _RankedResult(
+                document_id=real_id,
+                document_title=hit.get("title", ""),
+                chunk_text=hit.get("content_plain", "")[:500],
+                heading_context=None,
+                chunk_index=None,
+                rank=rank_pos,
+                raw_score=1.0 / rank_pos,  # Approximate relevance from rank
+                source="keyword",
+                application_id=UUID(hit["application_id"]) if hit.get("application_id") else None,
+                project_id=UUID(hit["project_id"]) if hit.get("project_id") else None,
+                source_type=source_type,
+                file_id=file_id,
+            )
+        )
+    return ranked
 
 
 class HybridRetrievalService:
@@ -80,6 +333,8 @@ class HybridRetrievalService:
         provider_registry: For generating query embeddings.
         normalizer: For normalizing query embeddings.
         db: Async database session.
+        reranker: Post-RRF reranker. Defaults to a LightweightReranker
+            with weights from AgentConfigurations.
     """
 
     def __init__(
@@ -87,10 +342,12 @@ class HybridRetrievalService:
         provider_registry: ProviderRegistry,
         normalizer: EmbeddingNormalizer,
         db: AsyncSession,
+        reranker: LightweightReranker | None = None,
     ) -> None:
         self.provider_registry = provider_registry
         self.normalizer = normalizer
         self.db = db
+        self.reranker = reranker if reranker is not None else LightweightReranker()
 
     async def retrieve(
         self,
@@ -100,14 +357,18 @@ class HybridRetrievalService:
         application_id: UUID | None = None,
         project_id: UUID | None = None,
         query_embedding: list[float] | None = None,
+        expand_neighbors: bool = False,
     ) -> list[RetrievalResult]:
         """Main retrieval method combining all search sources.
 
-        1. Resolve user's accessible scope (RBAC)
+        1. Resolve user's accessible scope (RBAC), then consult the
+           generation-keyed result cache
         2. Run searches in parallel (semantic, keyword, fuzzy)
         3. Merge with Reciprocal Rank Fusion
         4. Deduplicate and sort
-        5. Return top results with snippets
+        5. Re-rank candidates with local lexical features
+        6. Optionally attach adjacent chunks as context
+        7. Return top results with snippets
 
         Args:
             query: Search query string.
@@ -115,9 +376,13 @@ class HybridRetrievalService:
             limit: Maximum results to return (default 10).
             application_id: Optional scope filter to specific application.
             project_id: Optional scope filter to specific project.
+            query_embedding: Pre-computed query embedding.
+            expand_neighbors: Fill ``context_before``/``context_after`` with
+                adjacent chunks (fetched in the semantic query, token-budgeted
+                by ``search.neighbor_*`` config).
 
         Returns:
-            List of RetrievalResult sorted by RRF score descending.
+            List of RetrievalResult sorted by rerank score descending.
         """
         if not query or not query.strip():
             return []
@@ -126,7 +391,152 @@ class HybridRetrievalService:
         if not query:
             return []
 
-        # Step 1: Resolve user's RBAC scope (M8: cached in Redis for 30s)
+        # Step 1: Resolve user's RBAC scope
+        scope_ids = await self._resolve_scope(user_id, application_id, project_id)
+        if scope_ids is None:
+            return []
+
+        # Repeat queries over an unchanged scope skip all three backends
+        result_cache = RetrievalCache(
+            query, scope_ids["app_ids"], scope_ids["project_ids"], user_id, limit, expand_neighbors
+        )
+        cached = await result_cache.get()
+        if cached is not None:
+            return cached
+
+        # Step 2: Run searches — semantic and fuzzy share the DB session so
+        # they must run sequentially; keyword search uses Meilisearch (HTTP)
+        # and can run in parallel with the DB searches.
+        keyword_task = asyncio.ensure_future(self._keyword_search(query, scope_ids, limit=20))
+
+        # Run DB-backed searches sequentially to avoid concurrent access
+        # on the same AsyncSession (not safe with asyncpg).
+        try:
+            semantic_results: list | Exception = await self._semantic_search(
+                query,
+                scope_ids,
+                limit=20,
+                query_embedding=query_embedding,
+                expand_neighbors=expand_neighbors,
+            )
+        except Exception as exc:
+            semantic_results = exc
+
+        try:
+            fuzzy_results: list | Exception = await self._fuzzy_title_search(query, scope_ids, limit=10)
+        except Exception as exc:
+            fuzzy_results = exc
+
+        # Await the Meilisearch keyword search
+        try:
+            keyword_results: list | Exception = await keyword_task
+        except Exception as exc:
+            keyword_results = exc
+
+        return await self._fuse_and_rank(
+            query, semantic_results, keyword_results, fuzzy_results, limit, result_cache, expand_neighbors
+        )
+
+    async def retrieve_many(
+        self,
+        queries: list[str],
+        user_id: UUID,
+        limit: int = 10,
+        application_id: UUID | None = None,
+        project_id: UUID | None = None,
+        expand_neighbors: bool = False,
+    ) -> list[list[RetrievalResult]]:
+        """Batched variant of ``retrieve`` for several queries over one scope.
+
+        Resolves RBAC scope once, embeds every uncached query in a single
+        ``generate_embeddings_batch`` call, runs one LATERAL pgvector query
+        for all of them and one Meilisearch multi-search. Fuzzy title
+        search, RRF, re-ranking and result caching run per query exactly as
+        in ``retrieve``.
+
+        Args:
+            queries: Search query strings. Duplicates are searched once.
+            user_id: UUID of the searching user (for RBAC).
+            limit: Maximum results per query (default 10).
+            application_id: Optional scope filter to specific application.
+            project_id: Optional scope filter to specific project.
+            expand_neighbors: Attach adjacent chunks, as in ``retrieve``.
+
+        Returns:
+            One result list per input query, in input order. Blank or
+            fully-sanitized-away queries yield an empty list.
+        """
+        sanitized = [sanitize_search_query(q) if q and q.strip() else "" for q in queries]
+        unique = list(dict.fromkeys(q for q in sanitized if q))
+        if not unique:
+            return [[] for _ in queries]
+
+        scope_ids = await self._resolve_scope(user_id, application_id, project_id)
+        if scope_ids is None:
+            return [[] for _ in queries]
+
+        by_query: dict[str, list[RetrievalResult]] = {}
+        caches: dict[str, RetrievalCache] = {}
+        for q in unique:
+            result_cache = RetrievalCache(
+                q, scope_ids["app_ids"], scope_ids["project_ids"], user_id, limit, expand_neighbors
+            )
+            cached = await result_cache.get()
+            if cached is not None:
+                by_query[q] = cached
+            else:
+                caches[q] = result_cache
+
+        pending = list(caches)
+        if pending:
+            keyword_task = asyncio.ensure_future(self._keyword_search_many(pending, scope_ids, limit=20))
+
+            # DB-backed searches stay sequential on the shared session
+            try:
+                semantic_many: dict | Exception = await self._semantic_search_many(
+                    pending, scope_ids, limit=20, expand_neighbors=expand_neighbors
+                )
+            except Exception as exc:
+                semantic_many = exc
+
+            fuzzy_many: dict[str, list | Exception] = {}
+            for q in pending:
+                try:
+                    fuzzy_many[q] = await self._fuzzy_title_search(q, scope_ids, limit=10)
+                except Exception as exc:
+                    fuzzy_many[q] = exc
+
+            try:
+                keyword_many: dict | Exception = await keyword_task
+            except Exception as exc:
+                keyword_many = exc
+
+            for q in pending:
+                by_query[q] = await self._fuse_and_rank(
+                    q,
+                    semantic_many[q] if isinstance(semantic_many, dict) else semantic_many,
+                    keyword_many[q] if isinstance(keyword_many, dict) else keyword_many,
+                    fuzzy_many[q],
+                    limit,
+                    caches[q],
+                    expand_neighbors,
+                )
+
+        return [by_query.get(q, []) if q else [] for q in sanitized]
+
+    async def _resolve_scope(
+        self,
+        user_id: UUID,
+        application_id: UUID | None = None,
+        project_id: UUID | None = None,
+    ) -> dict | None:
+        """Resolve the user's accessible app/project IDs, narrowed by filters.
+
+        Returns:
+            Dict with app_ids, project_ids, user_id, or None when the
+            requested application/project is outside the user's access.
+        """
+        # M8: cached in Redis for 30s.
         # Don't early-return on empty app_ids — user may have personal-scope docs
         app_ids: list[UUID] = []
         project_ids: list[UUID] = []
@@ -169,50 +579,33 @@ class HybridRetrievalService:
         # Apply optional scope narrowing
         if application_id is not None:
             if application_id not in app_ids:
-                return []  # User doesn't have access to this application
+                return None  # User doesn't have access to this application
             app_ids = [application_id]
             # Re-resolve projects for narrowed app
             project_ids = await _get_projects_in_applications(self.db, app_ids)
 
         if project_id is not None:
             if project_id not in project_ids:
-                return []  # User doesn't have access to this project
+                return None  # User doesn't have access to this project
             project_ids = [project_id]
 
-        scope_ids = {
+        return {
             "app_ids": app_ids,
             "project_ids": project_ids,
             "user_id": user_id,
         }
 
-        # Step 2: Run searches — semantic and fuzzy share the DB session so
-        # they must run sequentially; keyword search uses Meilisearch (HTTP)
-        # and can run in parallel with the DB searches.
-        keyword_task = asyncio.ensure_future(self._keyword_search(query, scope_ids, limit=20))
-
-        # Run DB-backed searches sequentially to avoid concurrent access
-        # on the same AsyncSession (not safe with asyncpg).
-        try:
-            semantic_results: list | Exception = await self._semantic_search(
-                query,
-                scope_ids,
-                limit=20,
-                query_embedding=query_embedding,
-            )
-        except Exception as exc:
-            semantic_results = exc
-
-        try:
-            fuzzy_results: list | Exception = await self._fuzzy_title_search(query, scope_ids, limit=10)
-        except Exception as exc:
-            fuzzy_results = exc
-
-        # Await the Meilisearch keyword search
-        try:
-            keyword_results: list | Exception = await keyword_task
-        except Exception as exc:
-            keyword_results = exc
-
+    async def _fuse_and_rank(
+        self,
+        query: str,
+        semantic_results: list | Exception,
+        keyword_results: list | Exception,
+        fuzzy_results: list | Exception,
+        limit: int,
+        result_cache: RetrievalCache,
+        expand_neighbors: bool = False,
+    ) -> list[RetrievalResult]:
+        """Steps 3-6: RRF merge, re-rank, limit, expand and cache one query's results."""
         # Handle exceptions gracefully — don't fail if one source is unavailable
         ranked_lists: list[list[_RankedResult]] = []
 
@@ -237,9 +630,36 @@ class HybridRetrievalService:
         # Step 3: RRF merge
         merged = self._reciprocal_rank_fusion(*ranked_lists, k=60)
 
-        # Step 4: Sort and limit
+        # Step 4: Sort by RRF score
         merged.sort(key=lambda r: r.score, reverse=True)
-        return merged[:limit]
+
+        # Step 5: Re-rank the full fused candidate set, then limit
+        try:
+            merged = self.reranker.rerank(query, merged)
+        except Exception as e:
+            logger.warning("Re-ranking failed, falling back to RRF order: %s", type(e).__name__)
+        final = merged[:limit]
+
+        # Step 6: Attach adjacent chunks fetched alongside the semantic hits
+        if expand_neighbors and isinstance(semantic_results, list):
+            neighbors_by_key = {
+                (r.source_type, r.document_id, r.chunk_index): r.neighbors for r in semantic_results if r.neighbors
+            }
+            if neighbors_by_key:
+                cfg = get_agent_config()
+                final = _expand_with_neighbors(
+                    final,
+                    neighbors_by_key,
+                    per_hit_budget=cfg.get_int("search.neighbor_token_budget", 256),
+                    total_budget=cfg.get_int("search.neighbor_total_token_budget", 2048),
+                )
+
+        # Only cache complete result sets; a failed source raises in its
+        # search helper and is missing from ranked_lists, and its partial
+        # results should not be pinned until the next knowledge change.
+        if len(ranked_lists) == 3:
+            await result_cache.set(final)
+        return final
 
     async def _semantic_search(
         self,
@@ -247,6 +667,7 @@ class HybridRetrievalService:
         scope_ids: dict,
         limit: int = 20,
         query_embedding: list[float] | None = None,
+        expand_neighbors: bool = False,
     ) -> list[_RankedResult]:
         """pgvector cosine similarity search.
 
@@ -258,46 +679,24 @@ class HybridRetrievalService:
             scope_ids: Dict with app_ids, project_ids, user_id.
             limit: Maximum results.
             query_embedding: Pre-computed embedding to skip generation.
+            expand_neighbors: Also fetch each hit's adjacent chunks.
 
         Returns:
             List of _RankedResult with source="semantic".
-        """
-        if query_embedding is not None:
-            # Use pre-computed embedding (from cache)
-            pass
-        else:
-            try:
-                provider, model_id = await self.provider_registry.get_embedding_provider(self.db)
-                raw_embedding = await provider.generate_embedding(query, model_id)
-                query_embedding = self.normalizer.normalize(raw_embedding)
-            except Exception as e:
-                logger.warning("Semantic search embedding failed: %s", type(e).__name__)
-                return []
-
-        app_ids = scope_ids["app_ids"]
-        project_ids = scope_ids.get("project_ids", [])
-        user_id = scope_ids["user_id"]
-
-        # Build scope filter SQL
-        # Format embedding as pgvector-compatible string (no spaces after commas)
-        embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-        scope_conditions: list[str] = []
-        params: dict = {"query_embedding": embedding_str, "limit": limit}
-
-        if app_ids:
-            scope_conditions.append("dc.application_id = ANY(:app_ids)")
-            params["app_ids"] = [str(aid) for aid in app_ids]
 
-        if project_ids:
-            scope_conditions.append("dc.project_id = ANY(:project_ids)")
-            params["project_ids"] = [str(pid) for pid in project_ids]
-
-        # Personal-scope: only match docs where application_id AND project_id
-        # are NULL (truly personal docs), not all docs created by this user.
-        scope_conditions.append("dc.application_id IS NULL AND dc.project_id IS NULL AND dc.user_id = :user_id")
-        params["user_id"] = str(user_id)
+        Raises:
+            Exception: If embedding the query or the vector query fails; the
+                caller drops the semantic source for this query.
+        """
+        if query_embedding is None:
+            provider, model_id = await self.provider_registry.get_embedding_provider(self.db)
+            raw_embedding = await provider.generate_embedding(query, model_id)
+            query_embedding = self.normalizer.normalize(raw_embedding)
 
-        scope_filter = " OR ".join(f"({c})" for c in scope_conditions)
+        # The embedding is bound as a binary real[] and cast to vector
+        # server-side instead of being formatted as a text literal.
+        params: dict = {"query_embedding": to_vector_param(query_embedding), "limit": limit}
+        scope_filter = _chunk_scope_filter(scope_ids, params)
 
         # SET LOCAL scopes ef_search to this transaction only, improving recall
         # at a modest latency cost. Must be a separate execute() call because
@@ -308,57 +707,104 @@ class HybridRetrievalService:
         # they are built from hardcoded strings above, not user input.
         # The scope_filter uses parameterized :app_ids, :project_ids, :user_id.
         # LEFT JOIN both Documents and FolderFiles to support both source types.
-        sql = text(f"""
+        hits_sql = f"""
             SELECT
-                dc.document_id,
-                dc.file_id,
-                dc.source_type,
-                dc.chunk_text,
-                dc.heading_context,
-                dc.chunk_index,
-                dc.chunk_type,
-                dc.application_id,
-                dc.project_id,
-                COALESCE(d.title, ff.display_name) AS document_title,
-                1 - (dc.embedding <=> CAST(:query_embedding AS vector)) AS similarity
-            FROM "DocumentChunks" dc
-            LEFT JOIN "Documents" d ON d.id = dc.document_id
-            LEFT JOIN "FolderFiles" ff ON ff.id = dc.file_id
-            WHERE (
-                (dc.document_id IS NOT NULL AND d.deleted_at IS NULL)
-                OR (dc.file_id IS NOT NULL AND ff.deleted_at IS NULL)
-              )
+                {_SEMANTIC_COLUMNS},
+                1 - (dc.embedding <=> CAST(CAST(:query_embedding AS real[]) AS vector)) AS similarity
+            {_SEMANTIC_FROM}
+            WHERE {_SEMANTIC_LIVE_FILTER}
               AND ({scope_filter})
-            ORDER BY dc.embedding <=> CAST(:query_embedding AS vector)
+            ORDER BY dc.embedding <=> CAST(CAST(:query_embedding AS real[]) AS vector)
             LIMIT :limit
+        """
+        if expand_neighbors:
+            # Neighbors join outside the LIMIT so they are fetched only for hits
+            params["neighbor_window"] = get_agent_config().get_int("search.neighbor_window", 1)
+            hits_sql = f"""
+            SELECT hits.*, nbr.neighbors
+            FROM ({hits_sql}) hits
+            {_neighbor_join("hits")}
+            ORDER BY hits.similarity DESC
+        """
+
+        result = await self.db.execute(text(hits_sql), params)
+        return _semantic_rows_to_ranked(result.fetchall())
+
+    async def _semantic_search_many(
+        self,
+        queries: list[str],
+        scope_ids: dict,
+        limit: int = 20,
+        expand_neighbors: bool = False,
+    ) -> dict[str, list[_RankedResult]]:
+        """pgvector search for several queries in one round trip.
+
+        Embeds all queries with one ``generate_embeddings_batch`` call, binds
+        them as a single flat ``real[]`` and slices one vector per query
+        inside a ``LATERAL`` subquery, so each query still gets its own HNSW
+        index scan with ``ORDER BY ... LIMIT``.
+
+        Args:
+            queries: Distinct, sanitized query strings.
+            scope_ids: Dict with app_ids, project_ids, user_id.
+            limit: Maximum results per query.
+            expand_neighbors: Also fetch each hit's adjacent chunks.
+
+        Returns:
+            Mapping of query to its _RankedResult list (source="semantic").
+
+        Raises:
+            Exception: If embedding or the vector query fails; the caller
+                drops the semantic source for every query in the batch.
+        """
+        provider, model_id = await self.provider_registry.get_embedding_provider(self.db)
+        raw_embeddings = await provider.generate_embeddings_batch(queries, model_id)
+        embeddings = self.normalizer.normalize_batch(raw_embeddings)
+
+        params: dict = {
+            "query_embeddings": to_vector_param(embeddings.ravel()),
+            "dims": int(embeddings.shape[1]),
+            "n_queries": len(queries),
+            "limit": limit,
+        }
+        scope_filter = _chunk_scope_filter(scope_ids, params)
+        neighbor_select = neighbor_join = ""
+        if expand_neighbors:
+            params["neighbor_window"] = get_agent_config().get_int("search.neighbor_window", 1)
+            neighbor_select = ", nbr.neighbors"
+            neighbor_join = _neighbor_join("hit")
+
+        await self.db.execute(text("SET LOCAL hnsw.ef_search = 100"))
+
+        sql = text(f"""
+            SELECT q.ord, hit.*{neighbor_select}
+            FROM generate_series(1, :n_queries) AS q(ord)
+            CROSS JOIN LATERAL (
+                SELECT CAST(
+                    (CAST(:query_embeddings AS real[]))[(q.ord - 1) * :dims + 1 : q.ord * :dims]
+                    AS vector
+                ) AS qv
+            ) qe
+            CROSS JOIN LATERAL (
+                SELECT
+                    {_SEMANTIC_COLUMNS},
+                    1 - (dc.embedding <=> qe.qv) AS similarity
+                {_SEMANTIC_FROM}
+                WHERE {_SEMANTIC_LIVE_FILTER}
+                  AND ({scope_filter})
+                ORDER BY dc.embedding <=> qe.qv
+                LIMIT :limit
+            ) hit
+            {neighbor_join}
+            ORDER BY q.ord, hit.similarity DESC
         """)
 
         result = await self.db.execute(sql, params)
-        rows = result.fetchall()
+        rows_by_ord: dict[int, list] = {}
+        for row in result.fetchall():
+            rows_by_ord.setdefault(row.ord, []).append(row)
 
-        ranked: list[_RankedResult] = []
-        for rank_pos, row in enumerate(rows, 1):
-            # Determine the effective ID for dedup
-            effective_id = row.document_id or row.file_id
-            ranked.append(
-                _RankedResult(
-                    document_id=effective_id,
-                    document_title=row.document_title or "",
-                    chunk_text=row.chunk_text or "",
-                    heading_context=row.heading_context,
-                    chunk_index=row.chunk_index,
-                    rank=rank_pos,
-                    raw_score=float(row.similarity),
-                    source="semantic",
-                    application_id=row.application_id,
-                    project_id=row.project_id,
-                    chunk_type=row.chunk_type or "text",
-                    source_type=row.source_type or "document",
-                    file_id=row.file_id,
-                )
-            )
-
-        return ranked
+        return {q: _semantic_rows_to_ranked(rows_by_ord.get(i, [])) for i, q in enumerate(queries, 1)}
 
     async def _keyword_search(
         self,
@@ -377,75 +823,50 @@ class HybridRetrievalService:
 
         Returns:
             List of _RankedResult with source="keyword".
-        """
-        try:
-            index = get_meili_index()
-        except RuntimeError:
-            logger.warning("Meilisearch not initialized, skipping keyword search")
-            return []
 
-        # Build scope filter matching search_service.py pattern
-        app_ids = scope_ids["app_ids"]
-        project_ids = scope_ids.get("project_ids", [])
-        user_id = scope_ids["user_id"]
-
-        scope_filters: list[str] = []
-        if app_ids:
-            app_id_list = ", ".join(f"'{UUID(str(aid))}'" for aid in app_ids)
-            scope_filters.append(f"application_id IN [{app_id_list}]")
-        if project_ids:
-            proj_id_list = ", ".join(f"'{UUID(str(pid))}'" for pid in project_ids)
-            scope_filters.append(f"project_id IN [{proj_id_list}]")
-        scope_filters.append(f"user_id = '{UUID(str(user_id))}'")
-
-        filter_expr = [scope_filters, "deleted_at IS NULL"]
-
-        try:
-            results = await index.search(
-                query,
-                filter=filter_expr,
-                limit=limit,
-                show_matches_position=False,
-            )
-        except Exception as e:
-            logger.warning("Meilisearch keyword search failed: %s", type(e).__name__)
-            return []
-
-        ranked: list[_RankedResult] = []
-        for rank_pos, hit in enumerate(results.hits, 1):
-            doc_id = hit.get("id", "")
-            if not doc_id:
-                continue
+        Raises:
+            RuntimeError: If Meilisearch is not initialized.
+            Exception: If the search request fails. Either way the caller
+                drops the keyword source for this query.
+        """
+        index = get_meili_index()
+        results = await index.search(
+            query,
+            filter=_meili_scope_filter(scope_ids),
+            limit=limit,
+            show_matches_position=False,
+        )
+        return _meili_hits_to_ranked(results.hits)
+
+    async def _keyword_search_many(
+        self,
+        queries: list[str],
+        scope_ids: dict,
+        limit: int = 20,
+    ) -> dict[str, list[_RankedResult]]:
+        """Meilisearch keyword search for several queries via multi-search.
 
-            # Handle file_ prefixed IDs from Meilisearch
-            is_file = isinstance(doc_id, str) and doc_id.startswith("file_")
-            if is_file:
-                real_id = UUID(doc_id[5:])  # Strip "file_" prefix
-                source_type = "file"
-                file_id = real_id
-            else:
-                real_id = UUID(doc_id)
-                source_type = "document"
-                file_id = None
+        Args:
+            queries: Distinct, sanitized query strings.
+            scope_ids: Dict with app_ids, project_ids, user_id.
+            limit: Maximum results per query.
 
-            ranked.append(
-                _RankedResult(
-                    document_id=real_id,
-                    document_title=hit.get("title", ""),
-                    chunk_text=hit.get("content_plain", "")[:500],
-                    heading_context=None,
-                    chunk_index=None,
-                    rank=rank_pos,
-                    raw_score=1.0 / rank_pos,  # Approximate relevance from rank
-                    source="keyword",
-                    application_id=UUID(hit["application_id"]) if hit.get("application_id") else None,
-                    project_id=UUID(hit["project_id"]) if hit.get("project_id") else None,
-                    source_type=source_type,
-                    file_id=file_id,
-                )
-            )
+        Returns:
+            Mapping of query to its _RankedResult list (source="keyword").
 
-        return ranked
+        Raises:
+            RuntimeError: If Meilisearch is not initialized.
+            Exception: If the multi-search request fails. Either way the
+                caller drops the keyword source for every query in the batch.
+        """
+        index = get_meili_index()
+        client = get_meili_client()
+        filter_expr = _meili_scope_filter(scope_ids)
+        responses = await client.multi_search(
+            [SearchParams(index_uid=index.uid, query=q, filter=filter_expr, limit=limit) for q in queries]
+        )
+
+        return {q: _meili_hits_to_ranked(resp.hits) for q, resp in zip(queries, responses)}
 
     async def _fuzzy_title_search(
         self,
@@ -10,6 +10,12 @@ Output format:
 - <=10 columns: Markdown pipe table
 - >10 columns: Markdown key-value format (one row = one KV block)
 
+``iter_excel_sections`` / ``iter_csv_sections`` read rows lazily and yield
+the Markdown in sections of at most ``rows_per_section`` rows (each with
+its own table header), so the embedding pipeline can chunk large sheets
+without holding the whole Markdown in memory. ``extract_excel`` /
+``extract_csv`` join the same sections into one string.
+
 Guards:
 - Max 50 sheets per workbook
 - Max 500K rows per sheet
@@ -21,8 +27,10 @@ from __future__ import annotations
 import csv
 import io
 import logging
+from collections.abc import Generator, Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any, Sequence
 from zipfile import BadZipFile
@@ -104,10 +112,10 @@ def _rows_to_markdown_table(headers: list[str], rows: list[list[str]]) -> str:
     return "\n".join(lines) + "\n"
 
 
-def _rows_to_markdown_kv(headers: list[str], rows: list[list[str]]) -> str:
+def _rows_to_markdown_kv(headers: list[str], rows: list[list[str]], start: int = 1) -> str:
     """Convert rows to Markdown key-value format (for wide tables)."""
     blocks: list[str] = []
-    for row_idx, row in enumerate(rows, 1):
+    for row_idx, row in enumerate(rows, start):
         lines = [f"**Row {row_idx}**"]
         for col_idx, header in enumerate(headers):
             value = row[col_idx] if col_idx < len(row) else ""
@@ -117,6 +125,39 @@ def _rows_to_markdown_kv(headers: list[str], rows: list[list[str]]) -> str:
     return "\n\n".join(blocks) + "\n"
 
 
+def _iter_row_sections(
+    headers: list[str],
+    rows: Iterable[list[str]],
+    rows_per_section: int | None,
+    prefix: str = "",
+) -> Generator[str, None, int]:
+    """Render rows as Markdown sections of at most ``rows_per_section`` rows.
+
+    Every section repeats ``prefix`` and the table header. A header-only
+    table still yields one section. Returns the number of rows rendered.
+    """
+    wide = len(headers) > 10
+    buffer: list[list[str]] = []
+    rendered = 0
+
+    def _render() -> str:
+        if wide:
+            return prefix + _rows_to_markdown_kv(headers, buffer, start=rendered + 1)
+        return prefix + _rows_to_markdown_table(headers, buffer)
+
+    for row in rows:
+        buffer.append(row)
+        if rows_per_section and len(buffer) >= rows_per_section:
+            yield _render()
+            rendered += len(buffer)
+            buffer = []
+
+    if buffer or not rendered:
+        yield _render()
+        rendered += len(buffer)
+    return rendered
+
+
 class SpreadsheetExtractor:
     """Extracts text content from spreadsheet files.
 
@@ -134,6 +175,35 @@ class SpreadsheetExtractor:
         Returns:
             SpreadsheetResult with Markdown content.
 
+        Raises:
+            ImportError: If python-calamine is not installed.
+            ValueError: If the file is corrupt, password-protected, or invalid.
+        """
+        result = SpreadsheetResult(markdown="")
+        result.markdown = "\n\n".join(self.iter_excel_sections(file_path, result))
+        return result
+
+    def iter_excel_sections(
+        self,
+        file_path: str | Path,
+        result: SpreadsheetResult,
+        rows_per_section: int | None = None,
+    ) -> Iterator[str]:
+        """Yield an Excel file's Markdown one section at a time.
+
+        Sheets are read row by row, and a sheet longer than
+        ``rows_per_section`` is split into several sections that each start
+        with the sheet heading and table header.
+
+        Args:
+            file_path: Path to the Excel file.
+            result: Receives sheet_count, total_rows and warnings as the
+                workbook is read (its markdown is left untouched).
+            rows_per_section: Max data rows per section (None = whole sheet).
+
+        Yields:
+            Markdown sections, to be joined with blank lines.
+
         Raises:
             ImportError: If python-calamine is not installed.
             ValueError: If the file is corrupt, password-protected, or invalid.
@@ -143,7 +213,7 @@ class SpreadsheetExtractor:
         except ImportError:
             raise ImportError("python-calamine is required for Excel extraction. Install with: uv add python-calamine")
 
-        warnings: list[str] = []
+        warnings = result.warnings
 
         try:
             wb = CalamineWorkbook.from_path(str(file_path))
@@ -158,54 +228,43 @@ class SpreadsheetExtractor:
 
         sheet_names = wb.sheet_names
         if not sheet_names:
-            return SpreadsheetResult(markdown="*Empty workbook*\n", warnings=warnings)
+            yield "*Empty workbook*\n"
+            return
 
         if len(sheet_names) > MAX_SHEETS:
             warnings.append(f"Workbook has {len(sheet_names)} sheets; only the first {MAX_SHEETS} are processed.")
             sheet_names = sheet_names[:MAX_SHEETS]
+        result.sheet_count = len(sheet_names)
 
-        sections: list[str] = []
-        total_rows = 0
-
+        emitted = False
         for sheet_name in sheet_names:
             try:
-                data = wb.get_sheet_by_name(sheet_name).to_python()
+                sheet = wb.get_sheet_by_name(sheet_name)
+                row_iter = iter(sheet.iter_rows())
+                raw_headers = next(row_iter, None)
             except Exception as exc:
                 warnings.append(f"Skipped sheet '{sheet_name}': {exc}")
                 continue
 
-            if not data:
+            if not raw_headers:
                 continue
 
-            # Cap rows
-            if len(data) > MAX_ROWS_PER_SHEET:
-                warnings.append(f"Sheet '{sheet_name}' has {len(data)} rows; capped at {MAX_ROWS_PER_SHEET}.")
-                data = data[:MAX_ROWS_PER_SHEET]
-
-            total_rows += len(data)
-
-            # First row is headers
-            raw_headers = data[0] if data else []
+            # First row is headers; cap rows (header included)
             headers = [_format_cell(h) or f"Col{i + 1}" for i, h in enumerate(raw_headers)]
-            rows = [[_format_cell(c) for c in row] for row in data[1:]]
+            capped = islice(row_iter, MAX_ROWS_PER_SHEET - 1)
+            rows = ([_format_cell(c) for c in row] for row in capped)
 
-            # Build section
-            section_title = f"## {sheet_name}\n\n"
-            if len(headers) <= 10:
-                section_body = _rows_to_markdown_table(headers, rows)
-            else:
-                section_body = _rows_to_markdown_kv(headers, rows)
-
-            sections.append(section_title + section_body)
+            row_count = yield from _iter_row_sections(headers, rows, rows_per_section, prefix=f"## {sheet_name}\n\n")
+            emitted = True
+            result.total_rows += row_count + 1
 
-        markdown = "\n\n".join(sections) if sections else "*Empty workbook*\n"
+            if next(row_iter, None) is not None:
+                warnings.append(
+                    f"Sheet '{sheet_name}' has more than {MAX_ROWS_PER_SHEET} rows; capped at {MAX_ROWS_PER_SHEET}."
+                )
 
-        return SpreadsheetResult(
-            markdown=markdown,
-            sheet_count=len(sheet_names),
-            total_rows=total_rows,
-            warnings=warnings,
-        )
+        if not emitted:
+            yield "*Empty workbook*\n"
 
     def extract_csv(
         self,
@@ -223,11 +282,40 @@ class SpreadsheetExtractor:
         Returns:
             SpreadsheetResult with Markdown content.
 
+        Raises:
+            ValueError: If the file cannot be read.
+        """
+        result = SpreadsheetResult(markdown="")
+        result.markdown = "\n\n".join(self.iter_csv_sections(file_path, result, delimiter=delimiter))
+        return result
+
+    def iter_csv_sections(
+        self,
+        file_path: str | Path,
+        result: SpreadsheetResult,
+        delimiter: str | None = None,
+        rows_per_section: int | None = None,
+    ) -> Iterator[str]:
+        """Yield a CSV or TSV file's Markdown one section at a time.
+
+        Rows are streamed from disk; only the first 20 are buffered for
+        header detection.
+
+        Args:
+            file_path: Path to the CSV/TSV file.
+            result: Receives sheet_count, total_rows and warnings as the
+                file is read (its markdown is left untouched).
+            delimiter: Explicit delimiter. If None, auto-detected from extension.
+            rows_per_section: Max data rows per section (None = one section).
+
+        Yields:
+            Markdown sections, to be joined with blank lines.
+
         Raises:
             ValueError: If the file cannot be read.
         """
         path = Path(file_path)
-        warnings: list[str] = []
+        warnings = result.warnings
 
         # Detect delimiter from extension
         if delimiter is None:
@@ -237,7 +325,8 @@ class SpreadsheetExtractor:
         with open(path, "rb") as f:
             sample = f.read(32 * 1024)
             if not sample:
-                return SpreadsheetResult(markdown="*Empty file*\n", warnings=warnings)
+                yield "*Empty file*\n"
+                return
 
             # Detect encoding from sample
             encoding = "utf-8"
@@ -255,46 +344,35 @@ class SpreadsheetExtractor:
                     warnings.append("chardet not available; fell back to latin-1 encoding")
 
         # Stream-read the file with detected encoding
-        all_rows: list[list[str]] = []
         with open(path, "r", encoding=encoding, errors="replace") as f:
-            reader = csv.reader(f, delimiter=delimiter)
-            for row in reader:
-                if len(all_rows) >= MAX_ROWS_PER_SHEET + 1:
-                    warnings.append(f"CSV file has more than {MAX_ROWS_PER_SHEET} rows; truncated.")
-                    break
-                all_rows.append([_format_cell(c) for c in row])
-
-        if not all_rows:
-            return SpreadsheetResult(markdown="*Empty file*\n", warnings=warnings)
-
-        # MED-17: Detect if first row is a header using csv.Sniffer
-        has_header = True
-        try:
-            # Re-read a sample for header detection
-            sample_text = "\n".join(delimiter.join(row) for row in all_rows[:20])
-            has_header = csv.Sniffer().has_header(sample_text)
-        except csv.Error:
-            pass  # Default to assuming first row is header
-
-        if has_header:
-            headers = all_rows[0] if all_rows else []
-            headers = [h or f"Col{i + 1}" for i, h in enumerate(headers)]
-            data_rows = all_rows[1:]
-        else:
-            # Generate column headers: Column_1, Column_2, ...
-            col_count = len(all_rows[0]) if all_rows else 0
-            headers = [f"Column_{i + 1}" for i in range(col_count)]
-            data_rows = all_rows
-            warnings.append("No header row detected; generated column names.")
-
-        if len(headers) <= 10:
-            markdown = _rows_to_markdown_table(headers, data_rows)
-        else:
-            markdown = _rows_to_markdown_kv(headers, data_rows)
-
-        return SpreadsheetResult(
-            markdown=markdown,
-            sheet_count=1,
-            total_rows=len(data_rows),
-            warnings=warnings,
-        )
+            reader = ([_format_cell(c) for c in row] for row in csv.reader(f, delimiter=delimiter))
+            head = list(islice(reader, 20))
+            if not head:
+                yield "*Empty file*\n"
+                return
+
+            # MED-17: Detect if first row is a header using csv.Sniffer
+            has_header = True
+            try:
+                sample_text = "\n".join(delimiter.join(row) for row in head)
+                has_header = csv.Sniffer().has_header(sample_text)
+            except csv.Error:
+                pass  # Default to assuming first row is header
+
+            if has_header:
+                headers = [h or f"Col{i + 1}" for i, h in enumerate(head[0])]
+                data_rows = chain(head[1:], reader)
+                max_data_rows = MAX_ROWS_PER_SHEET
+            else:
+                # Generate column headers: Column_1, Column_2, ...
+                headers = [f"Column_{i + 1}" for i in range(len(head[0]))]
+                data_rows = chain(head, reader)
+                max_data_rows = MAX_ROWS_PER_SHEET + 1
+                warnings.append("No header row detected; generated column names.")
+
+            row_count = yield from _iter_row_sections(headers, islice(data_rows, max_data_rows), rows_per_section)
+            if next(data_rows, None) is not None:
+                warnings.append(f"CSV file has more than {MAX_ROWS_PER_SHEET} rows; truncated.")
+
+        result.sheet_count = 1
+        result.total_rows = row_count
@@ -66,6 +66,11 @@ class Settings(BaseSettings):
     # WebSocket settings (DDoS protection)
     ws_max_connections_per_user: int = 15  # Normal user: ~5-10, attack: 100+
     ws_max_message_size: int = 65536  # 64KB max message size (DoS protection)
+    # Serve /ws from the standalone gateway (uvicorn app.gateway:app) instead of the API
+    # workers; API workers then only publish events through Redis.
+    ws_gateway_enabled: bool = False
+    # Per-process connection cap in the gateway (API workers use websocket.max_global_connections)
+    ws_gateway_max_connections: int = 50000
 
     # Redis settings (for WebSocket pub/sub and distributed caching)
     redis_url: str = "redis://localhost:6379/0"
@@ -73,6 +78,8 @@ class Settings(BaseSettings):
     redis_max_connections: int = 200
     redis_socket_timeout: float = 5.0
     redis_retry_on_timeout: bool = True
+    # Max queued pub/sub messages per channel before its overflow policy applies
+    redis_pubsub_max_backlog: int = 1000
     # H8: Default to True so token blacklist fails closed in production.
     # Set to False only for single-worker dev/test environments.
     redis_required: bool = True
@@ -95,6 +102,18 @@ class Settings(BaseSettings):
     # Legacy setting (deprecated, use arq_archive_hours instead)
     archive_test_mode: bool = False
 
+    # Priority lanes: route jobs to per-lane queues (interactive, bulk_embed,
+    # import, maintenance), each consumed by its own worker class in
+    # app.worker. When False, every job uses the default queue and a single
+    # `arq app.worker.WorkerSettings` process runs them all.
+    arq_lanes_enabled: bool = False
+
+    # Max concurrent jobs per lane worker process
+    arq_interactive_max_jobs: int = 20
+    arq_bulk_embed_max_jobs: int = 10
+    arq_import_max_jobs: int = 4
+    arq_maintenance_max_jobs: int = 10
+
     @property
     def database_url(self) -> str:
         """Build PostgreSQL async connection string."""
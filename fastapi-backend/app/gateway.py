@@ -0,0 +1,110 @@
+"""Standalone WebSocket gateway entry point.
+
+Serves only ``/ws``: the ConnectionManager, PresenceManager and the Redis
+pub/sub relay, without the REST routers, LangGraph checkpointer or search.
+Sockets can then be scaled and tuned apart from the API (worker count,
+event loop, connection cap), and REST load no longer delays pings and
+broadcasts. Set ``WS_GATEWAY_ENABLED=true`` on the API workers so they
+stop serving ``/ws`` and only publish events through Redis.
+
+Run with:
+    uvicorn app.gateway:app --port 8002 --workers 4 --loop uvloop \\
+        --ws websockets --ws-per-message-deflate true
+"""
+
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+
+from .config import settings
+from .database import warmup_connection_pool
+from .services.auth_service import decode_access_token, is_token_blacklisted
+from .services.redis_service import redis_service
+from .websocket import manager
+from .websocket.deltas import snapshots as update_snapshots
+from .websocket.endpoint import router as ws_router
+from .websocket.lifecycle import start_realtime, stop_realtime
+from .websocket.presence import presence_manager
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Gateway lifespan: Redis relay and runtime config only."""
+    # Room authorization queries the database
+    logger.info("Warming up database connection pool...")
+    await warmup_connection_pool()
+
+    try:
+        await start_realtime(relay=True)
+    except Exception as e:
+        if settings.redis_required:
+            logger.error(f"Redis connection failed and REDIS_REQUIRED=true: {e}")
+            raise RuntimeError(f"Redis is required for the WebSocket gateway but connection failed: {e}")
+        logger.warning(f"Redis connection failed, gateway running without cross-process relay: {e}")
+
+    # websocket.* runtime config (timeouts, queue sizes, coalescing window)
+    try:
+        from .ai.config_service import get_agent_config
+        from .database import async_session_maker as _asm
+        from .utils.tasks import fire_and_forget
+
+        _agent_cfg = get_agent_config()
+        _agent_cfg.set_db_session_factory(_asm)
+        await _agent_cfg.load_all()
+        fire_and_forget(_agent_cfg.subscribe_invalidation(), name="agent-cfg-subscription")
+    except Exception as e:
+        logger.warning(f"AgentConfigService initialization failed: {e}")
+
+    manager.max_connections = settings.ws_gateway_max_connections
+    logger.info(f"WebSocket gateway ready (max_connections={manager.max_connections})")
+
+    yield
+
+    from .utils.tasks import drain_background_tasks
+
+    await drain_background_tasks(timeout=5.0)
+    await stop_realtime()
+
+
+app = FastAPI(
+    title="PM WebSocket Gateway",
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+    lifespan=lifespan,
+)
+
+app.include_router(ws_router)
+
+
+@app.get("/health")
+async def health_check(request: Request):
+    """Health check; connection and relay stats for authenticated requests only."""
+    auth_header = request.headers.get("authorization", "")
+    authenticated = False
+    if auth_header.startswith("Bearer "):
+        token_data = decode_access_token(auth_header[7:])
+        if token_data and token_data.user_id:
+            authenticated = not (token_data.jti and await is_token_blacklisted(token_data.jti))
+
+    if not authenticated:
+        return {"status": "healthy"}
+
+    return {
+        "status": "healthy",
+        "service": "PM WebSocket Gateway",
+        "redis": await redis_service.health_check(),
+        "websocket": {
+            "connections": manager.total_connections,
+            "max_connections": manager.max_connections,
+            "rooms": manager.total_rooms,
+            "send_queues": manager.send_queue_stats(),
+            "coalescing": manager.coalesce_stats(),
+            "deltas": update_snapshots.stats(),
+        },
+        "presence": await presence_manager.get_stats(),
+    }
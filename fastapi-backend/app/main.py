@@ -1,14 +1,11 @@
 """FastAPI application entry point."""
 
 import asyncio
-import json
 import logging
-import random
 import traceback
 from contextlib import asynccontextmanager
-from uuid import UUID
 
-from fastapi import Depends, FastAPI, Request, WebSocket, WebSocketDisconnect, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
@@ -56,13 +53,15 @@ from .routers import (
     team_activity_router,
     users_router,
 )
-from .websocket import manager, route_incoming_message, check_room_access
+from .websocket import manager
+from .websocket.endpoint import router as ws_router
+from .websocket.lifecycle import start_realtime, stop_realtime
+from .websocket.deltas import snapshots as update_snapshots
 from .models.user import User
 from .services.auth_service import (
     decode_access_token,
     get_current_user,
     is_token_blacklisted,
-    validate_ws_connection_token,
 )
 from .dependencies.redis_gate import require_redis
 from .services.redis_service import redis_service
@@ -77,64 +76,8 @@ async def lifespan(app: FastAPI):
     await warmup_connection_pool()
     logger.info("Database connection pool ready")
 
-    logger.info("Connecting to Redis...")
     try:
-        await redis_service.connect()
-        logger.info("Redis connected")
-
-        logger.info("Initializing WebSocket manager with Redis...")
-        await manager.initialize_redis()
-        logger.info("WebSocket manager Redis initialized")
-
-        logger.info("Starting Redis pub/sub listener...")
-        await redis_service.start_listening()
-        logger.info("Redis pub/sub listener started")
-
-        # Subscribe cross-worker cache invalidation channels
-        from .websocket.room_auth import setup_room_auth_pubsub
-        from .services.user_cache_service import setup_user_cache_pubsub
-
-        await setup_room_auth_pubsub()
-        await setup_user_cache_pubsub()
-        logger.info("Cache invalidation pub/sub channels subscribed")
-
-        # Start background health monitor with state-change callback
-        async def _on_redis_state_change(connected: bool) -> None:
-            """Handle Redis connected ↔ disconnected transitions."""
-            if connected:
-                logger.info("Redis recovered — re-initializing pub/sub and WebSocket relay")
-                try:
-                    await redis_service.start_listening()
-                    await manager.initialize_redis()
-                except Exception as exc:
-                    logger.error("Failed to re-initialize after Redis recovery: %s", exc)
-
-                # Flush stale in-memory caches accumulated during the outage
-                try:
-                    from .services.user_cache_service import clear_all_caches
-
-                    clear_all_caches()
-                    logger.info("Flushed stale in-memory caches after Redis recovery")
-                except Exception as exc:
-                    logger.error("Failed to flush caches after Redis recovery: %s", exc)
-            else:
-                logger.warning("Redis health monitor detected outage — gate is active")
-
-            # Broadcast status change to all local WebSocket connections
-            from .websocket.manager import MessageType
-
-            try:
-                await manager.broadcast_to_all(
-                    {
-                        "type": MessageType.REDIS_STATUS_CHANGED,
-                        "data": {"connected": connected},
-                    }
-                )
-            except Exception as exc:
-                logger.error("Failed to broadcast Redis status change: %s", exc)
-
-        await redis_service.start_health_monitor(interval=5, on_state_change=_on_redis_state_change)
-        logger.info("Redis health monitor started")
+        await start_realtime(relay=not settings.ws_gateway_enabled)
     except Exception as e:
         if settings.redis_required:
             logger.error(f"Redis connection failed and REDIS_REQUIRED=true: {e}")
@@ -246,12 +189,7 @@ async def lifespan(app: FastAPI):
         except Exception:
             pass
 
-    logger.info("Stopping Redis health monitor...")
-    await redis_service.stop_health_monitor()
-
-    logger.info("Disconnecting from Redis...")
-    await redis_service.disconnect()
-    logger.info("Redis disconnected")
+    await stop_realtime()
 
 
 # Create FastAPI application
@@ -359,6 +297,11 @@ app.include_router(chat_sessions_router)
 app.include_router(folder_files_router)
 app.include_router(team_activity_router)
 
+# WebSocket endpoint; served by the standalone gateway (app.gateway) instead
+# when WS_GATEWAY_ENABLED is set, so API workers hold no sockets
+if not settings.ws_gateway_enabled:
+    app.include_router(ws_router)
+
 # TODO: Mount CopilotKit AG-UI endpoint at startup when the agent graph is
 # built.  Requires a compiled graph instance which depends on provider config
 # from the DB (resolved per-request currently).  Once a shared graph instance
@@ -420,17 +363,32 @@ async def health_check(request: Request):
 
     ai_agent_slots = get_agent_semaphore_usage()
 
+    # Per-lane ARQ queue depth and head-of-line wait
+    queue_stats: dict | str = "unavailable"
+    try:
+        from .services.arq_helper import get_lane_stats
+
+        queue_stats = await asyncio.wait_for(get_lane_stats(redis_service.client), timeout=2.0)
+    except Exception:
+        queue_stats = "unavailable"
+
     return {
         "status": "healthy",
         "database": db_health,
         "redis": redis_health,
         "websocket": {
+            "served_by": "gateway" if settings.ws_gateway_enabled else "api",
             "connections": manager.total_connections,
             "rooms": manager.total_rooms,
+            "send_queues": manager.send_queue_stats(),
+            "coalescing": manager.coalesce_stats(),
+            "deltas": update_snapshots.stats(),
         },
         "scheduler": {
             "type": "arq",
             "note": "Run ARQ worker separately: arq app.worker.WorkerSettings",
+            "lanes_enabled": settings.arq_lanes_enabled,
+            "queues": queue_stats,
         },
         "ai": ai_health,
         "ai_agent_slots": ai_agent_slots,
@@ -607,156 +565,3 @@ async def run_archive_jobs_manually(
 
     result = await archive_service.run_now()
     return result
-
-
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, token: str | None = None):
-    """
-    WebSocket endpoint for real-time collaboration.
-
-    Args:
-        websocket: The WebSocket connection
-        token: Opaque connection token for authentication (query parameter)
-
-    Authentication uses opaque connection tokens obtained via POST /auth/ws-token.
-    JWT tokens are NOT accepted directly to avoid exposing them in URLs/logs.
-
-    Usage:
-        ws://localhost:8000/ws?token=<opaque_connection_token>
-    """
-    # Validate token — only accept opaque connection tokens
-    if not token:
-        logger.debug("WebSocket connection attempt without token")
-        await websocket.close(code=4001, reason="Authentication required")
-        return
-
-    user_id: UUID | None = None
-
-    try:
-        ws_user_id = await validate_ws_connection_token(token)
-        if ws_user_id:
-            user_id = UUID(ws_user_id)
-        else:
-            logger.debug("WebSocket connection with invalid token")
-            await websocket.close(code=4001, reason="Invalid token")
-            return
-    except Exception as e:
-        logger.warning(f"WebSocket token validation error: {e}")
-        await websocket.close(code=4001, reason="Invalid token")
-        return
-
-    # Accept connection and register
-    connection = await manager.connect(websocket, user_id)
-    if connection is None:
-        logger.warning(f"WebSocket connection rejected (limit) for user: {user_id}")
-        return  # Connection rejected (DDoS protection)
-
-    logger.info(f"WebSocket connection established for user: {user_id}")
-
-    # Connection configuration (read from AgentConfigService with hardcoded fallbacks)
-    from .ai.config_service import get_agent_config as _get_ws_cfg
-
-    _ws_cfg = _get_ws_cfg()
-    RECEIVE_TIMEOUT = _ws_cfg.get_int("websocket.receive_timeout", 45)
-    SERVER_PING_INTERVAL = _ws_cfg.get_int("websocket.ping_interval", 30)
-    RATE_LIMIT_MESSAGES = _ws_cfg.get_int("websocket.rate_limit_messages", 100)
-    RATE_LIMIT_WINDOW = _ws_cfg.get_int("websocket.rate_limit_window", 10)
-
-    # Rate limiting state
-    message_timestamps: list[float] = []
-
-    # Token validity tracking
-    token_valid = True
-
-    async def server_ping_task():
-        """Background task to send periodic pings with jitter."""
-        nonlocal token_valid
-        try:
-            while True:
-                await asyncio.sleep(SERVER_PING_INTERVAL + random.uniform(-5, 5))
-                try:
-                    # Send ping
-                    await websocket.send_json({"type": "ping", "data": {}})
-                except Exception:
-                    break  # Connection is dead, exit task
-        except asyncio.CancelledError:
-            pass
-
-    # Start server-initiated ping task
-    ping_task = asyncio.create_task(server_ping_task())
-
-    try:
-        while token_valid:
-            # Receive with timeout to detect stale connections
-            try:
-                raw_message = await asyncio.wait_for(websocket.receive_text(), timeout=RECEIVE_TIMEOUT)
-            except asyncio.TimeoutError:
-                # No message received within timeout - send ping to verify
-                try:
-                    await websocket.send_json({"type": "ping", "data": {}})
-                    raw_message = await asyncio.wait_for(websocket.receive_text(), timeout=10)
-                except (asyncio.TimeoutError, Exception):
-                    logger.info(f"Connection timeout for user: {user_id}")
-                    break
-
-            # Rate limiting check
-            current_time = asyncio.get_event_loop().time()
-            # Remove timestamps outside the window
-            message_timestamps[:] = [t for t in message_timestamps if current_time - t < RATE_LIMIT_WINDOW]
-
-            if len(message_timestamps) >= RATE_LIMIT_MESSAGES:
-                logger.warning(f"Rate limit exceeded for user {user_id}")
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "data": {"error": "RATE_LIMIT", "message": "Too many messages, slow down"},
-                    }
-                )
-                continue
-
-            message_timestamps.append(current_time)
-
-            # Validate message size
-            if len(raw_message) > settings.ws_max_message_size:
-                logger.warning(
-                    f"Message too large from user {user_id}: "
-                    f"{len(raw_message)} bytes (max: {settings.ws_max_message_size})"
-                )
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "data": {
-                            "error": "MESSAGE_TOO_LARGE",
-                            "message": f"Message exceeds maximum size of {settings.ws_max_message_size} bytes",
-                        },
-                    }
-                )
-                continue
-
-            # Parse JSON
-            try:
-                data = json.loads(raw_message)
-            except json.JSONDecodeError:
-                logger.warning(f"Invalid JSON from user {user_id}")
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "data": {"error": "INVALID_JSON", "message": "Invalid JSON format"},
-                    }
-                )
-                continue
-
-            await route_incoming_message(connection, data, room_authorizer=check_room_access)
-
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnect for user: {user_id}")
-    except Exception as e:
-        logger.error(f"WebSocket exception for user {user_id}: {e}")
-    finally:
-        # Cancel ping task and cleanup
-        ping_task.cancel()
-        try:
-            await ping_task
-        except asyncio.CancelledError:
-            pass
-        await manager.disconnect(websocket)
@@ -16,6 +16,7 @@ from .document import Document
 from .document_chunk import DocumentChunk
 from .document_folder import DocumentFolder
 from .document_snapshot import DocumentSnapshot
+from .extraction_cache import ExtractionCacheChunk, ExtractionCacheEntry
 from .folder_file import FolderFile
 from .document_tag import DocumentTag, DocumentTagAssignment
 from .import_job import ImportJob
@@ -48,6 +49,8 @@ __all__ = [
     "DocumentChunk",
     "DocumentFolder",
     "DocumentSnapshot",
+    "ExtractionCacheChunk",
+    "ExtractionCacheEntry",
     "FolderFile",
     "DocumentTag",
     "DocumentTagAssignment",
@@ -0,0 +1,131 @@
+"""Content-addressed extraction cache models.
+
+An ExtractionCacheEntry holds the extracted text and metadata of one file
+content (SHA-256) as produced by one extractor version and embedded by one
+embedding model. Its ExtractionCacheChunks keep the chunk texts and
+vectors, so an identical upload can clone them into DocumentChunks with
+its own scope columns instead of re-running Docling, vision and embedding.
+Entries are evicted least-recently-used by total size and by age.
+"""
+
+import uuid
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
+
+from ..database import Base
+from ..utils.timezone import utc_now
+
+
+class ExtractionCacheEntry(Base):
+    """
+    Cached extraction and embedding result for one file content.
+
+    Attributes:
+        id: Unique identifier (UUID)
+        sha256_hash: SHA-256 of the file bytes
+        extractor_version: Extraction + chunking version the result came from
+        embedding_model: Embedding model id the chunk vectors were made with
+        content_plain: Extracted text (already capped like FolderFile.content_plain)
+        extracted_metadata: Extractor metadata (page_count, sheet_count, ...)
+        chunk_count: Number of cached chunks
+        token_count: Total tokens across text chunks
+        size_bytes: Approximate storage footprint (text + vectors), used for eviction
+        hit_count: Number of files served from this entry
+        last_used_at: Last store or hit (LRU eviction order)
+        created_at: Timestamp when the entry was stored
+    """
+
+    __tablename__ = "ExtractionCache"
+    __allow_unmapped__ = True
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+    )
+
+    # Cache key
+    sha256_hash = Column(String(64), nullable=False)
+    extractor_version = Column(String(100), nullable=False)
+    embedding_model = Column(String(255), nullable=False)
+
+    # Cached extraction result
+    content_plain = Column(Text, nullable=False, default="")
+    extracted_metadata = Column(JSONB, nullable=True, default=dict)
+    chunk_count = Column(Integer, nullable=False, default=0)
+    token_count = Column(Integer, nullable=False, default=0)
+
+    # Eviction bookkeeping
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    hit_count = Column(Integer, nullable=False, default=0)
+    last_used_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "uq_extraction_cache_key",
+            "sha256_hash",
+            "extractor_version",
+            "embedding_model",
+            unique=True,
+        ),
+        Index("ix_extraction_cache_last_used", "last_used_at"),
+    )
+
+    chunks = relationship(
+        "ExtractionCacheChunk",
+        back_populates="entry",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def __repr__(self) -> str:
+        """String representation of ExtractionCacheEntry."""
+        return f"<ExtractionCacheEntry(sha256={self.sha256_hash[:12]}, chunks={self.chunk_count})>"
+
+
+class ExtractionCacheChunk(Base):
+    """
+    One cached chunk (text, heading, vector) of an ExtractionCacheEntry.
+
+    Mirrors the content columns of DocumentChunks; scope and parent columns
+    are filled in when the chunk is cloned for a file.
+    """
+
+    __tablename__ = "ExtractionCacheChunks"
+    __allow_unmapped__ = True
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+    )
+
+    entry_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("ExtractionCache.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    chunk_index = Column(Integer, nullable=False)
+    chunk_text = Column(Text, nullable=False)
+    chunk_type = Column(String(20), nullable=False, default="text")
+    heading_context = Column(String(500), nullable=True)
+    embedding = Column(Vector(1536), nullable=True)
+    token_count = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_extraction_cache_chunks_entry", "entry_id", "chunk_index", unique=True),)
+
+    entry = relationship(
+        "ExtractionCacheEntry",
+        back_populates="chunks",
+    )
+
+    def __repr__(self) -> str:
+        """String representation of ExtractionCacheChunk."""
+        return f"<ExtractionCacheChunk(entry_id={self.entry_id}, index={self.chunk_index})>"
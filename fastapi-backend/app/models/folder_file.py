@@ -331,6 +331,13 @@ class FolderFile(Base):
             postgresql_where=text("deleted_at IS NULL"),
             info={"skip_autogenerate": True},
         ),
+        # Live files by content hash: extraction cache purge on delete/replace
+        Index(
+            "ix_folder_files_sha256_live",
+            "sha256_hash",
+            postgresql_where=text("deleted_at IS NULL"),
+            info={"skip_autogenerate": True},
+        ),
         # Partial index for batch embedding jobs on stale/none/failed files.
         # NOTE: This index is created for a planned batch_embed_stale_files cron job.
         # Currently unused — remove if the batch job is not implemented by the next migration cleanup.
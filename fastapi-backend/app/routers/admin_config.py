@@ -372,6 +372,15 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "0",
         "max_value": "10",
     },
+    {
+        "key": "agent.search_many_max_queries",
+        "value": "6",
+        "value_type": "int",
+        "category": "agent",
+        "description": "Maximum queries per batched knowledge search tool call",
+        "min_value": "1",
+        "max_value": "20",
+    },
     # agent_tool
     {
         "key": "agent_tool.list_tasks_limit",
@@ -483,6 +492,78 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "1",
         "max_value": "50",
     },
+    {
+        "key": "embedding.batch_window_ms",
+        "value": "20",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Worker wait (ms) to coalesce concurrent embedding requests (0 disables)",
+        "min_value": "0",
+        "max_value": "500",
+    },
+    {
+        "key": "embedding.batch_max_texts",
+        "value": "256",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Max chunk texts per coalesced embedding provider call",
+        "min_value": "1",
+        "max_value": "2048",
+    },
+    {
+        "key": "embedding.batch_max_tokens",
+        "value": "100000",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Max input tokens per coalesced embedding provider call",
+        "min_value": "1000",
+        "max_value": "300000",
+    },
+    {
+        "key": "embedding.parallel_chunk_min_chars",
+        "value": "200000",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Min document size (chars) before chunking runs in the process pool",
+        "min_value": "10000",
+        "max_value": "50000000",
+    },
+    {
+        "key": "embedding.chunk_workers",
+        "value": "4",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Chunking process pool size (0 or 1 keeps chunking in-process; restart to resize)",
+        "min_value": "0",
+        "max_value": "32",
+    },
+    {
+        "key": "embedding.debounce_idle_s",
+        "value": "0",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Seconds without edits before a document is re-embedded (0 = autosave never embeds)",
+        "min_value": "0",
+        "max_value": "86400",
+    },
+    {
+        "key": "embedding.debounce_max_wait_s",
+        "value": "1800",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Max seconds a continuously edited document waits for a re-embed",
+        "min_value": "60",
+        "max_value": "86400",
+    },
+    {
+        "key": "embedding.stream_flush_chunks",
+        "value": "256",
+        "value_type": "int",
+        "category": "embedding",
+        "description": "Chunks embedded and committed per batch while a file is streamed",
+        "min_value": "16",
+        "max_value": "4096",
+    },
     # rate_limit
     {
         "key": "rate_limit.ai_chat",
@@ -675,13 +756,49 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "max_value": "120",
     },
     {
-        "key": "websocket.batch_size",
-        "value": "50",
+        "key": "websocket.send_queue_max",
+        "value": "256",
+        "value_type": "int",
+        "category": "websocket",
+        "description": "Messages queued per connection before it is evicted as a slow consumer",
+        "min_value": "16",
+        "max_value": "10000",
+    },
+    {
+        "key": "websocket.coalesce_window_ms",
+        "value": "75",
         "value_type": "int",
         "category": "websocket",
-        "description": "Messages per broadcast batch",
+        "description": "Window in which repeated task/checklist/indicator events collapse to the latest (0 disables)",
+        "min_value": "0",
+        "max_value": "1000",
+    },
+    {
+        "key": "websocket.replay_max_events",
+        "value": "200",
+        "value_type": "int",
+        "category": "websocket",
+        "description": "Events kept per room for reconnect replay (larger gaps trigger a refetch)",
         "min_value": "10",
-        "max_value": "200",
+        "max_value": "10000",
+    },
+    {
+        "key": "websocket.replay_ttl_s",
+        "value": "21600",
+        "value_type": "int",
+        "category": "websocket",
+        "description": "Seconds a room event stream is kept after its last event",
+        "min_value": "60",
+        "max_value": "604800",
+    },
+    {
+        "key": "websocket.presence_flush_ms",
+        "value": "1000",
+        "value_type": "int",
+        "category": "websocket",
+        "description": "Interval at which buffered presence heartbeats are written to Redis",
+        "min_value": "50",
+        "max_value": "10000",
     },
     # search
     {
@@ -766,6 +883,24 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "1",
         "max_value": "20",
     },
+    {
+        "key": "file.extraction_cache_max_mb",
+        "value": "2048",
+        "value_type": "int",
+        "category": "file",
+        "description": "Extraction cache size budget in MB, LRU-evicted (0 disables the cache)",
+        "min_value": "0",
+        "max_value": "1048576",
+    },
+    {
+        "key": "file.extraction_cache_ttl_days",
+        "value": "90",
+        "value_type": "int",
+        "category": "file",
+        "description": "Days an unused extraction cache entry is kept",
+        "min_value": "1",
+        "max_value": "3650",
+    },
     # worker
     {
         "key": "worker.archive_after_days",
@@ -794,24 +929,6 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "0",
         "max_value": "10",
     },
-    {
-        "key": "worker.nightly_embed_batch_size",
-        "value": "10",
-        "value_type": "int",
-        "category": "worker",
-        "description": "Nightly embedding batch size",
-        "min_value": "1",
-        "max_value": "100",
-    },
-    {
-        "key": "worker.nightly_embed_batch_delay_s",
-        "value": "5",
-        "value_type": "int",
-        "category": "worker",
-        "description": "Delay between batches",
-        "min_value": "1",
-        "max_value": "60",
-    },
     {
         "key": "worker.max_nightly_embed",
         "value": "500",
@@ -830,6 +947,133 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "1",
         "max_value": "20",
     },
+    {
+        "key": "throttle.embedding_rpm",
+        "value": "3000",
+        "value_type": "int",
+        "category": "throttle",
+        "description": "Embedding provider requests per minute shared by all workers (0 = unlimited)",
+        "min_value": "0",
+        "max_value": "100000",
+    },
+    {
+        "key": "throttle.embedding_tpm",
+        "value": "1000000",
+        "value_type": "int",
+        "category": "throttle",
+        "description": "Embedding provider input tokens per minute shared by all workers (0 = unlimited)",
+        "min_value": "0",
+        "max_value": "50000000",
+    },
+    {
+        "key": "throttle.vision_rpm",
+        "value": "500",
+        "value_type": "int",
+        "category": "throttle",
+        "description": "Vision provider requests per minute shared by all workers (0 = unlimited)",
+        "min_value": "0",
+        "max_value": "100000",
+    },
+    {
+        "key": "throttle.vision_tpm",
+        "value": "200000",
+        "value_type": "int",
+        "category": "throttle",
+        "description": "Vision provider tokens per minute shared by all workers (0 = unlimited)",
+        "min_value": "0",
+        "max_value": "50000000",
+    },
+    {
+        "key": "throttle.max_concurrency",
+        "value": "16",
+        "value_type": "int",
+        "category": "throttle",
+        "description": "Max concurrent provider calls per worker process (AIMD upper bound)",
+        "min_value": "1",
+        "max_value": "200",
+    },
+    {
+        "key": "throttle.target_latency_ms",
+        "value": "10000",
+        "value_type": "int",
+        "category": "throttle",
+        "description": "Provider calls slower than this reduce concurrency (0 disables)",
+        "min_value": "0",
+        "max_value": "120000",
+    },
+    # search
+    {
+        "key": "search.rerank_rrf_weight",
+        "value": "1.0",
+        "value_type": "float",
+        "category": "search",
+        "description": "Re-rank weight for the fused RRF score",
+        "min_value": "0.0",
+        "max_value": "5.0",
+    },
+    {
+        "key": "search.rerank_bm25_weight",
+        "value": "0.6",
+        "value_type": "float",
+        "category": "search",
+        "description": "Re-rank weight for BM25 over candidate chunk text",
+        "min_value": "0.0",
+        "max_value": "5.0",
+    },
+    {
+        "key": "search.rerank_proximity_weight",
+        "value": "0.25",
+        "value_type": "float",
+        "category": "search",
+        "description": "Re-rank weight for query-term proximity",
+        "min_value": "0.0",
+        "max_value": "5.0",
+    },
+    {
+        "key": "search.rerank_heading_weight",
+        "value": "0.3",
+        "value_type": "float",
+        "category": "search",
+        "description": "Re-rank weight for query terms in the chunk heading",
+        "min_value": "0.0",
+        "max_value": "5.0",
+    },
+    {
+        "key": "search.rerank_title_weight",
+        "value": "0.15",
+        "value_type": "float",
+        "category": "search",
+        "description": "Re-rank weight for query terms in the document title",
+        "min_value": "0.0",
+        "max_value": "5.0",
+    },
+    {
+        "key": "search.neighbor_window",
+        "value": "1",
+        "value_type": "int",
+        "category": "search",
+        "description": "Adjacent chunks fetched on each side of a hit (0 disables)",
+        "min_value": "0",
+        "max_value": "3",
+    },
+    {
+        "key": "search.neighbor_token_budget",
+        "value": "256",
+        "value_type": "int",
+        "category": "search",
+        "description": "Max adjacent-chunk tokens attached to a single hit",
+        "min_value": "0",
+        "max_value": "2000",
+    },
+    {
+        "key": "search.neighbor_total_token_budget",
+        "value": "2048",
+        "value_type": "int",
+        "category": "search",
+        "description": "Max adjacent-chunk tokens attached across all hits",
+        "min_value": "0",
+        "max_value": "8000",
+    },
     # cache
     {
         "key": "cache.document_lock_ttl",
@@ -885,6 +1129,15 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "5",
         "max_value": "300",
     },
+    {
+        "key": "cache.retrieval_ttl",
+        "value": "120",
+        "value_type": "int",
+        "category": "cache",
+        "description": "Retrieval result cache TTL (0 disables)",
+        "min_value": "0",
+        "max_value": "3600",
+    },
     # web
     {
         "key": "web.scrape_timeout",
@@ -964,4 +1217,13 @@ _SEED_DEFAULTS: list[dict[str, Any]] = [
         "min_value": "1000",
         "max_value": "200000",
     },
+    {
+        "key": "content.ir_cache_ttl_seconds",
+        "value": "3600",
+        "value_type": "int",
+        "category": "content",
+        "description": "Redis TTL for cached TipTap walks reused by the embed job (0 disables)",
+        "min_value": "0",
+        "max_value": "86400",
+    },
 ]
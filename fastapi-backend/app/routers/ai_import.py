@@ -280,9 +280,15 @@ async def upload_and_import(
 
         from ..worker import parse_redis_url
         from ..config import settings
+        from ..services.arq_helper import lane_queue
 
         redis = await create_pool(parse_redis_url(settings.redis_url))
-        await redis.enqueue_job("process_document_import", job_id, _job_id=f"import:{job_id}")
+        await redis.enqueue_job(
+            "process_document_import",
+            job_id,
+            _job_id=f"import:{job_id}",
+            _queue_name=lane_queue("process_document_import"),
+        )
         await redis.aclose()
     except Exception as e:
         # Clean up temp file if enqueue fails
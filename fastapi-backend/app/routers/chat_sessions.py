@@ -303,7 +303,7 @@ async def persist_messages(
     # Enqueue LLM title generation (best-effort, non-blocking)
     if is_first_persist and first_user_content:
         try:
-            from ..services.arq_helper import get_arq_redis
+            from ..services.arq_helper import get_arq_redis, lane_queue
 
             arq_redis = await get_arq_redis()
             await arq_redis.enqueue_job(
@@ -312,6 +312,7 @@ async def persist_messages(
                 first_user_content,
                 _job_id=f"title:{session.id}",
                 _max_tries=3,
+                _queue_name=lane_queue("generate_session_title"),
             )
         except Exception:
             logger.debug("Failed to enqueue title generation", exc_info=True)
@@ -791,6 +791,12 @@ async def update_document(
     # Fire-and-forget: update search index (non-blocking)
     _create_search_task(index_document_from_data(search_doc_data))
 
+    # Debounced embed only when opted in (see save_content)
+    if "content_json" in update_data:
+        from ..services.embed_debounce import schedule_document_embed
+
+        await schedule_document_embed(document_id)
+
     # Broadcast document updated event using pre-captured data
     await _broadcast_document_event_from_data(
         MessageType.DOCUMENT_UPDATED,
@@ -878,8 +884,12 @@ async def save_content(
 
         _create_search_task(index_document_from_data(search_doc_data))
 
-    # Auto-embed removed (Phase 9.6): embeddings now triggered only by
-    # manual sync (POST /documents/{id}/sync-embeddings) or nightly batch job.
+    # Auto-embed removed (Phase 9.6): embeddings are triggered by manual sync
+    # (POST /documents/{id}/sync-embeddings) or the nightly batch job, unless
+    # embedding.debounce_idle_s opts in to one debounced embed per burst.
+    from ..services.embed_debounce import schedule_document_embed
+
+    await schedule_document_embed(document_id)
 
     await _broadcast_document_event_from_data(
         MessageType.DOCUMENT_UPDATED,
@@ -950,7 +960,13 @@ async def delete_document(
     # Fire-and-forget: mark document as deleted in search index (non-blocking)
     from ..services.search_service import index_document_soft_delete
 
-    _create_search_task(index_document_soft_delete(doc_id_for_search))
+    _create_search_task(
+        index_document_soft_delete(
+            doc_id_for_search,
+            application_id=broadcast_data["application_id"] or project_application_id,
+            user_id=broadcast_data["user_id"],
+        )
+    )
 
     # Broadcast document deleted event using pre-captured data
     await _broadcast_document_event_from_data(
@@ -1039,7 +1055,13 @@ async def restore_document(
     # Fire-and-forget: restore document in search index (non-blocking)
     from ..services.search_service import index_document_restore
 
-    _create_search_task(index_document_restore(doc_id_for_search))
+    _create_search_task(
+        index_document_restore(
+            doc_id_for_search,
+            application_id=broadcast_data["application_id"] or project_application_id,
+            user_id=broadcast_data["user_id"],
+        )
+    )
 
     # Broadcast document restored event using pre-captured data
     await _broadcast_document_event_from_data(
@@ -1105,6 +1127,14 @@ async def permanent_delete_document(
                 )
         await db.delete(attachment)
 
+    # Capture owning scope before delete for retrieval cache invalidation
+    owner_application_id = document.application_id
+    owner_user_id = document.user_id
+    if document.project_id:
+        project = await db.get(Project, document.project_id)
+        if project:
+            owner_application_id = project.application_id
+
     await db.delete(document)
     await db.flush()
     await db.commit()
@@ -1113,7 +1143,11 @@ async def permanent_delete_document(
     try:
         from ..services.search_service import remove_document_from_index
 
-        await remove_document_from_index(document_id)
+        await remove_document_from_index(
+            document_id,
+            application_id=owner_application_id,
+            user_id=owner_user_id,
+        )
     except Exception:
         logger.warning("Failed to remove document %s from search index", document_id)
 
@@ -1311,7 +1345,7 @@ async def sync_embeddings(
     await db.flush()
 
     try:
-        from ..services.arq_helper import get_arq_redis
+        from ..services.arq_helper import get_arq_redis, lane_queue
 
         arq_redis = await get_arq_redis()
         # Clear previous job + result keys so ARQ dedup doesn't silently skip re-enqueue
@@ -1323,6 +1357,7 @@ async def sync_embeddings(
             "embed_document_job",
             str(document_id),
             _job_id=f"embed:{document_id}",
+            _queue_name=lane_queue("embed_document_job"),
         )
         await db.commit()
     except RuntimeError:
@@ -20,7 +20,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..ai.config_service import get_agent_config
+from ..ai.extraction_cache import purge_unreferenced_extraction
 from ..ai.rate_limiter import AIRateLimiter, get_rate_limiter
+from ..ai.retrieval_cache import bump_knowledge_generation
 from ..database import get_db
 from ..models.attachment import Attachment
 from ..models.document_chunk import DocumentChunk
@@ -382,7 +384,7 @@ async def _enqueue_extraction_job(file_id: UUID) -> None:
     defer_by = cfg.get_int("worker.extract_defer_s", 5)  # MED-4: configurable
 
     try:
-        from ..services.arq_helper import get_arq_redis
+        from ..services.arq_helper import get_arq_redis, lane_queue
 
         arq_redis = await get_arq_redis()
         await arq_redis.enqueue_job(
@@ -390,6 +392,7 @@ async def _enqueue_extraction_job(file_id: UUID) -> None:
             str(file_id),
             _job_id=f"extract_file:{file_id}",
             _defer_by=defer_by,
+            _queue_name=lane_queue("extract_and_embed_file_job"),
         )
     except Exception as e:
         logger.warning("Failed to enqueue extraction job for file %s: %s", file_id, e)
@@ -1102,6 +1105,8 @@ async def delete_file(
         .returning(Attachment.minio_bucket, Attachment.minio_key)
     )
     image_minio_refs = [(row[0], row[1]) for row in att_result.all() if row[0] and row[1]]
+    # Cached text and vectors go with the last live copy of these bytes
+    await purge_unreferenced_extraction(db, file.sha256_hash)
     await db.commit()
 
     # FIX-13: Move MinIO cleanup to background task to avoid blocking async event loop
@@ -1122,6 +1127,15 @@ async def delete_file(
 
     background_tasks.add_task(_cleanup_minio)
 
+    # Chunks are gone: invalidate cached retrievals for the owning scope
+    owner_application_id = file.application_id
+    if owner_application_id is None and file.project_id:
+        from ..models.project import Project
+
+        proj_result = await db.execute(select(Project.application_id).where(Project.id == file.project_id))
+        owner_application_id = proj_result.scalar_one_or_none()
+    await bump_knowledge_generation(owner_application_id, file.user_id)
+
     # Soft-delete from search index (non-blocking, consistency checker is backstop)
     try:
         from ..services.search_service import get_meili_index, _meili_circuit_is_open
@@ -1253,6 +1267,7 @@ async def replace_file(
     old_storage_bucket = folder_file.storage_bucket
     old_storage_key = folder_file.storage_key
     old_thumbnail_key = folder_file.thumbnail_key
+    old_sha256_hash = folder_file.sha256_hash
 
     # F-107: Use scope_prefix logic matching upload_file (unfiled/{scope_id} when no folder)
     uuid8 = str(uuid4())[:8]
@@ -1328,6 +1343,7 @@ async def replace_file(
         .returning(Attachment.minio_bucket, Attachment.minio_key)
     )
     old_image_refs = [(row[0], row[1]) for row in old_att_result.all() if row[0] and row[1]]
+    await purge_unreferenced_extraction(db, old_sha256_hash)
 
     try:
         await db.commit()
@@ -1457,7 +1473,7 @@ async def sync_embeddings(
     await db.flush()
 
     try:
-        from ..services.arq_helper import get_arq_redis
+        from ..services.arq_helper import get_arq_redis, lane_queue
 
         arq_redis = await get_arq_redis()
 
@@ -1470,6 +1486,7 @@ async def sync_embeddings(
             "extract_and_embed_file_job",
             str(file_id),
             _job_id=job_key,
+            _queue_name=lane_queue("extract_and_embed_file_job"),
         )
         await db.commit()
     except RuntimeError:
@@ -968,7 +968,7 @@ async def list_project_statuses(
         401: {"description": "Not authenticated"},
         403: {"description": "Access denied - not an owner or editor"},
         404: {"description": "Project not found"},
-        409: {"description": "Project is archived and cannot be modified"},
+        409: {"description": "Project is archived, or was modified concurrently (row_version mismatch)"},
     },
 )
 async def update_project(
@@ -1005,11 +1005,22 @@ async def update_project(
             detail="No fields to update provided",
         )
 
+    # Optimistic concurrency check: row_version is the version being edited,
+    # never a value to store (the server bumps it below)
+    expected_version = update_data.pop("row_version", None)
+    if expected_version is not None and project.row_version != expected_version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Concurrent modification detected. Expected version {expected_version}, "
+            f"but current version is {project.row_version}. Please refresh and try again.",
+        )
+
     for field, value in update_data.items():
         setattr(project, field, value)
 
-    # Update timestamp
+    # Update timestamp and row version
     project.updated_at = utc_now()
+    project.row_version += 1
 
     # Save changes
     await db.commit()
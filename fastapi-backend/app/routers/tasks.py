@@ -1349,6 +1349,7 @@ async def get_task(
         401: {"description": "Not authenticated"},
         403: {"description": "Access denied - not an owner or editor"},
         404: {"description": "Task not found"},
+        409: {"description": "Concurrent modification detected (row_version mismatch)"},
     },
 )
 async def update_task(
@@ -1402,6 +1403,16 @@ async def update_task(
             detail="No fields to update provided",
         )
 
+    # Optimistic concurrency check: row_version is the version being edited,
+    # never a value to store (the server bumps it below)
+    expected_version = update_data.pop("row_version", None)
+    if expected_version is not None and task.row_version != expected_version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Concurrent modification detected. Expected version {expected_version}, "
+            f"but current version is {task.row_version}. Please refresh and try again.",
+        )
+
     # Business rule: Done tasks can only have status changed (to reopen) or row_version updated
     # Attachments and comments are handled by separate endpoints
     is_done = task.task_status and task.task_status.category == "Done"
@@ -1484,8 +1495,9 @@ async def update_task(
         else:
             setattr(task, field, value)
 
-    # Update timestamp
+    # Update timestamp and version (every edit bumps it so clients can order update deltas)
     task.updated_at = utc_now()
+    task.row_version = (task.row_version or 0) + 1
 
     # Reload task_status relationship if task_status_id changed
     if "task_status_id" in update_data:
@@ -2164,6 +2176,7 @@ async def unarchive_task(
     task.archived_at = None
     task.completed_at = now
     task.updated_at = now
+    task.row_version = (task.row_version or 0) + 1
 
     # Update aggregation to include this task back in project stats
     project = task.project
@@ -2,16 +2,88 @@
 
 Eliminates repeated boilerplate across routers that enqueue ARQ jobs.
 Uses a module-level asyncio.Lock to safely initialize the cached instance.
+
+Also routes jobs to priority lanes. With ``ARQ_LANES_ENABLED`` each job
+type goes to its lane's queue (see ``JOB_LANES``), consumed by that lane's
+worker class in ``app.worker``, so bulk re-embeds and imports never sit in
+front of the embed a user is waiting on. Callers pass
+``_queue_name=lane_queue(function)`` to ``enqueue_job``.
 """
 
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Any
 
+from ..config import settings
+
 _cached_arq_redis: Any | None = None
 _arq_init_lock = asyncio.Lock()
 
+# ARQ's own default queue (arq.constants.default_queue_name)
+DEFAULT_QUEUE = "arq:queue"
+
+LANE_INTERACTIVE = "interactive"
+LANE_BULK_EMBED = "bulk_embed"
+LANE_IMPORT = "import"
+LANE_MAINTENANCE = "maintenance"
+
+LANE_QUEUES: dict[str, str] = {
+    LANE_INTERACTIVE: "arq:queue:interactive",
+    LANE_BULK_EMBED: "arq:queue:bulk_embed",
+    LANE_IMPORT: "arq:queue:import",
+    LANE_MAINTENANCE: "arq:queue:maintenance",
+}
+
+# Default lane per job function; anything not listed is maintenance work.
+JOB_LANES: dict[str, str] = {
+    "embed_document_job": LANE_INTERACTIVE,
+    "generate_session_title": LANE_INTERACTIVE,
+    "process_document_import": LANE_IMPORT,
+    "extract_and_embed_file_job": LANE_IMPORT,
+}
+
+
+def lane_queue(function: str, lane: str | None = None) -> str:
+    """Queue name for a job, by its function name or an explicit lane.
+
+    Args:
+        function: ARQ job function name.
+        lane: Lane override, e.g. ``LANE_BULK_EMBED`` for embeds enqueued
+            by the nightly stale re-embed.
+
+    Returns:
+        The lane's queue, or ARQ's default queue when lanes are disabled.
+    """
+    if not settings.arq_lanes_enabled:
+        return DEFAULT_QUEUE
+    return LANE_QUEUES[lane or JOB_LANES.get(function, LANE_MAINTENANCE)]
+
+
+async def get_lane_stats(redis: Any) -> dict[str, dict[str, Any]]:
+    """Queue depth and head-of-line wait for each active queue.
+
+    ``ready`` counts jobs due now, ``deferred`` those scheduled later, and
+    ``oldest_wait_ms`` is how long the oldest due job has been waiting.
+
+    Args:
+        redis: Redis client (queues are sorted sets scored by due time in ms).
+    """
+    queues = LANE_QUEUES if settings.arq_lanes_enabled else {"default": DEFAULT_QUEUE}
+    now_ms = int(time.time() * 1000)
+    stats: dict[str, dict[str, Any]] = {}
+    for lane, queue in queues.items():
+        total = await redis.zcard(queue)
+        ready = await redis.zcount(queue, "-inf", now_ms)
+        oldest = await redis.zrangebyscore(queue, "-inf", now_ms, start=0, num=1, withscores=True)
+        stats[lane] = {
+            "ready": ready,
+            "deferred": total - ready,
+            "oldest_wait_ms": max(0, now_ms - int(oldest[0][1])) if oldest else 0,
+        }
+    return stats
+
 
 async def get_arq_redis() -> Any:
     """Return a cached ArqRedis wrapping the global redis_service client.
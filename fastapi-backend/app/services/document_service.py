@@ -369,42 +369,20 @@ CLEANUP_GRACE_PERIOD = timedelta(minutes=5)
 
 def extract_attachment_ids(content_json: str) -> Set[str]:
     """
-    Recursively walk TipTap JSON and collect all attachmentId values
-    from image and drawio nodes.
+    Collect all attachmentId values from image and drawio nodes in TipTap
+    JSON (including every container of a canvas document).
 
-    NOTE: Update this function if new attachment-bearing node types are added
-    (e.g., video, audio, file embed). Currently 'image' and 'drawio' nodes use attachmentId.
+    NOTE: Update tiptap_walker._ATTACHMENT_TYPES if new attachment-bearing
+    node types are added (e.g., video, audio, file embed).
     """
     try:
         content = json.loads(content_json)
     except (json.JSONDecodeError, TypeError):
         return set()
 
-    ids: Set[str] = set()
-
-    def walk(node: dict) -> None:
-        node_type = node.get("type")
-        if node_type in ("image", "drawio"):
-            attachment_id = node.get("attrs", {}).get("attachmentId")
-            if attachment_id:
-                ids.add(attachment_id)
-        for child in node.get("content", []):
-            if isinstance(child, dict):
-                walk(child)
-
-    if isinstance(content, dict):
-        if content.get("format") == "canvas":
-            containers = content.get("containers")
-            if isinstance(containers, list):
-                for container in containers:
-                    if isinstance(container, dict):
-                        container_content = container.get("content")
-                        if isinstance(container_content, dict) and container_content.get("type") == "doc":
-                            walk(container_content)
-        else:
-            walk(content)
+    from .tiptap_walker import walk_tiptap
 
-    return ids
+    return set(walk_tiptap(content).attachment_ids)
 
 
 async def cleanup_orphaned_attachments(
@@ -412,16 +390,22 @@ async def cleanup_orphaned_attachments(
     content_json: str,
     db: AsyncSession,
     minio: MinIOService,
+    referenced_ids: Set[str] | None = None,
 ) -> int:
     """
     Delete Attachment records (and MinIO files) for this document that are
     no longer referenced in the given content_json.
 
+    Args:
+        referenced_ids: Attachment ids already extracted from content_json
+            (e.g. from the save's TipTap walk); extracted here when omitted.
+
     Returns:
         Number of orphaned attachments deleted
     """
     # 1. Extract attachment IDs currently in the content
-    referenced_ids = extract_attachment_ids(content_json)
+    if referenced_ids is None:
+        referenced_ids = extract_attachment_ids(content_json)
 
     # 2. Query all Attachment records for this document
     result = await db.execute(
@@ -544,12 +528,14 @@ async def save_document_content(
                 detail="You do not have permission to edit this document",
             )
 
-    # Run content conversion BEFORE the atomic update
+    # Run content conversion BEFORE the atomic update. One walk yields
+    # Markdown, plain text and attachment ids, and is cached for the embed job.
     content_dict = json.loads(content_json)
-    from .content_converter import tiptap_json_to_markdown, tiptap_json_to_plain_text
+    from .tiptap_walker import get_tiptap_ir
 
-    content_markdown = tiptap_json_to_markdown(content_dict)
-    content_plain = tiptap_json_to_plain_text(content_dict)
+    ir = await get_tiptap_ir(content_json, content_dict)
+    content_markdown = ir.markdown
+    content_plain = ir.plain_text
 
     # Atomic UPDATE with version check — prevents concurrent overwrites
     result = await db.execute(
@@ -593,7 +579,9 @@ async def save_document_content(
     # Clean up orphaned attachments (images removed from content)
     if minio is not None:
         try:
-            await cleanup_orphaned_attachments(document_id, content_json, db, minio)
+            await cleanup_orphaned_attachments(
+                document_id, content_json, db, minio, referenced_ids=set(ir.attachment_ids)
+            )
         except Exception:
             logger.exception(
                 "Failed to clean up orphaned attachments for document %s",
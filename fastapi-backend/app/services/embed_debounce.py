@@ -0,0 +1,173 @@
+"""Embed-on-idle debouncing for document edits.
+
+Document edits call ``schedule_document_embed`` instead of enqueuing
+``embed_document_job`` directly. Due times live in one Redis sorted set:
+
+    embed_debounce:due                  member = document id, score = due time
+    embed_debounce:first:{document_id}  first edit time of the current burst
+
+Each edit pushes the due time to ``now + embedding.debounce_idle_s``, but
+never past ``first edit + embedding.debounce_max_wait_s``, so a document
+is embedded once after editing stops, or at most once per max-wait window
+while someone keeps typing. The ``dispatch_due_embeds`` cron pops due
+documents and enqueues their embed jobs.
+
+If the debounce set cannot be written (Redis down or erroring), the edit
+falls back to enqueuing ``embed_document_job`` directly, deferred by the
+idle window and deduplicated on its job id, so the embed is not lost.
+
+Debouncing is off by default (``embedding.debounce_idle_s`` = 0): autosave
+then embeds nothing, as since Phase 9.6, and callers that always embedded
+(agent ``update_document``) pass ``fallback_defer_s`` to keep their direct,
+deferred enqueue.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from ..ai.config_service import get_agent_config
+from .arq_helper import get_arq_redis, lane_queue
+from .redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+_DUE_KEY = "embed_debounce:due"
+_FIRST_PREFIX = "embed_debounce:first"
+
+# Max documents dispatched per cron tick; the rest wait for the next tick.
+_DISPATCH_BATCH = 500
+
+
+def _first_key(document_id: str) -> str:
+    return f"{_FIRST_PREFIX}:{document_id}"
+
+
+def _get_idle_s() -> int:
+    return get_agent_config().get_int("embedding.debounce_idle_s", 0)
+
+
+def _get_max_wait_s() -> int:
+    return get_agent_config().get_int("embedding.debounce_max_wait_s", 1800)
+
+
+async def schedule_document_embed(
+    document_id: UUID | str,
+    fallback_defer_s: int | None = None,
+) -> float | None:
+    """Record an edit and (re)schedule the document's debounced embed.
+
+    Args:
+        document_id: The edited document.
+        fallback_defer_s: When debouncing is disabled, enqueue the embed
+            directly, deferred by this many seconds. None (autosave) skips
+            the embed instead.
+
+    Returns:
+        The scheduled due time (epoch seconds), or None when debouncing is
+        disabled (``embedding.debounce_idle_s`` = 0) without a fallback or
+        no embed could be scheduled at all.
+    """
+    doc_id = str(document_id)
+    now = time.time()
+    idle_s = _get_idle_s()
+    if idle_s <= 0:
+        if fallback_defer_s is None:
+            return None
+        return await _enqueue_deferred(doc_id, fallback_defer_s, now)
+
+    if not redis_service.is_connected:
+        return await _enqueue_deferred(doc_id, idle_s, now)
+
+    max_wait_s = max(_get_max_wait_s(), idle_s)
+    try:
+        client = redis_service.client
+        first_key = _first_key(doc_id)
+        # Outlives the burst so the cap still applies if a dispatch is late
+        await client.set(first_key, now, nx=True, ex=max_wait_s * 2)
+        first = float(await client.get(first_key) or now)
+        due = min(now + idle_s, first + max_wait_s)
+        await client.zadd(_DUE_KEY, {doc_id: due})
+        return due
+    except Exception:
+        logger.warning("Failed to schedule debounced embed for document %s", doc_id, exc_info=True)
+        return await _enqueue_deferred(doc_id, idle_s, now)
+
+
+async def _enqueue_deferred(doc_id: str, idle_s: int, now: float) -> float | None:
+    """Enqueue the embed directly when it is not debounced (disabled or Redis down).
+
+    The ``embed:{id}`` job id collapses further edits within the deferral
+    into the already-queued job.
+    """
+    try:
+        arq_redis = await get_arq_redis()
+        await arq_redis.enqueue_job(
+            "embed_document_job",
+            doc_id,
+            _job_id=f"embed:{doc_id}",
+            _defer_by=timedelta(seconds=idle_s),
+            _queue_name=lane_queue("embed_document_job"),
+        )
+    except Exception:
+        logger.warning("Failed to enqueue embedding job for document %s", doc_id, exc_info=True)
+        return None
+    return now + idle_s
+
+
+async def dispatch_due_embeds(ctx: dict[str, Any]) -> dict[str, Any]:
+    """Enqueue ``embed_document_job`` for every document whose debounce expired.
+
+    A document is claimed by removing it from the sorted set, so concurrent
+    dispatchers never enqueue it twice. If its embed job is still queued or
+    running (ARQ ``_job_id`` dedup), it is rescheduled one idle period later
+    so edits made during that run are not lost.
+
+    Args:
+        ctx: ARQ context dictionary.
+
+    Returns:
+        Dict with dispatched and rescheduled counts.
+    """
+    if not redis_service.is_connected:
+        return {"status": "skipped", "reason": "redis_unavailable"}
+
+    client = redis_service.client
+    now = time.time()
+    due_ids = await client.zrangebyscore(_DUE_KEY, "-inf", now, start=0, num=_DISPATCH_BATCH)
+    if not due_ids:
+        return {"status": "success", "dispatched": 0, "rescheduled": 0}
+
+    arq_redis = await get_arq_redis()
+    dispatched = 0
+    rescheduled = 0
+    for doc_id in due_ids:
+        if not await client.zrem(_DUE_KEY, doc_id):
+            continue  # claimed by another dispatcher
+        await client.delete(_first_key(doc_id))
+        try:
+            # Drop the previous run's result so ARQ dedup only blocks a job
+            # that is actually queued or in progress
+            await arq_redis.delete(f"arq:result:embed:{doc_id}")
+            job = await arq_redis.enqueue_job(
+                "embed_document_job",
+                doc_id,
+                _job_id=f"embed:{doc_id}",
+                _queue_name=lane_queue("embed_document_job"),
+            )
+        except Exception:
+            logger.warning("Failed to dispatch debounced embed for document %s", doc_id, exc_info=True)
+            job = None
+        if job is None:
+            await client.zadd(_DUE_KEY, {doc_id: now + _get_idle_s()})
+            rescheduled += 1
+        else:
+            dispatched += 1
+
+    if dispatched or rescheduled:
+        logger.info("Debounced embeds: dispatched %d, rescheduled %d", dispatched, rescheduled)
+    return {"status": "success", "dispatched": dispatched, "rescheduled": rescheduled}
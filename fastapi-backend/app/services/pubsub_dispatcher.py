@@ -0,0 +1,259 @@
+"""Per-channel dispatch of Redis pub/sub messages.
+
+The pub/sub listener used to await every handler inline, so one slow
+handler (a room broadcast fanning out to thousands of sockets) held up
+every other channel, including cache and room-auth invalidations.
+
+PubSubDispatcher decouples receiving from handling: the listener only
+enqueues, and each channel gets a bounded queue drained by its own worker
+task. Messages within a channel keep their order; channels no longer wait
+on each other. What happens when a queue is full is set per channel by a
+ChannelPolicy:
+
+- ``block``: the listener waits for room (default; nothing is lost, for
+  invalidations and room entity events). While it waits, every other
+  channel waits too, so the handler must be cheap (room broadcasts only
+  enqueue onto each recipient's send queue).
+- ``drop_oldest``: the oldest queued message is discarded
+- ``coalesce``: a message whose ``coalesce_key`` matches a queued one
+  replaces it in place (latest state wins); otherwise the oldest is dropped.
+  Meant for presence and typing, where only the newest state matters.
+
+Per-channel backlog, lag (enqueue to handler start), drop and coalesce
+counters are exposed via ``stats()``.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["block", "drop_oldest", "coalesce"]
+
+# Minimum seconds between overflow warnings per channel
+_WARN_INTERVAL_S = 60.0
+
+
+@dataclass(frozen=True)
+class ChannelPolicy:
+    """Queueing policy for one pub/sub channel.
+
+    Attributes:
+        max_backlog: Maximum queued messages before the overflow policy applies.
+        overflow: What to do when the queue is full (see module docstring).
+        coalesce_key: For ``coalesce``, maps a message to its identity; messages
+            with equal keys replace each other while queued. None means the
+            message is never coalesced.
+    """
+
+    max_backlog: int = 1000
+    overflow: OverflowPolicy = "block"
+    coalesce_key: Optional[Callable[[dict], Optional[Hashable]]] = None
+
+
+class _Pending:
+    """A queued message; mutable so coalescing can swap its payload."""
+
+    __slots__ = ("data", "enqueued_at", "key")
+
+    def __init__(self, data: dict, key: Optional[Hashable]) -> None:
+        self.data = data
+        self.key = key
+        self.enqueued_at = time.monotonic()
+
+
+class _ChannelQueue:
+    """Bounded queue, worker task and counters for a single channel."""
+
+    def __init__(self, channel: str, policy: ChannelPolicy) -> None:
+        self.channel = channel
+        self.policy = policy
+        self.items: deque[_Pending] = deque()
+        self.by_key: dict[Hashable, _Pending] = {}
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.not_full.set()
+        self.worker: Optional[asyncio.Task] = None
+        self.closed = False
+        # Metrics
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.handler_errors = 0
+        self.peak_backlog = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._last_warning = 0.0
+
+    def _push(self, pending: _Pending) -> None:
+        self.items.append(pending)
+        if pending.key is not None:
+            self.by_key[pending.key] = pending
+        self.peak_backlog = max(self.peak_backlog, len(self.items))
+        self.not_empty.set()
+        if len(self.items) >= self.policy.max_backlog:
+            self.not_full.clear()
+
+    def pop(self) -> _Pending:
+        pending = self.items.popleft()
+        if pending.key is not None and self.by_key.get(pending.key) is pending:
+            del self.by_key[pending.key]
+        if not self.items:
+            self.not_empty.clear()
+        if len(self.items) < self.policy.max_backlog:
+            self.not_full.set()
+        return pending
+
+    def _warn_overflow(self) -> None:
+        now = time.monotonic()
+        if now - self._last_warning > _WARN_INTERVAL_S:
+            self._last_warning = now
+            logger.warning(
+                "Pub/sub channel %s over backlog (%d queued, policy=%s, dropped=%d, coalesced=%d)",
+                self.channel,
+                len(self.items),
+                self.policy.overflow,
+                self.dropped,
+                self.coalesced,
+            )
+
+    async def put(self, data: dict) -> None:
+        policy = self.policy
+        key = policy.coalesce_key(data) if policy.overflow == "coalesce" and policy.coalesce_key else None
+
+        if key is not None and key in self.by_key:
+            self.by_key[key].data = data
+            self.coalesced += 1
+            return
+
+        if len(self.items) >= policy.max_backlog:
+            if policy.overflow == "block":
+                self._warn_overflow()
+                while len(self.items) >= policy.max_backlog and not self.closed:
+                    await self.not_full.wait()
+            else:
+                self.pop()
+                self.dropped += 1
+                self._warn_overflow()
+
+        self._push(_Pending(data, key))
+
+    def close(self) -> Optional[asyncio.Task]:
+        """Release a blocked producer and cancel the worker; returns the worker."""
+        self.closed = True
+        self.not_full.set()
+        if self.worker is not None:
+            self.worker.cancel()
+        return self.worker
+
+    def stats(self) -> dict[str, Any]:
+        oldest_ms = (time.monotonic() - self.items[0].enqueued_at) * 1000 if self.items else 0.0
+        return {
+            "policy": self.policy.overflow,
+            "max_backlog": self.policy.max_backlog,
+            "backlog": len(self.items),
+            "peak_backlog": self.peak_backlog,
+            "oldest_ms": round(oldest_ms, 1),
+            "last_lag_ms": round(self.last_lag_ms, 1),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "handler_errors": self.handler_errors,
+        }
+
+
+class PubSubDispatcher:
+    """Routes received pub/sub messages through per-channel queues and workers.
+
+    Args:
+        get_handlers: Returns the current handler list for a channel; read at
+            delivery time so (un)subscribes take effect for queued messages.
+        default_policy: Policy for channels without an explicit one.
+    """
+
+    def __init__(
+        self,
+        get_handlers: Callable[[str], list[Callable]],
+        default_policy: Optional[ChannelPolicy] = None,
+    ) -> None:
+        self._get_handlers = get_handlers
+        self._default_policy = default_policy or ChannelPolicy()
+        self._policies: dict[str, ChannelPolicy] = {}
+        self._queues: dict[str, _ChannelQueue] = {}
+
+    def set_policy(self, channel: str, policy: ChannelPolicy) -> None:
+        """Set the queueing policy for a channel."""
+        self._policies[channel] = policy
+        queue = self._queues.get(channel)
+        if queue is not None:
+            queue.policy = policy
+
+    async def dispatch(self, channel: str, data: dict) -> None:
+        """Queue a message for its channel's worker.
+
+        Only waits when the channel's policy is ``block`` and its queue is full.
+        """
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = _ChannelQueue(channel, self._policies.get(channel, self._default_policy))
+            queue.worker = asyncio.create_task(self._worker(queue))
+            self._queues[channel] = queue
+        await queue.put(data)
+
+    async def _worker(self, queue: _ChannelQueue) -> None:
+        """Deliver a channel's messages to its handlers, one at a time in order."""
+        while True:
+            await queue.not_empty.wait()
+            pending = queue.pop()
+            lag_ms = (time.monotonic() - pending.enqueued_at) * 1000
+            queue.last_lag_ms = lag_ms
+            queue.max_lag_ms = max(queue.max_lag_ms, lag_ms)
+
+            for handler in list(self._get_handlers(queue.channel)):
+                try:
+                    await handler(pending.data)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    queue.handler_errors += 1
+                    logger.error(f"Handler error on {queue.channel}: {e}")
+            queue.delivered += 1
+
+    async def discard(self, channel: str) -> None:
+        """Stop a channel's worker and drop its backlog (channel unsubscribed)."""
+        self._policies.pop(channel, None)
+        queue = self._queues.pop(channel, None)
+        if queue is not None:
+            await self._join(queue.close())
+
+    async def stop(self) -> None:
+        """Cancel all workers and drop all backlogs (policies are kept)."""
+        workers = [queue.close() for queue in self._queues.values()]
+        self._queues.clear()
+        for worker in workers:
+            await self._join(worker)
+
+    @staticmethod
+    async def _join(worker: Optional[asyncio.Task]) -> None:
+        if worker is None:
+            return
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-channel backlog, lag and overflow counters."""
+        return {channel: queue.stats() for channel, queue in self._queues.items()}
+
+
+__all__ = [
+    "ChannelPolicy",
+    "OverflowPolicy",
+    "PubSubDispatcher",
+]
@@ -13,10 +13,18 @@ import json
 import logging
 from typing import Any, Callable, Optional
 
+import orjson
 import redis.asyncio as aioredis
 from redis.asyncio.client import PubSub
 
 from ..config import settings
+from .pubsub_dispatcher import ChannelPolicy, PubSubDispatcher
+
+
+def _dumps(message: dict) -> bytes:
+    """Serialize a pub/sub payload (orjson; unknown types fall back to ``str``)."""
+    return orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS)
+
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +53,11 @@ class RedisService:
         self._reconnect_delay: float = 1.0
         self._health_monitor_task: Optional[asyncio.Task] = None
         self._on_state_change: Optional[Callable[[bool], Any]] = None
+        # Per-channel queues + workers so a slow handler only delays its own channel
+        self._dispatcher = PubSubDispatcher(
+            lambda channel: self._handlers.get(channel, []),
+            default_policy=ChannelPolicy(max_backlog=settings.redis_pubsub_max_backlog),
+        )
 
     async def connect(self) -> None:
         """Initialize Redis connection with connection pooling."""
@@ -71,6 +84,7 @@ class RedisService:
             except asyncio.CancelledError:
                 pass
             self._listener_task = None
+        await self._dispatcher.stop()
         if self._pubsub:
             await self._pubsub.close()
             self._pubsub = None
@@ -95,14 +109,24 @@ class RedisService:
     # Pub/Sub Methods
     # =========================================================================
 
-    async def subscribe(self, channel: str, handler: Callable) -> None:
+    async def subscribe(
+        self,
+        channel: str,
+        handler: Callable,
+        policy: Optional[ChannelPolicy] = None,
+    ) -> None:
         """
         Subscribe to a channel with a message handler.
 
         Args:
             channel: The channel name to subscribe to
             handler: Async function to call when a message is received
+            policy: Optional queueing policy for the channel (backlog bound and
+                overflow behaviour); defaults to a blocking queue of
+                ``redis_pubsub_max_backlog`` messages
         """
+        if policy is not None:
+            self._dispatcher.set_policy(channel, policy)
         if channel not in self._handlers:
             self._handlers[channel] = []
             if self._pubsub:
@@ -139,6 +163,7 @@ class RedisService:
                 return
             del self._handlers[channel]
 
+        await self._dispatcher.discard(channel)
         if self._pubsub:
             await self._pubsub.unsubscribe(channel)
         logger.debug(f"Unsubscribed from channel: {channel}")
@@ -155,7 +180,60 @@ class RedisService:
             Number of subscribers that received the message
         """
         try:
-            result = await self.client.publish(channel, json.dumps(message, default=str))
+            result = await self.client.publish(channel, _dumps(message))
+            self._connected = True
+            return result
+        except Exception:
+            self._connected = False
+            raise
+
+    # Appends to the stream and publishes in one script so stream order and
+    # publish order are the same, and the published envelope carries the id.
+    _PUBLISH_TO_STREAM_LUA = (
+        "local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'm', ARGV[3]) "
+        "redis.call('EXPIRE', KEYS[1], ARGV[2]) "
+        "redis.call('PUBLISH', ARGV[5], ARGV[4] .. ',\"event_id\":\"' .. id .. '\"}') "
+        "return id"
+    )
+
+    async def publish_to_stream(
+        self,
+        channel: str,
+        envelope: dict,
+        stream_key: str,
+        payload: dict,
+        maxlen: int,
+        ttl: int,
+    ) -> str:
+        """
+        Append a payload to a capped stream and publish an envelope, atomically.
+
+        The published envelope gains an ``event_id`` field holding the stream
+        entry id, so subscribers and stream readers see the same id.
+
+        Args:
+            channel: The channel name to publish to
+            envelope: The message dictionary to publish (must be non-empty)
+            stream_key: Redis Stream key to append to
+            payload: Dictionary stored in the stream entry (field ``m``)
+            maxlen: Approximate stream length cap (MAXLEN ~)
+            ttl: Stream key expiry in seconds, refreshed on every append
+
+        Returns:
+            The stream entry id
+        """
+        envelope_json = _dumps(envelope)
+        try:
+            result = await self.client.eval(
+                self._PUBLISH_TO_STREAM_LUA,
+                1,
+                stream_key,
+                maxlen,
+                ttl,
+                _dumps(payload),
+                envelope_json[:-1],
+                channel,
+            )
             self._connected = True
             return result
         except Exception:
@@ -198,6 +276,9 @@ class RedisService:
         Uses ``async for message in pubsub.listen()`` for push-based delivery
         instead of polling with ``get_message(timeout=1.0)``, eliminating up to
         1 second of latency per message.
+
+        Messages are handed to the per-channel dispatcher rather than awaited
+        inline, so a slow handler on one channel no longer stalls the others.
         """
         while self._running:
             try:
@@ -209,14 +290,15 @@ class RedisService:
                     if message["type"] != "message":
                         continue
                     channel = message["channel"]
-                    data = json.loads(message["data"])
-
-                    # Call all handlers for this channel
-                    for handler in self._handlers.get(channel, []):
-                        try:
-                            await handler(data)
-                        except Exception as e:
-                            logger.error(f"Handler error on {channel}: {e}")
+                    if channel not in self._handlers:
+                        continue
+                    try:
+                        data = orjson.loads(message["data"])
+                    except ValueError as e:
+                        logger.error(f"Invalid pub/sub payload on {channel}: {e}")
+                        continue
+
+                    await self._dispatcher.dispatch(channel, data)
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -243,6 +325,10 @@ class RedisService:
                 # Reset backoff on successful iteration
                 self._reconnect_delay = 1.0
 
+    def pubsub_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-channel dispatcher backlog, lag and drop/coalesce counters."""
+        return self._dispatcher.stats()
+
     # =========================================================================
     # Caching Methods
     # =========================================================================
@@ -304,6 +390,26 @@ class RedisService:
             self._connected = False
             raise
 
+    async def swap_json(self, key: str, value: dict, ttl: int) -> Optional[dict]:
+        """
+        Replace a JSON value and return the previous one, in one round trip.
+
+        Args:
+            key: The cache key
+            value: The dictionary to store
+            ttl: Time-to-live in seconds
+
+        Returns:
+            The previously stored dictionary or None if there was none
+        """
+        try:
+            previous = await self.client.set(key, _dumps(value), ex=ttl, get=True)
+            self._connected = True
+            return orjson.loads(previous) if previous else None
+        except Exception:
+            self._connected = False
+            raise
+
     async def delete(self, key: str) -> None:
         """
         Delete a key from cache.
@@ -561,6 +667,7 @@ class RedisService:
                 "used_memory_human": info.get("used_memory_human", "unknown"),
                 "connected_clients": info.get("connected_clients", 0),
                 "gate_active": False,
+                "pubsub": self.pubsub_stats(),
             }
         except Exception as e:
             return {
@@ -581,6 +688,7 @@ async def get_redis() -> RedisService:
 
 # Export for use in other modules
 __all__ = [
+    "ChannelPolicy",
     "RedisService",
     "redis_service",
     "get_redis",
@@ -32,6 +32,7 @@ from app.models.document import Document
 from app.models.project import Project
 
 from ..ai.config_service import get_agent_config
+from ..ai.retrieval_cache import bump_knowledge_generation
 
 logger = logging.getLogger(__name__)
 
@@ -386,6 +387,8 @@ async def index_document_from_data(data: dict) -> None:
     Args:
         data: Dict with keys matching Meilisearch document schema.
     """
+    # Content changed in Postgres regardless of Meilisearch health
+    await bump_knowledge_generation(data.get("application_id"), data.get("user_id"))
     if _meili_circuit_is_open():
         logger.debug("Skipping index for doc %s: circuit breaker open", data.get("id"))
         return
@@ -418,12 +421,23 @@ async def index_document(
     await index_document_from_data(data)
 
 
-async def index_document_soft_delete(doc_id: UUID) -> None:
+async def index_document_soft_delete(
+    doc_id: UUID,
+    application_id: UUID | None = None,
+    user_id: UUID | None = None,
+) -> None:
     """Update deleted_at in Meilisearch for soft-deleted document (fire-and-forget).
 
     The document stays in the index but is excluded by 'deleted_at IS NULL' filter.
     This allows restore without full re-indexing.
+
+    Args:
+        doc_id: UUID of the soft-deleted document.
+        application_id: Owning application (parent app for project docs), used
+            to invalidate cached retrievals.
+        user_id: Owning user for personal documents.
     """
+    await bump_knowledge_generation(application_id, user_id)
     try:
         index = get_meili_index()
         await index.update_documents(
@@ -438,12 +452,19 @@ async def index_document_soft_delete(doc_id: UUID) -> None:
         logger.error("Failed to update deleted_at for doc %s: %s", doc_id, exc)
 
 
-async def index_document_restore(doc_id: UUID) -> None:
+async def index_document_restore(
+    doc_id: UUID,
+    application_id: UUID | None = None,
+    user_id: UUID | None = None,
+) -> None:
     """Clear deleted_at in Meilisearch for a restored document. Fire-and-forget.
 
     Args:
         doc_id: UUID of the restored document.
+        application_id: Owning application (parent app for project docs).
+        user_id: Owning user for personal documents.
     """
+    await bump_knowledge_generation(application_id, user_id)
     try:
         index = get_meili_index()
         await index.update_documents(
@@ -458,12 +479,22 @@ async def index_document_restore(doc_id: UUID) -> None:
         logger.error("Failed to restore index for doc %s: %s", doc_id, exc)
 
 
-async def remove_document_from_index(doc_id: UUID) -> None:
+async def remove_document_from_index(
+    doc_id: UUID,
+    application_id: UUID | None = None,
+    user_id: UUID | None = None,
+) -> None:
     """Synchronously remove document from Meilisearch (for hard deletes).
 
     Uses synchronous call with timeout because ghost results pointing to
     non-existent documents are worse than a slightly slower hard delete.
+
+    Args:
+        doc_id: UUID of the deleted document.
+        application_id: Owning application (parent app for project docs).
+        user_id: Owning user for personal documents.
     """
+    await bump_knowledge_generation(application_id, user_id)
     try:
         index = get_meili_index()
         task = await index.delete_document(str(doc_id))
@@ -531,11 +562,16 @@ async def index_file_from_data(data: dict) -> None:
     await index_document_from_data(data)
 
 
-async def remove_file_from_index(file_id: UUID) -> None:
+async def remove_file_from_index(
+    file_id: UUID,
+    application_id: UUID | None = None,
+    user_id: UUID | None = None,
+) -> None:
     """Remove a file from the Meilisearch index.
 
     Uses the "file_" prefixed ID to match the indexed document.
     """
+    await bump_knowledge_generation(application_id, user_id)
     try:
         index = get_meili_index()
         task = await index.delete_document(f"file_{file_id}")
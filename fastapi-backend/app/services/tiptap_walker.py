@@ -0,0 +1,753 @@
+"""Single-pass TipTap document walker.
+
+Saving and embedding a document used to walk the same TipTap JSON five
+times: Markdown and plain text conversion on save, attachment-id extraction
+for orphan cleanup, chunk block extraction in the embed job, and image node
+discovery for vision captioning. ``walk_tiptap`` visits every node once and
+emits all of those outputs into a :class:`TiptapIR`:
+
+  - ``markdown``: Markdown for AI consumption (``Document.content_markdown``)
+  - ``plain_text``: plain text for full-text search (``Document.content_plain``)
+  - ``attachment_ids``: attachmentId of every image/drawio node
+  - ``images``: image nodes with their nearest preceding heading
+  - ``blocks``: heading-scoped text blocks consumed by ``SemanticChunker``
+
+Node types handled:
+  Block: doc, paragraph, heading (1-6), bulletList, orderedList, listItem,
+         taskList, taskItem, codeBlock, blockquote, table, tableRow,
+         tableCell, tableHeader, horizontalRule, drawio, image
+  Inline: text, hardBreak
+  Marks: bold, italic, underline, strike, code, link
+  Skipped (presentation-only): textStyle, highlight, indent, textAlign
+
+Design decisions:
+  - underline renders as <u>text</u> (no Markdown equivalent)
+  - codeBlock with 'plaintext' or empty/null language renders bare ``` fences
+  - drawio XML is parsed once per node; Markdown lists shapes + connections,
+    plain text lists labels, chunk blocks describe the graph structure
+  - Unknown node types render their children recursively (graceful degradation)
+  - ``content.max_recursion_depth`` / ``content.max_node_count`` bound the
+    text outputs; attachment ids are still collected past either limit so
+    orphan cleanup never deletes an attachment that is still referenced
+
+The IR is plain data and cacheable by content hash: ``get_tiptap_ir`` keeps
+it in a small per-process LRU and in Redis (``content.ir_cache_ttl_seconds``),
+so the embed job reuses the walk done when the document was saved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import defusedxml.ElementTree as ET
+
+from ..ai.config_service import get_agent_config
+
+logger = logging.getLogger(__name__)
+
+_cfg = get_agent_config()
+_MAX_RECURSION_DEPTH = _cfg.get_int("content.max_recursion_depth", 100)
+_MAX_NODE_COUNT = _cfg.get_int("content.max_node_count", 50_000)
+
+_MARK_WRAPPERS: dict[str, str] = {
+    "bold": "**",
+    "italic": "_",
+    "strike": "~~",
+    "code": "`",
+}
+
+# Plain text gets a newline after these block-level nodes
+_BLOCK_TYPES = frozenset({"paragraph", "heading", "listItem", "taskItem", "codeBlock", "blockquote"})
+_LIST_TYPES = frozenset({"bulletList", "orderedList", "taskList"})
+_ATTACHMENT_TYPES = frozenset({"image", "drawio"})
+# Chunk text skips these: images go through vision, tables/drawio get their own blocks
+_CHUNK_SKIP_TYPES = frozenset({"image", "table", "drawio"})
+
+_TRUNCATION_NOTICE = "\n... (content truncated — node limit reached)\n"
+
+_IR_PREFIX = "tiptap_ir"
+_LOCAL_CACHE_SIZE = 64
+
+
+# -- Intermediate representation -----------------------------------------------
+
+
+@dataclass
+class TiptapBlock:
+    """Text segment for chunking.
+
+    ``heading_context`` is None before the first heading; the chunker
+    substitutes the document title.
+    """
+
+    text: str
+    heading_context: str | None
+    is_table: bool = False
+    table_columns: list[str] | None = None
+
+
+@dataclass
+class TiptapImage:
+    """Image node referencing an uploaded attachment."""
+
+    attachment_id: str
+    heading_context: str | None
+    alt: str = ""
+    title: str = ""
+
+
+@dataclass
+class TiptapIR:
+    """Everything derived from one TipTap document in a single walk."""
+
+    markdown: str = ""
+    plain_text: str = ""
+    attachment_ids: list[str] = field(default_factory=list)
+    images: list[TiptapImage] = field(default_factory=list)
+    blocks: list[TiptapBlock] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TiptapIR:
+        return cls(
+            markdown=data.get("markdown", ""),
+            plain_text=data.get("plain_text", ""),
+            attachment_ids=list(data.get("attachment_ids", [])),
+            images=[TiptapImage(**i) for i in data.get("images", [])],
+            blocks=[TiptapBlock(**b) for b in data.get("blocks", [])],
+        )
+
+
+# -- Walker ---------------------------------------------------------------------
+
+# Chunk block modes: top-level flow, or inside a list (only tables and
+# drawio nodes become blocks there; the list itself becomes one text block).
+_BLOCK = 1
+_RICH = 2
+
+
+class _Scope:
+    """Heading context shared by sibling nodes in the chunk block flow."""
+
+    __slots__ = ("heading",)
+
+    def __init__(self, heading: str | None) -> None:
+        self.heading = heading
+
+
+@dataclass
+class _Out:
+    """Per-node results handed to the parent."""
+
+    node: dict[str, Any]
+    kids: list[_Out]
+    md: str = ""  # block Markdown at the indent the node was visited with
+    plain: str = ""  # contribution to the parent's plain text
+    chunk: str = ""  # contribution to the parent's chunk text
+    inner_chunk: str = ""  # chunk text of the children alone
+    inline_md: str = ""  # text/hardBreak only: Markdown inline form
+    inline_text: str = ""  # text/hardBreak only: raw inline form
+
+
+_EMPTY = _Out(node={}, kids=[])
+
+
+def _strip_html_tags(text: str) -> str:
+    """Strip HTML tags from draw.io label text."""
+    clean = re.sub(r"<[^>]+>", " ", text).strip()
+    return re.sub(r"\s+", " ", clean)
+
+
+def _marked(node: dict[str, Any]) -> str:
+    text = node.get("text", "")
+    for mark in node.get("marks", []):
+        mark_type = mark.get("type", "")
+        wrapper = _MARK_WRAPPERS.get(mark_type, "")
+        if mark_type == "link":
+            href = mark.get("attrs", {}).get("href", "")
+            text = f"[{text}]({href})"
+        elif mark_type == "underline":
+            text = f"<u>{text}</u>"
+        elif wrapper:
+            text = f"{wrapper}{text}{wrapper}"
+        # textStyle, highlight marks are presentation-only; skip
+    return text
+
+
+def _inline_md(kids: list[_Out]) -> str:
+    return "".join(k.inline_md for k in kids)
+
+
+def _inline_text(kids: list[_Out]) -> str:
+    return "".join(k.inline_text for k in kids)
+
+
+class _Walker:
+    def __init__(self, max_depth: int, max_nodes: int) -> None:
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.node_count = 0
+        self.truncated = False
+        self.attachment_ids: dict[str, None] = {}
+        self.images: list[TiptapImage] = []
+        self.image_heading: str | None = None
+
+    # -- limits -------------------------------------------------------------
+
+    def _collect_ids_only(self, node: dict[str, Any]) -> None:
+        """Attachment ids for a subtree the text outputs no longer cover."""
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if n.get("type") in _ATTACHMENT_TYPES:
+                attachment_id = (n.get("attrs") or {}).get("attachmentId")
+                if attachment_id:
+                    self.attachment_ids[attachment_id] = None
+            content = n.get("content")
+            if isinstance(content, list):
+                stack.extend(c for c in reversed(content) if isinstance(c, dict))
+
+    # -- traversal ----------------------------------------------------------
+
+    def visit(
+        self,
+        node: dict[str, Any],
+        depth: int,
+        indent: int | None,
+        mode: int | None,
+        scope: _Scope,
+        sink: list[TiptapBlock],
+        as_item: bool = False,
+    ) -> _Out:
+        """Visit one node and its subtree.
+
+        Args:
+            node: TipTap node.
+            depth: Tree depth.
+            indent: Markdown list indent, or None where Markdown is not rendered.
+            mode: Chunk block mode (_BLOCK/_RICH), or None inside nodes whose
+                text is consumed by an ancestor block.
+            scope: Heading context for chunk blocks.
+            sink: Chunk blocks emitted at this level.
+            as_item: Node is an item of a list rendered to Markdown.
+        """
+        self.node_count += 1
+        if self.truncated or self.node_count > self.max_nodes or depth > self.max_depth:
+            if self.node_count > self.max_nodes:
+                self.truncated = True
+            self._collect_ids_only(node)
+            return _EMPTY
+
+        t = node.get("type", "")
+        attrs = node.get("attrs") or {}
+        has_content = "content" in node
+        content = node.get("content")
+        children = [c for c in content if isinstance(c, dict)] if isinstance(content, list) else []
+
+        if t in _ATTACHMENT_TYPES:
+            attachment_id = attrs.get("attachmentId")
+            if attachment_id:
+                self.attachment_ids[attachment_id] = None
+                if t == "image":
+                    self.images.append(
+                        TiptapImage(
+                            attachment_id=str(attachment_id),
+                            heading_context=self.image_heading,
+                            alt=attrs.get("alt", "") or "",
+                            title=attrs.get("title", "") or "",
+                        )
+                    )
+
+        if t == "text":
+            text = node.get("text", "")
+            return _Out(node, [], plain=text, chunk=text, inline_md=_marked(node), inline_text=text)
+        if t == "hardBreak":
+            return _Out(node, [], plain="\n", chunk="\n", inline_md="  \n", inline_text="\n")
+
+        # -- children ---------------------------------------------------------
+        child_indent: int | None = None
+        if indent is not None:
+            if as_item:
+                child_indent = indent + 1
+            elif t == "blockquote":
+                child_indent = 0
+            elif t not in ("paragraph", "heading", "codeBlock", "table", "horizontalRule", "drawio"):
+                child_indent = indent  # lists pass their own indent to items
+
+        child_mode: int | None = None
+        child_scope = scope
+        child_sink = sink
+        if mode == _BLOCK:
+            if t in _LIST_TYPES:
+                child_mode, child_sink = _RICH, []
+            elif t == "blockquote":
+                child_mode, child_scope, child_sink = _BLOCK, _Scope(scope.heading), []
+            elif t not in ("paragraph", "heading", "codeBlock", "table", "horizontalRule", "image", "drawio"):
+                child_mode, child_scope = _BLOCK, _Scope(scope.heading)
+        elif mode == _RICH and t not in ("table", "drawio"):
+            child_mode = _RICH
+
+        kids: list[_Out] = []
+        if t == "heading":
+            # Headings set the image context before their subtree is visited
+            heading_text = "".join(
+                c.get("text", "") if c.get("type") == "text" else "\n" if c.get("type") == "hardBreak" else ""
+                for c in children
+            ).strip()
+            if heading_text:
+                self.image_heading = heading_text
+        item_list = indent is not None and t in _LIST_TYPES and not as_item
+        for child in children:
+            kids.append(
+                self.visit(child, depth + 1, child_indent, child_mode, child_scope, child_sink, as_item=item_list)
+            )
+
+        out = _Out(node, kids)
+        inner_plain = "".join(k.plain for k in kids)
+        out.inner_chunk = "".join(k.chunk for k in kids)
+
+        # -- plain text / chunk text --------------------------------------------
+        drawio_root = _parse_drawio(attrs) if t == "drawio" else None
+        if t == "drawio":
+            out.plain = (_drawio_labels(drawio_root) if drawio_root is not None else "") + "\n"
+        elif has_content:
+            out.plain = inner_plain + ("\n" if t in _BLOCK_TYPES else "")
+        if t not in _CHUNK_SKIP_TYPES and has_content:
+            out.chunk = out.inner_chunk + ("\n" if t in _BLOCK_TYPES else "")
+
+        # -- Markdown -----------------------------------------------------------
+        if indent is not None:
+            out.md = self._markdown(t, attrs, has_content, kids, indent, as_item, inner_plain, drawio_root)
+
+        # -- chunk blocks ---------------------------------------------------------
+        if mode == _BLOCK:
+            self._emit_block(t, attrs, kids, out, scope, sink, child_sink, drawio_root)
+        elif mode == _RICH:
+            if t == "drawio":
+                _append_text_block(sink, _drawio_graph_text(drawio_root), scope.heading)
+            elif t == "table":
+                text, header_cells = _table_chunk_text(kids)
+                _append_text_block(sink, text, scope.heading, is_table=True, table_columns=header_cells)
+
+        return out
+
+    # -- Markdown -----------------------------------------------------------------
+
+    def _markdown(
+        self,
+        t: str,
+        attrs: dict[str, Any],
+        has_content: bool,
+        kids: list[_Out],
+        indent: int,
+        as_item: bool,
+        inner_plain: str,
+        drawio_root: Any,
+    ) -> str:
+        if as_item:
+            parts: list[str] = []
+            for i, kid in enumerate(kids):
+                kid_type = kid.node.get("type")
+                if kid_type in _LIST_TYPES:
+                    # Nested list -- rendered one indent deeper
+                    parts.append("\n" + kid.md)
+                elif kid_type == "paragraph":
+                    text = _inline_md(kid.kids)
+                    if i == 0:
+                        parts.append(text + "\n")
+                    else:
+                        # Continuation paragraph in list item
+                        parts.append("  " * (indent + 1) + text + "\n")
+                else:
+                    parts.append(kid.md)
+            return "".join(parts)
+
+        if t == "paragraph":
+            return _inline_md(kids) + "\n\n"
+        if t == "heading":
+            level = attrs.get("level", 1)
+            return "#" * level + " " + _inline_md(kids) + "\n\n"
+        if t in _LIST_TYPES:
+            parts = []
+            for i, item in enumerate(kids, 1):
+                if t == "orderedList":
+                    prefix = "  " * indent + f"{i}. "
+                elif t == "taskList":
+                    checked = (item.node.get("attrs") or {}).get("checked", False)
+                    prefix = "  " * indent + ("- [x] " if checked else "- [ ] ")
+                else:
+                    prefix = "  " * indent + "- "
+                parts.append(prefix + item.md)
+            parts.append("\n")
+            return "".join(parts)
+        if t == "codeBlock":
+            lang = attrs.get("language", "") or ""
+            # Skip "plaintext" default language -- render as bare ```
+            if lang == "plaintext":
+                lang = ""
+            return f"```{lang}\n{inner_plain}\n```\n\n"
+        if t == "blockquote":
+            lines = "".join(k.md for k in kids).strip().split("\n")
+            return "\n".join("> " + line for line in lines) + "\n\n"
+        if t == "table":
+            return _table_markdown(kids) + "\n\n"
+        if t == "horizontalRule":
+            return "---\n\n"
+        if t == "drawio":
+            return _drawio_markdown(attrs, drawio_root)
+        # Unknown node -- render children if any (graceful degradation)
+        return "".join(k.md for k in kids) if has_content else ""
+
+    # -- chunk blocks ---------------------------------------------------------------
+
+    @staticmethod
+    def _emit_block(
+        t: str,
+        attrs: dict[str, Any],
+        kids: list[_Out],
+        out: _Out,
+        scope: _Scope,
+        sink: list[TiptapBlock],
+        child_sink: list[TiptapBlock],
+        drawio_root: Any,
+    ) -> None:
+        if t == "heading":
+            heading_text = _inline_text(kids)
+            if heading_text.strip():
+                scope.heading = heading_text.strip()
+                level = attrs.get("level", 1)
+                sink.append(TiptapBlock(text=f"{'#' * level} {heading_text}\n", heading_context=scope.heading))
+        elif t == "paragraph":
+            text = _inline_text(kids)
+            if text.strip():
+                sink.append(TiptapBlock(text=text + "\n", heading_context=scope.heading))
+        elif t in _LIST_TYPES:
+            _append_text_block(sink, _list_chunk_text(t, kids), scope.heading)
+            # Tables and drawio nodes nested anywhere in the list follow it
+            sink.extend(child_sink)
+        elif t == "codeBlock":
+            code = out.inner_chunk
+            if code.strip():
+                lang = attrs.get("language", "") or ""
+                sink.append(TiptapBlock(text=f"```{lang}\n{code}\n```\n", heading_context=scope.heading))
+        elif t == "blockquote":
+            for b in child_sink:
+                b.text = "> " + b.text.replace("\n", "\n> ").removesuffix("> ") + "\n"
+            sink.extend(child_sink)
+        elif t == "table":
+            text, header_cells = _table_chunk_text(kids)
+            _append_text_block(sink, text, scope.heading, is_table=True, table_columns=header_cells)
+        elif t == "drawio":
+            _append_text_block(sink, _drawio_graph_text(drawio_root), scope.heading)
+        # horizontalRule and image are skipped; unknown nodes already emitted
+        # their children's blocks into the same sink
+
+
+def _append_text_block(
+    sink: list[TiptapBlock],
+    text: str,
+    heading: str | None,
+    is_table: bool = False,
+    table_columns: list[str] | None = None,
+) -> None:
+    if text.strip():
+        sink.append(TiptapBlock(text=text, heading_context=heading, is_table=is_table, table_columns=table_columns))
+
+
+def _list_chunk_text(list_type: str, items: list[_Out]) -> str:
+    parts: list[str] = []
+    for i, item in enumerate(items):
+        prefix = "- "
+        if list_type == "orderedList":
+            prefix = f"{i + 1}. "
+        elif list_type == "taskList":
+            checked = (item.node.get("attrs") or {}).get("checked", False)
+            prefix = "[x] " if checked else "[ ] "
+        parts.append(prefix + item.inner_chunk.strip() + "\n")
+    return "".join(parts)
+
+
+def _table_chunk_text(rows: list[_Out]) -> tuple[str, list[str]]:
+    """Table text for chunking plus the header row's cell texts."""
+    parts: list[str] = []
+    header_cells: list[str] = []
+    for row_idx, row in enumerate(rows):
+        cell_texts = [cell.inner_chunk.strip() for cell in row.kids]
+        if row_idx == 0:
+            header_cells = cell_texts
+        parts.append(" | ".join(cell_texts) + "\n")
+    return "".join(parts), header_cells
+
+
+def _table_markdown(rows: list[_Out]) -> str:
+    if not rows:
+        return ""
+    # Each cell renders the inline content of its first child
+    md_rows = [[_inline_md(cell.kids[0].kids).strip() if cell.kids else "" for cell in row.kids] for row in rows]
+
+    lines: list[str] = []
+    lines.append("| " + " | ".join(md_rows[0]) + " |")
+    lines.append("| " + " | ".join("---" for _ in md_rows[0]) + " |")
+    for row in md_rows[1:]:
+        lines.append("| " + " | ".join(row) + " |")
+    return "\n".join(lines)
+
+
+# -- Draw.io ----------------------------------------------------------------------
+
+
+def _parse_drawio(attrs: dict[str, Any]) -> Any:
+    xml_data = attrs.get("data")
+    if not xml_data:
+        return None
+    try:
+        return ET.fromstring(xml_data)
+    except Exception:
+        # Malformed XML (ParseError) or defusedxml security rejections
+        # (DTDForbidden, EntitiesForbidden, ExternalReferenceForbidden)
+        return None
+
+
+def _drawio_labels(root: Any) -> str:
+    """Space-separated labels of every cell, for full-text search."""
+    texts: list[str] = []
+    for cell in root.iter("mxCell"):
+        value = cell.get("value", "")
+        if value:
+            clean = _strip_html_tags(value)
+            if clean:
+                texts.append(clean)
+    return " ".join(texts)
+
+
+def _drawio_markdown(attrs: dict[str, Any], root: Any) -> str:
+    """Shapes and connections of a draw.io diagram as Markdown."""
+    if not attrs.get("data"):
+        return "**[Diagram]** *(empty)*\n\n"
+    if root is None:
+        return "**[Diagram]** *(parse error)*\n\n"
+
+    cell_map: dict[str, str] = {}
+    shapes: list[str] = []
+    edges: list[tuple[str, str, str]] = []  # (source_id, edge_label, target_id)
+
+    for cell in root.iter("mxCell"):
+        cell_id = cell.get("id", "")
+        value = cell.get("value", "")
+        clean_value = _strip_html_tags(value) if value else ""
+
+        if cell_id:
+            cell_map[cell_id] = clean_value
+
+        if cell.get("vertex") == "1" and clean_value:
+            shapes.append(clean_value)
+        elif cell.get("edge") == "1":
+            edge_label = clean_value or "connected_to"
+            edges.append((cell.get("source", ""), edge_label, cell.get("target", "")))
+
+    parts: list[str] = ["**[Diagram]**\n"]
+
+    if shapes:
+        parts.append("Shapes:\n")
+        for s in shapes:
+            parts.append(f"  - {s}\n")
+
+    if edges:
+        parts.append("Connections:\n")
+        for src_id, label, tgt_id in edges:
+            src_name = cell_map.get(src_id, src_id)
+            tgt_name = cell_map.get(tgt_id, tgt_id)
+            if src_name and tgt_name:
+                parts.append(f"  - {src_name} --[{label}]--> {tgt_name}\n")
+
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _drawio_graph_text(root: Any) -> str:
+    """Vertices, edges and containment of a draw.io diagram, for chunking.
+
+    Falls back to plain label extraction if no edges or containment are found.
+    """
+    if root is None:
+        return ""
+
+    vertices: dict[str, dict[str, str]] = {}
+    edges: list[tuple[str, str, str]] = []
+    for cell in root.iter("mxCell"):
+        if cell.get("vertex") == "1":
+            cell_id = cell.get("id", "")
+            value = cell.get("value", "")
+            if cell_id:
+                vertices[cell_id] = {
+                    "label": _strip_html_tags(value) if value else "",
+                    "parent": cell.get("parent", ""),
+                }
+        elif cell.get("edge") == "1":
+            value = cell.get("value", "")
+            edges.append((cell.get("source", ""), cell.get("target", ""), _strip_html_tags(value) if value else ""))
+
+    # Filter edges to only include those with valid source/target vertices
+    edges = [edge for edge in edges if edge[0] in vertices and edge[1] in vertices]
+
+    # Containment: only parents that are actual vertices (not root "0" or layer "1")
+    children_map: dict[str, list[str]] = {}
+    for cell_id, info in vertices.items():
+        parent_id = info["parent"]
+        if parent_id and parent_id in vertices:
+            children_map.setdefault(parent_id, []).append(cell_id)
+
+    if not edges and not children_map:
+        labels = [info["label"] for info in vertices.values() if info["label"]]
+        if labels:
+            return "[Diagram] " + " ".join(labels) + "\n"
+        # Final fallback: any mxCell value (handles XML without vertex/edge
+        # attributes, e.g. simplified draw.io exports)
+        all_labels = _drawio_labels(root)
+        return "[Diagram] " + all_labels + "\n" if all_labels else ""
+
+    parts: list[str] = ["[Diagram]"]
+
+    labeled = [info["label"] for info in vertices.values() if info["label"]]
+    if labeled:
+        parts.append("Components: " + ", ".join(labeled))
+
+    if edges:
+        parts.append("Relationships:")
+        for source_id, target_id, edge_label in edges:
+            src_label = vertices[source_id]["label"] or source_id
+            tgt_label = vertices[target_id]["label"] or target_id
+            if edge_label:
+                parts.append(f"- {src_label} -> {edge_label} -> {tgt_label}")
+            else:
+                parts.append(f"- {src_label} -> {tgt_label}")
+
+    if children_map:
+        parts.append("Structure:")
+        for parent_id, child_ids in children_map.items():
+            parent_label = vertices[parent_id]["label"] or parent_id
+            child_labels = [vertices[cid]["label"] or cid for cid in child_ids]
+            parts.append(f"- {parent_label} contains: {', '.join(child_labels)}")
+
+    return "\n".join(parts) + "\n"
+
+
+# -- Entry points -------------------------------------------------------------------
+
+
+def walk_tiptap(doc: dict[str, Any] | None) -> TiptapIR:
+    """Walk a TipTap document (or canvas) once and return every derived output.
+
+    Args:
+        doc: TipTap JSON dict with type="doc" at root, or a canvas document
+             with format="canvas".
+
+    Returns:
+        TiptapIR. Markdown and plain text are empty unless the root is a doc
+        or canvas; canvas documents yield no images or chunk blocks (canvas
+        chunking works on spatial elements instead).
+    """
+    ir = TiptapIR()
+    if not doc or not isinstance(doc, dict):
+        return ir
+
+    walker = _Walker(_MAX_RECURSION_DEPTH, _MAX_NODE_COUNT)
+
+    if doc.get("format") == "canvas":
+        containers = doc.get("containers")
+        md_parts: list[str] = []
+        plain_parts: list[str] = []
+        for i, container in enumerate(containers if isinstance(containers, list) else [], 1):
+            if not isinstance(container, dict):
+                continue
+            content = container.get("content")
+            if not isinstance(content, dict) or content.get("type") != "doc":
+                continue
+            out = walker.visit(content, 0, 0, None, _Scope(None), [])
+            if out.md.strip():
+                md_parts.append(f"## Section {i}\n\n{out.md}")
+            if out.plain.strip():
+                plain_parts.append(out.plain.strip())
+        walker.images.clear()
+        ir.markdown = "\n".join(md_parts)
+        ir.plain_text = "\n\n".join(plain_parts)
+    else:
+        is_doc = doc.get("type") == "doc"
+        root = doc if is_doc else {"type": "doc", "content": doc.get("content", [])}
+        blocks: list[TiptapBlock] = []
+        out = walker.visit(root, 0, 0 if is_doc else None, _BLOCK, _Scope(None), blocks)
+        if is_doc:
+            ir.markdown = out.md
+            ir.plain_text = out.plain.strip()
+        ir.blocks = blocks
+        ir.images = walker.images
+
+    if walker.truncated and ir.markdown:
+        ir.markdown += _TRUNCATION_NOTICE
+    ir.attachment_ids = list(walker.attachment_ids)
+    return ir
+
+
+def content_hash(content_json: str) -> str:
+    """Cache key for a serialized document."""
+    return hashlib.sha256(content_json.encode("utf-8")).hexdigest()
+
+
+_local_cache: OrderedDict[str, TiptapIR] = OrderedDict()
+
+
+def _redis():
+    from .redis_service import redis_service
+
+    return redis_service if redis_service.is_connected else None
+
+
+async def get_tiptap_ir(content_json: str, content: dict[str, Any] | None = None) -> TiptapIR:
+    """IR for a serialized document, reusing a previous walk of the same content.
+
+    Looks in the per-process LRU, then Redis, and walks the document only on
+    a miss. Redis failures fall through to a fresh walk.
+
+    Args:
+        content_json: Document JSON exactly as stored (the cache key).
+        content: Already-parsed ``content_json``, to skip re-parsing on a miss.
+
+    Returns:
+        TiptapIR. Callers must not mutate it; it may be shared.
+    """
+    key = content_hash(content_json)
+    ir = _local_cache.get(key)
+    if ir is not None:
+        _local_cache.move_to_end(key)
+        return ir
+
+    ttl = get_agent_config().get_int("content.ir_cache_ttl_seconds", 3600)
+    rs = _redis() if ttl > 0 else None
+    if rs is not None:
+        try:
+            cached = await rs.get_json(f"{_IR_PREFIX}:{key}")
+            if cached is not None:
+                ir = TiptapIR.from_dict(cached)
+        except Exception as e:
+            logger.debug("TipTap IR cache read failed: %s", type(e).__name__)
+
+    if ir is None:
+        ir = walk_tiptap(content if content is not None else json.loads(content_json))
+        if rs is not None:
+            try:
+                await rs.set(f"{_IR_PREFIX}:{key}", ir.to_dict(), ttl=ttl)
+            except Exception as e:
+                logger.debug("TipTap IR cache write failed: %s", type(e).__name__)
+
+    _local_cache[key] = ir
+    if len(_local_cache) > _LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+    return ir
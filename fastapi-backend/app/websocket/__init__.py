@@ -43,7 +43,7 @@ from .presence import (
     PRESENCE_TTL,
     HEARTBEAT_INTERVAL,
 )
-from .room_auth import check_room_access
+from .room_auth import check_room_access, check_room_access_many
 
 __all__ = [
     # Manager
@@ -88,4 +88,5 @@ __all__ = [
     "HEARTBEAT_INTERVAL",
     # Room authorization
     "check_room_access",
+    "check_room_access_many",
 ]
@@ -0,0 +1,133 @@
+"""Short-window coalescing of high-frequency room broadcasts.
+
+Kanban drags emit bursts of ``task_moved`` / ``task_updated`` for the same
+task, checklist toggling emits one ``checklist_item_toggled`` per click,
+and typing and viewing indicators fire constantly. Each of these carries
+the entity's full latest state, so within a short window only the newest
+one per (room, message type, entity) needs to reach clients.
+
+The first event for a key is published immediately (no added latency for
+isolated updates) and opens a window of ``websocket.coalesce_window_ms``
+for its room. Further events for a key already sent or pending in that
+window replace each other and only the latest goes out when the window
+closes. Anything else published to the room first flushes the pending
+events, so room order is kept: a ``task_deleted`` never overtakes the
+``task_updated`` that preceded it.
+
+Updates sent as field deltas cannot simply replace each other, so the
+manager passes a ``merge`` that folds a newer delta into the pending one.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# publish(room_id, message, exclude) -> local recipients
+PublishFn = Callable[[str, dict[str, Any], Any], Awaitable[int]]
+# merge(pending, newer) -> message that replaces the pending one
+MergeFn = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]]
+
+
+class _RoomWindow:
+    """Pending and already-sent keys of one room's open coalescing window."""
+
+    __slots__ = ("lock", "pending", "sent", "timer")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.pending: dict[Hashable, tuple[dict[str, Any], Any]] = {}
+        self.sent: set[Hashable] = set()
+        self.timer: Optional[asyncio.Task] = None
+
+
+class RoomEventCoalescer:
+    """Coalesces room broadcasts per key within a short window.
+
+    Args:
+        publish: Publishes one message to a room (the un-coalesced path).
+        merge: Combines a pending message with a newer one for the same key
+            (default: the newer one wins).
+    """
+
+    def __init__(self, publish: PublishFn, merge: Optional[MergeFn] = None) -> None:
+        self._publish = publish
+        self._merge = merge
+        self._windows: dict[str, _RoomWindow] = {}
+        # Metrics
+        self.published = 0
+        self.coalesced = 0
+
+    async def submit(
+        self,
+        room_id: str,
+        key: Hashable,
+        message: dict[str, Any],
+        exclude: Any,
+        window_s: float,
+    ) -> None:
+        """Publish now, or hold as the latest state for ``key`` until the window closes."""
+        window = self._windows.get(room_id)
+        if window is not None and (key in window.pending or key in window.sent):
+            if key in window.pending:
+                self.coalesced += 1
+                if self._merge is not None:
+                    message = self._merge(window.pending[key][0], message)
+            window.pending[key] = (message, exclude)
+            return
+
+        if window is None:
+            window = _RoomWindow()
+            self._windows[room_id] = window
+            window.timer = asyncio.create_task(self._run_window(room_id, window, window_s))
+
+        async with window.lock:
+            await self._drain(room_id, window)
+            await self._send(room_id, message, exclude)
+            window.sent.add(key)
+
+    async def flush(self, room_id: str) -> None:
+        """Publish a room's pending events now (before an uncoalesced broadcast)."""
+        window = self._windows.get(room_id)
+        if window is None or not window.pending:
+            return
+        async with window.lock:
+            await self._drain(room_id, window)
+
+    async def _run_window(self, room_id: str, window: _RoomWindow, window_s: float) -> None:
+        """Close the room's window every ``window_s``; stop once a window is quiet."""
+        while True:
+            await asyncio.sleep(window_s)
+            async with window.lock:
+                window.sent = set()
+                if not await self._drain(room_id, window):
+                    if self._windows.get(room_id) is window:
+                        del self._windows[room_id]
+                    return
+
+    async def _drain(self, room_id: str, window: _RoomWindow) -> int:
+        """Publish pending events in first-seen order; caller holds the lock."""
+        events, window.pending = window.pending, {}
+        for key, (message, exclude) in events.items():
+            await self._send(room_id, message, exclude)
+            window.sent.add(key)
+        return len(events)
+
+    async def _send(self, room_id: str, message: dict[str, Any], exclude: Any) -> None:
+        try:
+            await self._publish(room_id, message, exclude)
+            self.published += 1
+        except Exception as e:
+            logger.warning("Coalesced broadcast to %s failed: %s", room_id, e)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "open_windows": len(self._windows),
+            "pending": sum(len(w.pending) for w in self._windows.values()),
+            "published": self.published,
+            "coalesced": self.coalesced,
+        }
+
+
+__all__ = ["RoomEventCoalescer"]
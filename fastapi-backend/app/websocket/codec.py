@@ -0,0 +1,104 @@
+"""Wire encodings for outbound WebSocket messages.
+
+Clients pick an encoding when they connect (``/ws?encoding=...``):
+
+- ``json`` (default): UTF-8 JSON text frames, produced by orjson
+- ``msgpack``: MessagePack binary frames, smaller for task payloads
+
+A broadcast wraps its message in one ``Frame`` shared by every recipient's
+send queue; each encoding is produced at most once per message, so fan-out
+cost does not grow with recipients. Direct sends from the endpoint (pings,
+rate-limit errors) stay JSON text, so msgpack clients must accept both
+frame kinds.
+
+Compression is negotiated per connection by the ASGI server
+(permessage-deflate) and applied to the encoded frame.
+"""
+
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional, Union
+from uuid import UUID
+
+import msgpack
+import orjson
+
+JSON = "json"
+MSGPACK = "msgpack"
+ENCODINGS = (JSON, MSGPACK)
+
+Encoded = Union[str, bytes]
+
+_BATCH_JSON_PREFIX = '{"type":"batch","events":['
+_msgpack_packer = msgpack.Packer(use_bin_type=True)
+_BATCH_MSGPACK_PREFIX = (
+    _msgpack_packer.pack_map_header(2)
+    + _msgpack_packer.pack("type")
+    + _msgpack_packer.pack("batch")
+    + _msgpack_packer.pack("events")
+)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Map the types orjson handles natively onto MessagePack primitives."""
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
+
+
+def encode_json(message: dict[str, Any]) -> str:
+    """Serialize a message to JSON text (UUIDs, datetimes and enums included)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def encode_msgpack(message: dict[str, Any]) -> bytes:
+    """Serialize a message to MessagePack."""
+    return msgpack.packb(message, default=_msgpack_default, use_bin_type=True)
+
+
+def encode(message: dict[str, Any], encoding: str) -> Encoded:
+    return encode_msgpack(message) if encoding == MSGPACK else encode_json(message)
+
+
+def batch(encoding: str, encoded: list[Encoded]) -> Encoded:
+    """Pack already-encoded messages into one BATCH message without re-encoding them."""
+    if encoding == MSGPACK:
+        return _BATCH_MSGPACK_PREFIX + _msgpack_packer.pack_array_header(len(encoded)) + b"".join(encoded)
+    return _BATCH_JSON_PREFIX + ",".join(encoded) + "]}"
+
+
+class Frame:
+    """One outbound message, encoded lazily and at most once per encoding."""
+
+    __slots__ = ("message", "_json", "_msgpack")
+
+    def __init__(self, message: dict[str, Any]) -> None:
+        self.message = message
+        self._json: Optional[str] = None
+        self._msgpack: Optional[bytes] = None
+
+    def encoded(self, encoding: str) -> Encoded:
+        if encoding == MSGPACK:
+            if self._msgpack is None:
+                self._msgpack = encode_msgpack(self.message)
+            return self._msgpack
+        if self._json is None:
+            self._json = encode_json(self.message)
+        return self._json
+
+
+__all__ = [
+    "ENCODINGS",
+    "JSON",
+    "MSGPACK",
+    "Encoded",
+    "Frame",
+    "batch",
+    "encode",
+    "encode_json",
+    "encode_msgpack",
+]
@@ -0,0 +1,147 @@
+"""Field-level deltas for task and project update broadcasts.
+
+``task_updated`` used to carry the whole task on every change, even when
+only ``task_rank`` or ``assignee_id`` moved. The last broadcast state of
+each task and project is now kept (``ws:snapshot:{kind}:{id}`` in Redis,
+an in-process LRU when Redis is unavailable). Every field edit bumps
+``row_version``, so an update exactly one version past that state is sent
+as ``changes`` (only the fields that differ) with ``base_version`` (the
+version the changes apply to) and the new ``row_version``. Clients patch
+their cached copy only when it is at ``base_version`` and refetch
+otherwise.
+
+A full payload is sent on create, when no snapshot is held, and whenever
+the versions are not consecutive: a gap (the entity changed through a path
+that does not publish an update), an unchanged version (a write that did
+not bump it), or two workers swapping snapshots out of order.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+from uuid import UUID
+
+import orjson
+
+from ..services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_PREFIX = "ws:snapshot:"
+_SNAPSHOT_TTL_S = 3600
+_LOCAL_MAX_ENTRIES = 10_000
+
+# Payload keys holding the full entity, by kind
+_ENTITY_FIELDS = ("task", "project")
+
+
+def _normalize(data: dict[str, Any]) -> dict[str, Any]:
+    """Round-trip through JSON so UUIDs and datetimes compare as sent."""
+    return orjson.loads(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
+
+
+def _changes(previous: Optional[dict[str, Any]], current: dict[str, Any]) -> Optional[dict[str, Any]]:
+    if previous is None or not isinstance(current.get("row_version"), int):
+        return None
+    if previous.get("row_version") != current["row_version"] - 1:
+        return None
+    return {k: v for k, v in current.items() if k not in previous or previous[k] != v}
+
+
+class EntitySnapshots:
+    """Last broadcast state per entity, used to compute update deltas."""
+
+    def __init__(self, max_local: int = _LOCAL_MAX_ENTRIES) -> None:
+        self._local: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._max_local = max_local
+        # Metrics
+        self.deltas = 0
+        self.full = 0
+
+    @staticmethod
+    def _key(kind: str, entity_id: UUID | str) -> str:
+        return f"{_SNAPSHOT_PREFIX}{kind}:{entity_id}"
+
+    async def _swap(self, key: str, data: dict[str, Any]) -> Optional[dict[str, Any]]:
+        if redis_service.is_connected:
+            return await redis_service.swap_json(key, data, _SNAPSHOT_TTL_S)
+        previous = self._local.pop(key, None)
+        self._local[key] = data
+        while len(self._local) > self._max_local:
+            self._local.popitem(last=False)
+        return previous
+
+    async def record(self, kind: str, entity_id: UUID | str, data: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Store ``data`` as the entity's latest broadcast state.
+
+        Args:
+            kind: Entity kind (``task`` or ``project``).
+            entity_id: The entity's UUID.
+            data: The full entity payload about to be broadcast.
+
+        Returns:
+            The fields that changed since the previous broadcast, which was
+            at ``row_version - 1``, or None when a full payload must be sent.
+        """
+        current = _normalize(data)
+        try:
+            previous = await self._swap(self._key(kind, entity_id), current)
+        except Exception as e:
+            logger.warning("Snapshot swap for %s %s failed: %s", kind, entity_id, e)
+            previous = None
+        changes = _changes(previous, current)
+        if changes is None:
+            self.full += 1
+        else:
+            self.deltas += 1
+        return changes
+
+    async def forget(self, kind: str, entity_id: UUID | str) -> None:
+        """Drop a deleted entity's snapshot."""
+        key = self._key(kind, entity_id)
+        self._local.pop(key, None)
+        if redis_service.is_connected:
+            try:
+                await redis_service.delete(key)
+            except Exception as e:
+                logger.warning("Snapshot delete for %s %s failed: %s", kind, entity_id, e)
+
+    def stats(self) -> dict[str, int]:
+        return {"deltas": self.deltas, "full": self.full, "local_entries": len(self._local)}
+
+
+def merge_updates(older: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    """Combine two pending updates for one entity so no delta is lost to coalescing.
+
+    A full payload supersedes whatever preceded it; a delta is folded into
+    the pending full payload or delta it directly follows. A delta that
+    does not follow the pending version replaces it unchanged, and clients
+    refetch on the version mismatch.
+    """
+    new_data = newer.get("data") or {}
+    old_data = older.get("data") or {}
+    if "changes" not in new_data:
+        return newer
+
+    base_version = new_data.get("base_version")
+    merged = dict(new_data)
+    for field in _ENTITY_FIELDS:
+        if isinstance(old_data.get(field), dict):
+            if old_data[field].get("row_version") != base_version:
+                return newer
+            merged[field] = {**old_data[field], **new_data["changes"]}
+            for key in ("changes", "base_version", "row_version"):
+                merged.pop(key, None)
+            return {**newer, "data": merged}
+    if isinstance(old_data.get("changes"), dict):
+        if old_data.get("row_version") != base_version:
+            return newer
+        merged["changes"] = {**old_data["changes"], **new_data["changes"]}
+        merged["base_version"] = old_data.get("base_version")
+    return {**newer, "data": merged}
+
+
+snapshots = EntitySnapshots()
+
+
+__all__ = ["EntitySnapshots", "merge_updates", "snapshots"]
@@ -0,0 +1,194 @@
+"""WebSocket endpoint shared by the API app and the standalone gateway.
+
+``app.main`` mounts this router unless ``WS_GATEWAY_ENABLED`` is set, in
+which case sockets are held only by the gateway process (``app.gateway``)
+and API workers publish events through Redis without holding any.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from uuid import UUID
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from ..ai.config_service import get_agent_config
+from ..config import settings
+from ..services.auth_service import validate_ws_connection_token
+from . import codec
+from .handlers import route_incoming_message
+from .manager import manager
+from .room_auth import check_room_access, check_room_access_many
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.websocket("/ws")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    token: str | None = None,
+    batch: bool = False,
+    encoding: str = codec.JSON,
+):
+    """
+    WebSocket endpoint for real-time collaboration.
+
+    Args:
+        websocket: The WebSocket connection
+        token: Opaque connection token for authentication (query parameter)
+        batch: Client accepts several queued messages in one ``batch`` frame
+        encoding: Wire encoding for broadcasts, ``json`` (text) or ``msgpack`` (binary)
+
+    Authentication uses opaque connection tokens obtained via POST /auth/ws-token.
+    JWT tokens are NOT accepted directly to avoid exposing them in URLs/logs.
+
+    Usage:
+        ws://localhost:8000/ws?token=<opaque_connection_token>&batch=1&encoding=msgpack
+    """
+    # Validate token — only accept opaque connection tokens
+    if not token:
+        logger.debug("WebSocket connection attempt without token")
+        await websocket.close(code=4001, reason="Authentication required")
+        return
+
+    if encoding not in codec.ENCODINGS:
+        logger.debug(f"WebSocket connection with unsupported encoding: {encoding}")
+        await websocket.close(code=4400, reason="Unsupported encoding")
+        return
+
+    user_id: UUID | None = None
+
+    try:
+        ws_user_id = await validate_ws_connection_token(token)
+        if ws_user_id:
+            user_id = UUID(ws_user_id)
+        else:
+            logger.debug("WebSocket connection with invalid token")
+            await websocket.close(code=4001, reason="Invalid token")
+            return
+    except Exception as e:
+        logger.warning(f"WebSocket token validation error: {e}")
+        await websocket.close(code=4001, reason="Invalid token")
+        return
+
+    # Accept connection and register
+    connection = await manager.connect(websocket, user_id, batch_frames=batch, encoding=encoding)
+    if connection is None:
+        logger.warning(f"WebSocket connection rejected (limit) for user: {user_id}")
+        return  # Connection rejected (DDoS protection)
+
+    logger.info(f"WebSocket connection established for user: {user_id}")
+
+    # Connection configuration (read from AgentConfigService with hardcoded fallbacks)
+    _ws_cfg = get_agent_config()
+    RECEIVE_TIMEOUT = _ws_cfg.get_int("websocket.receive_timeout", 45)
+    SERVER_PING_INTERVAL = _ws_cfg.get_int("websocket.ping_interval", 30)
+    RATE_LIMIT_MESSAGES = _ws_cfg.get_int("websocket.rate_limit_messages", 100)
+    RATE_LIMIT_WINDOW = _ws_cfg.get_int("websocket.rate_limit_window", 10)
+
+    # Rate limiting state
+    message_timestamps: list[float] = []
+
+    # Token validity tracking
+    token_valid = True
+
+    async def server_ping_task():
+        """Background task to send periodic pings with jitter."""
+        nonlocal token_valid
+        try:
+            while True:
+                await asyncio.sleep(SERVER_PING_INTERVAL + random.uniform(-5, 5))
+                try:
+                    # Send ping
+                    await websocket.send_json({"type": "ping", "data": {}})
+                except Exception:
+                    break  # Connection is dead, exit task
+        except asyncio.CancelledError:
+            pass
+
+    # Start server-initiated ping task
+    ping_task = asyncio.create_task(server_ping_task())
+
+    try:
+        while token_valid:
+            # Receive with timeout to detect stale connections
+            try:
+                raw_message = await asyncio.wait_for(websocket.receive_text(), timeout=RECEIVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # No message received within timeout - send ping to verify
+                try:
+                    await websocket.send_json({"type": "ping", "data": {}})
+                    raw_message = await asyncio.wait_for(websocket.receive_text(), timeout=10)
+                except (asyncio.TimeoutError, Exception):
+                    logger.info(f"Connection timeout for user: {user_id}")
+                    break
+
+            # Rate limiting check
+            current_time = asyncio.get_event_loop().time()
+            # Remove timestamps outside the window
+            message_timestamps[:] = [t for t in message_timestamps if current_time - t < RATE_LIMIT_WINDOW]
+
+            if len(message_timestamps) >= RATE_LIMIT_MESSAGES:
+                logger.warning(f"Rate limit exceeded for user {user_id}")
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "data": {"error": "RATE_LIMIT", "message": "Too many messages, slow down"},
+                    }
+                )
+                continue
+
+            message_timestamps.append(current_time)
+
+            # Validate message size
+            if len(raw_message) > settings.ws_max_message_size:
+                logger.warning(
+                    f"Message too large from user {user_id}: "
+                    f"{len(raw_message)} bytes (max: {settings.ws_max_message_size})"
+                )
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "data": {
+                            "error": "MESSAGE_TOO_LARGE",
+                            "message": f"Message exceeds maximum size of {settings.ws_max_message_size} bytes",
+                        },
+                    }
+                )
+                continue
+
+            # Parse JSON
+            try:
+                data = json.loads(raw_message)
+            except json.JSONDecodeError:
+                logger.warning(f"Invalid JSON from user {user_id}")
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "data": {"error": "INVALID_JSON", "message": "Invalid JSON format"},
+                    }
+                )
+                continue
+
+            await route_incoming_message(
+                connection,
+                data,
+                room_authorizer=check_room_access,
+                rooms_authorizer=check_room_access_many,
+            )
+
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket disconnect for user: {user_id}")
+    except Exception as e:
+        logger.error(f"WebSocket exception for user {user_id}: {e}")
+    finally:
+        # Cancel ping task and cleanup
+        ping_task.cancel()
+        try:
+            await ping_task
+        except asyncio.CancelledError:
+            pass
+        await manager.disconnect(websocket)
@@ -0,0 +1,161 @@
+"""Resumable room event streams for WebSocket reconnects.
+
+Room broadcasts are fire-and-forget over pub/sub, so a client that drops
+for a few seconds (network blip, deploy) used to refetch whole boards and
+document lists through REST to catch up. Every room event is now also
+appended to a capped Redis Stream per room (``ws:stream:{room_id}``), in
+the same Lua script that publishes it, and the stream entry id travels to
+clients as ``event_id`` (ids increase monotonically within a room).
+
+A reconnecting client sends the last ``event_id`` it saw with ``join_room``
+and receives only the events it missed, followed by a ``room_replay``
+summary. When the gap is no longer fully retained (trimmed past
+``websocket.replay_max_events``, or the stream expired after
+``websocket.replay_ttl_s`` without events) the summary says
+``complete: false`` and the client falls back to a full refetch.
+
+Presence, typing and viewing indicators are not streamed; they are only
+meaningful live.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Optional
+
+from ..ai.config_service import get_agent_config
+from ..services.redis_service import redis_service
+
+logger = logging.getLogger(__name__)
+
+_STREAM_PREFIX = "ws:stream:"
+_EVENT_ID_RE = re.compile(r"^\d+-\d+$")
+
+
+def _get_max_events() -> int:
+    return max(1, get_agent_config().get_int("websocket.replay_max_events", 200))
+
+
+def _get_ttl_s() -> int:
+    return max(1, get_agent_config().get_int("websocket.replay_ttl_s", 21600))
+
+
+def stream_key(room_id: str) -> str:
+    """Redis Stream key holding a room's recent events."""
+    return f"{_STREAM_PREFIX}{room_id}"
+
+
+def _parse_id(event_id: str) -> tuple[int, int]:
+    ms, seq = event_id.split("-", 1)
+    return int(ms), int(seq)
+
+
+async def publish_room_event(
+    channel: str,
+    room_id: str,
+    message: dict[str, Any],
+    exclude_conn_id: Optional[str] = None,
+) -> str:
+    """Append a room event to its stream and publish it for live delivery.
+
+    Args:
+        channel: Pub/sub channel relaying room broadcasts.
+        room_id: Target room.
+        message: The WebSocket message (type + data).
+        exclude_conn_id: Optional connection id the relay should skip.
+
+    Returns:
+        The event id assigned to the message.
+    """
+    envelope: dict[str, Any] = {"room_id": room_id, "message": message}
+    if exclude_conn_id is not None:
+        envelope["exclude_conn_id"] = exclude_conn_id
+    return await redis_service.publish_to_stream(
+        channel,
+        envelope,
+        stream_key(room_id),
+        message,
+        maxlen=_get_max_events(),
+        ttl=_get_ttl_s(),
+    )
+
+
+def with_event_id(message: dict[str, Any], room_id: str, event_id: Optional[str]) -> dict[str, Any]:
+    """Stamp a room message with its room and stream id (no-op without id)."""
+    if not event_id:
+        return message
+    return {**message, "room_id": room_id, "event_id": event_id}
+
+
+async def latest_event_id(room_id: str) -> Optional[str]:
+    """Id of the newest event in a room's stream, or None if it has none.
+
+    Sent with ROOM_JOINED so a client has a resume point before the first
+    live event arrives.
+    """
+    if not redis_service.is_connected:
+        return None
+    try:
+        entries = await redis_service.client.xrevrange(stream_key(room_id), count=1)
+    except Exception as e:
+        logger.debug("Event stream tip lookup failed for %s: %s", room_id, e)
+        return None
+    return entries[0][0] if entries else None
+
+
+async def replay_room_events(room_id: str, last_event_id: str) -> tuple[list[dict[str, Any]], bool]:
+    """Return the events of a room published after ``last_event_id``.
+
+    Args:
+        room_id: Room to replay.
+        last_event_id: Last event id the client received for this room.
+
+    Returns:
+        ``(events, complete)``. ``complete`` is False when events after
+        ``last_event_id`` may have been trimmed or expired (or Redis is
+        unavailable); the client must then refetch instead of patching.
+    """
+    if not redis_service.is_connected or not isinstance(last_event_id, str) or not _EVENT_ID_RE.match(last_event_id):
+        return [], False
+
+    key = stream_key(room_id)
+    limit = _get_max_events()
+    try:
+        pipe = redis_service.client.pipeline(transaction=False)
+        pipe.xinfo_stream(key)
+        pipe.xrange(key, min=f"({last_event_id}", max="+", count=limit + 1)
+        info, entries = await pipe.execute()
+    except Exception as e:
+        # Missing stream (expired) lands here too: XINFO errors on no such key
+        logger.debug("Event stream replay unavailable for %s: %s", room_id, e)
+        return [], False
+
+    # Nothing was missed if the cursor is still inside the stream, or (Redis
+    # 7+) if trimming stopped at or before it. A stream that expired and was
+    # recreated has no trimmed ids and starts after the cursor, so it fails both.
+    cursor = _parse_id(last_event_id)
+    first = info.get("first-entry")
+    max_deleted = info.get("max-deleted-entry-id")
+    retained = (first is not None and _parse_id(first[0]) <= cursor) or (
+        max_deleted is not None and max_deleted != "0-0" and _parse_id(max_deleted) <= cursor
+    )
+    if not retained or len(entries) > limit:
+        return [], False
+
+    events = []
+    for event_id, fields in entries:
+        try:
+            message = json.loads(fields["m"])
+        except (KeyError, ValueError):
+            continue
+        events.append(with_event_id(message, room_id, event_id))
+    return events, True
+
+
+__all__ = [
+    "latest_event_id",
+    "publish_room_event",
+    "replay_room_events",
+    "stream_key",
+    "with_event_id",
+]
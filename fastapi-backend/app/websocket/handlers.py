@@ -8,8 +8,12 @@ from typing import Any, Optional
 from uuid import UUID, uuid4
 
 from ..utils.timezone import utc_now
+from .deltas import snapshots
 from .manager import ConnectionManager, MessageType, WebSocketConnection, manager
 
+# Most rooms a single join_rooms message may ask for
+MAX_JOIN_ROOMS = 100
+
 logger = logging.getLogger(__name__)
 
 
@@ -195,13 +199,13 @@ async def handle_document_lock_change(
 
     if project_id:
         room = get_project_room(project_id)
-        if room not in rooms_sent and mgr.get_room_count(room) > 0:
+        if room not in rooms_sent and mgr.may_have_subscribers(room):
             scope_recipients += await mgr.broadcast_to_room(room, message)
             rooms_sent.add(room)
 
     if application_id:
         room = get_application_room(application_id)
-        if room not in rooms_sent and mgr.get_room_count(room) > 0:
+        if room not in rooms_sent and mgr.may_have_subscribers(room):
             scope_recipients += await mgr.broadcast_to_room(room, message)
             rooms_sent.add(room)
 
@@ -221,6 +225,28 @@ async def handle_document_lock_change(
     )
 
 
+async def _attach_entity(
+    payload: dict[str, Any],
+    kind: str,
+    entity_id: UUID | str,
+    action: UpdateAction,
+    data: dict[str, Any],
+) -> None:
+    """Put the entity on an update payload, as a field delta when possible."""
+    if action == UpdateAction.DELETED:
+        await snapshots.forget(kind, entity_id)
+        payload[kind] = data
+        return
+
+    changes = await snapshots.record(kind, entity_id, data)
+    if action == UpdateAction.UPDATED and changes is not None:
+        payload["changes"] = changes
+        payload["base_version"] = data["row_version"] - 1
+        payload["row_version"] = data["row_version"]
+    else:
+        payload[kind] = data
+
+
 async def handle_task_update(
     project_id: UUID | str,
     task_id: UUID | str,
@@ -234,6 +260,11 @@ async def handle_task_update(
     """
     Handle task update events and broadcast to project room.
 
+    Updates one ``row_version`` past the last broadcast state carry only
+    the changed fields (``changes`` + ``base_version`` + ``row_version``)
+    instead of ``task``; creates, status changes and non-consecutive
+    versions send the full task.
+
     Args:
         project_id: The project's UUID
         task_id: The task's UUID
@@ -264,9 +295,9 @@ async def handle_task_update(
         "task_id": str(task_id),
         "project_id": str(project_id),
         "action": action.value,
-        "task": task_data,
         "timestamp": utc_now().isoformat(),
     }
+    await _attach_entity(payload, "task", task_id, action, task_data)
 
     if user_id:
         payload["changed_by"] = str(user_id)
@@ -284,7 +315,7 @@ async def handle_task_update(
 
     # Also broadcast to task-specific room for detailed view subscribers
     task_room_id = get_task_room(task_id)
-    if mgr.get_room_count(task_room_id) > 0:
+    if mgr.may_have_subscribers(task_room_id):
         await mgr.broadcast_to_room(task_room_id, message)
 
     logger.info(f"Task {action.value}: task_id={task_id}, project_room={room_id}, recipients={recipients}")
@@ -308,6 +339,8 @@ async def handle_project_update(
     """
     Handle project update events and broadcast to application room.
 
+    Updates are sent as field deltas the same way as in handle_task_update.
+
     Args:
         application_id: The application's UUID
         project_id: The project's UUID
@@ -335,9 +368,9 @@ async def handle_project_update(
         "project_id": str(project_id),
         "application_id": str(application_id),
         "action": action.value,
-        "project": project_data,
         "timestamp": utc_now().isoformat(),
     }
+    await _attach_entity(payload, "project", project_id, action, project_data)
 
     if user_id:
         payload["changed_by"] = str(user_id)
@@ -351,7 +384,7 @@ async def handle_project_update(
 
     # Also broadcast to the project room for users viewing the project
     project_room_id = get_project_room(project_id)
-    if mgr.get_room_count(project_room_id) > 0:
+    if mgr.may_have_subscribers(project_room_id):
         await mgr.broadcast_to_room(project_room_id, message)
 
     logger.info(f"Project {action.value}: project_id={project_id}, application_room={room_id}, recipients={recipients}")
@@ -417,7 +450,7 @@ async def handle_project_status_changed(
 
     # Also broadcast to the project room for users viewing the project
     project_room_id = get_project_room(project_id)
-    if mgr.get_room_count(project_room_id) > 0:
+    if mgr.may_have_subscribers(project_room_id):
         await mgr.broadcast_to_room(project_room_id, message)
 
     logger.info(
@@ -635,6 +668,7 @@ async def route_incoming_message(
     data: dict[str, Any],
     connection_manager: Optional[ConnectionManager] = None,
     room_authorizer: Optional[Any] = None,
+    rooms_authorizer: Optional[Any] = None,
 ) -> None:
     """
     Route incoming WebSocket messages to appropriate handlers.
@@ -647,12 +681,18 @@ async def route_incoming_message(
         data: The message data
         connection_manager: Optional custom manager (defaults to global)
         room_authorizer: Optional callable(user_id, room_id) -> bool for room access check
+        rooms_authorizer: Optional callable(user_id, room_ids) -> dict[str, bool] for
+            join_rooms (defaults to check_room_access_many)
     """
     mgr = connection_manager or manager
     message_type = data.get("type")
 
     logger.debug(f"Routing message: user={connection.user_id}, type={message_type}")
 
+    if message_type == MessageType.JOIN_ROOMS.value:
+        await _handle_join_rooms(connection, data.get("data") or {}, mgr, rooms_authorizer)
+        return
+
     # Intercept JOIN_ROOM to enforce authorization
     if message_type == MessageType.JOIN_ROOM.value or message_type == "join_room":
         room_id = data.get("data", {}).get("room_id")
@@ -698,6 +738,64 @@ async def route_incoming_message(
                 logger.warning(f"Invalid action: {action_str}")
 
 
+async def _handle_join_rooms(
+    connection: WebSocketConnection,
+    payload: dict[str, Any],
+    mgr: ConnectionManager,
+    rooms_authorizer: Optional[Any],
+) -> None:
+    """
+    Join several rooms from one message, authorizing them in a single batch.
+
+    Payload: ``{"rooms": [{"room_id": ..., "last_event_id": ...}, ...]}``.
+    Each allowed room gets the same ROOM_JOINED (and replay) as join_room;
+    each denied room gets the same UNAUTHORIZED error.
+    """
+    requested: dict[str, Optional[str]] = {}
+    for entry in payload.get("rooms") or []:
+        if isinstance(entry, dict) and isinstance(entry.get("room_id"), str):
+            requested[entry["room_id"]] = entry.get("last_event_id")
+
+    if len(requested) > MAX_JOIN_ROOMS:
+        await mgr.send_personal(
+            connection,
+            {
+                "type": MessageType.ERROR.value,
+                "data": {
+                    "error": "TOO_MANY_ROOMS",
+                    "message": f"join_rooms accepts at most {MAX_JOIN_ROOMS} rooms",
+                },
+            },
+        )
+        return
+    if not requested:
+        return
+
+    if rooms_authorizer is None:
+        from .room_auth import check_room_access_many
+
+        rooms_authorizer = check_room_access_many
+
+    access = await rooms_authorizer(connection.user_id, list(requested))
+
+    for room_id, last_event_id in requested.items():
+        if access.get(room_id):
+            await mgr.join_room(connection, room_id, last_event_id=last_event_id)
+            continue
+        logger.warning(f"Room access denied: user={connection.user_id}, room={room_id}")
+        await mgr.send_personal(
+            connection,
+            {
+                "type": MessageType.ERROR.value,
+                "data": {
+                    "error": "UNAUTHORIZED",
+                    "message": f"Access denied to room: {room_id}",
+                    "room_id": room_id,
+                },
+            },
+        )
+
+
 async def handle_invitation_notification(
     user_id: UUID,
     invitation_data: dict[str, Any],
@@ -0,0 +1,107 @@
+"""Realtime startup and shutdown shared by the API app and the WebSocket gateway.
+
+Both processes connect Redis, run the pub/sub listener, subscribe the
+cache invalidation channels and watch Redis health. Only processes that
+hold sockets (``relay=True``) subscribe the ConnectionManager's broadcast
+channels; API workers behind a gateway publish room and user events but
+never receive them back.
+"""
+
+import logging
+
+from ..services.redis_service import redis_service
+from .manager import MessageType, manager
+from .presence import presence_manager
+
+logger = logging.getLogger(__name__)
+
+
+async def start_realtime(relay: bool = True) -> None:
+    """
+    Connect Redis and start the pub/sub machinery for this process.
+
+    Args:
+        relay: Subscribe the broadcast relay to local sockets (False for API
+            workers when WebSockets are served by the gateway)
+
+    Raises:
+        Exception: If Redis cannot be connected (callers decide whether that is fatal)
+    """
+    logger.info("Connecting to Redis...")
+    await redis_service.connect()
+    logger.info("Redis connected")
+
+    if relay:
+        logger.info("Initializing WebSocket manager with Redis...")
+        await manager.initialize_redis()
+        logger.info("WebSocket manager Redis initialized")
+    else:
+        logger.info("WebSocket gateway mode: API worker publishes events without a socket relay")
+
+    logger.info("Starting Redis pub/sub listener...")
+    await redis_service.start_listening()
+    logger.info("Redis pub/sub listener started")
+
+    # Subscribe cross-worker cache invalidation channels
+    from ..services.user_cache_service import setup_user_cache_pubsub
+    from .room_auth import setup_room_auth_pubsub
+
+    await setup_room_auth_pubsub()
+    await setup_user_cache_pubsub()
+    logger.info("Cache invalidation pub/sub channels subscribed")
+
+    # Start background health monitor with state-change callback
+    async def _on_redis_state_change(connected: bool) -> None:
+        """Handle Redis connected ↔ disconnected transitions."""
+        if connected:
+            logger.info("Redis recovered — re-initializing pub/sub and WebSocket relay")
+            try:
+                await redis_service.start_listening()
+                if relay:
+                    await manager.initialize_redis()
+            except Exception as exc:
+                logger.error("Failed to re-initialize after Redis recovery: %s", exc)
+
+            # Flush stale in-memory caches accumulated during the outage
+            try:
+                from ..services.user_cache_service import clear_all_caches
+
+                clear_all_caches()
+                logger.info("Flushed stale in-memory caches after Redis recovery")
+            except Exception as exc:
+                logger.error("Failed to flush caches after Redis recovery: %s", exc)
+        else:
+            logger.warning("Redis health monitor detected outage — gate is active")
+
+        # Broadcast status change to all local WebSocket connections
+        try:
+            await manager.broadcast_to_all(
+                {
+                    "type": MessageType.REDIS_STATUS_CHANGED,
+                    "data": {"connected": connected},
+                }
+            )
+        except Exception as exc:
+            logger.error("Failed to broadcast Redis status change: %s", exc)
+
+    await redis_service.start_health_monitor(interval=5, on_state_change=_on_redis_state_change)
+    logger.info("Redis health monitor started")
+
+
+async def stop_realtime() -> None:
+    """Flush buffered presence and disconnect Redis (shutdown)."""
+    # Write heartbeats still buffered for the next presence flush
+    try:
+        await presence_manager.stop()
+    except Exception as e:
+        logger.warning(f"Presence flush on shutdown failed: {e}")
+
+    logger.info("Stopping Redis health monitor...")
+    await redis_service.stop_health_monitor()
+
+    logger.info("Disconnecting from Redis...")
+    await redis_service.disconnect()
+    logger.info("Redis disconnected")
+
+
+__all__ = ["start_realtime", "stop_realtime"]
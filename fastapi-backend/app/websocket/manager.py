@@ -4,43 +4,35 @@ This module provides WebSocket connection management with:
 - Room-based connection grouping for targeted broadcasts
 - Redis pub/sub for cross-worker message delivery
 - User tracking for direct messaging
+- Per-connection bounded send queues with slow-consumer eviction
+- Short-window coalescing of high-frequency room events
 - Graceful disconnect handling
 """
 
 import asyncio
-import json
 import logging
 import time
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 from fastapi import WebSocket
 
 from ..ai.config_service import get_agent_config
 from ..config import settings
-from ..services.redis_service import redis_service
+from ..services.redis_service import ChannelPolicy, redis_service
 from ..utils.timezone import utc_now
+from . import codec
+from .coalescer import RoomEventCoalescer
+from .deltas import merge_updates
+from .event_stream import latest_event_id, publish_room_event, replay_room_events, with_event_id
+from .send_queue import SendQueue
 
 logger = logging.getLogger(__name__)
 
 
-def _ws_json_default(obj: Any) -> Any:
-    """Custom JSON serializer for WebSocket messages.
-
-    Handles UUID and datetime objects that ``json.dumps`` cannot
-    serialize by default.  Matches Starlette's ``send_json`` behaviour
-    which falls back to ``str()`` for unknown types.
-    """
-    if isinstance(obj, UUID):
-        return str(obj)
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
-
-
 class MessageType(str, Enum):
     """WebSocket message types."""
 
@@ -51,9 +43,14 @@ class MessageType(str, Enum):
 
     # Room events
     JOIN_ROOM = "join_room"
+    JOIN_ROOMS = "join_rooms"
     LEAVE_ROOM = "leave_room"
     ROOM_JOINED = "room_joined"
     ROOM_LEFT = "room_left"
+    ROOM_REPLAY = "room_replay"
+
+    # Envelope for several queued messages sent in one frame (opt-in)
+    BATCH = "batch"
 
     # Entity update events
     TASK_CREATED = "task_created"
@@ -156,6 +153,83 @@ class MessageType(str, Enum):
     PONG = "pong"
 
 
+# Presence/typing/viewing indicators: only the latest state matters, so they
+# travel on their own pub/sub channel that coalesces under backlog instead of
+# queueing behind (or ahead of) entity events.
+_EPHEMERAL_TYPES = frozenset(
+    {
+        MessageType.PRESENCE_UPDATE.value,
+        MessageType.TASK_VIEWERS.value,
+        MessageType.USER_PRESENCE.value,
+        MessageType.USER_TYPING.value,
+        MessageType.USER_VIEWING.value,
+    }
+)
+_EPHEMERAL_MAX_BACKLOG = 500
+
+# Per-send timeout for a connection's writer; 3 consecutive failures disconnect
+_SEND_TIMEOUT_S = 2.0
+# "Try Again Later": the client reconnects and resumes via room replay
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+# Most queued messages a writer packs into one batch frame
+_BATCH_MAX_EVENTS = 50
+
+
+def _message_type_value(message: dict[str, Any]) -> Any:
+    msg_type = message.get("type")
+    return msg_type.value if isinstance(msg_type, Enum) else msg_type
+
+
+def _sender_id(payload: dict[str, Any]) -> Any:
+    return payload.get("user_id") or (payload.get("d") or {}).get("uid")
+
+
+def _indicator_key(room_id: Optional[str], message: dict[str, Any]) -> tuple:
+    """Identity of a presence/typing/viewing message: same room, type and sender."""
+    return (room_id, _message_type_value(message), _sender_id(message.get("data") or {}))
+
+
+# High-frequency message types whose payload is the entity's full latest
+# state, mapped to the entity id they are coalesced on within a room
+_COALESCED_ENTITY: dict[str, Callable[[dict[str, Any]], Any]] = {
+    MessageType.TASK_UPDATED.value: lambda payload: payload.get("task_id"),
+    MessageType.TASK_MOVED.value: lambda payload: payload.get("task_id"),
+    MessageType.CHECKLIST_ITEM_TOGGLED.value: lambda payload: (payload.get("d") or {}).get("id"),
+    MessageType.USER_TYPING.value: _sender_id,
+    MessageType.USER_VIEWING.value: _sender_id,
+    MessageType.PRESENCE_UPDATE.value: lambda payload: "room",
+    MessageType.TASK_VIEWERS.value: lambda payload: (payload.get("d") or {}).get("tid"),
+}
+
+
+def _coalesce_key(message: dict[str, Any], exclude: Optional["WebSocketConnection"]) -> Optional[tuple]:
+    """Coalescing identity of a room message (type, entity, exclusion), or None."""
+    msg_type = _message_type_value(message)
+    entity_of = _COALESCED_ENTITY.get(msg_type)
+    if entity_of is None:
+        return None
+    entity_id = entity_of(message.get("data") or {})
+    if entity_id is None:
+        return None
+    return (msg_type, entity_id, id(exclude.websocket) if exclude else None)
+
+
+def _ephemeral_coalesce_key(data: dict) -> Optional[tuple]:
+    """Identity of an ephemeral broadcast: same room, type, sender and exclusion."""
+    message = data.get("message")
+    if not isinstance(message, dict):
+        return None
+    return (*_indicator_key(data.get("room_id"), message), data.get("exclude_conn_id"))
+
+
+def _get_send_queue_max() -> int:
+    return get_agent_config().get_int("websocket.send_queue_max", 256)
+
+
+def _get_coalesce_window_ms() -> int:
+    return get_agent_config().get_int("websocket.coalesce_window_ms", 75)
+
+
 @dataclass
 class WebSocketConnection:
     """Represents a WebSocket connection with user context."""
@@ -165,6 +239,15 @@ class WebSocketConnection:
     connected_at: datetime = field(default_factory=lambda: utc_now())
     rooms: set[str] = field(default_factory=set)
     consecutive_failures: int = 0
+    # Outbound broadcasts, drained by the writer task started in connect()
+    send_queue: SendQueue = field(default_factory=SendQueue, repr=False)
+    writer: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Client accepts several queued messages in one BATCH frame
+    batch_frames: bool = False
+    # Wire encoding chosen at connect (codec.JSON or codec.MSGPACK)
+    encoding: str = codec.JSON
+    # Live room events held back while a rejoin replay is being sent
+    replay_holds: dict[str, list[tuple[codec.Frame, Optional[str]]]] = field(default_factory=dict, repr=False)
 
     def __hash__(self) -> int:
         """Hash by websocket id for set operations."""
@@ -184,6 +267,8 @@ class ConnectionManager:
     Features:
     - Room-based connection grouping for targeted broadcasts
     - Redis pub/sub for cross-worker message delivery
+    - Non-blocking fan-out through per-connection send queues
+    - Coalescing of high-frequency room events
     - User tracking per room
     - Graceful disconnect handling
     - Message type validation
@@ -192,6 +277,7 @@ class ConnectionManager:
 
     # Redis pub/sub channels
     _BROADCAST_CHANNEL = "ws:broadcast"
+    _EPHEMERAL_CHANNEL = "ws:broadcast:ephemeral"
     _USER_CHANNEL = "ws:user"
 
     def __init__(self) -> None:
@@ -213,6 +299,12 @@ class ConnectionManager:
         self._init_lock = asyncio.Lock()
         # Redis initialization flag
         self._redis_initialized = False
+        # Connections closed because their send queue overflowed
+        self._evicted_slow_consumers = 0
+        # Latest-state-wins window for high-frequency room events
+        self._coalescer = RoomEventCoalescer(self._publish_to_room, merge=merge_updates)
+        # Per-process connection cap override (set by the WebSocket gateway)
+        self.max_connections: Optional[int] = None
 
     async def _get_room_lock(self, room_id: str) -> asyncio.Lock:
         """Get or create a lock for a specific room."""
@@ -234,7 +326,22 @@ class ConnectionManager:
             if self._redis_initialized:
                 return
 
-            await redis_service.subscribe(self._BROADCAST_CHANNEL, self._handle_redis_broadcast)
+            # Entity events must never be lost, so room broadcasts block rather
+            # than drop; the handler only enqueues per recipient, so it keeps up
+            await redis_service.subscribe(
+                self._BROADCAST_CHANNEL,
+                self._handle_redis_broadcast,
+                policy=ChannelPolicy(max_backlog=settings.redis_pubsub_max_backlog, overflow="block"),
+            )
+            await redis_service.subscribe(
+                self._EPHEMERAL_CHANNEL,
+                self._handle_redis_broadcast,
+                policy=ChannelPolicy(
+                    max_backlog=_EPHEMERAL_MAX_BACKLOG,
+                    overflow="coalesce",
+                    coalesce_key=_ephemeral_coalesce_key,
+                ),
+            )
             await redis_service.subscribe(self._USER_CHANNEL, self._handle_redis_user_message)
             self._redis_initialized = True
             logger.info("ConnectionManager Redis pub/sub initialized")
@@ -243,10 +350,11 @@ class ConnectionManager:
         """
         Handle broadcast messages from Redis (from other workers).
 
-        Uses batched sends with timeout to prevent amplification.
+        Only queues the message on each local recipient's send queue.
 
         Args:
-            data: Message containing room_id, message, and exclude_conn_id
+            data: Message containing room_id, message, exclude_conn_id and,
+                for streamed room events, event_id
         """
         room_id = data.get("room_id")
         message = data.get("message")
@@ -254,6 +362,7 @@ class ConnectionManager:
 
         if not room_id or not message:
             return
+        message = with_event_id(message, room_id, data.get("event_id"))
 
         # Send to LOCAL connections only (Redis already distributed to all workers)
         connections = [
@@ -262,7 +371,7 @@ class ConnectionManager:
             if not (exclude_conn_id and str(id(conn.websocket)) == exclude_conn_id)
         ]
 
-        await self._batched_send(connections, message)
+        self._fanout(connections, message, room_id)
 
     async def _handle_redis_user_message(self, data: dict) -> None:
         """
@@ -284,54 +393,109 @@ class ConnectionManager:
 
         # Send to LOCAL connections for this user
         connections = list(self._user_connections.get(user_id, set()).copy())
-        await self._batched_send(connections, message)
+        self._fanout(connections, message)
 
-    async def _batched_send(
+    def _fanout(
         self,
         connections: list[WebSocketConnection],
         message: dict[str, Any],
+        room_id: Optional[str] = None,
     ) -> int:
-        """Send a message to connections in batches with per-send timeout.
-
-        Pre-serializes the message to JSON once, then sends the text string
-        to each connection to avoid redundant serialization per recipient.
+        """Queue a message on each connection's send queue without waiting.
 
-        Sends in groups of 50 with a 2-second timeout per send to prevent
-        amplification and stalled connections from blocking the event loop.
+        The message is serialized once per wire encoding in use among the
+        recipients; each connection's writer task delivers it. Room presence/typing/viewing indicators replace an
+        older queued one from the same sender. A connection whose queue is
+        full of undeliverable messages is evicted as a slow consumer. A
+        connection still receiving a replay of ``room_id`` holds the message
+        until the replay is sent (see join_room).
 
         Args:
             connections: List of target connections.
             message: The message dict to send.
+            room_id: Room the message is for, if any (scopes coalescing).
 
         Returns:
-            Number of successful sends.
+            Number of connections the message was queued for.
         """
         if not connections:
             return 0
 
-        _BATCH_SIZE = get_agent_config().get_int("websocket.batch_size", 50)
-        _SEND_TIMEOUT_S = 2.0
-        success_count = 0
-
-        # Pre-serialize once instead of per-connection
-        serialized = json.dumps(message, default=_ws_json_default)
-
-        for i in range(0, len(connections), _BATCH_SIZE):
-            batch = connections[i : i + _BATCH_SIZE]
-            tasks = [
-                asyncio.wait_for(
-                    self._send_text_personal(conn, serialized),
-                    timeout=_SEND_TIMEOUT_S,
-                )
-                for conn in batch
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            success_count += sum(1 for r in results if r is True)
-            # Yield to event loop between batches
-            if i + _BATCH_SIZE < len(connections):
-                await asyncio.sleep(0)
+        frame = codec.Frame(message)
+        key = _indicator_key(room_id, message) if room_id and _message_type_value(message) in _EPHEMERAL_TYPES else None
+
+        queued = 0
+        for conn in connections:
+            # Encodes on the first recipient of each encoding (errors reach the caller)
+            frame.encoded(conn.encoding)
+            held = conn.replay_holds.get(room_id) if room_id else None
+            if held is not None:
+                held.append((frame, key))
+                queued += 1
+            elif conn.send_queue.put(frame, key):
+                queued += 1
+            elif not conn.send_queue.closed:
+                self._evict_slow_consumer(conn)
+        return queued
+
+    async def _write_loop(self, connection: WebSocketConnection) -> None:
+        """Deliver a connection's queued messages in order (one task per connection).
+
+        For clients that opted into batch frames, everything queued while the
+        previous send was in flight goes out as one BATCH message.
+        """
+        queue = connection.send_queue
+        encoding = connection.encoding
+        while not queue.closed:
+            await queue.not_empty.wait()
+            if not len(queue):
+                continue
+            if connection.batch_frames and len(queue) > 1:
+                encoded = [queue.pop().encoded(encoding) for _ in range(min(len(queue), _BATCH_MAX_EVENTS))]
+                payload = codec.batch(encoding, encoded)
+            else:
+                encoded = [queue.pop().encoded(encoding)]
+                payload = encoded[0]
+            if await self._send_encoded(connection, payload):
+                queue.sent += len(encoded)
+
+    def _evict_slow_consumer(self, connection: WebSocketConnection) -> None:
+        """Drop a connection that cannot keep up with its broadcasts."""
+        self._evicted_slow_consumers += 1
+        logger.warning(
+            "Evicting slow WebSocket consumer: user=%s, queued=%d",
+            connection.user_id,
+            len(connection.send_queue),
+        )
+        connection.send_queue.close()
+        task = asyncio.create_task(self._close_slow_consumer(connection))
+        task.add_done_callback(self._log_disconnect_error)
 
-        return success_count
+    async def _close_slow_consumer(self, connection: WebSocketConnection) -> None:
+        try:
+            await asyncio.wait_for(
+                connection.websocket.close(code=_SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer"),
+                timeout=_SEND_TIMEOUT_S,
+            )
+        except Exception:
+            pass  # Already closed or the transport is stuck; unregister regardless
+        await self.disconnect(connection.websocket)
+
+    def send_queue_stats(self) -> dict[str, Any]:
+        """Aggregate send queue backlog and overflow counters for local connections."""
+        queues = [conn.send_queue for conn in self._connections.values()]
+        return {
+            "max_size": _get_send_queue_max(),
+            "backlog": sum(len(q) for q in queues),
+            "max_backlog": max((len(q) for q in queues), default=0),
+            "coalesced": sum(q.coalesced for q in queues),
+            "shed": sum(q.shed for q in queues),
+            "evicted": self._evicted_slow_consumers,
+        }
+
+    def coalesce_stats(self) -> dict[str, Any]:
+        """Open coalescing windows and published/coalesced room event counters."""
+        return self._coalescer.stats()
 
     @property
     def total_connections(self) -> int:
@@ -347,6 +511,15 @@ class ConnectionManager:
         """Get number of connections in a room."""
         return len(self._rooms.get(room_id, set()))
 
+    def may_have_subscribers(self, room_id: str) -> bool:
+        """Whether a room broadcast could reach anyone.
+
+        Room counts only cover this process's sockets. With Redis, other
+        workers (or the WebSocket gateway, when API workers hold no sockets)
+        may have subscribers, so the broadcast must be published.
+        """
+        return redis_service.is_connected or self.get_room_count(room_id) > 0
+
     def get_user_connections_count(self, user_id: UUID) -> int:
         """Get number of connections for a user."""
         return len(self._user_connections.get(user_id, set()))
@@ -356,6 +529,8 @@ class ConnectionManager:
         websocket: WebSocket,
         user_id: UUID,
         initial_rooms: Optional[list[str]] = None,
+        batch_frames: bool = False,
+        encoding: str = codec.JSON,
     ) -> Optional[WebSocketConnection]:
         """
         Accept a WebSocket connection and register it.
@@ -364,12 +539,14 @@ class ConnectionManager:
             websocket: The WebSocket instance
             user_id: The authenticated user's ID
             initial_rooms: Optional list of rooms to join immediately
+            batch_frames: Whether the client accepts BATCH frames
+            encoding: Wire encoding for server-to-client messages
 
         Returns:
             WebSocketConnection: The connection wrapper object, or None if rejected
         """
         # L3: Global WebSocket connection cap (per worker process)
-        _global_cap = get_agent_config().get_int("websocket.max_global_connections", 10000)
+        _global_cap = self.max_connections or get_agent_config().get_int("websocket.max_global_connections", 10000)
         if len(self._connections) >= _global_cap:
             logger.warning(
                 "Global WebSocket cap reached: %d/%d — rejecting connection for user %s",
@@ -395,7 +572,11 @@ class ConnectionManager:
         connection = WebSocketConnection(
             websocket=websocket,
             user_id=user_id,
+            send_queue=SendQueue(_get_send_queue_max()),
+            batch_frames=batch_frames,
+            encoding=encoding,
         )
+        connection.writer = asyncio.create_task(self._write_loop(connection))
 
         async with self._connection_lock:
             self._connections[websocket] = connection
@@ -441,6 +622,11 @@ class ConnectionManager:
             if connection is None:
                 return
 
+            # Stop the writer; anything still queued is undeliverable now
+            connection.send_queue.close()
+            if connection.writer is not None:
+                connection.writer.cancel()
+
             # Remove from user tracking
             if connection.user_id in self._user_connections:
                 self._user_connections[connection.user_id].discard(connection)
@@ -469,14 +655,22 @@ class ConnectionManager:
         connection: WebSocketConnection,
         room_id: str,
         notify_others: bool = True,
+        last_event_id: Optional[str] = None,
     ) -> None:
         """
         Add a connection to a room.
 
+        When the client resumes with ``last_event_id``, the room events it
+        missed are replayed after ROOM_JOINED, followed by a ROOM_REPLAY
+        summary whose ``complete`` flag tells it whether a refetch is needed.
+        Live events for the room are held until then, so none overtakes an
+        older replayed one.
+
         Args:
             connection: The connection to add
             room_id: The room identifier
             notify_others: Whether to notify other room members
+            last_event_id: Last room event id the client saw before reconnecting
         """
         room_lock = await self._get_room_lock(room_id)
         async with room_lock:
@@ -484,18 +678,54 @@ class ConnectionManager:
                 self._rooms[room_id] = set()
             self._rooms[room_id].add(connection)
             connection.rooms.add(room_id)
+            if last_event_id:
+                connection.replay_holds[room_id] = []
 
-        # Confirm to the joining user
-        await self.send_personal(
-            connection,
-            {
-                "type": MessageType.ROOM_JOINED,
-                "data": {
-                    "room_id": room_id,
-                    "user_count": self.get_room_count(room_id),
+        # Replay is read after joining, so an event published meanwhile can be
+        # both replayed and held; the held copy is dropped on release.
+        missed: list[dict[str, Any]] = []
+        try:
+            if last_event_id:
+                missed, complete = await replay_room_events(room_id, last_event_id)
+                if not complete:
+                    latest = await latest_event_id(room_id)
+                else:
+                    latest = missed[-1]["event_id"] if missed else last_event_id
+            else:
+                complete = True
+                latest = await latest_event_id(room_id)
+
+            # Confirm to the joining user
+            await self.send_personal(
+                connection,
+                {
+                    "type": MessageType.ROOM_JOINED,
+                    "data": {
+                        "room_id": room_id,
+                        "user_count": self.get_room_count(room_id),
+                        "latest_event_id": latest,
+                    },
                 },
-            },
-        )
+            )
+
+            if last_event_id:
+                for event in missed:
+                    await self.send_personal(connection, event)
+                await self.send_personal(
+                    connection,
+                    {
+                        "type": MessageType.ROOM_REPLAY,
+                        "data": {
+                            "room_id": room_id,
+                            "complete": complete,
+                            "replayed": len(missed),
+                            "latest_event_id": latest,
+                        },
+                    },
+                )
+        finally:
+            if last_event_id:
+                self._release_replay_hold(connection, room_id, {event["event_id"] for event in missed})
 
         # Notify other room members
         if notify_others:
@@ -513,6 +743,22 @@ class ConnectionManager:
                 exclude=connection,
             )
 
+    def _release_replay_hold(
+        self,
+        connection: WebSocketConnection,
+        room_id: str,
+        replayed: set[str],
+    ) -> None:
+        """Queue the live room events held during a replay, skipping replayed ones."""
+        held = connection.replay_holds.pop(room_id, None) or []
+        for frame, key in held:
+            if frame.message.get("event_id") in replayed:
+                continue
+            if not connection.send_queue.put(frame, key):
+                if not connection.send_queue.closed:
+                    self._evict_slow_consumer(connection)
+                return
+
     async def leave_room(
         self,
         connection: WebSocketConnection,
@@ -536,6 +782,7 @@ class ConnectionManager:
                     del self._rooms[room_id]
                     room_empty = True
             connection.rooms.discard(room_id)
+            connection.replay_holds.pop(room_id, None)
 
         # Clean up per-room lock when room becomes empty to prevent unbounded growth
         if room_empty:
@@ -587,7 +834,10 @@ class ConnectionManager:
             bool: True if sent successfully, False otherwise
         """
         try:
-            await connection.websocket.send_json(message)
+            if connection.encoding == codec.MSGPACK:
+                await connection.websocket.send_bytes(codec.encode_msgpack(message))
+            else:
+                await connection.websocket.send_json(message)
             connection.consecutive_failures = 0
             return True
         except Exception:
@@ -602,25 +852,29 @@ class ConnectionManager:
                 task.add_done_callback(self._log_disconnect_error)
             return False
 
-    async def _send_text_personal(
+    async def _send_encoded(
         self,
         connection: WebSocketConnection,
-        serialized: str,
+        payload: codec.Encoded,
     ) -> bool:
-        """Send a pre-serialized JSON string to a specific connection.
+        """Send an already-encoded message to a specific connection.
 
         Same failure tracking as send_personal but avoids per-connection
-        JSON serialization overhead during broadcasts.
+        serialization overhead during broadcasts. Text is sent as a text
+        frame, bytes (MessagePack) as a binary frame. A send that does not
+        complete within 2 seconds counts as a failure.
 
         Args:
             connection: The target connection
-            serialized: Pre-serialized JSON string
+            payload: Encoded message from codec
 
         Returns:
             bool: True if sent successfully, False otherwise
         """
+        websocket = connection.websocket
+        send = websocket.send_bytes if isinstance(payload, bytes) else websocket.send_text
         try:
-            await connection.websocket.send_text(serialized)
+            await asyncio.wait_for(send(payload), timeout=_SEND_TIMEOUT_S)
             connection.consecutive_failures = 0
             return True
         except Exception:
@@ -653,7 +907,16 @@ class ConnectionManager:
         """
         Broadcast a message to all connections in a room (across all workers).
 
-        Uses Redis pub/sub to ensure all workers receive the broadcast.
+        Uses Redis pub/sub to ensure all workers receive the broadcast. Room
+        events are also appended to the room's replay stream and delivered
+        with an ``event_id``. Presence, typing and viewing indicators go on
+        the ephemeral channel instead, which coalesces them when receivers
+        fall behind and is not replayed.
+
+        High-frequency types (task moves and updates, checklist toggles,
+        indicators) are coalesced per entity: the first is sent at once,
+        repeats within ``websocket.coalesce_window_ms`` collapse into the
+        latest one sent when the window closes.
 
         Args:
             room_id: The room to broadcast to
@@ -661,18 +924,40 @@ class ConnectionManager:
             exclude: Optional connection to exclude from broadcast
 
         Returns:
-            int: Number of local successful sends
+            int: Number of local connections in the room
         """
+        window_ms = _get_coalesce_window_ms()
+        key = _coalesce_key(message, exclude) if window_ms > 0 else None
+        if key is not None:
+            await self._coalescer.submit(room_id, key, message, exclude, window_ms / 1000)
+            return self.get_room_count(room_id)
+
+        # Pending coalesced events for the room go out first to keep order
+        await self._coalescer.flush(room_id)
+        return await self._publish_to_room(room_id, message, exclude)
+
+    async def _publish_to_room(
+        self,
+        room_id: str,
+        message: dict[str, Any],
+        exclude: Optional[WebSocketConnection] = None,
+    ) -> int:
+        """Publish a room message for delivery on every worker (no coalescing)."""
         # Publish to Redis for cross-worker delivery
         if redis_service.is_connected:
-            await redis_service.publish(
-                self._BROADCAST_CHANNEL,
-                {
-                    "room_id": room_id,
-                    "message": message,
-                    "exclude_conn_id": str(id(exclude.websocket)) if exclude else None,
-                },
-            )
+            exclude_conn_id = str(id(exclude.websocket)) if exclude else None
+            if _message_type_value(message) in _EPHEMERAL_TYPES:
+                await redis_service.publish(
+                    self._EPHEMERAL_CHANNEL,
+                    {
+                        "room_id": room_id,
+                        "message": message,
+                        "exclude_conn_id": exclude_conn_id,
+                    },
+                )
+            else:
+                # Also appended to the room's event stream for reconnect replay
+                await publish_room_event(self._BROADCAST_CHANNEL, room_id, message, exclude_conn_id)
             # Redis will deliver to all workers including this one via _handle_redis_broadcast
             return len(self._rooms.get(room_id, []))
 
@@ -692,7 +977,7 @@ class ConnectionManager:
         if not connections:
             return 0
 
-        return await self._batched_send(connections, message)
+        return self._fanout(connections, message, room_id)
 
     async def broadcast_to_user(
         self,
@@ -729,7 +1014,7 @@ class ConnectionManager:
         if not connections:
             return 0
 
-        return await self._batched_send(connections, message)
+        return self._fanout(connections, message)
 
     async def broadcast_to_all(
         self,
@@ -744,7 +1029,7 @@ class ConnectionManager:
             exclude: Optional connection to exclude
 
         Returns:
-            int: Number of successful sends
+            int: Number of connections the message was queued for
         """
         connections = list(self._connections.values())
 
@@ -754,7 +1039,7 @@ class ConnectionManager:
         if not connections:
             return 0
 
-        return await self._batched_send(connections, message)
+        return self._fanout(connections, message)
 
     async def handle_message(
         self,
@@ -783,7 +1068,11 @@ class ConnectionManager:
                 from .room_auth import check_room_access
 
                 if await check_room_access(connection.user_id, room_id):
-                    await self.join_room(connection, room_id)
+                    await self.join_room(
+                        connection,
+                        room_id,
+                        last_event_id=data.get("data", {}).get("last_event_id"),
+                    )
                 else:
                     logger.warning(
                         "Room join DENIED: user=%s room=%s",
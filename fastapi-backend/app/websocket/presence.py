@@ -6,9 +6,17 @@ across multiple Uvicorn workers.
 Uses Redis sorted sets for timestamp-based presence tracking and
 Redis hashes for user metadata (name, avatar, idle status).
 
-Cleanup is handled by ARQ worker (see app/worker.py).
+Heartbeats are buffered per worker and written in one pipeline per flush
+interval (``websocket.presence_flush_ms``): one ZADD and one HSET per room,
+one SADD per user, plus one SADD to the ``presence:rooms`` index of rooms
+with presence. A repeated heartbeat for the same room and user within an
+interval is written once. Reads see a heartbeat after the next flush.
+
+Cleanup is handled by ARQ worker (see app/worker.py), which walks only the
+rooms in ``presence:rooms`` instead of scanning the keyspace.
 """
 
+import asyncio
 import json
 import logging
 import time
@@ -26,6 +34,12 @@ _cfg = get_agent_config()
 # Presence TTL in seconds (45s allows for network jitter with 30s heartbeat)
 PRESENCE_TTL = _cfg.get_int("websocket.presence_ttl", 45)
 HEARTBEAT_INTERVAL = 30
+# Set of rooms with presence entries, walked by the cleanup job
+PRESENCE_ROOMS_KEY = "presence:rooms"
+
+
+def _get_flush_interval_s() -> float:
+    return max(50, _cfg.get_int("websocket.presence_flush_ms", 1000)) / 1000
 
 
 @dataclass
@@ -68,11 +82,15 @@ class PresenceManager:
         # Note: asyncio.Lock is not created here to avoid event loop issues
         # It will be created lazily when needed
         self._lock: Optional[Any] = None
+        # Heartbeats awaiting the next flush: (room_id, user_id) -> (timestamp, user data JSON)
+        self._pending: dict[tuple[str, str], tuple[float, str]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        # Metrics
+        self.heartbeats = 0
+        self.flushes = 0
 
     def _get_lock(self):
         """Get or create the asyncio lock (lazy initialization)."""
-        import asyncio
-
         if self._lock is None:
             self._lock = asyncio.Lock()
         return self._lock
@@ -98,25 +116,18 @@ class PresenceManager:
         now = time.time()
 
         if redis_service.is_connected:
-            try:
-                # Update presence timestamp in sorted set
-                await redis_service.presence_set(room_id, user_id, now)
-
-                # Store user metadata in hash
-                user_data = json.dumps(
-                    {
-                        "name": user_name,
-                        "avatar": avatar_url,
-                        "idle": idle,
-                    }
-                )
-                await redis_service.client.hset(f"{self._USER_DATA_PREFIX}{room_id}", user_id, user_data)
-
-                # Track room in user's reverse index for O(1) leave_all
-                await redis_service.client.sadd(f"{self._USER_ROOMS_PREFIX}{user_id}", room_id)
-            except Exception as e:
-                logger.error(f"Redis heartbeat error: {e}")
-                # Fall through to local storage
+            # Buffered; written by the flusher in one pipeline per interval
+            user_data = json.dumps(
+                {
+                    "name": user_name,
+                    "avatar": avatar_url,
+                    "idle": idle,
+                }
+            )
+            self._pending[(room_id, user_id)] = (now, user_data)
+            self.heartbeats += 1
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush_loop())
         else:
             # Fallback: update local storage
             async with self._get_lock():
@@ -135,6 +146,64 @@ class PresenceManager:
                     self._local_user_rooms[user_id] = set()
                 self._local_user_rooms[user_id].add(room_id)
 
+    async def _flush_loop(self) -> None:
+        """Write buffered heartbeats every flush interval until none arrive."""
+        while True:
+            await asyncio.sleep(_get_flush_interval_s())
+            if not self._pending:
+                return
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write buffered heartbeats to Redis in a single pipeline.
+
+        Returns:
+            Number of (room, user) heartbeats written
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        scores: dict[str, dict[str, float]] = {}
+        user_data: dict[str, dict[str, str]] = {}
+        user_rooms: dict[str, list[str]] = {}
+        for (room_id, user_id), (timestamp, data) in pending.items():
+            scores.setdefault(room_id, {})[user_id] = timestamp
+            user_data.setdefault(room_id, {})[user_id] = data
+            user_rooms.setdefault(user_id, []).append(room_id)
+
+        try:
+            pipe = redis_service.client.pipeline(transaction=False)
+            for room_id, members in scores.items():
+                pipe.zadd(f"{self._PRESENCE_PREFIX}{room_id}", members)
+                pipe.hset(f"{self._USER_DATA_PREFIX}{room_id}", mapping=user_data[room_id])
+            # Track rooms in each user's reverse index for O(1) leave_all
+            for user_id, room_ids in user_rooms.items():
+                pipe.sadd(f"{self._USER_ROOMS_PREFIX}{user_id}", *room_ids)
+            pipe.sadd(PRESENCE_ROOMS_KEY, *scores)
+            await pipe.execute()
+            self.flushes += 1
+        except Exception as e:
+            logger.error(f"Redis heartbeat flush error: {e}")
+            # Keep the newest state for the next flush unless superseded meanwhile
+            for key, value in pending.items():
+                self._pending.setdefault(key, value)
+            return 0
+        return len(pending)
+
+    async def stop(self) -> None:
+        """Stop the flusher and write any buffered heartbeats (shutdown)."""
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+        if self._pending and redis_service.is_connected:
+            await self.flush()
+
     async def leave(
         self,
         room_id: str,
@@ -147,6 +216,9 @@ class PresenceManager:
             room_id: The room to leave
             user_id: The user's ID
         """
+        # A buffered heartbeat must not re-add the user after leaving
+        self._pending.pop((room_id, user_id), None)
+
         if redis_service.is_connected:
             try:
                 # Remove from sorted set
@@ -196,6 +268,8 @@ class PresenceManager:
             List of room IDs the user was removed from
         """
         rooms_left = []
+        for key in [key for key in self._pending if key[1] == user_id]:
+            del self._pending[key]
 
         if redis_service.is_connected:
             try:
@@ -376,13 +450,12 @@ class PresenceManager:
         """
         if redis_service.is_connected:
             try:
-                keys = await redis_service.scan_keys(f"{self._PRESENCE_PREFIX}*")
-                total_rooms = len(keys)
+                room_ids = await redis_service.client.smembers(PRESENCE_ROOMS_KEY)
+                total_rooms = len(room_ids)
                 total_entries = 0
                 cutoff = time.time() - PRESENCE_TTL
 
-                for key in keys:
-                    room_id = key.replace(self._PRESENCE_PREFIX, "")
+                for room_id in room_ids:
                     users = await redis_service.presence_get_room(room_id, cutoff)
                     total_entries += len(users)
 
@@ -390,6 +463,9 @@ class PresenceManager:
                     "backend": "redis",
                     "total_rooms": total_rooms,
                     "total_presence_entries": total_entries,
+                    "pending_heartbeats": len(self._pending),
+                    "heartbeats": self.heartbeats,
+                    "flushes": self.flushes,
                 }
             except Exception as e:
                 logger.error(f"Redis get_stats error: {e}")
@@ -419,5 +495,6 @@ __all__ = [
     "PresenceManager",
     "presence_manager",
     "PRESENCE_TTL",
+    "PRESENCE_ROOMS_KEY",
     "HEARTBEAT_INTERVAL",
 ]
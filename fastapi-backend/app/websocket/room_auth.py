@@ -6,13 +6,14 @@ Features:
 - Native async database operations (no thread pool needed)
 - TTL-based caching to prevent DB overload during reconnection storms
 - Hierarchical access checks (application -> project -> task)
+- Bulk checks for join storms: one session and one query per room type
 """
 
 import asyncio
 import logging
 import time
 from collections import OrderedDict
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy import select
@@ -198,6 +199,66 @@ async def check_room_access(user_id: UUID, room_id: str) -> bool:
         return False
 
 
+async def check_room_access_many(user_id: UUID, room_ids: Iterable[str]) -> dict[str, bool]:
+    """
+    Check a user's access to several rooms at once.
+
+    Same rules and cache as check_room_access, but all cache misses are
+    resolved in one session with one query per room type, so a client
+    rejoining many rooms after a reconnect costs a single DB round of work.
+
+    Args:
+        user_id: The user's UUID
+        room_ids: The room identifiers
+
+    Returns:
+        dict[str, bool]: Access result for each requested room
+    """
+    results: dict[str, bool] = {}
+    misses: dict[str, Tuple[str, UUID]] = {}
+
+    for room_id in room_ids:
+        if room_id in results or room_id in misses:
+            continue
+        if not room_id or ":" not in room_id:
+            logger.warning(f"[Room Auth] DENIED - invalid room format: {room_id}")
+            results[room_id] = False
+            continue
+        try:
+            room_type, resource_id_str = room_id.split(":", 1)
+            resource_id = UUID(resource_id_str)
+        except (ValueError, AttributeError):
+            logger.warning(f"[Room Auth] DENIED - invalid room ID format: {room_id}")
+            results[room_id] = False
+            continue
+
+        if room_type == "user":
+            results[room_id] = resource_id == user_id
+            continue
+
+        cached_result = await _get_cached_auth(user_id, room_id)
+        if cached_result is not None:
+            results[room_id] = cached_result
+        else:
+            misses[room_id] = (room_type, resource_id)
+
+    if not misses:
+        return results
+
+    try:
+        allowed = await _check_room_access_many_async(user_id, set(misses.values()))
+    except Exception as e:
+        logger.error(f"[Room Auth] ERROR checking access to {len(misses)} rooms: {e}")
+        results.update(dict.fromkeys(misses, False))
+        return results
+
+    for room_id, resource in misses.items():
+        result = resource in allowed
+        results[room_id] = result
+        await _set_cached_auth(user_id, room_id, result)
+    return results
+
+
 async def _check_room_access_async(user_id: UUID, room_type: str, resource_id: UUID) -> bool:
     """
     Async room access check using native async SQLAlchemy.
@@ -216,6 +277,120 @@ async def _check_room_access_async(user_id: UUID, room_type: str, resource_id: U
             return False
 
 
+async def _check_room_access_many_async(
+    user_id: UUID,
+    resources: set[Tuple[str, UUID]],
+) -> set[Tuple[str, UUID]]:
+    """
+    Resolve access to many (room_type, resource_id) pairs in one session.
+
+    Tasks and documents are loaded first to find their parent projects and
+    applications, then accessible applications and projects are each
+    resolved with a single query.
+
+    Returns:
+        The subset of ``resources`` the user may join.
+    """
+    ids: dict[str, set[UUID]] = {}
+    for room_type, resource_id in resources:
+        if room_type not in ("application", "project", "task", "document"):
+            logger.warning(f"[Room Auth] DENIED - unknown room type: {room_type}")
+            continue
+        ids.setdefault(room_type, set()).add(resource_id)
+
+    allowed: set[Tuple[str, UUID]] = set()
+    if not ids:
+        return allowed
+
+    async with async_session_maker() as db:
+        application_ids = set(ids.get("application", ()))
+        project_ids = set(ids.get("project", ()))
+
+        task_projects: dict[UUID, UUID] = {}
+        if ids.get("task"):
+            rows = await db.execute(select(Task.id, Task.project_id).where(Task.id.in_(ids["task"])))
+            task_projects = {task_id: project_id for task_id, project_id in rows.all()}
+            project_ids.update(task_projects.values())
+
+        documents = []
+        if ids.get("document"):
+            rows = await db.execute(
+                select(Document.id, Document.user_id, Document.application_id, Document.project_id).where(
+                    Document.id.in_(ids["document"]),
+                    # R2-20: Exclude soft-deleted documents from WebSocket room access
+                    Document.deleted_at.is_(None),
+                )
+            )
+            documents = rows.all()
+            for _, _, doc_application_id, doc_project_id in documents:
+                if doc_application_id is not None:
+                    application_ids.add(doc_application_id)
+                elif doc_project_id is not None:
+                    project_ids.add(doc_project_id)
+
+        allowed_applications = await _accessible_applications(db, user_id, application_ids)
+        allowed_projects = await _accessible_projects(db, user_id, project_ids)
+
+    for application_id in ids.get("application", ()):
+        if application_id in allowed_applications:
+            allowed.add(("application", application_id))
+    for project_id in ids.get("project", ()):
+        if project_id in allowed_projects:
+            allowed.add(("project", project_id))
+    for task_id, project_id in task_projects.items():
+        if project_id in allowed_projects:
+            allowed.add(("task", task_id))
+    for document_id, doc_user_id, doc_application_id, doc_project_id in documents:
+        # Same precedence as _check_document_access
+        if doc_user_id is not None and doc_user_id == user_id:
+            has_access = True
+        elif doc_application_id is not None:
+            has_access = doc_application_id in allowed_applications
+        elif doc_project_id is not None:
+            has_access = doc_project_id in allowed_projects
+        else:
+            has_access = False
+        if has_access:
+            allowed.add(("document", document_id))
+    return allowed
+
+
+async def _accessible_applications(db: AsyncSession, user_id: UUID, application_ids: set[UUID]) -> set[UUID]:
+    """Return the applications among ``application_ids`` the user owns or is a member of."""
+    if not application_ids:
+        return set()
+    member_of = select(ApplicationMember.application_id).where(ApplicationMember.user_id == user_id)
+    result = await db.execute(
+        select(Application.id).where(
+            Application.id.in_(application_ids),
+            (Application.owner_id == user_id) | Application.id.in_(member_of),
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def _accessible_projects(db: AsyncSession, user_id: UUID, project_ids: set[UUID]) -> set[UUID]:
+    """Return the projects among ``project_ids`` the user can access.
+
+    Same access paths as _check_project_access: application owner,
+    application member, or direct project member.
+    """
+    if not project_ids:
+        return set()
+    owned = select(Application.id).where(Application.owner_id == user_id)
+    member_of = select(ApplicationMember.application_id).where(ApplicationMember.user_id == user_id)
+    project_member_of = select(ProjectMember.project_id).where(ProjectMember.user_id == user_id)
+    result = await db.execute(
+        select(Project.id).where(
+            Project.id.in_(project_ids),
+            Project.application_id.in_(owned)
+            | Project.application_id.in_(member_of)
+            | Project.id.in_(project_member_of),
+        )
+    )
+    return set(result.scalars().all())
+
+
 async def _check_application_access(db: AsyncSession, user_id: UUID, application_id: UUID) -> bool:
     """Check if user is a member of the application or the owner.
 
@@ -0,0 +1,118 @@
+"""Bounded per-connection outbound queue for WebSocket fan-out.
+
+Broadcasts used to await every recipient's send in batches of 50 with a 2s
+timeout, so one slow client held up the rest of its batch and a large room
+serialized into many such waits. Each connection now owns a SendQueue of
+outbound frames (shared by all recipients of a broadcast), drained by its
+own writer task in the ConnectionManager; a broadcast is one non-blocking
+``put`` per recipient.
+
+Presence, typing and viewing indicators carry a coalesce key (room, type,
+user); a newer one replaces its queued predecessor in place, so a lagging
+client only ever holds the latest state. When a queue is full the oldest
+queued indicator is shed to make room. If there is none, the connection is
+a slow consumer: ``put`` returns False and the caller evicts it, and the
+client reconnects and catches up via room replay.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Hashable, Optional
+
+from .codec import Frame
+
+
+class _Outbound:
+    """A queued frame; mutable so coalescing can swap it."""
+
+    __slots__ = ("frame", "key")
+
+    def __init__(self, frame: Frame, key: Optional[Hashable]) -> None:
+        self.frame = frame
+        self.key = key
+
+
+class SendQueue:
+    """Bounded FIFO of outbound frames for one connection.
+
+    Args:
+        max_size: Messages held before the connection counts as a slow consumer.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max(1, max_size)
+        self._items: deque[_Outbound] = deque()
+        # Insertion-ordered, so the first entry is the oldest coalescable message
+        self._by_key: dict[Hashable, _Outbound] = {}
+        self.not_empty = asyncio.Event()
+        self.closed = False
+        # Metrics
+        self.sent = 0
+        self.coalesced = 0
+        self.shed = 0
+        self.peak = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, frame: Frame, key: Optional[Hashable] = None) -> bool:
+        """Queue a message without waiting.
+
+        Args:
+            frame: The message to send.
+            key: Coalesce key; a queued message with the same key is replaced.
+
+        Returns:
+            False if the queue is full and nothing could be shed (or it is
+            closed); the message was not queued.
+        """
+        if self.closed:
+            return False
+
+        if key is not None and key in self._by_key:
+            self._by_key[key].frame = frame
+            self.coalesced += 1
+            return True
+
+        if len(self._items) >= self.max_size:
+            if not self._by_key:
+                return False
+            oldest_key = next(iter(self._by_key))
+            self._items.remove(self._by_key.pop(oldest_key))
+            self.shed += 1
+
+        item = _Outbound(frame, key)
+        self._items.append(item)
+        if key is not None:
+            self._by_key[key] = item
+        self.peak = max(self.peak, len(self._items))
+        self.not_empty.set()
+        return True
+
+    def pop(self) -> Frame:
+        """Remove and return the oldest message (queue must be non-empty)."""
+        item = self._items.popleft()
+        if item.key is not None and self._by_key.get(item.key) is item:
+            del self._by_key[item.key]
+        if not self._items:
+            self.not_empty.clear()
+        return item.frame
+
+    def close(self) -> None:
+        """Drop the backlog and refuse further messages."""
+        self.closed = True
+        self._items.clear()
+        self._by_key.clear()
+        self.not_empty.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backlog": len(self._items),
+            "peak": self.peak,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "shed": self.shed,
+        }
+
+
+__all__ = ["SendQueue"]
@@ -11,6 +11,7 @@ Run with:
 import asyncio
 import logging
 import os
+import time
 from datetime import timedelta
 from typing import Any
 
@@ -18,12 +19,21 @@ from arq import cron
 from arq.connections import RedisSettings
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .ai.retrieval_cache import bump_knowledge_generation
 from .config import settings
 from .database import async_session_maker
 from .utils.timezone import utc_now
 from .models.project import Project
 from .models.task import Task
 from .models.task_status import StatusName, TaskStatus
+from .services.arq_helper import (
+    LANE_BULK_EMBED,
+    LANE_IMPORT,
+    LANE_INTERACTIVE,
+    LANE_MAINTENANCE,
+    LANE_QUEUES,
+)
+from .services.embed_debounce import dispatch_due_embeds
 from .services.redis_service import redis_service
 from .services.search_service import check_search_index_consistency
 from .models.document import Document
@@ -278,12 +288,52 @@ async def _recalculate_project_aggregation(db: AsyncSession, project_id: Any) ->
 PRESENCE_TTL = 45  # seconds
 PRESENCE_PREFIX = "presence:"
 USER_DATA_PREFIX = "presence_data:"
+PRESENCE_ROOMS_KEY = "presence:rooms"
+
+# Drops an emptied room from the index together with its metadata hash,
+# unless a heartbeat flush re-populated the room since it was checked
+_DROP_EMPTY_PRESENCE_ROOM_LUA = """
+if redis.call('ZCARD', KEYS[1]) > 0 then
+    return 0
+end
+redis.call('SREM', KEYS[2], ARGV[1])
+redis.call('DEL', KEYS[3])
+return 1
+"""
+
+# Set once this process has indexed presence keys written before presence:rooms
+_presence_rooms_backfilled = False
+
+
+async def _backfill_presence_rooms() -> None:
+    """Add rooms with presence keys but no ``presence:rooms`` entry to the index.
+
+    Runs one SCAN per worker process, so keys left from before the index
+    existed (or orphaned metadata hashes) are still cleaned up.
+    """
+    global _presence_rooms_backfilled
+
+    room_ids = {
+        key[len(PRESENCE_PREFIX) :]
+        for key in await redis_service.scan_keys(f"{PRESENCE_PREFIX}*")
+        if key != PRESENCE_ROOMS_KEY
+    }
+    room_ids.update(key[len(USER_DATA_PREFIX) :] for key in await redis_service.scan_keys(f"{USER_DATA_PREFIX}*"))
+    if room_ids:
+        await redis_service.client.sadd(PRESENCE_ROOMS_KEY, *room_ids)
+        logger.info("Backfilled %d rooms into the presence index", len(room_ids))
+    _presence_rooms_backfilled = True
 
 
 async def cleanup_stale_presence(ctx: dict[str, Any]) -> dict[str, int]:
     """
     Remove presence entries older than PRESENCE_TTL.
 
+    Walks only the rooms in the ``presence:rooms`` index (maintained by
+    heartbeat flushes) instead of scanning the keyspace; the first run in a
+    process backfills the index once. Rooms left empty are dropped from the
+    index along with their metadata hash.
+
     Returns:
         dict with count of removed entries
     """
@@ -297,30 +347,45 @@ async def cleanup_stale_presence(ctx: dict[str, Any]) -> dict[str, int]:
         return {"removed": 0}
 
     try:
-        keys = await redis_service.scan_keys(f"{PRESENCE_PREFIX}*")
-        if keys:
-            # L2: Process in batches to avoid sending thousands of commands
-            # in a single pipeline.
-            _SCAN_BATCH_LIMIT = 200
-            room_ids = []
-            for batch_start in range(0, len(keys), _SCAN_BATCH_LIMIT):
-                batch_keys = keys[batch_start : batch_start + _SCAN_BATCH_LIMIT]
+        if not _presence_rooms_backfilled:
+            await _backfill_presence_rooms()
+        room_ids = list(await redis_service.client.smembers(PRESENCE_ROOMS_KEY))
+        # L2: Process in batches to avoid sending thousands of commands
+        # in a single pipeline.
+        _BATCH_LIMIT = 200
+        for batch_start in range(0, len(room_ids), _BATCH_LIMIT):
+            batch_room_ids = room_ids[batch_start : batch_start + _BATCH_LIMIT]
+            pipe = redis_service.client.pipeline(transaction=False)
+            for room_id in batch_room_ids:
+                pipe.zremrangebyscore(
+                    f"{PRESENCE_PREFIX}{room_id}",
+                    min="-inf",
+                    max=cutoff,
+                )
+                pipe.zcard(f"{PRESENCE_PREFIX}{room_id}")
+            results = await pipe.execute()
+
+            empty_rooms = []
+            for room_id, removed, remaining in zip(batch_room_ids, results[::2], results[1::2]):
+                if removed > 0:
+                    logger.debug(f"Cleaned {removed} stale entries from room {room_id}")
+                    total_removed += removed
+                if remaining == 0:
+                    empty_rooms.append(room_id)
+
+            # Re-checked atomically: a heartbeat flushed since the ZCARD keeps the room
+            if empty_rooms:
                 pipe = redis_service.client.pipeline(transaction=False)
-                batch_room_ids = []
-                for key in batch_keys:
-                    room_id = key.replace(PRESENCE_PREFIX, "")
-                    batch_room_ids.append(room_id)
-                    pipe.zremrangebyscore(
+                for room_id in empty_rooms:
+                    pipe.eval(
+                        _DROP_EMPTY_PRESENCE_ROOM_LUA,
+                        3,
                         f"{PRESENCE_PREFIX}{room_id}",
-                        min="-inf",
-                        max=cutoff,
+                        PRESENCE_ROOMS_KEY,
+                        f"{USER_DATA_PREFIX}{room_id}",
+                        room_id,
                     )
-                results = await pipe.execute()
-                for room_id, removed in zip(batch_room_ids, results):
-                    if removed > 0:
-                        logger.debug(f"Cleaned {removed} stale entries from room {room_id}")
-                        total_removed += removed
-                room_ids.extend(batch_room_ids)
+                await pipe.execute()
     except Exception as e:
         logger.error(f"Redis presence cleanup error: {e}")
 
@@ -369,7 +434,9 @@ async def _broadcast_embedding_status(
         else:
             room_id = None
         if room_id:
-            await redis_service.publish("ws:broadcast", {"room_id": room_id, "message": ws_payload})
+            from .websocket.event_stream import publish_room_event
+
+            await publish_room_event("ws:broadcast", room_id, ws_payload)
     except Exception as ws_err:
         logger.warning(
             "Failed to broadcast embedding_status=%s for document %s: %s",
@@ -509,7 +576,15 @@ async def embed_document_job(ctx: dict[str, Any], document_id: str) -> dict[str,
                 "user_id": doc.user_id,
             }
 
+            # Reuse the TipTap walk the save already did (cached by content hash)
+            ir = None
+            if doc_type == "document":
+                from .services.tiptap_walker import get_tiptap_ir
+
+                ir = await get_tiptap_ir(doc.content_json, content)
+
             from .ai.chunking_service import SemanticChunker
+            from .ai.embedding_batcher import get_embedding_batcher
             from .ai.embedding_normalizer import EmbeddingNormalizer
             from .ai.embedding_service import EmbeddingService
             from .ai.provider_registry import ProviderRegistry
@@ -518,11 +593,13 @@ async def embed_document_job(ctx: dict[str, Any], document_id: str) -> dict[str,
             chunker = SemanticChunker()
             normalizer = EmbeddingNormalizer()
 
+            # Shared batcher coalesces this job's chunks with concurrent jobs'
             service = EmbeddingService(
                 provider_registry=registry,
                 chunker=chunker,
                 normalizer=normalizer,
                 db=db,
+                batcher=get_embedding_batcher(),
             )
 
             embed_result = await asyncio.wait_for(
@@ -532,6 +609,7 @@ async def embed_document_job(ctx: dict[str, Any], document_id: str) -> dict[str,
                     title=doc.title,
                     scope_ids=scope_ids,
                     document_type=doc_type,
+                    ir=ir,
                 ),
                 timeout=EMBED_TIMEOUT_S,
             )
@@ -551,6 +629,7 @@ async def embed_document_job(ctx: dict[str, Any], document_id: str) -> dict[str,
                 image_descriptions = await image_svc.process_document_images(
                     document_id=doc_uuid,
                     content_json=content,
+                    ir=ir,
                 )
                 image_count = len(image_descriptions)
             except Exception as img_err:
@@ -572,6 +651,12 @@ async def embed_document_job(ctx: dict[str, Any], document_id: str) -> dict[str,
                 embed_result.duration_ms,
             )
 
+            # Chunks changed: invalidate cached retrievals for the owning scope
+            await bump_knowledge_generation(
+                doc_scope["application_id"] or doc_scope.get("_application_id"),
+                doc_scope["user_id"],
+            )
+
             await _broadcast_embedding_status(doc_scope, document_id, "synced", total_chunks)
 
             # Clear retry counter on success
@@ -632,12 +717,13 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
     1. Retry guard (Redis key extract_retry:{file_id})
     2. Load FolderFile (skip if deleted/completed/unsupported)
     3. Set processing status
-    4. Download from MinIO to temp file
-    5. Extract content (with timeout)
-    6. Index in Meilisearch
-    7. Embed content (if extraction succeeded)
-    8. Commit + WebSocket broadcast
-    9. Error handling: set failed status, broadcast failure
+    4. Extraction cache hit (same sha256): clone cached chunks, skip 5-6
+    5. Download from MinIO to temp file
+    6. Stream extraction into chunking + batched embedding (extraction
+       timeout fatal, per-batch embed timeout non-fatal)
+    7. Index in Meilisearch
+    8. Commit, store fresh results in the extraction cache, WebSocket broadcast
+    9. Error handling: set failed status, drop partial chunks, broadcast failure
 
     Args:
         ctx: ARQ context dict.
@@ -651,7 +737,9 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
     from uuid import UUID as _UUID
     from pathlib import Path
 
-    from sqlalchemy import select, update as sa_update
+    from sqlalchemy import delete as sa_delete, select, update as sa_update
+
+    from .models.document_chunk import DocumentChunk
 
     _cfg = get_agent_config()
     EXTRACT_TIMEOUT_S = _cfg.get_int("worker.extract_timeout_s", 120)
@@ -709,6 +797,7 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
         file_folder_id = None
         file_created_by = None
         file_updated_at_ts: int = 0
+        file_sha256: str | None = None
 
         async with async_session_maker() as db:
             # HIGH-12: Atomic status transition — only grab the job if status
@@ -766,44 +855,94 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
             file_folder_id = ff.folder_id
             file_created_by = ff.created_by
             file_updated_at_ts = int(ff.updated_at.timestamp())
+            file_sha256 = ff.sha256_hash
         # Session closed here — no DB held during extraction
 
-        # HIGH-3: Wrap entire temp dir usage in try/finally for guaranteed cleanup
-        tmp_dir = tempfile.mkdtemp(prefix="pm_extract_")
+        # Content-addressed cache: bytes already extracted and embedded with
+        # the current extractor and embedding model are cloned, not re-processed
+        from .ai.extraction_cache import clone_cached_extraction, resolve_cache_key, store_extraction
+
+        cache_key = None
+        cached = None
         try:
-            # Download from MinIO to temp file
-            from .services.minio_service import minio_service
+            async with async_session_maker() as cache_db:
+                cache_key = await resolve_cache_key(cache_db, file_sha256)
+                if cache_key is not None:
+                    cached = await clone_cached_extraction(
+                        cache_db,
+                        cache_key,
+                        file_uuid,
+                        {
+                            "application_id": file_scope["application_id"],
+                            "project_id": file_scope["project_id"],
+                            "user_id": file_scope["user_id"],
+                        },
+                    )
+                    await cache_db.commit()
+        except Exception as cache_err:
+            logger.warning("extract_and_embed_file_job: extraction cache lookup failed for %s: %s", file_id, cache_err)
+            cached = None
 
-            ext = f".{file_extension}" if file_extension else ""
-            tmp_path = Path(tmp_dir) / f"file{ext}"
+        if cached is not None:
+            from .ai.embedding_service import EmbedResult
+            from .ai.file_extraction_service import ExtractionResult
 
-            # QE-NEW-2: Stream download to temp file instead of buffering in memory
+            logger.info(
+                "extract_and_embed_file_job: file %s served from extraction cache (%d chunks)",
+                file_id,
+                cached.chunk_count,
+            )
+            extraction_result = ExtractionResult(
+                markdown=cached.content_plain,
+                metadata=cached.extracted_metadata,
+            )
+            embed_result = EmbedResult(chunk_count=cached.chunk_count, token_count=cached.token_count, duration_ms=0)
+            # Image descriptions are already among the cloned chunks
+            extraction_images = []
+        else:
+            # HIGH-3: Wrap entire temp dir usage in try/finally for guaranteed cleanup
+            tmp_dir = tempfile.mkdtemp(prefix="pm_extract_")
             try:
-                await minio_service.download_to_file(
-                    bucket=file_storage_bucket,
-                    object_name=file_storage_key,
-                    file_path=str(tmp_path),
-                )
-            except Exception as dl_err:
-                raise RuntimeError(f"MinIO download failed: {dl_err}")
+                # Download from MinIO to temp file
+                from .services.minio_service import minio_service
 
-            # Extract content
-            from .ai.file_extraction_service import FileExtractionService
+                ext = f".{file_extension}" if file_extension else ""
+                tmp_path = Path(tmp_dir) / f"file{ext}"
 
-            extraction_svc = FileExtractionService()
-            extraction_result = await asyncio.wait_for(
-                extraction_svc.extract(
+                # QE-NEW-2: Stream download to temp file instead of buffering in memory
+                try:
+                    await minio_service.download_to_file(
+                        bucket=file_storage_bucket,
+                        object_name=file_storage_key,
+                        file_path=str(tmp_path),
+                    )
+                except Exception as dl_err:
+                    raise RuntimeError(f"MinIO download failed: {dl_err}")
+
+                # Extract, chunk and embed in one pass: sections are embedded in
+                # batches as they are read, so only a bounded content_plain prefix
+                # is kept in memory and the temp file must outlive the stream.
+                # Only the first MAX_CONTENT_PLAIN characters are embedded, as
+                # before streaming.
+                from .ai.file_extraction_service import FileExtractionService
+
+                extraction_svc = FileExtractionService()
+                stream = extraction_svc.extract_stream(
                     file_path=tmp_path,
                     extension=ext,
                     file_size=file_file_size,
-                ),
-                timeout=EXTRACT_TIMEOUT_S,
-            )
-            # Cache images before temp dir cleanup (in-memory bytes, safe)
-            extraction_images = extraction_result.images if extraction_result.success else []
-        finally:
-            # HIGH-3: Guaranteed temp dir cleanup
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+                    max_markdown_chars=MAX_CONTENT_PLAIN,
+                )
+                feed = _SectionFeed(stream, max_chars=MAX_CONTENT_PLAIN, timeout_s=EXTRACT_TIMEOUT_S)
+                embed_result = await _stream_embed_file(
+                    feed, file_uuid, file_display_name, file_scope, batch_timeout_s=EMBED_TIMEOUT_S
+                )
+                extraction_result = stream.result
+                # Cache images before temp dir cleanup (in-memory bytes, safe)
+                extraction_images = extraction_result.images if extraction_result.success else []
+            finally:
+                # HIGH-3: Guaranteed temp dir cleanup
+                shutil.rmtree(tmp_dir, ignore_errors=True)
 
         # CRIT-4: Map extraction errors to safe categories
         if not extraction_result.success:
@@ -823,6 +962,9 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
                         updated_at=utc_now(),
                     )
                 )
+                if err_result.rowcount:
+                    # Drop chunks embedded before the stream failed
+                    await db2.execute(sa_delete(DocumentChunk).where(DocumentChunk.file_id == file_uuid))
                 await db2.commit()
             # FIX-6: Skip broadcast if reaper already reset the status
             if err_result.rowcount == 0:
@@ -875,61 +1017,19 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
                     ms_err,
                 )
 
-            # Embed content
-            embed_chunk_count = 0
-            embed_token_count = 0
-            embed_duration_ms = 0
-            registry = None  # Sentinel — reused by image processing if created
-            embed_svc = None
-            if content_plain.strip():
-                try:
-                    ff3.embedding_status = "syncing"
-                    await db3.flush()
-
-                    from .ai.chunking_service import SemanticChunker
-                    from .ai.embedding_normalizer import EmbeddingNormalizer
-                    from .ai.embedding_service import EmbeddingService
-                    from .ai.provider_registry import ProviderRegistry
-
-                    registry = ProviderRegistry()
-                    chunker = SemanticChunker()
-                    normalizer = EmbeddingNormalizer()
-
-                    embed_svc = EmbeddingService(
-                        provider_registry=registry,
-                        chunker=chunker,
-                        normalizer=normalizer,
-                        db=db3,
-                    )
-
-                    embed_result = await asyncio.wait_for(
-                        embed_svc.embed_file(
-                            file_id=file_uuid,
-                            markdown=content_plain,
-                            title=file_display_name,
-                            scope_ids={
-                                "application_id": ff3.application_id,
-                                "project_id": ff3.project_id,
-                                "user_id": ff3.user_id,
-                            },
-                        ),
-                        timeout=EMBED_TIMEOUT_S,
-                    )
-                    embed_chunk_count = embed_result.chunk_count
-                    embed_token_count = embed_result.token_count
-                    embed_duration_ms = embed_result.duration_ms
-                    ff3.embedding_status = "synced"
-                    ff3.embedding_updated_at = utc_now()
-                except Exception as embed_err:
-                    logger.warning(
-                        "extract_and_embed_file_job: embedding failed for %s (non-fatal): %s",
-                        file_id,
-                        embed_err,
-                    )
-                    ff3.embedding_status = "failed"
+            # Text was embedded while streaming; record the outcome
+            embed_chunk_count = embed_result.chunk_count if embed_result else 0
+            embed_token_count = embed_result.token_count if embed_result else 0
+            embed_duration_ms = embed_result.duration_ms if embed_result else 0
+            if embed_result is not None:
+                ff3.embedding_status = "synced"
+                ff3.embedding_updated_at = utc_now()
+            else:
+                ff3.embedding_status = "failed"
 
             # Process extracted images through vision LLM (non-fatal)
             image_chunk_count = 0
+            image_failed = False
             if extraction_images:
                 try:
                     from .ai.image_understanding_service import (
@@ -938,22 +1038,18 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
                     )
                     from .services.minio_service import minio_service as _minio_svc
 
-                    # Reuse registry/embed_svc if created during text embedding
-                    if registry is None or embed_svc is None:
-                        from .ai.provider_registry import ProviderRegistry
-                        from .ai.chunking_service import SemanticChunker
-                        from .ai.embedding_normalizer import EmbeddingNormalizer
-                        from .ai.embedding_service import EmbeddingService
-
-                        registry = ProviderRegistry()
-                        chunker = SemanticChunker()
-                        normalizer = EmbeddingNormalizer()
-                        embed_svc = EmbeddingService(
-                            provider_registry=registry,
-                            chunker=chunker,
-                            normalizer=normalizer,
-                            db=db3,
-                        )
+                    from .ai.provider_registry import ProviderRegistry
+                    from .ai.chunking_service import SemanticChunker
+                    from .ai.embedding_normalizer import EmbeddingNormalizer
+                    from .ai.embedding_service import EmbeddingService
+
+                    registry = ProviderRegistry()
+                    embed_svc = EmbeddingService(
+                        provider_registry=registry,
+                        chunker=SemanticChunker(),
+                        normalizer=EmbeddingNormalizer(),
+                        db=db3,
+                    )
 
                     image_svc = ImageUnderstandingService(
                         provider_registry=registry,
@@ -1024,9 +1120,29 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
                         file_id,
                         img_err,
                     )
+                    image_failed = True
 
             await db3.commit()
 
+            # Cache complete results so identical uploads can be cloned
+            if cached is None and cache_key is not None and embed_result is not None and not image_failed:
+                try:
+                    async with async_session_maker() as cache_db:
+                        await store_extraction(
+                            cache_db,
+                            cache_key,
+                            file_uuid,
+                            content_plain,
+                            ff3.extracted_metadata or {},
+                        )
+                        await cache_db.commit()
+                except Exception as cache_err:
+                    logger.warning(
+                        "extract_and_embed_file_job: extraction cache store failed for %s: %s",
+                        file_id,
+                        cache_err,
+                    )
+
             logger.info(
                 "extract_and_embed_file_job: file %s processed — extraction=%s, "
                 "%d text chunks, %d image chunks, %d tokens, %dms",
@@ -1038,6 +1154,12 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
                 embed_duration_ms,
             )
 
+            # Chunks changed: invalidate cached retrievals for the owning scope
+            await bump_knowledge_generation(
+                file_scope["application_id"] or file_scope.get("_application_id"),
+                file_scope["user_id"],
+            )
+
             # CRIT-2: Include folder_id in broadcast payload
             await _broadcast_file_event(
                 file_scope,
@@ -1097,6 +1219,8 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
                         updated_at=utc_now(),
                     )
                 )
+                if err_result.rowcount:
+                    await err_db.execute(sa_delete(DocumentChunk).where(DocumentChunk.file_id == file_uuid))
                 await err_db.commit()
                 # FIX-6: Skip broadcast if reaper already reset the status
                 if err_result.rowcount == 0:
@@ -1118,6 +1242,122 @@ async def extract_and_embed_file_job(ctx: dict[str, Any], file_id: str) -> dict[
         return {"status": "error", "error": type(e).__name__}
 
 
+class _SectionFeed:
+    """Feeds an ExtractionStream to the embedder within the job's limits.
+
+    Sections are passed on until ``max_chars`` characters have been fed,
+    after which the embedder sees the end of input; ``drain`` then reads
+    the rest so ``stream.result`` is complete. Only time spent waiting on
+    the extractor counts against ``timeout_s``, so a slow embedding
+    provider cannot time out the extraction. Running out of time raises
+    TimeoutError and sets ``timed_out``.
+    """
+
+    def __init__(self, stream: Any, max_chars: int, timeout_s: float) -> None:
+        self._stream = stream
+        self._chars_left = max_chars
+        self._timeout_s = timeout_s
+        self._seconds_left = float(timeout_s)
+        self.timed_out = False
+
+    async def _next_section(self) -> str:
+        started = time.monotonic()
+        try:
+            if self._seconds_left <= 0:
+                raise asyncio.TimeoutError
+            return await asyncio.wait_for(self._stream.__anext__(), timeout=self._seconds_left)
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            raise TimeoutError(f"Extraction timeout after {self._timeout_s}s") from None
+        finally:
+            self._seconds_left -= time.monotonic() - started
+
+    def __aiter__(self) -> "_SectionFeed":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._chars_left <= 0:
+            raise StopAsyncIteration
+        section = (await self._next_section())[: self._chars_left]
+        self._chars_left -= len(section)
+        return section
+
+    async def drain(self) -> None:
+        """Read the sections left after the embedder stopped."""
+        try:
+            while True:
+                await self._next_section()
+        except StopAsyncIteration:
+            pass
+
+
+async def _stream_embed_file(
+    feed: _SectionFeed,
+    file_uuid: Any,
+    title: str,
+    file_scope: dict[str, Any],
+    batch_timeout_s: float | None = None,
+) -> Any:
+    """Chunk and embed a FolderFile while its ExtractionStream is read.
+
+    Runs in its own session, which commits after every embedded batch so
+    the first chunks are searchable before extraction finishes. Embedding
+    failures, including a batch exceeding ``batch_timeout_s``, are
+    non-fatal: batches already committed are kept and the rest of the
+    stream is still drained so ``stream.result`` (content_plain, metadata)
+    is complete. An extraction timeout propagates and fails the job.
+
+    Returns:
+        EmbedResult, or None if embedding failed.
+    """
+    from sqlalchemy import update as sa_update
+
+    from .ai.chunking_service import SemanticChunker
+    from .ai.embedding_batcher import get_embedding_batcher
+    from .ai.embedding_normalizer import EmbeddingNormalizer
+    from .ai.embedding_service import EmbeddingService
+    from .ai.provider_registry import ProviderRegistry
+
+    async with async_session_maker() as embed_db:
+        try:
+            await embed_db.execute(
+                sa_update(FolderFile)
+                .where(FolderFile.id == file_uuid)
+                .values(embedding_status="syncing", updated_at=FolderFile.updated_at)
+            )
+            embed_svc = EmbeddingService(
+                provider_registry=ProviderRegistry(),
+                chunker=SemanticChunker(),
+                normalizer=EmbeddingNormalizer(),
+                db=embed_db,
+                batcher=get_embedding_batcher(),
+            )
+            embed_result = await embed_svc.embed_file_stream(
+                file_id=file_uuid,
+                sections=feed,
+                title=title,
+                scope_ids={
+                    "application_id": file_scope["application_id"],
+                    "project_id": file_scope["project_id"],
+                    "user_id": file_scope["user_id"],
+                },
+                batch_timeout_s=batch_timeout_s,
+            )
+        except Exception as embed_err:
+            if feed.timed_out:
+                raise
+            logger.warning(
+                "extract_and_embed_file_job: embedding failed for %s (non-fatal): %s",
+                file_uuid,
+                embed_err or type(embed_err).__name__,
+            )
+            await embed_db.rollback()
+            embed_result = None
+
+    await feed.drain()
+    return embed_result
+
+
 def _categorize_extraction_error(error_text: str | None) -> str:
     """Map raw exception text to a safe user-facing error category (CRIT-4).
 
@@ -1199,10 +1439,9 @@ async def _broadcast_file_event(
             room_id = f"user:{scope['user_id']}"
 
         if room_id:
-            await redis_service.publish(
-                "ws:broadcast",
-                {"room_id": room_id, "message": ws_payload},
-            )
+            from .websocket.event_stream import publish_room_event
+
+            await publish_room_event("ws:broadcast", room_id, ws_payload)
     except Exception as ws_err:
         logger.warning("Failed to broadcast %s for file %s: %s", event_type, file_id, ws_err)
 
@@ -1216,8 +1455,10 @@ async def batch_embed_stale_documents(ctx: dict[str, Any]) -> dict[str, Any]:
     """Nightly cron job: embed all documents with stale or missing embeddings.
 
     Queries documents where ``embedding_status`` is ``'stale'`` or ``'none'``
-    and ``content_json IS NOT NULL``, then enqueues embed jobs
-    in batches with spacing to avoid overwhelming the embedding API.
+    and ``content_json IS NOT NULL``, then enqueues an embed job for each.
+    Jobs are enqueued back-to-back: provider throughput is governed by the
+    shared ``ProviderThrottle`` token bucket and the embedding batcher, so
+    the re-embed runs at the fastest rate the provider allows.
 
     Returns:
         dict with count of documents queued.
@@ -1225,8 +1466,6 @@ async def batch_embed_stale_documents(ctx: dict[str, Any]) -> dict[str, Any]:
     from sqlalchemy import select
 
     _cfg = get_agent_config()
-    NIGHTLY_EMBED_BATCH_SIZE = _cfg.get_int("worker.nightly_embed_batch_size", 10)
-    NIGHTLY_EMBED_BATCH_DELAY_S = _cfg.get_int("worker.nightly_embed_batch_delay_s", 5)
     MAX_NIGHTLY_EMBED = _cfg.get_int("worker.max_nightly_embed", 500)
 
     queued = 0
@@ -1256,26 +1495,21 @@ async def batch_embed_stale_documents(ctx: dict[str, Any]) -> dict[str, Any]:
             # transitions its own document to 'syncing' atomically, preventing
             # 24h limbo on crash.
 
-            from .services.arq_helper import get_arq_redis
+            from .services.arq_helper import get_arq_redis, lane_queue
 
             arq_redis = await get_arq_redis()
 
-            for i in range(0, len(stale_ids), NIGHTLY_EMBED_BATCH_SIZE):
-                batch = stale_ids[i : i + NIGHTLY_EMBED_BATCH_SIZE]
-                for doc_id in batch:
-                    try:
-                        await arq_redis.enqueue_job(
-                            "embed_document_job",
-                            str(doc_id),
-                            _job_id=f"embed:{doc_id}",
-                        )
-                        queued += 1
-                    except Exception as e:
-                        logger.warning("Failed to enqueue embed for doc %s: %s", doc_id, e)
-
-                # Pause between batches to avoid overwhelming the API
-                if i + NIGHTLY_EMBED_BATCH_SIZE < len(stale_ids):
-                    await asyncio.sleep(NIGHTLY_EMBED_BATCH_DELAY_S)
+            for doc_id in stale_ids:
+                try:
+                    await arq_redis.enqueue_job(
+                        "embed_document_job",
+                        str(doc_id),
+                        _job_id=f"embed:{doc_id}",
+                        _queue_name=lane_queue("embed_document_job", LANE_BULK_EMBED),
+                    )
+                    queued += 1
+                except Exception as e:
+                    logger.warning("Failed to enqueue embed for doc %s: %s", doc_id, e)
 
     except Exception as e:
         logger.error("batch_embed_stale_documents failed: %s", e, exc_info=True)
@@ -1720,7 +1954,7 @@ async def process_document_import(ctx: dict[str, Any], job_id: str, _retry_count
                             MAX_IMPORT_RETRIES,
                         )
                         # M4: Reuse shared ARQ pool instead of creating a fresh one
-                        from .services.arq_helper import get_arq_redis
+                        from .services.arq_helper import get_arq_redis, lane_queue
 
                         _arq_pool = await get_arq_redis()
                         # M6: Exponential backoff with jitter to prevent thundering herd
@@ -1733,6 +1967,7 @@ async def process_document_import(ctx: dict[str, Any], job_id: str, _retry_count
                             _retry_count + 1,
                             _job_id=f"import:{job_id}:retry:{_retry_count + 1}",
                             _defer_by=timedelta(seconds=_retry_delay),
+                            _queue_name=lane_queue("process_document_import"),
                         )
                         return {"status": "deferred", "reason": "concurrency_limit"}
                     _concurrency_acquired = True
@@ -1897,7 +2132,7 @@ async def process_document_import(ctx: dict[str, Any], job_id: str, _retry_count
             # 7. Trigger embed_document_job (90%)
             # ----------------------------------------------------------------
             try:
-                from .services.arq_helper import get_arq_redis
+                from .services.arq_helper import get_arq_redis, lane_queue
 
                 _arq_pool = await get_arq_redis()
                 await _arq_pool.enqueue_job(
@@ -1905,6 +2140,7 @@ async def process_document_import(ctx: dict[str, Any], job_id: str, _retry_count
                     str(doc.id),
                     _job_id=f"embed:{doc.id}",
                     _defer_by=timedelta(seconds=120),
+                    _queue_name=lane_queue("embed_document_job"),
                 )
             except Exception as embed_err:
                 logger.warning(
@@ -2286,6 +2522,10 @@ async def shutdown(ctx: dict[str, Any]) -> None:
     await redis_service.disconnect()
     logger.info("Redis disconnected")
 
+    from .ai.chunking_service import shutdown_chunk_pool
+
+    shutdown_chunk_pool()
+
 
 # =============================================================================
 # Schedule Parsing
@@ -2391,7 +2631,7 @@ async def cleanup_stale_processing_files(ctx: dict[str, Any]) -> dict[str, Any]:
                     len(reset_ids),
                 )
                 try:
-                    from .services.arq_helper import get_arq_redis
+                    from .services.arq_helper import get_arq_redis, lane_queue
 
                     arq_redis = await get_arq_redis()
                     for fid in reset_ids:
@@ -2399,6 +2639,7 @@ async def cleanup_stale_processing_files(ctx: dict[str, Any]) -> dict[str, Any]:
                             "extract_and_embed_file_job",
                             str(fid),
                             _job_id=f"extract_file:{fid}",
+                            _queue_name=lane_queue("extract_and_embed_file_job"),
                         )
                 except Exception as enq_err:
                     logger.warning("Failed to re-enqueue reset files: %s", enq_err)
@@ -2448,6 +2689,7 @@ class WorkerSettings:
         cleanup_checkpoints,
         generate_session_title,
         cleanup_stale_processing_files,
+        dispatch_due_embeds,
     ]
 
     # Scheduled cron jobs (configured via .env)
@@ -2465,6 +2707,8 @@ class WorkerSettings:
         cron(cleanup_checkpoints, hour={3}, minute=0, run_at_startup=False),
         # Stale processing file reaper: every 5 minutes (replaces per-job reaper)
         cron(cleanup_stale_processing_files, minute={0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55}, second=30),
+        # Debounced document embeds: hand off due documents every 10 seconds
+        cron(dispatch_due_embeds, second={0, 10, 20, 30, 40, 50}, run_at_startup=False),
     ]
 
     # Lifecycle hooks
@@ -2478,3 +2722,52 @@ class WorkerSettings:
 
     # Health check
     health_check_interval = 30
+
+
+# Priority lane workers (ARQ_LANES_ENABLED): run one process per class,
+# e.g. `arq app.worker.InteractiveWorkerSettings`, instead of WorkerSettings.
+# Each consumes only its lane's queue with its own max_jobs, so a nightly
+# re-embed burst or a large import never delays a user's embed or title.
+
+
+class InteractiveWorkerSettings(WorkerSettings):
+    """Lane for jobs a user is waiting on: post-save embeds and chat titles."""
+
+    queue_name = LANE_QUEUES[LANE_INTERACTIVE]
+    functions = [embed_document_job, generate_session_title]
+    cron_jobs = []
+    max_jobs = settings.arq_interactive_max_jobs
+
+
+class BulkEmbedWorkerSettings(WorkerSettings):
+    """Lane for embeds enqueued in bulk by batch_embed_stale_documents."""
+
+    queue_name = LANE_QUEUES[LANE_BULK_EMBED]
+    functions = [embed_document_job]
+    cron_jobs = []
+    max_jobs = settings.arq_bulk_embed_max_jobs
+
+
+class ImportWorkerSettings(WorkerSettings):
+    """Lane for document imports and file extraction."""
+
+    queue_name = LANE_QUEUES[LANE_IMPORT]
+    functions = [process_document_import, extract_and_embed_file_job]
+    cron_jobs = []
+    max_jobs = settings.arq_import_max_jobs
+
+
+class MaintenanceWorkerSettings(WorkerSettings):
+    """Lane for scheduled maintenance; the only lane that runs cron jobs."""
+
+    queue_name = LANE_QUEUES[LANE_MAINTENANCE]
+    functions = [
+        run_archive_jobs,
+        cleanup_stale_presence,
+        check_search_index_consistency,
+        batch_embed_stale_documents,
+        cleanup_checkpoints,
+        cleanup_stale_processing_files,
+        dispatch_due_embeds,
+    ]
+    max_jobs = settings.arq_maintenance_max_jobs
@@ -0,0 +1,65 @@
+"""Micro-benchmark: pure-Python vs NumPy embedding normalization.
+
+Compares the per-vector Python loop the normalizer used to run against
+``EmbeddingNormalizer.normalize_batch``, and text-literal vector formatting
+against the ``real[]`` bind parameter used by semantic search.
+
+Usage:
+    python scripts/bench_embedding_normalizer.py [--rows 2000] [--dims 1536] [--repeat 5]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ai.embedding_normalizer import EmbeddingNormalizer, to_vector_param  # noqa: E402
+
+
+def _legacy_normalize(embedding: list[float]) -> list[float]:
+    """The pre-NumPy implementation (exact-dimension path)."""
+    adjusted = list(embedding)
+    if any(math.isnan(x) or math.isinf(x) for x in adjusted):
+        raise ValueError("NaN/Inf")
+    norm = math.sqrt(sum(x * x for x in adjusted))
+    if norm < 1e-12:
+        return adjusted
+    return [x / norm for x in adjusted]
+
+
+def _legacy_format(embedding: list[float]) -> str:
+    return "[" + ",".join(str(x) for x in embedding) + "]"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    raw = [[rng.gauss(0.0, 1.0) for _ in range(args.dims)] for _ in range(args.rows)]
+    normalizer = EmbeddingNormalizer(target_dimensions=args.dims)
+
+    legacy = min(timeit.repeat(lambda: [_legacy_normalize(v) for v in raw], number=1, repeat=args.repeat))
+    batch = min(timeit.repeat(lambda: normalizer.normalize_batch(raw), number=1, repeat=args.repeat))
+
+    normalized = normalizer.normalize_batch(raw)
+    as_lists = normalized.tolist()
+    fmt_legacy = min(timeit.repeat(lambda: [_legacy_format(v) for v in as_lists], number=1, repeat=args.repeat))
+    fmt_param = min(timeit.repeat(lambda: [to_vector_param(v) for v in normalized], number=1, repeat=args.repeat))
+
+    print(f"{args.rows} x {args.dims} vectors, best of {args.repeat}")
+    print(f"  normalize  python loop : {legacy * 1000:9.1f} ms")
+    print(f"  normalize  numpy batch : {batch * 1000:9.1f} ms  ({legacy / batch:.1f}x)")
+    print(f"  bind param text literal: {fmt_legacy * 1000:9.1f} ms")
+    print(f"  bind param real[] list : {fmt_param * 1000:9.1f} ms  ({fmt_legacy / fmt_param:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Offline evaluation of the post-RRF lightweight reranker.
+
+Reads labeled queries from a JSONL file and prints MRR/nDCG/recall@k for
+the plain RRF order versus the reranked order. Weights can be overridden
+on the command line to tune ``search.rerank_*_weight`` values before
+changing them in the admin config panel.
+
+Each JSONL line:
+    {
+      "query": "how do we rotate API keys",
+      "candidates": [
+        {"document_id": "<uuid>", "document_title": "...", "chunk_text": "...",
+         "heading_context": "...", "score": 0.0325, "chunk_index": 3},
+        ...
+      ],
+      "relevant": [["<uuid>", 3], ["<uuid>", null]]
+    }
+
+Candidates must be in RRF order (highest fused score first).
+
+Usage:
+    python scripts/eval_reranker.py labeled.jsonl [--k 10] [--bm25 0.6] [--heading 0.3] ...
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import fields
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ai.reranker import (  # noqa: E402
+    LabeledQuery,
+    LightweightReranker,
+    RankingMetrics,
+    RerankWeights,
+    evaluate_reranker,
+)
+from app.ai.retrieval_service import RetrievalResult  # noqa: E402
+
+
+def _load(path: str) -> list[LabeledQuery]:
+    labeled: list[LabeledQuery] = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            candidates = [
+                RetrievalResult(
+                    document_id=UUID(c["document_id"]),
+                    document_title=c.get("document_title", ""),
+                    chunk_text=c.get("chunk_text", ""),
+                    heading_context=c.get("heading_context"),
+                    score=float(c.get("score", 0.0)),
+                    source=c.get("source", "semantic"),
+                    application_id=None,
+                    project_id=None,
+                    snippet="",
+                    chunk_index=c.get("chunk_index"),
+                )
+                for c in row["candidates"]
+            ]
+            relevant = {(UUID(doc_id), idx) for doc_id, idx in row.get("relevant", [])}
+            labeled.append(LabeledQuery(query=row["query"], candidates=candidates, relevant=relevant))
+    return labeled
+
+
+def _fmt(name: str, m: RankingMetrics, k: int) -> str:
+    return f"  {name:<9} MRR@{k}={m.mrr:.4f}  nDCG@{k}={m.ndcg:.4f}  recall@{k}={m.recall:.4f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="JSONL file of labeled queries")
+    parser.add_argument("--k", type=int, default=10)
+    defaults = RerankWeights()
+    for f in fields(RerankWeights):
+        parser.add_argument(f"--{f.name}", type=float, default=getattr(defaults, f.name))
+    args = parser.parse_args()
+
+    weights = RerankWeights(**{f.name: getattr(args, f.name) for f in fields(RerankWeights)})
+    labeled = _load(args.path)
+    report = evaluate_reranker(labeled, LightweightReranker(weights=weights), k=args.k)
+
+    print(f"{report.baseline.queries} labeled queries, weights={weights}")
+    print(_fmt("rrf", report.baseline, report.k))
+    print(_fmt("reranked", report.reranked, report.k))
+
+
+if __name__ == "__main__":
+    main()
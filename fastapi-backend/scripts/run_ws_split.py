@@ -0,0 +1,121 @@
+"""Run the API and the WebSocket gateway as separate local process groups.
+
+Starts ``app.main`` with ``WS_GATEWAY_ENABLED=true`` (no sockets, publishes
+only) and ``app.gateway`` (sockets and relay) under their own uvicorn
+masters, each with its own worker count, then prints CPU and RSS per tier
+every interval. Drive REST load at the API and socket load at the gateway,
+then scale either side alone to see where the time goes. Needs Postgres
+and Redis, like the API itself.
+
+Usage:
+    python scripts/run_ws_split.py [--api-workers 2] [--gateway-workers 2] \\
+        [--api-port 8001] [--gateway-port 8002] [--interval 5]
+
+CPU figures need psutil (installed with ``uv sync --group load``). For
+socket load, point ``tests/load/ws_fanout.py`` at the gateway with
+``--ws-url ws://localhost:8002/ws``.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _uvicorn(target: str, port: int, workers: int, extra: list[str]) -> list[str]:
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        target,
+        "--host",
+        "0.0.0.0",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--ws",
+        "websockets",
+        "--ws-per-message-deflate",
+        "true",
+        *extra,
+    ]
+
+
+def _tier_usage(proc: subprocess.Popen, psutil, seen: dict) -> tuple[float, float, int]:
+    """CPU percent (sum over workers), RSS in MB and worker count for one uvicorn master.
+
+    ``seen`` keeps psutil.Process objects across calls, since cpu_percent
+    measures from the previous call on the same object.
+    """
+    master = seen.setdefault(proc.pid, psutil.Process(proc.pid))
+    workers = [seen.setdefault(p.pid, p) for p in master.children(recursive=True)]
+    cpu = sum(p.cpu_percent(interval=None) for p in workers)
+    rss = sum(p.memory_info().rss for p in [master, *workers]) / (1024 * 1024)
+    return cpu, rss, len(workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api-workers", type=int, default=2)
+    parser.add_argument("--gateway-workers", type=int, default=2)
+    parser.add_argument("--api-port", type=int, default=8001)
+    parser.add_argument("--gateway-port", type=int, default=8002)
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between CPU reports")
+    args = parser.parse_args()
+
+    env = {**os.environ, "WS_GATEWAY_ENABLED": "true"}
+    tiers = {
+        "api": subprocess.Popen(
+            _uvicorn("app.main:app", args.api_port, args.api_workers, []),
+            cwd=BACKEND_DIR,
+            env=env,
+        ),
+        "gateway": subprocess.Popen(
+            _uvicorn("app.gateway:app", args.gateway_port, args.gateway_workers, ["--loop", "uvloop"]),
+            cwd=BACKEND_DIR,
+            env=env,
+        ),
+    }
+    print(f"API      http://localhost:{args.api_port}  ({args.api_workers} workers)")
+    print(f"Gateway  ws://localhost:{args.gateway_port}/ws  ({args.gateway_workers} workers)")
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+        print("psutil not installed; CPU reporting disabled")
+    seen: dict = {}
+
+    try:
+        while all(proc.poll() is None for proc in tiers.values()):
+            time.sleep(args.interval)
+            if psutil is None:
+                continue
+            parts = []
+            for name, proc in tiers.items():
+                try:
+                    cpu, rss, workers = _tier_usage(proc, psutil, seen)
+                except psutil.Error:
+                    continue
+                parts.append(f"{name}: {cpu:5.1f}% CPU over {workers} procs, {rss:6.0f} MB")
+            print(" | ".join(parts), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in tiers.values():
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGINT)
+        for proc in tiers.values():
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -102,6 +102,8 @@ _DROP_STATEMENTS = [
     'DROP TABLE IF EXISTS "ChatSessions" CASCADE',
     'DROP TABLE IF EXISTS "ImportJobs" CASCADE',
     'DROP TABLE IF EXISTS "DocumentChunks" CASCADE',
+    'DROP TABLE IF EXISTS "ExtractionCacheChunks" CASCADE',
+    'DROP TABLE IF EXISTS "ExtractionCache" CASCADE',
     'DROP TABLE IF EXISTS "FolderFiles" CASCADE',
     'DROP TABLE IF EXISTS "DocumentSnapshots" CASCADE',
     'DROP TABLE IF EXISTS "DocumentTagAssignments" CASCADE',
@@ -205,10 +207,12 @@ async def engine():
         if _pgvector_available:
             await conn.run_sync(Base.metadata.create_all)
         else:
-            # Create all tables except DocumentChunks (which requires vector type)
+            # Create all tables except those with vector columns
             from app.models.document_chunk import DocumentChunk
+            from app.models.extraction_cache import ExtractionCacheChunk
 
-            tables_to_create = [t for t in Base.metadata.sorted_tables if t.name != DocumentChunk.__tablename__]
+            vector_tables = {DocumentChunk.__tablename__, ExtractionCacheChunk.__tablename__}
+            tables_to_create = [t for t in Base.metadata.sorted_tables if t.name not in vector_tables]
             await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables_to_create))
 
     # Dispose DDL engine — its connections are no longer needed
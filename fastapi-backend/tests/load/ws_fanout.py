@@ -0,0 +1,422 @@
+"""WebSocket fan-out load test: REST mutation to ``task_updated`` on N sockets.
+
+The Locust suites only exercise REST endpoints. This tool measures the
+real-time path end to end:
+
+1. Mints connection tokens with ``create_ws_connection_token`` for the
+   members of a project's application (so room authorization passes) and
+   opens ``--sockets`` authenticated sockets, at most ``--sockets-per-user``
+   per member (the server caps connections per user).
+2. Each socket joins a realistic room mix with one ``join_rooms`` message:
+   the application room, the project room and ``--task-rooms`` random
+   task rooms of the project.
+3. Drives ``PUT /api/tasks/{id}`` title changes at ``--rate`` per second
+   across the project's tasks. Each title carries a sequence number.
+4. Every socket records when it first sees each sequence number, then
+   the tool reports delivery and fan-out completion latency (p50/p90/p99),
+   dropped events and, with ``--server-pid``, CPU per server worker.
+
+An update that a socket never saw counts as superseded, not dropped, when
+the socket later saw a newer update for the same task (coalescing sends
+only the latest state per task within ``websocket.coalesce_window_ms``).
+
+Needs the backend environment (``.env`` with database, Redis and JWT
+settings): tokens are minted directly rather than through the 2FA login.
+Mutations are made as the application owner unless ``--driver-user-id``
+names another editor. Run from ``fastapi-backend``:
+
+    uv run python -m tests.load.ws_fanout --project-id <uuid> \\
+        --sockets 2000 --rate 20 --duration 60 \\
+        [--api-url http://localhost:8001] [--ws-url ws://localhost:8002/ws] \\
+        [--encoding msgpack] [--server-pid <uvicorn master pid>] [--json results.json]
+
+Install the load group first (``uv sync --group load``) for httpx and psutil.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+
+TITLE_PREFIX = "ws-fanout"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (NaN for no values)."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class Mutation:
+    task_id: str
+    sent_at: float
+
+
+class FanoutStats:
+    """Which socket received which mutation, and when."""
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.mutations: dict[int, Mutation] = {}
+        # seq -> socket id -> first receipt time
+        self.received: dict[int, dict[int, float]] = {}
+        # Sockets that joined the project room and stayed connected
+        self.sockets: set[int] = set()
+        self.disconnected: set[int] = set()
+        self.connect_errors = 0
+        self.failed_mutations = 0
+
+    def title(self, seq: int) -> str:
+        return f"{TITLE_PREFIX} {self.run_id} {seq}"
+
+    def parse_seq(self, title: Any) -> Optional[int]:
+        prefix = f"{TITLE_PREFIX} {self.run_id} "
+        if not isinstance(title, str) or not title.startswith(prefix):
+            return None
+        try:
+            return int(title[len(prefix) :])
+        except ValueError:
+            return None
+
+    def record_sent(self, seq: int, task_id: str, sent_at: float) -> None:
+        self.mutations[seq] = Mutation(task_id, sent_at)
+
+    def record_event(self, socket_id: int, message: dict[str, Any], received_at: float) -> None:
+        """Note a task_updated event (full payload or field delta) from this run."""
+        if message.get("type") != "task_updated":
+            return
+        data = message.get("data") or {}
+        title = (data.get("changes") or {}).get("title") or (data.get("task") or {}).get("title")
+        seq = self.parse_seq(title)
+        if seq is None or seq not in self.mutations:
+            return
+        self.received.setdefault(seq, {}).setdefault(socket_id, received_at)
+
+    def summary(self) -> dict[str, Any]:
+        expected = self.sockets - self.disconnected
+
+        # Newest sequence each socket saw per task, to tell coalesced updates from lost ones
+        newest: dict[tuple[int, str], int] = {}
+        for seq, by_socket in self.received.items():
+            task_id = self.mutations[seq].task_id
+            for socket_id in by_socket:
+                key = (socket_id, task_id)
+                if newest.get(key, -1) < seq:
+                    newest[key] = seq
+
+        latencies: list[float] = []
+        completions: list[float] = []
+        delivered = superseded = dropped = 0
+        for seq, mutation in self.mutations.items():
+            by_socket = self.received.get(seq, {})
+            complete = True
+            for socket_id in expected:
+                received_at = by_socket.get(socket_id)
+                if received_at is not None:
+                    delivered += 1
+                    latencies.append(received_at - mutation.sent_at)
+                elif newest.get((socket_id, mutation.task_id), -1) > seq:
+                    superseded += 1
+                    complete = False
+                else:
+                    dropped += 1
+                    complete = False
+            if complete and expected:
+                completions.append(max(by_socket[s] for s in expected) - mutation.sent_at)
+
+        def ms(values: list[float]) -> dict[str, float]:
+            return {
+                "p50": round(percentile(values, 50) * 1000, 2),
+                "p90": round(percentile(values, 90) * 1000, 2),
+                "p99": round(percentile(values, 99) * 1000, 2),
+                "max": round(max(values) * 1000, 2) if values else math.nan,
+            }
+
+        return {
+            "sockets": len(expected),
+            "disconnected": len(self.disconnected),
+            "connect_errors": self.connect_errors,
+            "mutations": len(self.mutations),
+            "failed_mutations": self.failed_mutations,
+            "events_expected": len(self.mutations) * len(expected),
+            "events_delivered": delivered,
+            "events_superseded": superseded,
+            "events_dropped": dropped,
+            "delivery_latency_ms": ms(latencies),
+            "fanout_complete_ms": ms(completions),
+        }
+
+
+class CpuSampler:
+    """Samples CPU percent of each uvicorn worker under the given master PIDs."""
+
+    def __init__(self, master_pids: list[int]) -> None:
+        import psutil
+
+        self._psutil = psutil
+        self._masters = [psutil.Process(pid) for pid in master_pids]
+        self._procs: dict[int, Any] = {}
+        self.samples: dict[int, list[float]] = {}
+
+    def _workers(self) -> list[Any]:
+        workers = []
+        for master in self._masters:
+            children = master.children(recursive=True) or [master]
+            workers.extend(self._procs.setdefault(p.pid, p) for p in children)
+        return workers
+
+    async def run(self, interval: float = 1.0) -> None:
+        # cpu_percent measures from the previous call on the same Process object
+        for proc in self._workers():
+            proc.cpu_percent(interval=None)
+        while True:
+            await asyncio.sleep(interval)
+            for proc in self._workers():
+                try:
+                    self.samples.setdefault(proc.pid, []).append(proc.cpu_percent(interval=None))
+                except self._psutil.Error:
+                    continue
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            str(pid): {"avg": round(sum(s) / len(s), 1), "max": round(max(s), 1)}
+            for pid, s in sorted(self.samples.items())
+            if s
+        }
+
+
+async def _load_room_targets(project_id: str) -> tuple[str, str, list[str]]:
+    """Return the project's application id, its owner and the user ids allowed to join its rooms."""
+    from sqlalchemy import select
+
+    from app.database import async_session_maker
+    from app.models.application import Application
+    from app.models.application_member import ApplicationMember
+    from app.models.project import Project
+
+    async with async_session_maker() as db:
+        project = await db.get(Project, uuid.UUID(project_id))
+        if project is None:
+            raise SystemExit(f"Project {project_id} not found")
+        application = await db.get(Application, project.application_id)
+        result = await db.execute(
+            select(ApplicationMember.user_id).where(ApplicationMember.application_id == project.application_id)
+        )
+        member_ids = {str(user_id) for user_id in result.scalars().all()}
+    member_ids.add(str(application.owner_id))
+    return str(project.application_id), str(application.owner_id), sorted(member_ids)
+
+
+async def _run_socket(
+    socket_id: int,
+    url: str,
+    rooms: list[str],
+    project_room: str,
+    stats: FanoutStats,
+    joined: asyncio.Event,
+) -> None:
+    import msgpack
+    import orjson
+    import websockets
+
+    try:
+        ws = await websockets.connect(url, max_size=None, compression="deflate", ping_interval=None)
+    except Exception:
+        stats.connect_errors += 1
+        joined.set()
+        return
+
+    try:
+        # The server reads text frames only
+        join = {"type": "join_rooms", "data": {"rooms": [{"room_id": r} for r in rooms]}}
+        await ws.send(orjson.dumps(join).decode())
+        async for raw in ws:
+            received_at = time.perf_counter()
+            message = msgpack.unpackb(raw) if isinstance(raw, bytes) else orjson.loads(raw)
+            events = message.get("events", []) if message.get("type") == "batch" else [message]
+            for event in events:
+                event_type = event.get("type")
+                if event_type == "ping":
+                    await ws.send('{"type":"pong","data":{}}')
+                elif event_type == "room_joined" and (event.get("data") or {}).get("room_id") == project_room:
+                    stats.sockets.add(socket_id)
+                    joined.set()
+                else:
+                    stats.record_event(socket_id, event, received_at)
+    except asyncio.CancelledError:
+        # Closed by the tool at the end of the run
+        await ws.close()
+        raise
+    except Exception:
+        pass
+    # The server closed the socket, or it failed, before the run ended
+    if socket_id in stats.sockets:
+        stats.disconnected.add(socket_id)
+    joined.set()
+
+
+async def _open_sockets(args, stats: FanoutStats, application_id: str, user_ids: list[str], task_ids: list[str]):
+    from app.services.auth_service import create_ws_connection_token
+
+    capacity = len(user_ids) * args.sockets_per_user
+    if capacity < args.sockets:
+        print(f"Only {len(user_ids)} members x {args.sockets_per_user} sockets each: opening {capacity} sockets")
+    count = min(args.sockets, capacity)
+
+    project_room = f"project:{args.project_id}"
+    semaphore = asyncio.Semaphore(args.connect_concurrency)
+    tasks: list[asyncio.Task] = []
+
+    async def open_one(socket_id: int) -> None:
+        async with semaphore:
+            token = await create_ws_connection_token(user_ids[socket_id % len(user_ids)])
+            rooms = [f"application:{application_id}", project_room]
+            rooms += [f"task:{t}" for t in random.sample(task_ids, min(args.task_rooms, len(task_ids)))]
+            joined = asyncio.Event()
+            url = f"{args.ws_url}?token={token}&batch=1&encoding={args.encoding}"
+            tasks.append(asyncio.create_task(_run_socket(socket_id, url, rooms, project_room, stats, joined)))
+            await joined.wait()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(open_one(i) for i in range(count)))
+    print(
+        f"Opened {len(stats.sockets)}/{count} sockets in {time.perf_counter() - started:.1f}s "
+        f"({stats.connect_errors} connect errors)"
+    )
+    return tasks
+
+
+async def _drive_mutations(args, client, headers: dict, stats: FanoutStats, task_ids: list[str]) -> None:
+    interval = 1 / args.rate
+    deadline = time.perf_counter() + args.duration
+    in_flight: set[asyncio.Task] = set()
+    seq = 0
+
+    async def mutate(seq: int, task_id: str) -> None:
+        sent_at = time.perf_counter()
+        stats.record_sent(seq, task_id, sent_at)
+        try:
+            response = await client.put(f"/api/tasks/{task_id}", json={"title": stats.title(seq)}, headers=headers)
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+        if not ok:
+            stats.failed_mutations += 1
+            stats.mutations.pop(seq, None)
+
+    next_at = time.perf_counter()
+    while time.perf_counter() < deadline:
+        task = asyncio.create_task(mutate(seq, task_ids[seq % len(task_ids)]))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        seq += 1
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+def _print_summary(summary: dict[str, Any]) -> None:
+    print("\n" + "=" * 60)
+    print("  WebSocket fan-out results")
+    print("=" * 60)
+    print(f"  Sockets:            {summary['sockets']} ({summary['disconnected']} disconnected mid-run)")
+    print(f"  Mutations:          {summary['mutations']} ok, {summary['failed_mutations']} failed")
+    print(
+        f"  Events:             {summary['events_delivered']}/{summary['events_expected']} delivered, "
+        f"{summary['events_superseded']} superseded, {summary['events_dropped']} dropped"
+    )
+    for label, key in (("Delivery latency", "delivery_latency_ms"), ("Fan-out complete", "fanout_complete_ms")):
+        lat = summary[key]
+        print(f"  {label + ':':<20}p50 {lat['p50']} ms, p90 {lat['p90']} ms, p99 {lat['p99']} ms, max {lat['max']} ms")
+    for pid, cpu in (summary.get("worker_cpu") or {}).items():
+        print(f"  Worker {pid:<13}CPU avg {cpu['avg']}%, max {cpu['max']}%")
+    print("=" * 60)
+
+
+async def run(args) -> dict[str, Any]:
+    import httpx
+    import orjson
+
+    from app.services.auth_service import create_access_token
+    from app.services.redis_service import redis_service
+
+    stats = FanoutStats(run_id=uuid.uuid4().hex[:8])
+    await redis_service.connect()
+
+    application_id, owner_id, user_ids = await _load_room_targets(args.project_id)
+    driver_id = args.driver_user_id or owner_id
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': driver_id})}"}
+
+    async with httpx.AsyncClient(base_url=args.api_url, timeout=30) as client:
+        response = await client.get(
+            f"/api/projects/{args.project_id}/tasks", params={"limit": args.tasks}, headers=headers
+        )
+        response.raise_for_status()
+        task_ids = [t["id"] for t in response.json()]
+        if not task_ids:
+            raise SystemExit("Project has no tasks to mutate")
+
+        socket_tasks = await _open_sockets(args, stats, application_id, user_ids, task_ids)
+
+        sampler = CpuSampler(args.server_pid) if args.server_pid else None
+        sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+
+        print(f"Driving {args.rate}/s task updates across {len(task_ids)} tasks for {args.duration}s...")
+        await _drive_mutations(args, client, headers, stats, task_ids)
+        await asyncio.sleep(args.drain)
+
+        if sampler_task:
+            sampler_task.cancel()
+        for task in socket_tasks:
+            task.cancel()
+        await asyncio.gather(*socket_tasks, return_exceptions=True)
+
+    await redis_service.disconnect()
+
+    summary = stats.summary()
+    if sampler:
+        summary["worker_cpu"] = sampler.summary()
+    _print_summary(summary)
+    if args.json:
+        with open(args.json, "wb") as fh:
+            fh.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-id", required=True, help="Project whose tasks are mutated")
+    parser.add_argument("--driver-user-id", help="User who makes the task updates (default: application owner)")
+    parser.add_argument("--api-url", default="http://localhost:8001")
+    parser.add_argument("--ws-url", default="ws://localhost:8001/ws", help="API /ws or the gateway's /ws")
+    parser.add_argument("--encoding", choices=("json", "msgpack"), default="json")
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--sockets-per-user", type=int, default=10, help="Keep below WS_MAX_CONNECTIONS_PER_USER")
+    parser.add_argument("--task-rooms", type=int, default=3, help="Task rooms joined per socket")
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks of the project to mutate")
+    parser.add_argument("--connect-concurrency", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=10.0, help="Task updates per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of mutations")
+    parser.add_argument("--drain", type=float, default=5.0, help="Seconds to wait for late events")
+    parser.add_argument("--server-pid", type=int, action="append", help="uvicorn master PID to sample (repeatable)")
+    parser.add_argument("--json", help="Write the summary to this file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    sys.exit(1 if summary["events_dropped"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -55,6 +55,8 @@ class MockRetrievalResult:
     application_id: UUID | None = None
     source_type: str = "document"
     file_id: UUID | None = None
+    context_before: str = ""
+    context_after: str = ""
 
 
 @dataclass
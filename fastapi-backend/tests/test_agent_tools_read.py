@@ -8,7 +8,7 @@ Tests cover:
 - _format_date with date, datetime, None
 - _relative_time relative time formatting
 - _days_overdue positive result, None when not overdue
-- ALL_READ_TOOLS contains 24 tools
+- ALL_READ_TOOLS contains 27 tools
 - query_knowledge — access denied on invalid app_id, name resolution
 - sql_query — wraps sql_query_tool
 - get_projects — access denied, name resolution, returns markdown table
@@ -255,8 +255,8 @@ class TestDaysOverdue:
 
 
 class TestAllReadTools:
-    def test_returns_25_tools(self):
-        assert len(ALL_READ_TOOLS) == 25
+    def test_returns_27_tools(self):
+        assert len(ALL_READ_TOOLS) == 27
 
     def test_tool_names(self):
         names = {t.name for t in ALL_READ_TOOLS}
@@ -279,8 +279,10 @@ class TestAllReadTools:
             "get_task_detail",
             "get_task_comments",
             "get_blocked_tasks",
-            # Knowledge (5)
+            # Knowledge (7)
             "search_knowledge",
+            "search_knowledge_many",
+            "read_document",
             "browse_folders",
             "get_document_details",
             "list_recent_documents",
@@ -897,6 +899,51 @@ class TestSearchKnowledge:
         assert "Unexpected response format" in result
         _clear()
 
+    # -----------------------------------------------------------------------
+    # search_knowledge_many (batched variant)
+    # -----------------------------------------------------------------------
+
+    @patch("app.ai.agent_tools.rag_search_many_tool", new_callable=AsyncMock)
+    async def test_many_batches_deduped_queries_and_pushes_sources(self, mock_rag_many):
+        """search_knowledge_many issues one batched call and never interrupts."""
+        from app.ai.agent.source_references import (
+            get_accumulated_sources,
+            reset_source_accumulator,
+        )
+        from app.ai.agent.tools.knowledge_tools import search_knowledge_many
+        from app.ai.agent_tools import ToolResult
+
+        docs = self._make_docs_meta(6)
+        mock_rag_many.return_value = ToolResult(
+            success=True,
+            data="## Results for: auth\n...\n## Results for: billing\n...",
+            metadata={"documents": docs},
+        )
+        mock_session = AsyncMock()
+
+        @asynccontextmanager
+        async def mock_db_factory():
+            yield mock_session
+
+        _setup_context(provider_registry=MagicMock(), db_session_factory=mock_db_factory)
+        reset_source_accumulator()
+        result = await search_knowledge_many.ainvoke({"queries": ["auth", " auth ", "billing", ""]})
+
+        mock_rag_many.assert_awaited_once()
+        assert mock_rag_many.call_args.kwargs["queries"] == ["auth", "billing"]
+        assert "Results for: billing" in result
+        assert len(get_accumulated_sources()) == 6
+        _clear()
+
+    async def test_many_rejects_empty_and_oversized_batches(self):
+        from app.ai.agent.tools.knowledge_tools import search_knowledge_many
+
+        _setup_context(provider_registry=MagicMock())
+        assert "at least one" in await search_knowledge_many.ainvoke({"queries": ["", "  "]})
+        too_many = [f"topic {i}" for i in range(20)]
+        assert "At most" in await search_knowledge_many.ainvoke({"queries": too_many})
+        _clear()
+
 
 # ---------------------------------------------------------------------------
 # _build_sources helper
@@ -15,12 +15,16 @@ from app.config import settings
 from app.models import Application, Project, Task, User
 from app.models.task_status import TaskStatus, StatusName, STATUS_CATEGORY_MAP
 from app.services.redis_service import redis_service
+from app import worker
 from app.worker import (
+    _DROP_EMPTY_PRESENCE_ROOM_LUA,
     archive_stale_done_tasks,
     archive_eligible_projects,
     cleanup_stale_presence,
     run_archive_jobs,
     PRESENCE_PREFIX,
+    PRESENCE_ROOMS_KEY,
+    USER_DATA_PREFIX,
 )
 
 # ARCHIVE_AFTER_DAYS was removed from worker.py (now runtime-configurable);
@@ -364,6 +368,7 @@ class TestCleanupStalePresence:
         # Add a stale presence entry (old timestamp)
         stale_timestamp = time.time() - 60  # 60 seconds ago (TTL is 45s)
         await redis_service.client.zadd(f"{PRESENCE_PREFIX}{room_id}", {user_id: stale_timestamp})
+        await redis_service.client.sadd(PRESENCE_ROOMS_KEY, room_id)
 
         # Verify entry exists
         score = await redis_service.client.zscore(f"{PRESENCE_PREFIX}{room_id}", user_id)
@@ -373,10 +378,12 @@ class TestCleanupStalePresence:
         ctx = {}
         result = await cleanup_stale_presence(ctx)
 
-        # Verify entry was removed
+        # Verify entry was removed, and the emptied room left the index
         score = await redis_service.client.zscore(f"{PRESENCE_PREFIX}{room_id}", user_id)
         assert score is None
         assert result["removed"] >= 1
+        assert not await redis_service.client.sismember(PRESENCE_ROOMS_KEY, room_id)
+        assert not await redis_service.client.exists(f"{USER_DATA_PREFIX}{room_id}")
 
         # Cleanup
         await redis_service.client.delete(f"{PRESENCE_PREFIX}{room_id}")
@@ -390,6 +397,7 @@ class TestCleanupStalePresence:
         # Add a fresh presence entry (current timestamp)
         fresh_timestamp = time.time()
         await redis_service.client.zadd(f"{PRESENCE_PREFIX}{room_id}", {user_id: fresh_timestamp})
+        await redis_service.client.sadd(PRESENCE_ROOMS_KEY, room_id)
 
         # Run cleanup
         ctx = {}
@@ -398,9 +406,46 @@ class TestCleanupStalePresence:
         # Verify entry still exists
         score = await redis_service.client.zscore(f"{PRESENCE_PREFIX}{room_id}", user_id)
         assert score is not None
+        assert await redis_service.client.sismember(PRESENCE_ROOMS_KEY, room_id)
 
         # Cleanup
         await redis_service.client.delete(f"{PRESENCE_PREFIX}{room_id}")
+        await redis_service.client.srem(PRESENCE_ROOMS_KEY, room_id)
+
+    @pytest.mark.asyncio
+    async def test_first_run_backfills_unindexed_rooms(self, redis_connected, monkeypatch):
+        """Presence keys written before the room index existed are still cleaned."""
+        stale_room = f"test_room_{uuid4().hex[:8]}"
+        orphan_room = f"test_room_{uuid4().hex[:8]}"
+        await redis_service.client.zadd(f"{PRESENCE_PREFIX}{stale_room}", {"u1": time.time() - 60})
+        await redis_service.client.hset(f"{USER_DATA_PREFIX}{orphan_room}", mapping={"u2": "{}"})
+        monkeypatch.setattr(worker, "_presence_rooms_backfilled", False)
+
+        result = await cleanup_stale_presence({})
+
+        assert result["removed"] >= 1
+        assert worker._presence_rooms_backfilled
+        for room_id in (stale_room, orphan_room):
+            assert not await redis_service.client.sismember(PRESENCE_ROOMS_KEY, room_id)
+            assert not await redis_service.client.exists(f"{USER_DATA_PREFIX}{room_id}")
+
+    @pytest.mark.asyncio
+    async def test_drop_empty_room_keeps_room_with_new_heartbeat(self, redis_connected):
+        """A heartbeat flushed after the emptiness check keeps index entry and metadata."""
+        room_id = f"test_room_{uuid4().hex[:8]}"
+        keys = (f"{PRESENCE_PREFIX}{room_id}", PRESENCE_ROOMS_KEY, f"{USER_DATA_PREFIX}{room_id}")
+        await redis_service.client.zadd(keys[0], {"u1": time.time()})
+        await redis_service.client.sadd(PRESENCE_ROOMS_KEY, room_id)
+        await redis_service.client.hset(keys[2], mapping={"u1": "{}"})
+
+        assert await redis_service.client.eval(_DROP_EMPTY_PRESENCE_ROOM_LUA, 3, *keys, room_id) == 0
+        assert await redis_service.client.sismember(PRESENCE_ROOMS_KEY, room_id)
+        assert await redis_service.client.exists(keys[2])
+
+        await redis_service.client.delete(keys[0])
+        assert await redis_service.client.eval(_DROP_EMPTY_PRESENCE_ROOM_LUA, 3, *keys, room_id) == 1
+        assert not await redis_service.client.sismember(PRESENCE_ROOMS_KEY, room_id)
+        assert not await redis_service.client.exists(keys[2])
 
     @pytest.mark.asyncio
     async def test_cleanup_handles_empty_redis(self, redis_connected):
@@ -433,13 +478,13 @@ class TestWorkerSettings:
         """Cron jobs should be configured."""
         from app.worker import WorkerSettings
 
-        assert len(WorkerSettings.cron_jobs) == 6
+        assert len(WorkerSettings.cron_jobs) == 7
 
     def test_functions_registered(self):
         """Job functions should be registered."""
         from app.worker import WorkerSettings
 
-        assert len(WorkerSettings.functions) == 10
+        assert len(WorkerSettings.functions) == 11
         function_names = [f.__name__ for f in WorkerSettings.functions]
         assert "run_archive_jobs" in function_names
         assert "cleanup_stale_presence" in function_names
@@ -451,3 +496,81 @@ class TestWorkerSettings:
         assert "cleanup_checkpoints" in function_names
         assert "generate_session_title" in function_names
         assert "cleanup_stale_processing_files" in function_names
+        assert "dispatch_due_embeds" in function_names
+
+
+# =============================================================================
+# Priority Lane Tests
+# =============================================================================
+
+
+class TestPriorityLanes:
+    """Tests for lane routing and the per-lane worker settings."""
+
+    def test_lanes_disabled_use_default_queue(self, monkeypatch):
+        """With lanes off every job goes to ARQ's default queue."""
+        from app.services.arq_helper import DEFAULT_QUEUE, lane_queue
+
+        monkeypatch.setattr(settings, "arq_lanes_enabled", False)
+        assert lane_queue("embed_document_job") == DEFAULT_QUEUE
+        assert lane_queue("process_document_import") == DEFAULT_QUEUE
+
+    def test_lanes_route_by_job_type(self, monkeypatch):
+        """Each job type lands on its lane; unknown jobs are maintenance."""
+        from app.services.arq_helper import (
+            LANE_BULK_EMBED,
+            LANE_QUEUES,
+            lane_queue,
+        )
+
+        monkeypatch.setattr(settings, "arq_lanes_enabled", True)
+        assert lane_queue("embed_document_job") == LANE_QUEUES["interactive"]
+        assert lane_queue("generate_session_title") == LANE_QUEUES["interactive"]
+        assert lane_queue("extract_and_embed_file_job") == LANE_QUEUES["import"]
+        assert lane_queue("cleanup_checkpoints") == LANE_QUEUES["maintenance"]
+        assert lane_queue("embed_document_job", LANE_BULK_EMBED) == LANE_QUEUES["bulk_embed"]
+
+    def test_lane_workers_cover_routed_jobs(self):
+        """Every job is registered on the worker for the lane it routes to."""
+        from app.services.arq_helper import JOB_LANES, LANE_MAINTENANCE
+        from app.worker import (
+            BulkEmbedWorkerSettings,
+            ImportWorkerSettings,
+            InteractiveWorkerSettings,
+            MaintenanceWorkerSettings,
+            WorkerSettings,
+        )
+
+        lane_workers = {
+            "interactive": InteractiveWorkerSettings,
+            "bulk_embed": BulkEmbedWorkerSettings,
+            "import": ImportWorkerSettings,
+            "maintenance": MaintenanceWorkerSettings,
+        }
+        assert len({w.queue_name for w in lane_workers.values()}) == 4
+        for func in WorkerSettings.functions:
+            lane = JOB_LANES.get(func.__name__, LANE_MAINTENANCE)
+            assert func in lane_workers[lane].functions
+        assert "embed_document_job" in [f.__name__ for f in BulkEmbedWorkerSettings.functions]
+        assert MaintenanceWorkerSettings.cron_jobs == WorkerSettings.cron_jobs
+        assert InteractiveWorkerSettings.cron_jobs == []
+
+    @pytest.mark.asyncio
+    async def test_lane_stats_report_depth_and_wait(self, monkeypatch):
+        """Ready vs deferred jobs and the oldest ready job's wait are reported."""
+        from unittest.mock import AsyncMock
+
+        from app.services.arq_helper import get_lane_stats
+
+        now_ms = int(time.time() * 1000)
+        redis = AsyncMock()
+        redis.zcard.return_value = 3
+        redis.zcount.return_value = 2
+        redis.zrangebyscore.return_value = [(b"job", now_ms - 5000)]
+
+        monkeypatch.setattr(settings, "arq_lanes_enabled", False)
+        stats = await get_lane_stats(redis)
+
+        assert stats["default"]["ready"] == 2
+        assert stats["default"]["deferred"] == 1
+        assert stats["default"]["oldest_wait_ms"] >= 5000
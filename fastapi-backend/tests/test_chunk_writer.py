@@ -0,0 +1,94 @@
+"""Unit tests for the bulk DocumentChunk writer.
+
+The session is mocked; tests check the single statement's shape and the
+array parameters it binds (flat embeddings, presence mask, scope).
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.ai.chunk_writer import ChunkRow, write_chunks
+
+
+def _rows(n: int, chunk_type: str = "text") -> list[ChunkRow]:
+    return [
+        ChunkRow(chunk_index=i, chunk_text=f"chunk {i}", token_count=10 + i, heading_context="H", chunk_type=chunk_type)
+        for i in range(n)
+    ]
+
+
+class TestWriteChunks:
+    @pytest.mark.asyncio
+    async def test_replace_is_one_statement(self):
+        db = AsyncMock()
+        doc_id, app_id = uuid4(), uuid4()
+        embeddings = np.arange(6, dtype=np.float32).reshape(3, 2)
+
+        written = await write_chunks(
+            db,
+            _rows(3),
+            embeddings,
+            {"application_id": app_id, "project_id": None, "user_id": None},
+            document_id=doc_id,
+        )
+
+        assert written == 3
+        db.execute.assert_awaited_once()
+        sql, params = db.execute.call_args.args
+        assert 'DELETE FROM "DocumentChunks" WHERE document_id' in str(sql)
+        assert "count(*)" in str(sql)
+        assert params["parent_id"] == str(doc_id)
+        assert params["document_id"] == str(doc_id)
+        assert params["file_id"] is None
+        assert params["source_type"] == "document"
+        assert params["application_id"] == str(app_id)
+        assert params["project_id"] is None
+        assert params["dims"] == 2
+        assert params["embeddings"] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert params["has_embedding"] == [True, True, True]
+        assert params["chunk_indexes"] == [0, 1, 2]
+        assert params["token_counts"] == [10, 11, 12]
+        assert len(set(params["ids"])) == 3
+
+    @pytest.mark.asyncio
+    async def test_append_masks_missing_embeddings(self):
+        db = AsyncMock()
+        file_id = uuid4()
+
+        await write_chunks(
+            db, _rows(2, chunk_type="image"), [None, [0.5, 0.25]], {}, file_id=file_id, replace=False
+        )
+
+        sql, params = db.execute.call_args.args
+        assert "DELETE" not in str(sql)
+        assert params["source_type"] == "file"
+        assert params["file_id"] == str(file_id)
+        assert params["chunk_types"] == ["image", "image"]
+        assert params["has_embedding"] == [False, True]
+        assert params["embeddings"] == [0.0, 0.0, 0.5, 0.25]
+
+    @pytest.mark.asyncio
+    async def test_no_rows_only_deletes(self):
+        db = AsyncMock()
+
+        assert await write_chunks(db, [], np.empty((0, 4)), {}, document_id=uuid4()) == 0
+
+        sql, _ = db.execute.call_args.args
+        assert str(sql).startswith('DELETE FROM "DocumentChunks"')
+
+    @pytest.mark.asyncio
+    async def test_requires_exactly_one_parent(self):
+        with pytest.raises(ValueError):
+            await write_chunks(AsyncMock(), _rows(1), [[0.1]], {})
+        with pytest.raises(ValueError):
+            await write_chunks(AsyncMock(), _rows(1), [[0.1]], {}, document_id=uuid4(), file_id=uuid4())
+
+    @pytest.mark.asyncio
+    async def test_embedding_count_mismatch(self):
+        with pytest.raises(ValueError):
+            await write_chunks(AsyncMock(), _rows(2), [[0.1]], {}, document_id=uuid4())
@@ -578,6 +578,45 @@ class TestTokenCounting:
         assert count1 == count2
 
 
+class TestCarriedTokenIds:
+    """Token ids carried through merging must match a fresh encode of the text."""
+
+    def _long_doc(self):
+        nodes = []
+        for section in range(4):
+            nodes.append(heading(f"Section {section}", level=2))
+            for i in range(12):
+                nodes.append(
+                    paragraph(
+                        f"Paragraph {i} of section {section} covers  spacing, numbers like 3.14 "
+                        f"and punctuation (see item #{i}).\tTabs too."
+                    )
+                )
+        return make_tiptap_doc(*nodes)
+
+    def test_merged_chunk_ids_match_encode(self, chunker):
+        blocks = chunker._extract_blocks(self._long_doc())
+        for block in blocks:
+            chunker._count_block(block)
+        for chunk in chunker._merge_and_split(blocks):
+            if chunk.token_ids is not None:
+                assert chunk.token_ids == chunker._encoder.encode(chunk.text)
+
+    def test_split_large_text_ids_match_encode(self, chunker):
+        text = " ".join(f"Sentence number {i} ends here." for i in range(400))
+        for chunk in chunker._split_large_text(text, None):
+            if chunk.token_ids is not None:
+                assert chunk.token_ids == chunker._encoder.encode(chunk.text)
+
+    def test_overlap_token_counts_match_encode(self, chunker):
+        """Overlapped chunks (same heading, so every chunk after the first) count exactly."""
+        doc = make_tiptap_doc(*(paragraph(f"Line {i} has  two spaces and a\ttab.") for i in range(300)))
+        result = chunker.chunk_document(doc, "Overlap", "document")
+        assert len(result) >= 2
+        for chunk in result[1:]:
+            assert chunk.token_count == chunker.count_tokens(chunk.text)
+
+
 # ---- DrawIO Extraction Tests ----
 
 
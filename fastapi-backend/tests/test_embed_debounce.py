@@ -0,0 +1,161 @@
+"""Unit tests for embed-on-idle debouncing.
+
+Covers idle-window rescheduling, the max-wait cap during continuous
+editing, the direct-enqueue fallback when debouncing is disabled or the
+debounce set is unavailable, dispatch of due documents, and rescheduling
+when ARQ dedup rejects the enqueue. Redis is replaced by a small in-memory
+fake.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import embed_debounce
+from app.services.embed_debounce import dispatch_due_embeds, schedule_document_embed
+
+
+class _FakeRedis:
+    """Just the string and sorted-set commands the debouncer uses."""
+
+    def __init__(self) -> None:
+        self.kv: dict[str, str] = {}
+        self.zset: dict[str, float] = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.kv:
+            return None
+        self.kv[key] = str(value)
+        return True
+
+    async def get(self, key):
+        return self.kv.get(key)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.kv.pop(key, None)
+
+    async def zadd(self, key, mapping):
+        self.zset.update(mapping)
+
+    async def zrem(self, key, member):
+        return 1 if self.zset.pop(member, None) is not None else 0
+
+    async def zrangebyscore(self, key, low, high, start=0, num=None):
+        due = sorted((s, m) for m, s in self.zset.items() if s <= high)
+        return [m for _, m in due][start : start + num if num else None]
+
+
+@pytest.fixture
+def fake_redis():
+    fake = _FakeRedis()
+    service = SimpleNamespace(is_connected=True, client=fake)
+    with (
+        patch.object(embed_debounce, "redis_service", service),
+        patch.object(embed_debounce, "_get_idle_s", return_value=60),
+        patch.object(embed_debounce, "_get_max_wait_s", return_value=300),
+    ):
+        yield fake
+
+
+@pytest.fixture
+def clock():
+    now = SimpleNamespace(t=1_000_000.0)
+    with patch.object(embed_debounce.time, "time", side_effect=lambda: now.t):
+        yield now
+
+
+class TestScheduleDocumentEmbed:
+    @pytest.mark.asyncio
+    async def test_each_edit_pushes_due_time(self, fake_redis, clock):
+        assert await schedule_document_embed("doc-1") == clock.t + 60
+        clock.t += 30
+        assert await schedule_document_embed("doc-1") == clock.t + 60
+        assert fake_redis.zset == {"doc-1": clock.t + 60}
+
+    @pytest.mark.asyncio
+    async def test_continuous_editing_capped_at_max_wait(self, fake_redis, clock):
+        first = clock.t
+        for _ in range(20):
+            due = await schedule_document_embed("doc-1")
+            clock.t += 30
+        assert due == first + 300
+
+    @pytest.mark.asyncio
+    async def test_disabled_when_idle_is_zero(self, fake_redis):
+        with patch.object(embed_debounce, "_get_idle_s", return_value=0):
+            assert await schedule_document_embed("doc-1") is None
+        assert fake_redis.zset == {}
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_fallback_enqueues_directly(self, fake_redis, clock):
+        arq = AsyncMock()
+
+        with (
+            patch.object(embed_debounce, "_get_idle_s", return_value=0),
+            patch.object(embed_debounce, "get_arq_redis", AsyncMock(return_value=arq)),
+        ):
+            assert await schedule_document_embed("doc-1", fallback_defer_s=120) == clock.t + 120
+
+        assert arq.enqueue_job.call_args.kwargs["_defer_by"].total_seconds() == 120
+        assert fake_redis.zset == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_enqueues_deferred_embed(self, fake_redis, clock):
+        embed_debounce.redis_service.is_connected = False
+        arq = AsyncMock()
+
+        with patch.object(embed_debounce, "get_arq_redis", AsyncMock(return_value=arq)):
+            assert await schedule_document_embed("doc-1") == clock.t + 60
+
+        kwargs = arq.enqueue_job.call_args.kwargs
+        assert arq.enqueue_job.call_args.args == ("embed_document_job", "doc-1")
+        assert kwargs["_job_id"] == "embed:doc-1"
+        assert kwargs["_defer_by"].total_seconds() == 60
+        assert fake_redis.zset == {}
+
+    @pytest.mark.asyncio
+    async def test_debounce_write_failure_enqueues_deferred_embed(self, fake_redis, clock):
+        fake_redis.zadd = AsyncMock(side_effect=ConnectionError("redis down"))
+        arq = AsyncMock()
+
+        with patch.object(embed_debounce, "get_arq_redis", AsyncMock(return_value=arq)):
+            assert await schedule_document_embed("doc-1") == clock.t + 60
+
+        arq.enqueue_job.assert_awaited_once()
+
+
+class TestDispatchDueEmbeds:
+    @pytest.mark.asyncio
+    async def test_dispatches_only_due_documents(self, fake_redis, clock):
+        await schedule_document_embed("doc-due")
+        clock.t += 50
+        await schedule_document_embed("doc-busy")
+        clock.t += 15
+
+        arq = AsyncMock()
+        arq.enqueue_job.return_value = object()
+        with patch.object(embed_debounce, "get_arq_redis", AsyncMock(return_value=arq)):
+            result = await dispatch_due_embeds({})
+
+        assert result["dispatched"] == 1
+        arq.enqueue_job.assert_called_once()
+        assert arq.enqueue_job.call_args[0] == ("embed_document_job", "doc-due")
+        assert list(fake_redis.zset) == ["doc-busy"]
+        assert "embed_debounce:first:doc-due" not in fake_redis.kv
+
+    @pytest.mark.asyncio
+    async def test_reschedules_when_job_already_pending(self, fake_redis, clock):
+        await schedule_document_embed("doc-1")
+        clock.t += 61
+
+        arq = AsyncMock()
+        arq.enqueue_job.return_value = None  # ARQ dedup: job still queued or running
+        with patch.object(embed_debounce, "get_arq_redis", AsyncMock(return_value=arq)):
+            result = await dispatch_due_embeds({})
+
+        assert result == {"status": "success", "dispatched": 0, "rescheduled": 1}
+        assert fake_redis.zset == {"doc-1": clock.t + 60}
@@ -0,0 +1,113 @@
+"""Unit tests for the cross-document embedding micro-batcher.
+
+A fake provider records every ``generate_embeddings_batch`` call so tests
+can check that concurrent callers share provider calls, that limits split
+batches, and that each caller gets back exactly its own embeddings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.ai.embedding_batcher import EmbeddingBatcher
+
+
+class _FakeProvider:
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.calls: list[list[str]] = []
+        self.fail_on = fail_on
+
+    async def generate_embeddings_batch(self, texts, model):
+        self.calls.append(list(texts))
+        if self.fail_on is not None and self.fail_on in texts:
+            raise RuntimeError("provider rejected batch")
+        # Embedding encodes the text so callers can verify their slice
+        return [[float(len(t)), float(ord(t[0]))] for t in texts]
+
+
+def _expected(texts):
+    return [[float(len(t)), float(ord(t[0]))] for t in texts]
+
+
+class TestEmbeddingBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        provider = _FakeProvider()
+        batcher = EmbeddingBatcher(window_ms=10, max_texts=100, max_tokens=10000)
+        jobs = [["alpha", "beta"], ["gamma"], ["delta", "epsilon", "zeta"]]
+
+        results = await asyncio.gather(*(batcher.embed(provider, "m", texts) for texts in jobs))
+
+        assert len(provider.calls) == 1
+        assert len(provider.calls[0]) == 6
+        assert results == [_expected(texts) for texts in jobs]
+
+    @pytest.mark.asyncio
+    async def test_count_limit_splits_batches(self):
+        provider = _FakeProvider()
+        batcher = EmbeddingBatcher(window_ms=10, max_texts=2, max_tokens=10000)
+
+        results = await asyncio.gather(
+            batcher.embed(provider, "m", ["a1", "a2", "a3"]),
+            batcher.embed(provider, "m", ["b1"]),
+        )
+
+        assert all(len(call) <= 2 for call in provider.calls)
+        assert sum(len(call) for call in provider.calls) == 4
+        assert results == [_expected(["a1", "a2", "a3"]), _expected(["b1"])]
+
+    @pytest.mark.asyncio
+    async def test_token_limit_splits_batches(self):
+        provider = _FakeProvider()
+        batcher = EmbeddingBatcher(window_ms=10, max_texts=100, max_tokens=100)
+
+        await asyncio.gather(
+            batcher.embed(provider, "m", ["x"], token_counts=[60]),
+            batcher.embed(provider, "m", ["y"], token_counts=[60]),
+        )
+
+        assert provider.calls == [["x"], ["y"]]
+
+    @pytest.mark.asyncio
+    async def test_models_are_not_mixed(self):
+        provider = _FakeProvider()
+        batcher = EmbeddingBatcher(window_ms=10, max_texts=100, max_tokens=10000)
+
+        await asyncio.gather(
+            batcher.embed(provider, "small", ["a"]),
+            batcher.embed(provider, "large", ["b"]),
+        )
+
+        assert sorted(provider.calls) == [["a"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_failure_only_affects_callers_in_that_batch(self):
+        provider = _FakeProvider(fail_on="bad")
+        batcher = EmbeddingBatcher(window_ms=10, max_texts=1, max_tokens=10000)
+
+        ok, failed = await asyncio.gather(
+            batcher.embed(provider, "m", ["good"]),
+            batcher.embed(provider, "m", ["bad"]),
+            return_exceptions=True,
+        )
+
+        assert ok == _expected(["good"])
+        assert isinstance(failed, RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_zero_window_calls_provider_directly(self):
+        provider = _FakeProvider()
+        batcher = EmbeddingBatcher(window_ms=0)
+
+        await asyncio.gather(batcher.embed(provider, "m", ["a"]), batcher.embed(provider, "m", ["b"]))
+
+        assert provider.calls == [["a"], ["b"]]
+        assert batcher.provider_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self):
+        provider = _FakeProvider()
+        assert await EmbeddingBatcher(window_ms=10).embed(provider, "m", []) == []
+        assert provider.calls == []
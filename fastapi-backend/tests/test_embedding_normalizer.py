@@ -1,16 +1,18 @@
 """Unit tests for EmbeddingNormalizer.
 
 Covers L2 normalization, dimension adjustment (truncation, zero-padding),
-NaN/Inf rejection, near-zero vector handling, and constructor validation.
+NaN/Inf rejection, near-zero vector handling, batch normalization,
+vector bind-parameter conversion, and constructor validation.
 """
 
 from __future__ import annotations
 
 import math
 
+import numpy as np
 import pytest
 
-from app.ai.embedding_normalizer import EmbeddingNormalizer
+from app.ai.embedding_normalizer import EmbeddingNormalizer, to_vector_param
 
 
 class TestNormalize:
@@ -110,6 +112,91 @@ class TestNormalize:
         assert abs(result[2]) < 1e-10
 
 
+class TestNormalizeBatch:
+    """Tests for the vectorized normalize_batch() method."""
+
+    def test_batch_rows_have_unit_length(self):
+        """Every row of the batch is L2-normalized."""
+        normalizer = EmbeddingNormalizer(target_dimensions=4)
+        raw = [[3.0, 4.0, 0.0, 0.0], [1.0, 1.0, 1.0, 1.0]]
+        result = normalizer.normalize_batch(raw)
+
+        assert result.shape == (2, 4)
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(result, axis=1), [1.0, 1.0], atol=1e-6)
+
+    def test_batch_matches_single_normalize(self):
+        """Batch output equals per-vector normalize() output."""
+        normalizer = EmbeddingNormalizer(target_dimensions=8)
+        rng = np.random.default_rng(42)
+        raw = rng.normal(size=(5, 8)).tolist()
+
+        batch = normalizer.normalize_batch(raw)
+        for row, vec in zip(batch, raw):
+            np.testing.assert_allclose(row, normalizer.normalize(vec), atol=1e-7)
+
+    def test_batch_truncates_and_pads(self):
+        """Dimension adjustment applies column-wise to the whole batch."""
+        normalizer = EmbeddingNormalizer(target_dimensions=100)
+        assert normalizer.normalize_batch(np.ones((3, 120))).shape == (3, 100)
+        padded = normalizer.normalize_batch(np.ones((3, 95)))
+        assert padded.shape == (3, 100)
+        assert not padded[:, 95:].any()
+
+    def test_batch_rejects_large_gap(self):
+        """A >10% dimension gap raises for the whole batch."""
+        normalizer = EmbeddingNormalizer(target_dimensions=100)
+        with pytest.raises(ValueError, match="too far from target"):
+            normalizer.normalize_batch(np.ones((2, 89)))
+
+    def test_batch_rejects_nan_in_any_row(self):
+        """A single NaN anywhere in the batch raises ValueError."""
+        normalizer = EmbeddingNormalizer(target_dimensions=4)
+        raw = [[1.0, 2.0, 3.0, 4.0], [1.0, float("nan"), 3.0, 4.0]]
+        with pytest.raises(ValueError, match="NaN or Inf"):
+            normalizer.normalize_batch(raw)
+
+    def test_batch_near_zero_row_passthrough(self):
+        """Near-zero rows are left unscaled while other rows are normalized."""
+        normalizer = EmbeddingNormalizer(target_dimensions=2)
+        result = normalizer.normalize_batch([[1e-15, 1e-15], [3.0, 4.0]])
+
+        assert np.linalg.norm(result[0]) < 1e-10
+        np.testing.assert_allclose(result[1], [0.6, 0.8], atol=1e-6)
+
+    def test_batch_does_not_mutate_input(self):
+        """The caller's array is never modified in place."""
+        normalizer = EmbeddingNormalizer(target_dimensions=2)
+        raw = np.array([[3.0, 4.0]], dtype=np.float32)
+        normalizer.normalize_batch(raw)
+        np.testing.assert_array_equal(raw, [[3.0, 4.0]])
+
+    def test_batch_empty(self):
+        """An empty batch returns a (0, target_dimensions) array."""
+        normalizer = EmbeddingNormalizer(target_dimensions=4)
+        assert normalizer.normalize_batch([]).shape == (0, 4)
+
+    def test_batch_rejects_1d_input(self):
+        """A flat vector is not a valid batch."""
+        normalizer = EmbeddingNormalizer(target_dimensions=4)
+        with pytest.raises(ValueError, match="2-D"):
+            normalizer.normalize_batch(np.ones(4))
+
+
+class TestToVectorParam:
+    """Tests for the real[] bind-parameter helper."""
+
+    def test_ndarray_row_to_float_list(self):
+        """NumPy rows become plain Python float lists."""
+        param = to_vector_param(np.array([0.5, 0.25], dtype=np.float32))
+        assert param == [0.5, 0.25]
+        assert all(type(x) is float for x in param)
+
+    def test_list_passthrough(self):
+        """Lists are passed through as lists."""
+        assert to_vector_param([0.1, 0.2]) == [0.1, 0.2]
+
+
 class TestConstructor:
     """Tests for EmbeddingNormalizer initialization."""
 
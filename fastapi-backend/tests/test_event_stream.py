@@ -0,0 +1,226 @@
+"""Unit tests for resumable room event streams.
+
+Covers gap detection in replay (retained, trimmed, expired/recreated and
+over-limit streams), event id stamping, and the join_room resume flow.
+Redis is replaced by a small in-memory fake of the stream commands used.
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.websocket import event_stream
+from app.websocket.event_stream import replay_room_events, with_event_id
+from app.websocket.manager import ConnectionManager, MessageType
+
+
+class _FakeStreamRedis:
+    """Holds one stream; answers XINFO STREAM / XRANGE / XREVRANGE."""
+
+    def __init__(self, ids: list[str], max_deleted: str = "0-0", exists: bool = True) -> None:
+        self.entries = [(i, {"m": json.dumps({"type": "task_updated", "data": {"n": i}})}) for i in ids]
+        self.max_deleted = max_deleted
+        self.exists = exists
+        self._ops: list = []
+
+    def pipeline(self, transaction=True):
+        self._ops = []
+        return self
+
+    def xinfo_stream(self, key):
+        self._ops.append(("xinfo",))
+
+    def xrange(self, key, min="-", max="+", count=None):
+        self._ops.append(("xrange", min, count))
+
+    async def execute(self):
+        if not self.exists:
+            raise RuntimeError("ERR no such key")
+        results = []
+        for op in self._ops:
+            if op[0] == "xinfo":
+                results.append(
+                    {
+                        "first-entry": self.entries[0] if self.entries else None,
+                        "max-deleted-entry-id": self.max_deleted,
+                    }
+                )
+            else:
+                start = event_stream._parse_id(op[1].lstrip("("))
+                after = [e for e in self.entries if event_stream._parse_id(e[0]) > start]
+                results.append(after[: op[2]])
+        return results
+
+    async def xrevrange(self, key, count=None):
+        return list(reversed(self.entries))[:count]
+
+
+@pytest.fixture
+def fake_stream():
+    def _install(*args, **kwargs):
+        fake = _FakeStreamRedis(*args, **kwargs)
+        service = SimpleNamespace(is_connected=True, client=fake)
+        patcher = patch.object(event_stream, "redis_service", service)
+        patcher.start()
+        patches.append(patcher)
+        return fake
+
+    patches: list = []
+    with patch.object(event_stream, "_get_max_events", return_value=5):
+        yield _install
+    for p in patches:
+        p.stop()
+
+
+class TestReplayRoomEvents:
+    @pytest.mark.asyncio
+    async def test_returns_events_after_cursor(self, fake_stream):
+        fake_stream(["1-0", "2-0", "3-0", "4-0"])
+
+        events, complete = await replay_room_events("project:1", "2-0")
+
+        assert complete is True
+        assert [e["event_id"] for e in events] == ["3-0", "4-0"]
+        assert events[0]["room_id"] == "project:1"
+        assert events[0]["type"] == "task_updated"
+
+    @pytest.mark.asyncio
+    async def test_cursor_at_tip_is_complete_and_empty(self, fake_stream):
+        fake_stream(["1-0", "2-0"])
+
+        assert await replay_room_events("project:1", "2-0") == ([], True)
+
+    @pytest.mark.asyncio
+    async def test_trimmed_past_cursor_requires_resync(self, fake_stream):
+        fake_stream(["5-0", "6-0"], max_deleted="4-0")
+
+        assert await replay_room_events("project:1", "2-0") == ([], False)
+
+    @pytest.mark.asyncio
+    async def test_trimmed_up_to_cursor_is_complete(self, fake_stream):
+        fake_stream(["5-0", "6-0"], max_deleted="4-0")
+
+        events, complete = await replay_room_events("project:1", "4-0")
+
+        assert complete is True
+        assert [e["event_id"] for e in events] == ["5-0", "6-0"]
+
+    @pytest.mark.asyncio
+    async def test_recreated_stream_requires_resync(self, fake_stream):
+        # Expired and recreated: nothing trimmed, but it starts after the cursor
+        fake_stream(["9-0"])
+
+        assert await replay_room_events("project:1", "2-0") == ([], False)
+
+    @pytest.mark.asyncio
+    async def test_missing_stream_requires_resync(self, fake_stream):
+        fake_stream([], exists=False)
+
+        assert await replay_room_events("project:1", "2-0") == ([], False)
+
+    @pytest.mark.asyncio
+    async def test_gap_over_limit_requires_resync(self, fake_stream):
+        fake_stream([f"{n}-0" for n in range(1, 10)])
+
+        assert await replay_room_events("project:1", "1-0") == ([], False)
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor_requires_resync(self, fake_stream):
+        fake_stream(["1-0"])
+
+        assert await replay_room_events("project:1", "latest") == ([], False)
+        assert await replay_room_events("project:1", 42) == ([], False)
+
+
+class TestWithEventId:
+    def test_stamps_room_and_id(self):
+        message = {"type": "task_updated", "data": {}}
+
+        assert with_event_id(message, "project:1", "7-0") == {
+            "type": "task_updated",
+            "data": {},
+            "room_id": "project:1",
+            "event_id": "7-0",
+        }
+
+    def test_no_id_leaves_message_untouched(self):
+        message = {"type": "task_updated", "data": {}}
+
+        assert with_event_id(message, "project:1", None) is message
+
+
+class TestJoinRoomResume:
+    @pytest.mark.asyncio
+    async def test_replays_missed_events_then_summary(self, fake_stream):
+        fake_stream(["1-0", "2-0", "3-0"])
+        mgr = ConnectionManager()
+        ws = AsyncMock()
+        conn = await mgr.connect(ws, uuid4())
+        ws.send_json.reset_mock()
+
+        await mgr.join_room(conn, "project:1", notify_others=False, last_event_id="1-0")
+
+        sent = [c.args[0] for c in ws.send_json.call_args_list]
+        assert sent[0]["type"] == MessageType.ROOM_JOINED
+        assert sent[0]["data"]["latest_event_id"] == "3-0"
+        assert [m["event_id"] for m in sent[1:3]] == ["2-0", "3-0"]
+        assert sent[3]["type"] == MessageType.ROOM_REPLAY
+        assert sent[3]["data"] == {"room_id": "project:1", "complete": True, "replayed": 2, "latest_event_id": "3-0"}
+
+    @pytest.mark.asyncio
+    async def test_live_events_during_replay_follow_it(self, fake_stream):
+        fake_stream(["1-0", "2-0", "3-0"])
+        mgr = ConnectionManager()
+        ws = AsyncMock()
+        conn = await mgr.connect(ws, uuid4())
+        conn.writer.cancel()  # inspect the send queue directly
+        replay = event_stream.replay_room_events
+
+        async def replay_with_live_events(room_id, last_event_id):
+            # Published while the replay is read: 3-0 is also replayed, 4-0 is not
+            for event_id in ("3-0", "4-0"):
+                message = {"type": "task_updated", "data": {"n": event_id}}
+                await mgr._handle_redis_broadcast({"room_id": room_id, "message": message, "event_id": event_id})
+            assert len(conn.send_queue) == 0
+            return await replay(room_id, last_event_id)
+
+        with patch("app.websocket.manager.replay_room_events", replay_with_live_events):
+            await mgr.join_room(conn, "project:1", notify_others=False, last_event_id="1-0")
+
+        assert [conn.send_queue.pop().message["event_id"] for _ in range(len(conn.send_queue))] == ["4-0"]
+        assert conn.replay_holds == {}
+
+    @pytest.mark.asyncio
+    async def test_gap_reports_incomplete_with_current_tip(self, fake_stream):
+        fake_stream(["8-0", "9-0"], max_deleted="7-0")
+        mgr = ConnectionManager()
+        ws = AsyncMock()
+        conn = await mgr.connect(ws, uuid4())
+        ws.send_json.reset_mock()
+
+        await mgr.join_room(conn, "project:1", notify_others=False, last_event_id="1-0")
+
+        sent = [c.args[0] for c in ws.send_json.call_args_list]
+        assert sent[0]["data"]["latest_event_id"] == "9-0"
+        assert sent[1]["type"] == MessageType.ROOM_REPLAY
+        assert sent[1]["data"]["complete"] is False
+        assert sent[1]["data"]["latest_event_id"] == "9-0"
+
+    @pytest.mark.asyncio
+    async def test_fresh_join_gets_tip_without_replay(self, fake_stream):
+        fake_stream(["1-0", "2-0"])
+        mgr = ConnectionManager()
+        ws = AsyncMock()
+        conn = await mgr.connect(ws, uuid4())
+        ws.send_json.reset_mock()
+
+        await mgr.join_room(conn, "project:1", notify_others=False)
+
+        sent = [c.args[0] for c in ws.send_json.call_args_list]
+        assert len(sent) == 1
+        assert sent[0]["data"]["latest_event_id"] == "2-0"
@@ -0,0 +1,184 @@
+"""Tests for the content-addressed extraction cache.
+
+Covers storing a processed file's chunks, cloning them into a duplicate
+file with its own scope columns, key mismatches, size-based eviction, and
+purging entries once no live file has their hash.
+Runs against the test database (requires pgvector).
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai import extraction_cache
+from app.ai.extraction_cache import (
+    CacheKey,
+    clone_cached_extraction,
+    evict_extraction_cache,
+    purge_unreferenced_extraction,
+    resolve_cache_key,
+    store_extraction,
+)
+from app.models.document_chunk import DocumentChunk
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.models.folder_file import FolderFile
+from app.utils.timezone import utc_now
+
+
+@pytest.fixture(autouse=True)
+def _skip_without_pgvector(requires_pgvector):
+    """All tests in this module require pgvector."""
+
+
+@pytest.fixture(autouse=True)
+def _cache_limits():
+    with (
+        patch.object(extraction_cache, "_get_max_bytes", return_value=1024 * 1024 * 1024),
+        patch.object(extraction_cache, "_get_ttl_days", return_value=90),
+    ):
+        yield
+
+
+def _make_file(user, **scope) -> FolderFile:
+    return FolderFile(
+        id=uuid4(),
+        original_name="report.pdf",
+        display_name=f"report-{uuid4().hex[:6]}.pdf",
+        mime_type="application/pdf",
+        file_size=1024,
+        file_extension="pdf",
+        storage_bucket="pm-files",
+        storage_key=f"files/{uuid4()}.pdf",
+        sha256_hash="a" * 64,
+        created_by=user.id,
+        **scope,
+    )
+
+
+def _chunk(ff: FolderFile, index: int, chunk_type: str = "text") -> DocumentChunk:
+    return DocumentChunk(
+        id=uuid4(),
+        file_id=ff.id,
+        source_type="file",
+        chunk_index=index,
+        chunk_text=f"chunk {index}",
+        chunk_type=chunk_type,
+        embedding=[0.01 * (index + 1)] * 1536,
+        token_count=10,
+        application_id=ff.application_id,
+        project_id=ff.project_id,
+        user_id=ff.user_id,
+    )
+
+
+KEY = CacheKey("a" * 64, "test-version", "text-embedding-3-small")
+
+
+@pytest_asyncio.fixture
+async def processed_file(db_session: AsyncSession, test_user, test_application) -> FolderFile:
+    ff = _make_file(test_user, application_id=test_application.id)
+    db_session.add(ff)
+    await db_session.flush()
+    db_session.add_all([_chunk(ff, 0), _chunk(ff, 1), _chunk(ff, 2, chunk_type="image")])
+    await db_session.flush()
+    return ff
+
+
+async def _entry_count(db: AsyncSession) -> int:
+    return (await db.execute(select(func.count()).select_from(ExtractionCacheEntry))).scalar()
+
+
+class TestStoreAndClone:
+    @pytest.mark.asyncio
+    async def test_clone_copies_chunks_with_new_scope(self, db_session, processed_file, test_user):
+        assert await store_extraction(db_session, KEY, processed_file.id, "report text", {"page_count": 2})
+
+        duplicate = _make_file(test_user, user_id=test_user.id)
+        db_session.add(duplicate)
+        await db_session.flush()
+
+        cached = await clone_cached_extraction(db_session, KEY, duplicate.id, {"user_id": test_user.id})
+
+        assert cached is not None
+        assert cached.content_plain == "report text"
+        assert cached.extracted_metadata == {"page_count": 2}
+        assert cached.chunk_count == 3
+        assert cached.token_count == 20  # text chunks only
+
+        query = select(DocumentChunk).where(DocumentChunk.file_id == duplicate.id).order_by(DocumentChunk.chunk_index)
+        rows = (await db_session.execute(query)).scalars().all()
+        assert [r.chunk_text for r in rows] == ["chunk 0", "chunk 1", "chunk 2"]
+        assert [r.chunk_type for r in rows] == ["text", "text", "image"]
+        assert all(r.user_id == test_user.id and r.application_id is None for r in rows)
+        assert rows[1].embedding is not None
+
+        entry = (await db_session.execute(select(ExtractionCacheEntry))).scalar_one()
+        assert entry.hit_count == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_for_other_embedding_model(self, db_session, processed_file):
+        await store_extraction(db_session, KEY, processed_file.id, "text", {})
+        other = CacheKey(KEY.sha256_hash, KEY.extractor_version, "other-model")
+
+        assert await clone_cached_extraction(db_session, other, processed_file.id, {}) is None
+
+    @pytest.mark.asyncio
+    async def test_existing_entry_not_overwritten(self, db_session, processed_file):
+        assert await store_extraction(db_session, KEY, processed_file.id, "first", {})
+        assert not await store_extraction(db_session, KEY, processed_file.id, "second", {})
+
+
+class TestEviction:
+    @pytest.mark.asyncio
+    async def test_entry_over_budget_is_evicted(self, db_session, processed_file):
+        with patch.object(extraction_cache, "_get_max_bytes", return_value=1024):
+            await store_extraction(db_session, KEY, processed_file.id, "text", {})
+
+        assert await _entry_count(db_session) == 0
+
+    @pytest.mark.asyncio
+    async def test_entry_without_live_file_is_evicted(self, db_session, processed_file):
+        await store_extraction(db_session, KEY, processed_file.id, "text", {})
+        processed_file.deleted_at = utc_now()
+        await db_session.flush()
+
+        assert await evict_extraction_cache(db_session) == 1
+        assert await _entry_count(db_session) == 0
+
+
+class TestPurgeUnreferenced:
+    @pytest.mark.asyncio
+    async def test_purged_with_last_live_copy(self, db_session, processed_file):
+        await store_extraction(db_session, KEY, processed_file.id, "text", {})
+        processed_file.deleted_at = utc_now()
+        await db_session.flush()
+
+        assert await purge_unreferenced_extraction(db_session, KEY.sha256_hash) == 1
+        assert await _entry_count(db_session) == 0
+
+    @pytest.mark.asyncio
+    async def test_kept_while_another_copy_is_live(self, db_session, processed_file, test_user):
+        await store_extraction(db_session, KEY, processed_file.id, "text", {})
+        db_session.add(_make_file(test_user, user_id=test_user.id))
+        processed_file.deleted_at = utc_now()
+        await db_session.flush()
+
+        assert await purge_unreferenced_extraction(db_session, KEY.sha256_hash) == 0
+        assert await _entry_count(db_session) == 1
+
+
+class TestResolveCacheKey:
+    @pytest.mark.asyncio
+    async def test_none_without_hash(self, db_session):
+        assert await resolve_cache_key(db_session, None) is None
+
+    @pytest.mark.asyncio
+    async def test_none_when_disabled(self, db_session):
+        with patch.object(extraction_cache, "_get_max_bytes", return_value=0):
+            assert await resolve_cache_key(db_session, "a" * 64) is None
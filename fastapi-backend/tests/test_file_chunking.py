@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import numpy as np
 import pytest
 
 from app.ai.chunking_service import ChunkResult, SemanticChunker
@@ -117,6 +118,70 @@ class TestChunkMarkdown:
         assert len(chunks) >= 1
 
 
+# ============================================================================
+# achunk_markdown (parallel sections) Tests
+# ============================================================================
+
+
+def _large_markdown() -> str:
+    """Markdown mixing long, tiny and table sections under top-level headings."""
+    parts = []
+    for i in range(12):
+        parts.append(f"# Chapter {i}\n\n")
+        if i % 3 == 1:
+            parts.append("Short.\n\n")
+        else:
+            parts.append(f"Chapter {i} discusses the quarterly figures in detail. " * 40 + "\n\n")
+        if i % 4 == 2:
+            parts.append("| Region | Revenue |\n| --- | --- |\n")
+            parts.extend(f"| R{r} | {r * 100} |\n" for r in range(30))
+            parts.append("\n")
+        remarks = f"Closing remarks for chapter {i}. " * (15 if i % 2 == 0 else 1)
+        parts.append(f"## Notes {i}\n\n{remarks}\n\n")
+    return "".join(parts)
+
+
+class TestParallelChunkMarkdown:
+    """Tests for SemanticChunker.achunk_markdown section splitting."""
+
+    def setup_method(self):
+        self.chunker = SemanticChunker(target_tokens=600, overlap_tokens=100)
+
+    @pytest.mark.asyncio
+    async def test_sections_match_in_process_output(self):
+        """Stitched sections produce exactly the in-process chunks."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        md = _large_markdown()
+        expected = self.chunker.chunk_markdown(md, "Report")
+        with ThreadPoolExecutor(max_workers=4) as pool, patch(
+            "app.ai.chunking_service._get_chunk_pool", return_value=pool
+        ) as get_pool, patch.object(SemanticChunker, "_get_parallel_min_chars", return_value=1000):
+            chunks = await self.chunker.achunk_markdown(md, "Report")
+
+        get_pool.assert_called_once()
+        assert [(c.text, c.heading_context, c.token_count, c.chunk_index) for c in chunks] == [
+            (c.text, c.heading_context, c.token_count, c.chunk_index) for c in expected
+        ]
+
+    def test_split_sections_cuts_only_at_safe_headings(self):
+        """Cuts land on top-level headings that follow a large block."""
+        blocks = self.chunker._markdown_blocks(_large_markdown(), "Report")
+        sections = self.chunker._split_sections(blocks, workers=4)
+        assert len(sections) > 1
+        for section in sections[1:]:
+            assert section[0].text.startswith("# ")
+        assert sum(len(s) for s in sections) == len(blocks)
+
+    @pytest.mark.asyncio
+    async def test_small_markdown_stays_in_process(self):
+        """Inputs below the size threshold never start the pool."""
+        with patch("app.ai.chunking_service._get_chunk_pool") as get_pool:
+            chunks = await self.chunker.achunk_markdown("# Title\n\nSome text.\n", "Small")
+        get_pool.assert_not_called()
+        assert len(chunks) == 1
+
+
 # ============================================================================
 # EmbeddingService.embed_file Tests
 # ============================================================================
@@ -174,12 +239,10 @@ class TestEmbedFile:
         ]
 
         mock_normalizer = MagicMock()
-        mock_normalizer.normalize.side_effect = lambda x: x
+        mock_normalizer.normalize_batch.side_effect = lambda x: np.asarray(x, dtype=np.float32)
 
         mock_db = AsyncMock()
         mock_db.execute = AsyncMock(return_value=MagicMock(rowcount=0))
-        mock_db.add_all = MagicMock()
-        mock_db.flush = AsyncMock()
 
         svc = EmbeddingService(
             provider_registry=mock_registry,
@@ -198,9 +261,12 @@ class TestEmbedFile:
         assert result.chunk_count == 2
         assert result.token_count == 25
 
-        # Verify chunks were added with file_id
-        mock_db.add_all.assert_called_once()
-        chunks = mock_db.add_all.call_args[0][0]
-        assert len(chunks) == 2
-        assert chunks[0].file_id == file_id
-        assert chunks[0].source_type == "file"
+        # Verify chunks were replaced in one bulk statement keyed by file_id
+        sql, params = mock_db.execute.call_args_list[0].args
+        assert 'DELETE FROM "DocumentChunks" WHERE file_id' in str(sql)
+        assert params["chunk_texts"] == ["Chunk 1", "Chunk 2"]
+        assert params["file_id"] == str(file_id)
+        assert params["document_id"] is None
+        assert params["source_type"] == "file"
+        assert params["dims"] == 1536
+        assert len(params["embeddings"]) == 2 * 1536
@@ -9,16 +9,21 @@ TEST FIXES applied:
 - _format_cell with formula prefix sanitization test
 - Visio tests updated: ImportError -> ValueError for file-level errors
 - Weak assertions replaced with exact checks
+- Streaming: sectioned CSV output, ExtractionStream, embed_file_stream batching
 """
 
+import asyncio
 import tempfile
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 from zipfile import BadZipFile
 
 import pytest
 
+from app.ai.chunking_service import ChunkResult
+from app.ai.embedding_service import EmbeddingService
 from app.ai.file_extraction_service import (
     ExtractionResult,
     FileExtractionService,
@@ -188,6 +193,35 @@ class TestSpreadsheetExtractorCSV:
         assert isinstance(result, SpreadsheetResult)
         assert result.total_rows >= 2  # At least 2 data rows (3 if no header detected)
 
+    def test_csv_sections_repeat_header(self, tmp_path):
+        """Streamed sections hold at most rows_per_section rows, each with the header."""
+        csv_file = tmp_path / "long.csv"
+        csv_file.write_text("Name,Age\n" + "".join(f"n{i},{i}\n" for i in range(5)), encoding="utf-8")
+
+        extractor = SpreadsheetExtractor()
+        result = SpreadsheetResult(markdown="")
+        sections = list(extractor.iter_csv_sections(csv_file, result, rows_per_section=2))
+
+        assert len(sections) == 3
+        assert all(s.startswith("| Name | Age |\n| --- | --- |\n") for s in sections)
+        assert "| n4 | 4 |" in sections[2]
+        assert result.total_rows == 5
+        # Joined sections match the one-shot extraction's rows
+        full = extractor.extract_csv(csv_file).markdown
+        assert all(f"| n{i} | {i} |" in full for i in range(5))
+
+    def test_wide_csv_sections_continue_row_numbers(self, tmp_path):
+        headers = ",".join(f"Col{i}" for i in range(12))
+        rows = "".join(",".join(f"r{r}v{i}" for i in range(12)) + "\n" for r in range(3))
+        csv_file = tmp_path / "wide.csv"
+        csv_file.write_text(f"{headers}\n{rows}", encoding="utf-8")
+
+        result = SpreadsheetResult(markdown="")
+        sections = list(SpreadsheetExtractor().iter_csv_sections(csv_file, result, rows_per_section=2))
+
+        assert len(sections) == 2
+        assert sections[1].startswith("**Row 3**")
+
 
 class TestSpreadsheetExtractorExcel:
     """Tests for Excel extraction via python-calamine."""
@@ -471,6 +505,126 @@ class TestFileExtractionService:
             assert "Password-protected" in result.error
 
 
+class TestExtractStream:
+    """Tests for FileExtractionService.extract_stream / ExtractionStream."""
+
+    @pytest.mark.asyncio
+    async def test_csv_streams_sections_with_bounded_markdown(self, tmp_path):
+        csv_file = tmp_path / "data.csv"
+        csv_file.write_text("A,B\n" + "".join(f"{i},{i * 2}\n" for i in range(10)), encoding="utf-8")
+
+        svc = FileExtractionService()
+        stream = svc.extract_stream(str(csv_file), ".csv", 100, max_markdown_chars=40, rows_per_section=4)
+        sections = [section async for section in stream]
+
+        assert len(sections) == 3
+        assert stream.result.success
+        assert stream.result.markdown == "\n\n".join(sections)[:40]
+        assert stream.result.metadata == {"sheet_count": 1, "total_rows": 10}
+
+    @pytest.mark.asyncio
+    async def test_size_guard_allows_large_csv_only(self):
+        svc = FileExtractionService()
+        size = 200 * 1024 * 1024
+
+        xlsx = svc.extract_stream("/tmp/huge.xlsx", ".xlsx", size)
+        assert [s async for s in xlsx] == []
+        assert "too large" in xlsx.result.error.lower()
+
+        csv = svc.extract_stream("/tmp/missing.csv", ".csv", size)
+        assert [s async for s in csv] == []
+        # Passed the size guard; failed on the missing file instead
+        assert "too large" not in csv.result.error.lower()
+
+    @pytest.mark.asyncio
+    async def test_docling_yields_single_section(self):
+        svc = FileExtractionService()
+        whole = ExtractionResult(markdown="# Title\n\nBody", metadata={"page_count": 1}, images=["img"])
+        with patch.object(svc, "extract", new_callable=AsyncMock, return_value=whole):
+            stream = svc.extract_stream("/tmp/test.pdf", ".pdf", 1000)
+            sections = [s async for s in stream]
+
+        assert sections == ["# Title\n\nBody"]
+        assert stream.result.metadata == {"page_count": 1}
+        assert stream.result.images == ["img"]
+
+
+class TestEmbedFileStream:
+    """Tests for EmbeddingService.embed_file_stream batching."""
+
+    @staticmethod
+    def _service(generate=None):
+        def chunk(text, title):
+            return [
+                ChunkResult(text=f"{text}{i}", heading_context=None, token_count=1, chunk_index=i) for i in range(2)
+            ]
+
+        chunker = MagicMock()
+        chunker.achunk_markdown = AsyncMock(side_effect=chunk)
+        provider = MagicMock()
+        provider.generate_embeddings_batch = AsyncMock(
+            side_effect=generate or (lambda texts, model: [[0.1] for _ in texts])
+        )
+        registry = MagicMock()
+        registry.get_embedding_provider = AsyncMock(return_value=(provider, "model"))
+        normalizer = MagicMock()
+        normalizer.normalize_batch.side_effect = lambda e: e
+        db = AsyncMock()
+        return EmbeddingService(provider_registry=registry, chunker=chunker, normalizer=normalizer, db=db), db
+
+    @staticmethod
+    async def _sections(*names):
+        for name in names:
+            yield name
+
+    @pytest.mark.asyncio
+    async def test_flushes_batches_with_continuous_chunk_index(self):
+        svc, db = self._service()
+        config = MagicMock()
+        config.get_int.return_value = 4
+        with (
+            patch("app.ai.config_service.get_agent_config", return_value=config),
+            patch("app.ai.embedding_service.write_chunks", new_callable=AsyncMock) as mock_write,
+        ):
+            result = await svc.embed_file_stream(uuid4(), self._sections("a", "b", "c"), "data.csv", {})
+
+        assert result.chunk_count == 6
+        batches = [c.args[1] for c in mock_write.call_args_list]
+        assert [[r.chunk_index for r in rows] for rows in batches] == [[0, 1, 2, 3], [4, 5]]
+        assert [c.kwargs["replace"] for c in mock_write.call_args_list] == [True, False]
+        # One commit per batch plus the final timestamp update
+        assert db.commit.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_deletes_existing_chunks(self):
+        svc, _ = self._service()
+        file_id = uuid4()
+        with (
+            patch("app.ai.embedding_service.write_chunks", new_callable=AsyncMock) as mock_write,
+            patch.object(svc, "delete_file_chunks", new_callable=AsyncMock) as mock_delete,
+        ):
+            result = await svc.embed_file_stream(file_id, self._sections(), "data.csv", {})
+
+        assert result.chunk_count == 0
+        mock_write.assert_not_awaited()
+        mock_delete.assert_awaited_once_with(file_id)
+
+    @pytest.mark.asyncio
+    async def test_slow_batch_times_out(self):
+        async def generate(texts, model):
+            await asyncio.sleep(1)
+            return [[0.1] for _ in texts]
+
+        svc, _ = self._service(generate)
+        with (
+            patch("app.ai.embedding_service.write_chunks", new_callable=AsyncMock) as mock_write,
+            pytest.raises(TimeoutError),
+        ):
+            await svc.embed_file_stream(uuid4(), self._sections("a"), "data.csv", {}, batch_timeout_s=0.01)
+
+        mock_write.assert_not_awaited()
+
+
 # ============================================================================
 # VisioExtractor Tests
 # ============================================================================
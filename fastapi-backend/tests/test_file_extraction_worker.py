@@ -8,6 +8,9 @@ TEST FIXES applied:
 - Exact count assertions instead of weak >= 1
 - Updated to work with 3-session split architecture (HIGH-11)
 - QE-NEW-2: Updated mocks for streaming download_to_file (writes to disk)
+- Streaming pipeline: embedding is mocked at embed_file_stream, which drains
+  the ExtractionStream so content_plain/metadata are filled in
+- _SectionFeed: embed char budget; the timeout counts extractor time only
 """
 
 import asyncio
@@ -50,6 +53,8 @@ def _make_mock_folder_file(**overrides):
     ff.content_plain = overrides.get("content_plain", None)
     ff.extracted_metadata = overrides.get("extracted_metadata", None)
     ff.extraction_error = overrides.get("extraction_error", None)
+    # No hash by default so the extraction cache is bypassed
+    ff.sha256_hash = overrides.get("sha256_hash", None)
     return ff
 
 
@@ -86,6 +91,19 @@ def _make_mock_minio(content: bytes = b"fake pdf bytes"):
     return mock
 
 
+def _draining_embed(embed_result=None, error: Exception | None = None):
+    """Fake EmbeddingService.embed_file_stream that consumes every section."""
+
+    async def _embed(file_id, sections, title, scope_ids, batch_timeout_s=None):
+        async for _ in sections:
+            pass
+        if error is not None:
+            raise error
+        return embed_result
+
+    return _embed
+
+
 # ============================================================================
 # extract_and_embed_file_job Tests
 # ============================================================================
@@ -230,6 +248,11 @@ class TestExtractAndEmbedFileJob:
                 new_callable=AsyncMock,
                 return_value=extraction_result,
             ),
+            patch(
+                "app.ai.embedding_service.EmbeddingService.embed_file_stream",
+                new_callable=AsyncMock,
+                side_effect=_draining_embed(),
+            ),
             patch("app.worker._broadcast_file_event", new_callable=AsyncMock),
         ):
             result = await extract_and_embed_file_job({}, file_id)
@@ -242,7 +265,7 @@ class TestExtractAndEmbedFileJob:
 
     @pytest.mark.asyncio
     async def test_extraction_timeout_sets_failed(self):
-        """Extraction timeout returns timeout error category."""
+        """Timing out the streamed extract + embed pass fails the job."""
         from app.worker import extract_and_embed_file_job
 
         file_id = str(uuid4())
@@ -272,7 +295,7 @@ class TestExtractAndEmbedFileJob:
             patch("app.worker.redis_service", MagicMock(is_connected=False)),
             patch("app.services.minio_service.minio_service", mock_minio),
             patch(
-                "app.ai.file_extraction_service.FileExtractionService.extract",
+                "app.worker._stream_embed_file",
                 new_callable=AsyncMock,
                 side_effect=asyncio.TimeoutError("Extraction timed out"),
             ),
@@ -319,25 +342,15 @@ class TestExtractAndEmbedFileJob:
             call_count += 1
             return cm1 if call_count == 1 else cm3
 
+        # The CSV is extracted for real through the streaming spreadsheet path
         mock_minio = _make_mock_minio(b"Name,Age\nAlice,30\n")
 
-        extraction_result = ExtractionResult(
-            markdown="| Name | Age |\n| --- | --- |\n| Alice | 30 |",
-            success=True,
-            metadata={"total_rows": 1},
-        )
-
         embed_result = EmbedResult(chunk_count=2, token_count=50, duration_ms=100)
 
         with (
             patch("app.worker.async_session_maker", side_effect=session_factory),
             patch("app.worker.redis_service", MagicMock(is_connected=False)),
             patch("app.services.minio_service.minio_service", mock_minio),
-            patch(
-                "app.ai.file_extraction_service.FileExtractionService.extract",
-                new_callable=AsyncMock,
-                return_value=extraction_result,
-            ),
             patch(
                 "app.services.search_service.build_search_file_data",
                 return_value={"id": "file_" + str(ff.id)},
@@ -347,9 +360,9 @@ class TestExtractAndEmbedFileJob:
                 new_callable=AsyncMock,
             ),
             patch(
-                "app.ai.embedding_service.EmbeddingService.embed_file",
+                "app.ai.embedding_service.EmbeddingService.embed_file_stream",
                 new_callable=AsyncMock,
-                return_value=embed_result,
+                side_effect=_draining_embed(embed_result),
             ) as mock_embed,
             patch("app.worker._broadcast_file_event", new_callable=AsyncMock),
         ):
@@ -362,12 +375,15 @@ class TestExtractAndEmbedFileJob:
         assert result["token_count"] == 50
         assert result["duration_ms"] == 100
 
-        # Verify embed_file was called with the file_uuid parsed from file_id string
+        # Verify embed_file_stream was called with the file_uuid parsed from file_id string
         mock_embed.assert_called_once()
         embed_kwargs = mock_embed.call_args
         from uuid import UUID as _UUID
 
         assert embed_kwargs[1]["file_id"] == _UUID(file_id)
+        assert "| Alice | 30 |" in ff3.content_plain
+        assert ff3.extracted_metadata == {"sheet_count": 1, "total_rows": 1}
+        assert ff3.embedding_status == "synced"
 
     @pytest.mark.asyncio
     async def test_max_retries_exceeded(self):
@@ -486,9 +502,9 @@ class TestExtractAndEmbedFileJob:
                 new_callable=AsyncMock,
             ),
             patch(
-                "app.ai.embedding_service.EmbeddingService.embed_file",
+                "app.ai.embedding_service.EmbeddingService.embed_file_stream",
                 new_callable=AsyncMock,
-                side_effect=RuntimeError("Provider unavailable"),
+                side_effect=_draining_embed(error=RuntimeError("Provider unavailable")),
             ),
             patch("app.worker._broadcast_file_event", new_callable=AsyncMock),
         ):
@@ -549,9 +565,9 @@ class TestExtractAndEmbedFileJob:
                 new_callable=AsyncMock,
             ),
             patch(
-                "app.ai.embedding_service.EmbeddingService.embed_file",
+                "app.ai.embedding_service.EmbeddingService.embed_file_stream",
                 new_callable=AsyncMock,
-                side_effect=RuntimeError("skip embed"),
+                side_effect=_draining_embed(error=RuntimeError("skip embed")),
             ),
             patch("app.worker._broadcast_file_event", new_callable=AsyncMock),
         ):
@@ -562,6 +578,57 @@ class TestExtractAndEmbedFileJob:
         assert len(ff3.content_plain) == 2_000_000
 
 
+# ============================================================================
+# _SectionFeed Tests
+# ============================================================================
+
+
+async def _slow_sections(sections, delay_s=0.0):
+    for section in sections:
+        await asyncio.sleep(delay_s)
+        yield section
+
+
+class TestSectionFeed:
+    """Tests for the char budget and extraction timeout around embedding."""
+
+    @pytest.mark.asyncio
+    async def test_char_budget_ends_input_and_drain_reads_rest(self):
+        from app.worker import _SectionFeed
+
+        stream = _slow_sections(["aaaa", "bbbb", "cccc"])
+        feed = _SectionFeed(stream, max_chars=6, timeout_s=5)
+
+        assert [s async for s in feed] == ["aaaa", "bb"]
+        await feed.drain()
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_does_not_time_out_extraction(self):
+        from app.worker import _SectionFeed
+
+        feed = _SectionFeed(_slow_sections(["a", "b", "c"]), max_chars=100, timeout_s=0.05)
+        received = []
+        async for section in feed:
+            await asyncio.sleep(0.03)
+            received.append(section)
+
+        assert received == ["a", "b", "c"]
+        assert feed.timed_out is False
+
+    @pytest.mark.asyncio
+    async def test_slow_extractor_times_out(self):
+        from app.worker import _SectionFeed
+
+        feed = _SectionFeed(_slow_sections(["a", "b", "c"], delay_s=0.03), max_chars=100, timeout_s=0.05)
+
+        with pytest.raises(TimeoutError):
+            async for _ in feed:
+                pass
+        assert feed.timed_out is True
+
+
 # ============================================================================
 # _broadcast_file_event Tests
 # ============================================================================
@@ -578,15 +645,14 @@ class TestBroadcastFileEvent:
         app_id = uuid4()
         scope = {"application_id": app_id, "project_id": None, "user_id": None}
 
-        with patch("app.worker.redis_service") as mock_redis:
-            mock_redis.publish = AsyncMock()
+        with patch("app.websocket.event_stream.publish_room_event", new_callable=AsyncMock) as mock_publish:
             await _broadcast_file_event(scope, str(uuid4()), "file_extraction_completed", {})
 
-            mock_redis.publish.assert_called_once()
-            call_args = mock_redis.publish.call_args
-            assert call_args[0][0] == "ws:broadcast"
-            payload = call_args[0][1]
-            assert payload["room_id"] == f"application:{app_id}"
+            mock_publish.assert_called_once()
+            channel, room_id, message = mock_publish.call_args[0]
+            assert channel == "ws:broadcast"
+            assert room_id == f"application:{app_id}"
+            assert message["type"] == "file_extraction_completed"
 
     @pytest.mark.asyncio
     async def test_broadcast_user_scope(self):
@@ -596,25 +662,21 @@ class TestBroadcastFileEvent:
         user_id = uuid4()
         scope = {"application_id": None, "project_id": None, "user_id": user_id}
 
-        with patch("app.worker.redis_service") as mock_redis:
-            mock_redis.publish = AsyncMock()
+        with patch("app.websocket.event_stream.publish_room_event", new_callable=AsyncMock) as mock_publish:
             await _broadcast_file_event(scope, str(uuid4()), "file_extraction_completed", {})
 
-            mock_redis.publish.assert_called_once()
-            call_args = mock_redis.publish.call_args
-            payload = call_args[0][1]
-            assert payload["room_id"] == f"user:{user_id}"
+            mock_publish.assert_called_once()
+            assert mock_publish.call_args[0][1] == f"user:{user_id}"
 
     @pytest.mark.asyncio
     async def test_broadcast_none_scope(self):
         """None scope is a no-op."""
         from app.worker import _broadcast_file_event
 
-        with patch("app.worker.redis_service") as mock_redis:
-            mock_redis.publish = AsyncMock()
+        with patch("app.websocket.event_stream.publish_room_event", new_callable=AsyncMock) as mock_publish:
             await _broadcast_file_event(None, str(uuid4()), "file_extraction_completed", {})
 
-            mock_redis.publish.assert_not_called()
+            mock_publish.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_broadcast_includes_folder_id(self):
@@ -625,8 +687,7 @@ class TestBroadcastFileEvent:
         folder_id = uuid4()
         scope = {"application_id": app_id, "project_id": None, "user_id": None}
 
-        with patch("app.worker.redis_service") as mock_redis:
-            mock_redis.publish = AsyncMock()
+        with patch("app.websocket.event_stream.publish_room_event", new_callable=AsyncMock) as mock_publish:
             await _broadcast_file_event(
                 scope,
                 str(uuid4()),
@@ -634,9 +695,9 @@ class TestBroadcastFileEvent:
                 {"folder_id": str(folder_id)},
             )
 
-            mock_redis.publish.assert_called_once()
-            payload = mock_redis.publish.call_args[0][1]
-            assert payload["message"]["data"]["folder_id"] == str(folder_id)
+            mock_publish.assert_called_once()
+            message = mock_publish.call_args[0][2]
+            assert message["data"]["folder_id"] == str(folder_id)
 
 
 # ============================================================================
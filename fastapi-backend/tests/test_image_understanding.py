@@ -152,7 +152,6 @@ def mock_db() -> AsyncMock:
     mock_result.first.return_value = None
     db.execute.return_value = mock_result
     db.add = MagicMock()
-    db.add_all = MagicMock()
     db.flush = AsyncMock()
 
     return db
@@ -227,13 +226,14 @@ class TestProcessDocumentImages:
         attachment_result.scalar_one_or_none.return_value = attachment
 
         # First call: get_attachment lookup returns the attachment
-        # Second+ calls: max chunk_index query returns None, scope query returns None
+        # Then: max chunk_index query returns None, scope query returns None,
+        # and the bulk chunk insert
         max_idx_result = MagicMock()
         max_idx_result.scalar.return_value = None
         scope_result = MagicMock()
         scope_result.first.return_value = None
 
-        mock_db.execute = AsyncMock(side_effect=[attachment_result, max_idx_result, scope_result])
+        mock_db.execute = AsyncMock(side_effect=[attachment_result, max_idx_result, scope_result, MagicMock()])
 
         single_image_json = {
             "type": "doc",
@@ -257,13 +257,12 @@ class TestProcessDocumentImages:
         assert isinstance(results[0], ImageDescription)
         assert results[0].description == "A detailed description of the image content."
         assert results[0].token_count > 0
-        # Verify chunks were stored
-        mock_db.add_all.assert_called_once()
-        mock_db.flush.assert_awaited()
+        # Verify chunks were appended in one bulk insert
+        sql, params = mock_db.execute.call_args_list[-1].args
+        assert "DELETE" not in str(sql)
         # Verify chunk_type is set to "image"
-        stored_chunks = mock_db.add_all.call_args[0][0]
-        assert len(stored_chunks) == 1
-        assert stored_chunks[0].chunk_type == "image"
+        assert params["chunk_types"] == ["image"]
+        assert params["document_id"] == str(doc_id)
 
     async def test_process_document_images_skips_small_images(
         self,
@@ -8,16 +8,20 @@ Tests cover (using local in-memory fallback when Redis is not connected):
 - is_present: checks individual user presence
 - get_user_rooms: returns rooms a user is in
 - get_stats: returns correct statistics
+- heartbeat flush (Redis): buffered heartbeats written in one pipeline
 """
 
 from __future__ import annotations
 
+import asyncio
 import time
-from unittest.mock import AsyncMock, PropertyMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
 
+from app.websocket import presence as presence_module
 from app.websocket.presence import (
+    PRESENCE_ROOMS_KEY,
     PRESENCE_TTL,
     PresenceManager,
 )
@@ -258,6 +262,11 @@ def mock_redis_connected():
         mock_rs.client.keys = AsyncMock(return_value=[])
         mock_rs.client.sadd = AsyncMock()
         mock_rs.client.srem = AsyncMock()
+        mock_rs.client.smembers = AsyncMock(return_value=set())
+        # Heartbeat flushes queue commands on a pipeline
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        mock_rs.client.pipeline = MagicMock(return_value=pipe)
         # Presence helper methods on redis_service itself
         mock_rs.presence_set = AsyncMock()
         mock_rs.presence_remove = AsyncMock()
@@ -275,34 +284,85 @@ def mock_redis_connected():
 
 class TestHeartbeatRedis:
     @pytest.mark.asyncio
-    async def test_heartbeat_stores_in_redis(self, pm, mock_redis_connected):
-        """heartbeat() should call presence_set and hset for user data."""
+    async def test_heartbeat_is_buffered_until_flush(self, pm, mock_redis_connected):
+        """heartbeat() only buffers; flush() writes it in one pipeline."""
         await pm.heartbeat("room:1", "user-a", "Alice", avatar_url="http://img", idle=False)
 
-        mock_redis_connected.presence_set.assert_awaited_once()
-        call_args = mock_redis_connected.presence_set.call_args
-        assert call_args[0][0] == "room:1"
-        assert call_args[0][1] == "user-a"
+        pipe = mock_redis_connected.client.pipeline.return_value
+        pipe.execute.assert_not_awaited()
+        mock_redis_connected.presence_set.assert_not_awaited()
 
-        mock_redis_connected.client.hset.assert_awaited_once()
-        hset_args = mock_redis_connected.client.hset.call_args
-        assert "presence_data:room:1" in hset_args[0]
+        assert await pm.flush() == 1
 
-        # Also tracks room in user reverse index
-        mock_redis_connected.client.sadd.assert_awaited_once()
+        pipe.execute.assert_awaited_once()
+        zadd_args = pipe.zadd.call_args.args
+        assert zadd_args[0] == "presence:room:1"
+        assert list(zadd_args[1]) == ["user-a"]
+        assert pipe.hset.call_args.args[0] == "presence_data:room:1"
+        # Tracks room in the user reverse index and the active-room index
+        pipe.sadd.assert_any_call("user_rooms:user-a", "room:1")
+        pipe.sadd.assert_any_call(PRESENCE_ROOMS_KEY, "room:1")
+        await pm.stop()
 
     @pytest.mark.asyncio
-    async def test_heartbeat_publishes_user_data(self, pm, mock_redis_connected):
-        """heartbeat() stores JSON user metadata in the hash."""
+    async def test_heartbeat_stores_user_data(self, pm, mock_redis_connected):
+        """The flushed hash holds JSON user metadata."""
         import json as _json
 
         await pm.heartbeat("room:1", "user-b", "Bob", avatar_url=None, idle=True)
+        await pm.flush()
 
-        hset_args = mock_redis_connected.client.hset.call_args
-        stored_json = hset_args[0][2]  # third positional arg is the value
-        data = _json.loads(stored_json)
+        mapping = mock_redis_connected.client.pipeline.return_value.hset.call_args.kwargs["mapping"]
+        data = _json.loads(mapping["user-b"])
         assert data["name"] == "Bob"
         assert data["idle"] is True
+        await pm.stop()
+
+    @pytest.mark.asyncio
+    async def test_heartbeats_grouped_per_room(self, pm, mock_redis_connected):
+        """Repeated heartbeats collapse, and one ZADD covers a room's users."""
+        for _ in range(3):
+            await pm.heartbeat("room:1", "user-a", "Alice")
+        await pm.heartbeat("room:1", "user-b", "Bob")
+
+        assert await pm.flush() == 2
+
+        pipe = mock_redis_connected.client.pipeline.return_value
+        assert pipe.zadd.call_count == 1
+        assert set(pipe.zadd.call_args.args[1]) == {"user-a", "user-b"}
+        await pm.stop()
+
+    @pytest.mark.asyncio
+    async def test_leave_drops_buffered_heartbeat(self, pm, mock_redis_connected):
+        """A user who leaves before the flush is not written back."""
+        await pm.heartbeat("room:1", "user-a", "Alice")
+        await pm.leave("room:1", "user-a")
+
+        assert await pm.flush() == 0
+        mock_redis_connected.client.pipeline.return_value.execute.assert_not_awaited()
+        await pm.stop()
+
+    @pytest.mark.asyncio
+    async def test_flusher_writes_on_interval(self, pm, mock_redis_connected):
+        """The background flusher writes buffered heartbeats each interval."""
+        with patch.object(presence_module, "_get_flush_interval_s", return_value=0.01):
+            await pm.heartbeat("room:1", "user-a", "Alice")
+            await asyncio.sleep(0.05)
+
+        mock_redis_connected.client.pipeline.return_value.execute.assert_awaited_once()
+        assert pm.flushes == 1
+        await pm.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_heartbeats(self, pm, mock_redis_connected):
+        """Heartbeats survive a failed flush and go out with the next one."""
+        pipe = mock_redis_connected.client.pipeline.return_value
+        pipe.execute.side_effect = [ConnectionError("down"), []]
+        await pm.heartbeat("room:1", "user-a", "Alice")
+
+        assert await pm.flush() == 0
+        assert await pm.flush() == 1
+        await pm.stop()
 
 
 # ---------------------------------------------------------------------------
@@ -389,7 +449,7 @@ class TestGetStatsRedis:
     @pytest.mark.asyncio
     async def test_stats_returns_redis_backend(self, pm, mock_redis_connected):
         """get_stats() returns backend: 'redis' when connected."""
-        mock_redis_connected.scan_keys.return_value = ["presence:room:1", "presence:room:2"]
+        mock_redis_connected.client.smembers.return_value = {"room:1", "room:2"}
         mock_redis_connected.presence_get_room.side_effect = [["u1", "u2"], ["u3"]]
 
         stats = await pm.get_stats()
@@ -401,7 +461,7 @@ class TestGetStatsRedis:
     @pytest.mark.asyncio
     async def test_stats_empty_redis(self, pm, mock_redis_connected):
         """Empty Redis returns zero rooms/entries."""
-        mock_redis_connected.scan_keys.return_value = []
+        mock_redis_connected.client.smembers.return_value = set()
 
         stats = await pm.get_stats()
         assert stats["backend"] == "redis"
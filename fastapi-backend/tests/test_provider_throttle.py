@@ -0,0 +1,133 @@
+"""Unit tests for provider throughput control.
+
+Covers 429 detection through wrapped provider errors, AIMD concurrency
+adjustments, the in-memory token bucket fallback, and the ``slot`` context
+manager's cooldown on rate limiting. Redis is treated as unavailable so the
+per-process fallback bucket is exercised.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.ai.provider_interface import LLMProviderError
+from app.ai.provider_throttle import (
+    AdaptiveConcurrency,
+    ProviderThrottle,
+    _LocalBucket,
+    _retry_after_ms,
+    is_rate_limit_error,
+)
+
+
+class _RateLimited(Exception):
+    def __init__(self, headers=None) -> None:
+        super().__init__("429")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers=headers or {})
+
+
+@pytest.fixture(autouse=True)
+def no_redis():
+    fake = MagicMock()
+    fake.is_connected = False
+    with patch("app.services.redis_service.redis_service", fake):
+        yield
+
+
+class TestRateLimitDetection:
+    def test_wrapped_provider_error(self):
+        err = LLMProviderError("OpenAI batch embedding failed", provider="openai", original=_RateLimited())
+        assert is_rate_limit_error(err)
+
+    def test_other_errors(self):
+        assert not is_rate_limit_error(RuntimeError("boom"))
+        assert not is_rate_limit_error(LLMProviderError("bad request", provider="openai"))
+
+    def test_retry_after_header(self):
+        assert _retry_after_ms(_RateLimited({"retry-after": "3"})) == 3000
+        assert _retry_after_ms(_RateLimited({"retry-after-ms": "250"})) == 250
+        assert _retry_after_ms(_RateLimited()) == 2000
+
+
+class TestAdaptiveConcurrency:
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_and_success_recovers(self):
+        aimd = AdaptiveConcurrency(maximum=8, target_latency_ms=1000)
+        await aimd.acquire()
+        await aimd.release(None, rate_limited=True)
+        assert aimd.limit == 4.0
+
+        for _ in range(20):
+            await aimd.acquire()
+            await aimd.release(latency_ms=10)
+        assert 4.0 < aimd.limit <= 8.0
+
+    @pytest.mark.asyncio
+    async def test_slow_calls_shrink_limit_but_not_below_one(self):
+        aimd = AdaptiveConcurrency(maximum=2, target_latency_ms=100)
+        await aimd.acquire()
+        await aimd.release(latency_ms=500)
+        assert aimd.limit == pytest.approx(1.6)
+
+        aimd._last_decrease = 0.0
+        await aimd.acquire()
+        await aimd.release(None, rate_limited=True)
+        assert aimd.limit == 1.0
+
+    @pytest.mark.asyncio
+    async def test_burst_of_429s_counts_once(self):
+        aimd = AdaptiveConcurrency(maximum=16, target_latency_ms=0)
+        for _ in range(4):
+            await aimd.acquire()
+        for _ in range(4):
+            await aimd.release(None, rate_limited=True)
+        assert aimd.limit == 8.0
+
+
+class TestLocalBucket:
+    def test_request_budget(self):
+        bucket = _LocalBucket()
+        assert bucket.acquire(rpm=2, tpm=0, tokens=0) == 0
+        assert bucket.acquire(rpm=2, tpm=0, tokens=0) == 0
+        wait = bucket.acquire(rpm=2, tpm=0, tokens=0)
+        assert 0 < wait <= 30_001
+
+    def test_token_budget(self):
+        bucket = _LocalBucket()
+        assert bucket.acquire(rpm=0, tpm=1000, tokens=800) == 0
+        assert bucket.acquire(rpm=0, tpm=1000, tokens=800) > 0
+
+    def test_unlimited(self):
+        bucket = _LocalBucket()
+        assert all(bucket.acquire(rpm=0, tpm=0, tokens=10**6) == 0 for _ in range(100))
+
+
+class TestProviderThrottleSlot:
+    @pytest.mark.asyncio
+    async def test_rate_limit_starts_cooldown_and_reraises(self):
+        throttle = ProviderThrottle("embedding", "openai", "text-embedding-3-small")
+
+        with pytest.raises(LLMProviderError):
+            async with throttle.slot(tokens=10):
+                raise LLMProviderError("429", provider="openai", original=_RateLimited({"retry-after": "5"}))
+
+        assert throttle.rate_limited_count == 1
+        assert throttle.concurrency.in_flight == 0
+        assert throttle.concurrency.limit == throttle.concurrency.maximum / 2
+        assert await throttle._try_acquire(10) > 0
+
+    @pytest.mark.asyncio
+    async def test_other_errors_release_slot_without_penalty(self):
+        throttle = ProviderThrottle("vision", "anthropic", "claude")
+
+        with pytest.raises(ValueError):
+            async with throttle.slot():
+                raise ValueError("bad image")
+
+        assert throttle.rate_limited_count == 0
+        assert throttle.concurrency.in_flight == 0
+        assert throttle.concurrency.limit == throttle.concurrency.maximum
@@ -0,0 +1,207 @@
+"""Unit tests for the per-channel pub/sub dispatcher.
+
+Covers channel isolation (a slow handler only delays its own channel),
+in-order delivery, the block / drop_oldest / coalesce overflow policies,
+backlog and lag stats, and worker teardown on unsubscribe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.pubsub_dispatcher import ChannelPolicy, PubSubDispatcher
+
+
+class _Handlers:
+    """Handler registry with a gate to hold a channel's handler."""
+
+    def __init__(self) -> None:
+        self.received: dict[str, list[dict]] = {}
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def for_channel(self, channel: str) -> list:
+        async def handler(data: dict) -> None:
+            gate = self.gates.get(channel)
+            if gate is not None:
+                await gate.wait()
+            self.received.setdefault(channel, []).append(data)
+
+        return [handler]
+
+    def hold(self, channel: str) -> asyncio.Event:
+        self.gates[channel] = asyncio.Event()
+        return self.gates[channel]
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def handlers():
+    return _Handlers()
+
+
+class TestChannelIsolation:
+    @pytest.mark.asyncio
+    async def test_slow_channel_does_not_block_others(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel)
+        gate = handlers.hold("ws:broadcast")
+
+        await dispatcher.dispatch("ws:broadcast", {"n": 1})
+        await dispatcher.dispatch("user_cache_invalidate", {"user_id": "u1"})
+        await _settle()
+
+        assert handlers.received == {"user_cache_invalidate": [{"user_id": "u1"}]}
+        assert dispatcher.stats()["ws:broadcast"]["delivered"] == 0
+
+        gate.set()
+        await _settle()
+        assert handlers.received["ws:broadcast"] == [{"n": 1}]
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_messages_delivered_in_order(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel)
+        for n in range(5):
+            await dispatcher.dispatch("ch", {"n": n})
+        await _settle()
+
+        assert [m["n"] for m in handlers.received["ch"]] == [0, 1, 2, 3, 4]
+        assert dispatcher.stats()["ch"]["delivered"] == 5
+        await dispatcher.stop()
+
+
+class TestOverflowPolicies:
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel)
+        dispatcher.set_policy("ch", ChannelPolicy(max_backlog=2, overflow="drop_oldest"))
+        gate = handlers.hold("ch")
+
+        await dispatcher.dispatch("ch", {"n": 0})
+        await _settle()  # worker takes n=0 and waits on the gate
+        for n in range(1, 5):
+            await dispatcher.dispatch("ch", {"n": n})
+
+        stats = dispatcher.stats()["ch"]
+        assert stats["backlog"] == 2
+        assert stats["dropped"] == 2
+
+        gate.set()
+        await _settle()
+        assert [m["n"] for m in handlers.received["ch"]] == [0, 3, 4]
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_replaces_queued_message_in_place(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel)
+        dispatcher.set_policy(
+            "typing",
+            ChannelPolicy(max_backlog=10, overflow="coalesce", coalesce_key=lambda d: d["user"]),
+        )
+        gate = handlers.hold("typing")
+
+        await dispatcher.dispatch("typing", {"user": "busy", "v": 0})
+        await _settle()
+        await dispatcher.dispatch("typing", {"user": "a", "v": 1})
+        await dispatcher.dispatch("typing", {"user": "b", "v": 1})
+        await dispatcher.dispatch("typing", {"user": "a", "v": 2})
+
+        assert dispatcher.stats()["typing"]["coalesced"] == 1
+
+        gate.set()
+        await _settle()
+        assert handlers.received["typing"][1:] == [{"user": "a", "v": 2}, {"user": "b", "v": 1}]
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_room(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel, default_policy=ChannelPolicy(max_backlog=1))
+        gate = handlers.hold("ch")
+
+        await dispatcher.dispatch("ch", {"n": 0})
+        await _settle()
+        await dispatcher.dispatch("ch", {"n": 1})
+        blocked = asyncio.create_task(dispatcher.dispatch("ch", {"n": 2}))
+        await _settle()
+        assert not blocked.done()
+
+        gate.set()
+        await asyncio.wait_for(blocked, timeout=1.0)
+        await _settle()
+        assert [m["n"] for m in handlers.received["ch"]] == [0, 1, 2]
+        assert dispatcher.stats()["ch"]["dropped"] == 0
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_drop_oldest_channel_does_not_hold_listener(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel)
+        dispatcher.set_policy("ch", ChannelPolicy(max_backlog=1, overflow="drop_oldest"))
+        handlers.hold("ch")
+
+        await dispatcher.dispatch("ch", {"n": 0})
+        await _settle()  # worker takes n=0 and waits on the gate
+        for n in range(1, 5):
+            await asyncio.wait_for(dispatcher.dispatch("ch", {"n": n}), timeout=1.0)
+        await dispatcher.dispatch("room_auth_invalidate", {"user_id": "u1"})
+        await _settle()
+
+        assert handlers.received == {"room_auth_invalidate": [{"user_id": "u1"}]}
+        assert dispatcher.stats()["ch"]["dropped"] == 3
+        await dispatcher.stop()
+
+
+class TestStatsAndTeardown:
+    @pytest.mark.asyncio
+    async def test_lag_and_peak_backlog_recorded(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel)
+        gate = handlers.hold("ch")
+
+        await dispatcher.dispatch("ch", {"n": 0})
+        await _settle()
+        await dispatcher.dispatch("ch", {"n": 1})
+        await asyncio.sleep(0.02)
+        gate.set()
+        await _settle()
+
+        stats = dispatcher.stats()["ch"]
+        assert stats["peak_backlog"] == 1
+        assert stats["max_lag_ms"] >= 15
+        assert stats["backlog"] == 0
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_handler_error_counted_and_delivery_continues(self):
+        calls = []
+
+        async def failing(data):
+            calls.append(data)
+            raise RuntimeError("boom")
+
+        dispatcher = PubSubDispatcher(lambda channel: [failing])
+        await dispatcher.dispatch("ch", {"n": 0})
+        await dispatcher.dispatch("ch", {"n": 1})
+        await _settle()
+
+        assert len(calls) == 2
+        assert dispatcher.stats()["ch"]["handler_errors"] == 2
+        await dispatcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_discard_releases_blocked_producer(self, handlers):
+        dispatcher = PubSubDispatcher(handlers.for_channel, default_policy=ChannelPolicy(max_backlog=1))
+        handlers.hold("ch")
+
+        await dispatcher.dispatch("ch", {"n": 0})
+        await _settle()
+        await dispatcher.dispatch("ch", {"n": 1})
+        blocked = asyncio.create_task(dispatcher.dispatch("ch", {"n": 2}))
+        await _settle()
+
+        await dispatcher.discard("ch")
+        await asyncio.wait_for(blocked, timeout=1.0)
+        assert "ch" not in dispatcher.stats()
@@ -0,0 +1,140 @@
+"""Unit tests for the post-RRF lightweight reranker.
+
+Covers tokenization, BM25/proximity/heading/title features, the linear
+combination, RRF-order fallback with zero lexical weights, and the
+offline evaluation harness.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from app.ai.reranker import (
+    LabeledQuery,
+    LightweightReranker,
+    RerankWeights,
+    _proximity,
+    evaluate_reranker,
+    tokenize,
+)
+from app.ai.retrieval_service import RetrievalResult
+
+
+def _result(
+    text: str,
+    score: float,
+    heading: str | None = None,
+    title: str = "Doc",
+    doc_id: uuid.UUID | None = None,
+    chunk_index: int = 0,
+) -> RetrievalResult:
+    return RetrievalResult(
+        document_id=doc_id or uuid.uuid4(),
+        document_title=title,
+        chunk_text=text,
+        heading_context=heading,
+        score=score,
+        source="semantic",
+        application_id=None,
+        project_id=None,
+        snippet="",
+        chunk_index=chunk_index,
+    )
+
+
+class TestTokenize:
+    def test_lowercases_and_drops_stopwords(self):
+        assert tokenize("How to Rotate the API keys") == ["rotate", "api", "keys"]
+
+    def test_empty(self):
+        assert tokenize(None) == []
+        assert tokenize("") == []
+
+
+class TestProximity:
+    def test_adjacent_terms_score_higher_than_distant(self):
+        terms = ["rotate", "keys"]
+        near = _proximity(terms, tokenize("rotate keys every quarter"))
+        far = _proximity(terms, tokenize("rotate " + "filler " * 20 + "keys"))
+        assert near > far > 0.0
+
+    def test_no_match_is_zero(self):
+        assert _proximity(["rotate"], tokenize("nothing relevant here")) == 0.0
+
+    def test_single_term_scores_coverage(self):
+        assert _proximity(["rotate", "keys"], tokenize("rotate often")) == 0.5
+
+
+class TestRerank:
+    def test_lexical_match_promoted_over_higher_rrf(self):
+        """A chunk containing the query terms outranks a slightly better RRF hit."""
+        reranker = LightweightReranker(weights=RerankWeights())
+        off_topic = _result("Quarterly budget planning overview", score=1 / 61)
+        on_topic = _result("To rotate API keys open the security settings", score=1 / 62, heading="API keys")
+
+        ranked = reranker.rerank("rotate API keys", [off_topic, on_topic])
+
+        assert ranked[0].chunk_text == on_topic.chunk_text
+        assert ranked[0].rerank_score > ranked[1].rerank_score
+
+    def test_zero_lexical_weights_preserve_rrf_order(self):
+        weights = RerankWeights(rrf=1.0, bm25=0.0, proximity=0.0, heading=0.0, title=0.0)
+        reranker = LightweightReranker(weights=weights)
+        results = [_result(f"chunk {i} rotate keys" * (5 - i), score=1 / (61 + i)) for i in range(5)]
+
+        ranked = reranker.rerank("rotate keys", results)
+
+        assert [r.chunk_text for r in ranked] == [r.chunk_text for r in results]
+
+    def test_rrf_score_left_untouched(self):
+        reranker = LightweightReranker(weights=RerankWeights())
+        results = [_result("alpha", 0.03), _result("beta alpha", 0.02)]
+
+        ranked = reranker.rerank("alpha", results)
+
+        assert sorted(r.score for r in ranked) == [0.02, 0.03]
+        assert all(r.rerank_score is not None for r in ranked)
+
+    def test_heading_match_feature(self):
+        reranker = LightweightReranker(weights=RerankWeights())
+        feats = reranker.compute_features(
+            "deployment checklist",
+            [_result("steps", 0.01, heading="Deployment Checklist"), _result("steps", 0.01, heading="Intro")],
+        )
+        assert feats[0].heading == 1.0
+        assert feats[1].heading == 0.0
+
+    def test_single_and_empty_inputs(self):
+        reranker = LightweightReranker(weights=RerankWeights())
+        assert reranker.rerank("q", []) == []
+        only = reranker.rerank("q", [_result("x", 0.5)])
+        assert only[0].rerank_score == 0.5
+
+
+class TestEvaluationHarness:
+    def test_reranking_improves_mrr_on_labeled_queries(self):
+        relevant_doc = uuid.uuid4()
+        candidates = [
+            _result("Team offsite agenda and travel", score=1 / 61),
+            _result("Meeting notes from the retro", score=1 / 62),
+            _result("How to rotate API keys safely", score=1 / 63, doc_id=relevant_doc, chunk_index=2),
+        ]
+        labeled = [LabeledQuery(query="rotate API keys", candidates=candidates, relevant={(relevant_doc, 2)})]
+
+        report = evaluate_reranker(labeled, LightweightReranker(weights=RerankWeights()), k=3)
+
+        assert report.baseline.mrr == 1 / 3
+        assert report.reranked.mrr == 1.0
+        assert report.reranked.ndcg >= report.baseline.ndcg
+        assert report.reranked.recall == 1.0
+
+    def test_document_level_relevance(self):
+        doc_id = uuid.uuid4()
+        candidates = [_result("x", 0.02, doc_id=doc_id, chunk_index=7)]
+        labeled = LabeledQuery(query="x", candidates=candidates, relevant={(doc_id, None)})
+        assert labeled.is_relevant(candidates[0])
+
+    def test_empty_query_set(self):
+        report = evaluate_reranker([], LightweightReranker(weights=RerankWeights()))
+        assert report.baseline.queries == 0
+        assert report.reranked.mrr == 0.0
@@ -0,0 +1,180 @@
+"""Unit tests for the generation-keyed retrieval result cache.
+
+Uses a small in-memory stand-in for redis_service so key derivation,
+generation bumps and round-trip serialization can be checked without a
+live Redis.
+"""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.ai.retrieval_cache import (
+    RetrievalCache,
+    app_generation_key,
+    bump_knowledge_generation,
+    user_generation_key,
+)
+from app.ai.retrieval_service import RetrievalResult
+
+
+class _FakePipeline:
+    def __init__(self, store: dict) -> None:
+        self._store = store
+        self._ops: list[tuple] = []
+
+    def incr(self, key):
+        self._ops.append(("incr", key))
+
+    def expire(self, key, ttl):
+        self._ops.append(("expire", key))
+
+    async def execute(self):
+        for op, key in self._ops:
+            if op == "incr":
+                self._store[key] = str(int(self._store.get(key, 0)) + 1)
+        return []
+
+
+class _FakeRedisService:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.is_connected = True
+        self.client = MagicMock()
+        self.client.pipeline = lambda transaction=False: _FakePipeline(self.store)
+
+        async def _mget(keys):
+            return [self.store.get(k) for k in keys]
+
+        self.client.mget = _mget
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.store[key] = value
+
+
+@pytest.fixture
+def fake_redis():
+    fake = _FakeRedisService()
+    with patch("app.services.redis_service.redis_service", fake):
+        yield fake
+
+
+def _result(app_id: uuid.UUID | None = None) -> RetrievalResult:
+    return RetrievalResult(
+        document_id=uuid.uuid4(),
+        document_title="Runbook",
+        chunk_text="rotate keys quarterly",
+        heading_context="Security",
+        score=0.03,
+        source="semantic+keyword",
+        application_id=app_id,
+        project_id=None,
+        snippet="rotate keys",
+        chunk_index=1,
+        rerank_score=0.8,
+    )
+
+
+def _cache(app_ids, user_id, query="rotate keys", limit=10) -> RetrievalCache:
+    return RetrievalCache(query, app_ids, [], user_id, limit)
+
+
+class TestRetrievalCache:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, fake_redis):
+        app_id, user_id = uuid.uuid4(), uuid.uuid4()
+        results = [_result(app_id)]
+
+        cache = _cache([app_id], user_id)
+        assert await cache.get() is None
+        await cache.set(results)
+
+        cached = await _cache([app_id], user_id).get()
+        assert cached == results
+        assert isinstance(cached[0].document_id, uuid.UUID)
+
+    @pytest.mark.asyncio
+    async def test_app_bump_invalidates(self, fake_redis):
+        app_id, user_id = uuid.uuid4(), uuid.uuid4()
+        cache = _cache([app_id], user_id)
+        await cache.get()
+        await cache.set([_result(app_id)])
+
+        await bump_knowledge_generation(application_id=app_id)
+
+        assert fake_redis.store[app_generation_key(app_id)] == "1"
+        assert await _cache([app_id], user_id).get() is None
+
+    @pytest.mark.asyncio
+    async def test_personal_bump_invalidates_only_that_user(self, fake_redis):
+        app_id, alice, bob = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        for user in (alice, bob):
+            cache = _cache([app_id], user)
+            await cache.get()
+            await cache.set([_result(app_id)])
+
+        await bump_knowledge_generation(user_id=alice)
+
+        assert fake_redis.store[user_generation_key(alice)] == "1"
+        assert await _cache([app_id], alice).get() is None
+        assert await _cache([app_id], bob).get() is not None
+
+    @pytest.mark.asyncio
+    async def test_unrelated_app_bump_keeps_entry(self, fake_redis):
+        app_id, other_app, user_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        cache = _cache([app_id], user_id)
+        await cache.get()
+        await cache.set([_result(app_id)])
+
+        await bump_knowledge_generation(application_id=other_app)
+
+        assert await _cache([app_id], user_id).get() is not None
+
+    @pytest.mark.asyncio
+    async def test_key_depends_on_query_limit_and_scope(self, fake_redis):
+        app_id, user_id = uuid.uuid4(), uuid.uuid4()
+        cache = _cache([app_id], user_id)
+        await cache.get()
+        await cache.set([_result(app_id)])
+
+        assert await _cache([app_id], user_id, query="other").get() is None
+        assert await _cache([app_id], user_id, limit=5).get() is None
+        assert await _cache([app_id, uuid.uuid4()], user_id).get() is None
+
+    @pytest.mark.asyncio
+    async def test_bump_during_search_is_not_masked(self, fake_redis):
+        """Results computed before a bump are stored under the old generation."""
+        app_id, user_id = uuid.uuid4(), uuid.uuid4()
+        cache = _cache([app_id], user_id)
+        await cache.get()
+        await bump_knowledge_generation(application_id=app_id)
+        await cache.set([_result(app_id)])
+
+        assert await _cache([app_id], user_id).get() is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_when_ttl_zero(self, fake_redis):
+        cfg = MagicMock()
+        cfg.get_int.return_value = 0
+        with patch("app.ai.retrieval_cache.get_agent_config", return_value=cfg):
+            cache = _cache([uuid.uuid4()], uuid.uuid4())
+            assert await cache.get() is None
+            await cache.set([_result()])
+        assert not any(k.startswith("retrieval_cache:") for k in fake_redis.store)
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_is_a_miss(self):
+        fake = _FakeRedisService()
+        fake.is_connected = False
+        with patch("app.services.redis_service.redis_service", fake):
+            cache = _cache([uuid.uuid4()], uuid.uuid4())
+            assert await cache.get() is None
+            await cache.set([_result()])
+            await bump_knowledge_generation(application_id=uuid.uuid4())
+        assert fake.store == {}
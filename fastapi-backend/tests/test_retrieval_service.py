@@ -10,16 +10,20 @@ to avoid requiring live infrastructure in CI.
 from __future__ import annotations
 
 import uuid
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.embedding_normalizer import EmbeddingNormalizer
+from app.ai.retrieval_cache import RetrievalCache
 from app.ai.retrieval_service import (
     HybridRetrievalService,
+    RetrievalResult,
+    _expand_with_neighbors,
     _RankedResult,
+    _semantic_rows_to_ranked,
 )
 from app.models.application import Application
 from app.models.document import Document
@@ -682,3 +686,287 @@ class TestSnippetEdgeCases:
         # rsplit on no-spaces text returns the full truncated text + "..."
         # so snippet is text[:50] + "..." = 53 chars max
         assert len(snippet) <= 53
+
+
+class TestRetrieveMany:
+    """Batched multi-query retrieval (mocked backends, no DB)."""
+
+    @staticmethod
+    def _service(provider=None, db=None) -> HybridRetrievalService:
+        return HybridRetrievalService(
+            provider_registry=_make_mock_registry(provider),
+            normalizer=EmbeddingNormalizer(target_dimensions=4),
+            db=db or AsyncMock(),
+        )
+
+    @staticmethod
+    def _hit(doc_id: uuid.UUID, source: str, rank: int = 1, text: str = "chunk") -> _RankedResult:
+        return _RankedResult(
+            document_id=doc_id,
+            document_title="Doc",
+            chunk_text=text,
+            heading_context=None,
+            chunk_index=0,
+            rank=rank,
+            raw_score=0.9,
+            source=source,
+        )
+
+    @pytest.mark.asyncio
+    async def test_results_align_with_input_and_batches_backends(self):
+        service = self._service()
+        user_id = uuid.uuid4()
+        auth_doc, billing_doc = uuid.uuid4(), uuid.uuid4()
+        service._resolve_scope = AsyncMock(return_value={"app_ids": [], "project_ids": [], "user_id": user_id})
+        service._semantic_search_many = AsyncMock(
+            return_value={"auth": [self._hit(auth_doc, "semantic")], "billing": [self._hit(billing_doc, "semantic")]}
+        )
+        service._keyword_search_many = AsyncMock(return_value={"auth": [], "billing": []})
+        service._fuzzy_title_search = AsyncMock(return_value=[])
+
+        results = await service.retrieve_many(["auth", "", "billing", "auth"], user_id)
+
+        assert len(results) == 4
+        assert results[1] == []
+        assert results[0][0].document_id == auth_doc
+        assert results[2][0].document_id == billing_doc
+        assert results[3] == results[0]
+        service._resolve_scope.assert_awaited_once()
+        service._semantic_search_many.assert_awaited_once()
+        assert service._semantic_search_many.call_args.args[0] == ["auth", "billing"]
+        service._keyword_search_many.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_inaccessible_scope_returns_empty_lists(self):
+        service = self._service()
+        service._resolve_scope = AsyncMock(return_value=None)
+        service._semantic_search_many = AsyncMock()
+
+        results = await service.retrieve_many(["a query", "another"], uuid.uuid4(), application_id=uuid.uuid4())
+
+        assert results == [[], []]
+        service._semantic_search_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_keyword_failure_degrades_per_query(self):
+        service = self._service()
+        user_id = uuid.uuid4()
+        doc_id = uuid.uuid4()
+        service._resolve_scope = AsyncMock(return_value={"app_ids": [], "project_ids": [], "user_id": user_id})
+        service._semantic_search_many = AsyncMock(return_value={"auth": [self._hit(doc_id, "semantic")]})
+        service._keyword_search_many = AsyncMock(side_effect=RuntimeError("meili down"))
+        service._fuzzy_title_search = AsyncMock(return_value=[])
+
+        results = await service.retrieve_many(["auth"], user_id)
+
+        assert [r.document_id for r in results[0]] == [doc_id]
+
+    @pytest.mark.asyncio
+    async def test_degraded_results_are_not_cached(self):
+        service = self._service()
+        user_id = uuid.uuid4()
+        doc_id = uuid.uuid4()
+        service._resolve_scope = AsyncMock(return_value={"app_ids": [], "project_ids": [], "user_id": user_id})
+        service._semantic_search_many = AsyncMock(return_value={"auth": [self._hit(doc_id, "semantic")]})
+        service._fuzzy_title_search = AsyncMock(return_value=[])
+
+        with (
+            patch("app.ai.retrieval_service.get_meili_index", side_effect=RuntimeError("Meilisearch not initialized")),
+            patch.object(RetrievalCache, "get", AsyncMock(return_value=None)),
+            patch.object(RetrievalCache, "set", AsyncMock()) as cache_set,
+        ):
+            results = await service.retrieve_many(["auth"], user_id)
+
+        assert [r.document_id for r in results[0]] == [doc_id]
+        cache_set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_semantic_many_embeds_once_and_groups_rows(self):
+        from types import SimpleNamespace
+
+        provider = _make_mock_provider(embedding_dim=4)
+        db = AsyncMock()
+        doc_a, doc_b = uuid.uuid4(), uuid.uuid4()
+
+        def _row(ord_: int, doc_id: uuid.UUID, sim: float):
+            return SimpleNamespace(
+                ord=ord_,
+                document_id=doc_id,
+                file_id=None,
+                source_type="document",
+                chunk_text="text",
+                heading_context=None,
+                chunk_index=0,
+                chunk_type="text",
+                application_id=None,
+                project_id=None,
+                document_title="Doc",
+                similarity=sim,
+            )
+
+        query_result = AsyncMock()
+        query_result.fetchall = lambda: [_row(1, doc_a, 0.9), _row(1, doc_b, 0.8), _row(2, doc_b, 0.7)]
+        db.execute = AsyncMock(side_effect=[None, query_result])
+        service = self._service(provider=provider, db=db)
+        scope = {"app_ids": [uuid.uuid4()], "project_ids": [], "user_id": uuid.uuid4()}
+
+        ranked = await service._semantic_search_many(["alpha", "beta", "gamma"], scope, limit=5)
+
+        provider.generate_embeddings_batch.assert_awaited_once()
+        provider.generate_embedding.assert_not_awaited()
+        params = db.execute.call_args_list[1].args[1]
+        assert params["n_queries"] == 3
+        assert params["dims"] == 4
+        assert len(params["query_embeddings"]) == 12
+        assert [r.document_id for r in ranked["alpha"]] == [doc_a, doc_b]
+        assert [r.rank for r in ranked["alpha"]] == [1, 2]
+        assert [r.document_id for r in ranked["beta"]] == [doc_b]
+        assert ranked["gamma"] == []
+
+    @pytest.mark.asyncio
+    async def test_keyword_many_uses_single_multi_search(self):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock, patch
+
+        doc_id = uuid.uuid4()
+        client = MagicMock()
+        client.multi_search = AsyncMock(
+            return_value=[
+                SimpleNamespace(hits=[{"id": str(doc_id), "title": "Runbook", "content_plain": "steps"}]),
+                SimpleNamespace(hits=[{"id": f"file_{doc_id}", "title": "runbook.pdf"}]),
+            ]
+        )
+        index = MagicMock()
+        index.uid = "documents"
+        service = self._service()
+        scope = {"app_ids": [uuid.uuid4()], "project_ids": [], "user_id": uuid.uuid4()}
+
+        with (
+            patch("app.ai.retrieval_service.get_meili_index", return_value=index),
+            patch("app.ai.retrieval_service.get_meili_client", return_value=client),
+        ):
+            ranked = await service._keyword_search_many(["runbook", "pdf"], scope)
+
+        client.multi_search.assert_awaited_once()
+        searches = client.multi_search.call_args.args[0]
+        assert [s.query for s in searches] == ["runbook", "pdf"]
+        assert ranked["runbook"][0].source_type == "document"
+        assert ranked["pdf"][0].source_type == "file"
+        assert ranked["pdf"][0].file_id == doc_id
+
+
+class TestNeighborExpansion:
+    """Adjacent-chunk context attached to retrieval hits (no DB)."""
+
+    @staticmethod
+    def _result(doc_id: uuid.UUID, chunk_index: int) -> RetrievalResult:
+        return RetrievalResult(
+            document_id=doc_id,
+            document_title="Doc",
+            chunk_text=f"chunk {chunk_index}",
+            heading_context=None,
+            score=0.03,
+            source="semantic",
+            application_id=None,
+            project_id=None,
+            snippet="",
+            chunk_index=chunk_index,
+        )
+
+    @staticmethod
+    def _nb(chunk_index: int, tokens: int = 10) -> dict:
+        return {"chunk_index": chunk_index, "chunk_text": f"chunk {chunk_index}", "token_count": tokens}
+
+    def test_attaches_before_and_after(self):
+        doc_id = uuid.uuid4()
+        results = [self._result(doc_id, 5)]
+        neighbors = {("document", doc_id, 5): [self._nb(4), self._nb(6)]}
+
+        expanded = _expand_with_neighbors(results, neighbors, per_hit_budget=100, total_budget=100)
+
+        assert expanded[0].context_before == "chunk 4"
+        assert expanded[0].context_after == "chunk 6"
+        assert expanded[0].chunk_text == "chunk 5"
+
+    def test_skips_chunks_already_in_results_or_attached(self):
+        doc_id = uuid.uuid4()
+        results = [self._result(doc_id, 5), self._result(doc_id, 6), self._result(doc_id, 8)]
+        neighbors = {
+            ("document", doc_id, 5): [self._nb(4), self._nb(6)],
+            ("document", doc_id, 6): [self._nb(5), self._nb(7)],
+            ("document", doc_id, 8): [self._nb(7), self._nb(9)],
+        }
+
+        expanded = _expand_with_neighbors(results, neighbors, per_hit_budget=100, total_budget=100)
+
+        assert (expanded[0].context_before, expanded[0].context_after) == ("chunk 4", "")
+        assert (expanded[1].context_before, expanded[1].context_after) == ("", "chunk 7")
+        assert (expanded[2].context_before, expanded[2].context_after) == ("", "chunk 9")
+
+    def test_budgets_prefer_nearest_and_stop_at_total(self):
+        doc_id, other = uuid.uuid4(), uuid.uuid4()
+        results = [self._result(doc_id, 5), self._result(other, 0)]
+        neighbors = {
+            ("document", doc_id, 5): [self._nb(3, 10), self._nb(4, 10), self._nb(6, 10)],
+            ("document", other, 0): [self._nb(1, 10)],
+        }
+
+        expanded = _expand_with_neighbors(results, neighbors, per_hit_budget=20, total_budget=20)
+
+        assert expanded[0].context_before == "chunk 4"
+        assert expanded[0].context_after == "chunk 6"
+        assert expanded[1] == results[1]
+
+    def test_partial_neighbor_is_trimmed(self):
+        doc_id = uuid.uuid4()
+        results = [self._result(doc_id, 5)]
+        neighbors = {("document", doc_id, 5): [self._nb(4, 500)]}
+        encoder = type(
+            "Encoder", (), {"encode": lambda self, t: t.split(), "decode": lambda self, toks: " ".join(toks)}
+        )()
+
+        with patch("app.ai.retrieval_service._get_token_encoder", return_value=encoder):
+            expanded = _expand_with_neighbors(results, neighbors, per_hit_budget=40, total_budget=100)
+
+        assert expanded[0].context_before == "...chunk 4"
+
+    def test_rows_parse_json_neighbors(self):
+        from types import SimpleNamespace
+
+        row = SimpleNamespace(
+            document_id=uuid.uuid4(),
+            file_id=None,
+            source_type="document",
+            chunk_text="text",
+            heading_context=None,
+            chunk_index=2,
+            chunk_type="text",
+            application_id=None,
+            project_id=None,
+            document_title="Doc",
+            similarity=0.9,
+            neighbors='[{"chunk_index": 1, "chunk_text": "prev", "token_count": 3}]',
+        )
+
+        ranked = _semantic_rows_to_ranked([row])
+
+        assert ranked[0].neighbors == [{"chunk_index": 1, "chunk_text": "prev", "token_count": 3}]
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_fetches_neighbors_outside_limit(self):
+        db = AsyncMock()
+        query_result = AsyncMock()
+        query_result.fetchall = lambda: []
+        db.execute = AsyncMock(side_effect=[None, query_result])
+        service = HybridRetrievalService(
+            provider_registry=_make_mock_registry(),
+            normalizer=EmbeddingNormalizer(target_dimensions=4),
+            db=db,
+        )
+        scope = {"app_ids": [], "project_ids": [], "user_id": uuid.uuid4()}
+
+        await service._semantic_search("q", scope, query_embedding=[0.1] * 4, expand_neighbors=True)
+
+        sql, params = db.execute.call_args_list[1].args
+        assert "neighbor_window" in params
+        assert str(sql).index("LIMIT :limit") < str(sql).index("LEFT JOIN LATERAL")
@@ -6,6 +6,8 @@ Tests cover:
 - Cache: hit returns result without DB query, expired entry triggers fresh query,
   cache eviction when max size exceeded
 - invalidate_user_cache / invalidate_room_cache
+- check_room_access_many: cache hits, one batched DB check for misses,
+  and the batched application/project access queries
 """
 
 from __future__ import annotations
@@ -22,6 +24,7 @@ from app.websocket.room_auth import (
     _get_cached_auth,
     _set_cached_auth,
     check_room_access,
+    check_room_access_many,
     invalidate_room_cache,
     invalidate_user_cache,
 )
@@ -229,6 +232,66 @@ class TestCheckRoomAccess:
         assert result is False
 
 
+class TestCheckRoomAccessMany:
+    @pytest.mark.asyncio
+    async def test_misses_resolved_in_one_batch(self):
+        """Cache misses of every type go to a single batched check and are cached."""
+        uid = uuid4()
+        project_id, task_id = uuid4(), uuid4()
+        cached_room = f"application:{uuid4()}"
+        await _set_cached_auth(uid, cached_room, True)
+
+        with patch(
+            "app.websocket.room_auth._check_room_access_many_async",
+            new_callable=AsyncMock,
+            return_value={("project", project_id)},
+        ) as mock_check:
+            result = await check_room_access_many(
+                uid,
+                [cached_room, f"project:{project_id}", f"task:{task_id}", f"user:{uid}", "bogus"],
+            )
+
+        assert result == {
+            cached_room: True,
+            f"project:{project_id}": True,
+            f"task:{task_id}": False,
+            f"user:{uid}": True,
+            "bogus": False,
+        }
+        mock_check.assert_awaited_once_with(uid, {("project", project_id), ("task", task_id)})
+        assert await _get_cached_auth(uid, f"task:{task_id}") is False
+
+    @pytest.mark.asyncio
+    async def test_all_cached_skips_db(self):
+        uid = uuid4()
+        room_id = f"project:{uuid4()}"
+        await _set_cached_auth(uid, room_id, False)
+
+        with patch(
+            "app.websocket.room_auth._check_room_access_many_async",
+            new_callable=AsyncMock,
+        ) as mock_check:
+            result = await check_room_access_many(uid, [room_id])
+
+        assert result == {room_id: False}
+        mock_check.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_db_error_denies_without_caching(self):
+        uid = uuid4()
+        room_id = f"project:{uuid4()}"
+
+        with patch(
+            "app.websocket.room_auth._check_room_access_many_async",
+            new_callable=AsyncMock,
+            side_effect=Exception("DB connection error"),
+        ):
+            result = await check_room_access_many(uid, [room_id])
+
+        assert result == {room_id: False}
+        assert await _get_cached_auth(uid, room_id) is None
+
+
 # ---------------------------------------------------------------------------
 # Integration tests with DB (application/project access)
 # ---------------------------------------------------------------------------
@@ -285,3 +348,23 @@ class TestProjectAccess:
 
         result = await _check_project_access(db_session, test_user.id, uuid4())
         assert result is False
+
+
+class TestBatchedAccessQueries:
+    @pytest.mark.asyncio
+    async def test_accessible_applications(self, db_session, test_user, test_user_2, test_application):
+        """Owner sees the application; a non-member gets an empty set."""
+        from app.websocket.room_auth import _accessible_applications
+
+        ids = {test_application.id, uuid4()}
+        assert await _accessible_applications(db_session, test_user.id, ids) == {test_application.id}
+        assert await _accessible_applications(db_session, test_user_2.id, ids) == set()
+
+    @pytest.mark.asyncio
+    async def test_accessible_projects(self, db_session, test_user, test_user_2, test_project):
+        """App owner sees the project; nonexistent projects are dropped."""
+        from app.websocket.room_auth import _accessible_projects
+
+        ids = {test_project.id, uuid4()}
+        assert await _accessible_projects(db_session, test_user.id, ids) == {test_project.id}
+        assert await _accessible_projects(db_session, test_user_2.id, ids) == set()
@@ -480,6 +480,25 @@ class TestUpdateTask:
         assert response.status_code == 200
         assert response.json()["task_status"]["name"] == "Done"
 
+    async def test_update_task_bumps_row_version(self, client: AsyncClient, auth_headers: dict, test_task: Task):
+        """Every field edit bumps row_version; a stale expected version is rejected."""
+        version = test_task.row_version
+
+        response = await client.put(
+            f"/api/tasks/{test_task.id}",
+            headers=auth_headers,
+            json={"title": "Renamed", "row_version": version},
+        )
+        assert response.status_code == 200
+        assert response.json()["row_version"] == version + 1
+
+        response = await client.put(
+            f"/api/tasks/{test_task.id}",
+            headers=auth_headers,
+            json={"title": "Renamed again", "row_version": version},
+        )
+        assert response.status_code == 409
+
     async def test_update_task_empty_body(self, client: AsyncClient, auth_headers: dict, test_task: Task):
         """Test updating task with empty body fails."""
         response = await client.put(
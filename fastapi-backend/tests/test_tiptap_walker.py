@@ -0,0 +1,183 @@
+"""Unit tests for the single-pass TipTap walker and its IR cache.
+
+Markdown and plain text rendering details are covered through the
+content_converter wrappers in test_content_converter.py; these tests cover
+the outputs produced alongside them (attachment ids, image nodes, chunk
+blocks), the node limit, and reuse of a cached walk.
+"""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import tiptap_walker
+from app.services.tiptap_walker import TiptapIR, get_tiptap_ir, walk_tiptap
+
+IMG_A = "11111111-1111-1111-1111-111111111111"
+IMG_B = "22222222-2222-2222-2222-222222222222"
+
+DRAWIO_XML = (
+    '<mxGraphModel><root><mxCell id="0"/><mxCell id="1" parent="0"/>'
+    '<mxCell id="a" value="API" vertex="1" parent="1"/>'
+    '<mxCell id="b" value="DB" vertex="1" parent="1"/>'
+    '<mxCell id="e" value="reads" edge="1" source="a" target="b" parent="1"/>'
+    "</root></mxGraphModel>"
+)
+
+
+def _text(t: str) -> dict:
+    return {"type": "text", "text": t}
+
+
+def _para(t: str) -> dict:
+    return {"type": "paragraph", "content": [_text(t)]}
+
+
+def _table(*rows: list[str]) -> dict:
+    return {
+        "type": "table",
+        "content": [
+            {"type": "tableRow", "content": [{"type": "tableCell", "content": [_para(c)]} for c in row]} for row in rows
+        ],
+    }
+
+
+SAMPLE = {
+    "type": "doc",
+    "content": [
+        _para("Intro"),
+        {"type": "image", "attrs": {"attachmentId": IMG_A, "alt": "cover"}},
+        {"type": "heading", "attrs": {"level": 2}, "content": [_text("Setup")]},
+        {
+            "type": "bulletList",
+            "content": [
+                {"type": "listItem", "content": [_para("one"), _table(["k", "v"], ["a", "1"])]},
+                {"type": "listItem", "content": [_para("two")]},
+            ],
+        },
+        {"type": "blockquote", "content": [_para("quoted")]},
+        {"type": "drawio", "attrs": {"data": DRAWIO_XML, "attachmentId": "drawio-1"}},
+        {"type": "image", "attrs": {"attachmentId": IMG_B, "title": "diagram"}},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    tiptap_walker._local_cache.clear()
+    yield
+    tiptap_walker._local_cache.clear()
+
+
+class TestWalkTiptap:
+    def test_one_walk_emits_every_output(self):
+        ir = walk_tiptap(SAMPLE)
+
+        assert ir.markdown.startswith("Intro\n\n## Setup\n\n- one\n")
+        assert "> quoted" in ir.markdown
+        assert "  - API --[reads]--> DB\n" in ir.markdown
+        assert ir.plain_text.startswith("Intro\nSetup\none\n")
+        assert "API DB reads" in ir.plain_text
+        assert ir.attachment_ids == [IMG_A, "drawio-1", IMG_B]
+
+    def test_images_carry_preceding_heading(self):
+        ir = walk_tiptap(SAMPLE)
+
+        assert [(i.attachment_id, i.heading_context, i.alt, i.title) for i in ir.images] == [
+            (IMG_A, None, "cover", ""),
+            (IMG_B, "Setup", "", "diagram"),
+        ]
+
+    def test_chunk_blocks(self):
+        blocks = walk_tiptap(SAMPLE).blocks
+
+        assert [(b.text, b.heading_context) for b in blocks[:3]] == [
+            ("Intro\n", None),
+            ("## Setup\n", "Setup"),
+            ("- one\n- two\n", "Setup"),
+        ]
+        # Tables nested in a list follow the list's own block
+        assert blocks[3].is_table and blocks[3].table_columns == ["k", "v"]
+        assert blocks[4].text == "> quoted\n\n"
+        assert blocks[5].text.startswith("[Diagram]\nComponents: API, DB\n")
+
+    def test_canvas_collects_ids_from_every_container(self):
+        canvas = {
+            "format": "canvas",
+            "containers": [
+                {"content": {"type": "doc", "content": [_para("left")]}},
+                {"content": {"type": "doc", "content": [{"type": "image", "attrs": {"attachmentId": IMG_A}}]}},
+            ],
+        }
+
+        ir = walk_tiptap(canvas)
+
+        assert ir.markdown == "## Section 1\n\nleft\n\n"
+        assert ir.attachment_ids == [IMG_A]
+        assert ir.images == [] and ir.blocks == []
+
+    def test_node_limit_keeps_collecting_attachment_ids(self):
+        doc = {"type": "doc", "content": [_para(f"p{i}") for i in range(10)]}
+        doc["content"].append({"type": "image", "attrs": {"attachmentId": IMG_B}})
+
+        with patch.object(tiptap_walker, "_MAX_NODE_COUNT", 5):
+            ir = walk_tiptap(doc)
+
+        assert ir.markdown.endswith("(content truncated — node limit reached)\n")
+        assert "p9" not in ir.plain_text
+        assert ir.attachment_ids == [IMG_B]
+
+    def test_invalid_input(self):
+        assert walk_tiptap(None) == TiptapIR()
+        assert walk_tiptap({"type": "paragraph"}).markdown == ""
+
+    def test_round_trips_through_dict(self):
+        ir = walk_tiptap(SAMPLE)
+        assert TiptapIR.from_dict(json.loads(json.dumps(ir.to_dict()))) == ir
+
+
+class TestGetTiptapIR:
+    @pytest.mark.asyncio
+    async def test_reuses_local_walk(self):
+        content_json = json.dumps(SAMPLE)
+        with patch.object(tiptap_walker, "walk_tiptap", wraps=walk_tiptap) as walk:
+            first = await get_tiptap_ir(content_json)
+            second = await get_tiptap_ir(content_json)
+
+        assert walk.call_count == 1
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_uses_walk_cached_in_redis(self):
+        cached = walk_tiptap(SAMPLE).to_dict()
+        fake = MagicMock()
+        fake.is_connected = True
+        fake.get_json = AsyncMock(return_value=cached)
+        fake.set = AsyncMock()
+
+        with (
+            patch("app.services.redis_service.redis_service", fake),
+            patch.object(tiptap_walker, "walk_tiptap") as walk,
+        ):
+            ir = await get_tiptap_ir(json.dumps(SAMPLE))
+
+        walk.assert_not_called()
+        fake.set.assert_not_called()
+        assert ir.markdown == cached["markdown"]
+
+    @pytest.mark.asyncio
+    async def test_miss_writes_redis(self):
+        fake = MagicMock()
+        fake.is_connected = True
+        fake.get_json = AsyncMock(return_value=None)
+        fake.set = AsyncMock()
+        content_json = json.dumps(SAMPLE)
+
+        with patch("app.services.redis_service.redis_service", fake):
+            ir = await get_tiptap_ir(content_json)
+
+        key = f"tiptap_ir:{tiptap_walker.content_hash(content_json)}"
+        fake.set.assert_awaited_once_with(key, ir.to_dict(), ttl=3600)
@@ -16,6 +16,12 @@ from app.websocket.manager import (
 )
 
 
+async def _flush_send_queues() -> None:
+    """Let connection writer tasks deliver queued broadcasts."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
 class TestMessageType:
     """Tests for MessageType enum."""
 
@@ -320,12 +326,14 @@ class TestConnectionManagerBroadcast:
         await mgr.join_room(conn1, "test_room")
         await mgr.join_room(conn2, "test_room")
 
+        await _flush_send_queues()
         mock_ws1.send_text.reset_mock()
         mock_ws2.send_text.reset_mock()
 
         result = await mgr.broadcast_to_room("test_room", {"type": "test", "data": {}})
 
         assert result == 2
+        await _flush_send_queues()
         mock_ws1.send_text.assert_called_once()
         mock_ws2.send_text.assert_called_once()
 
@@ -344,12 +352,14 @@ class TestConnectionManagerBroadcast:
         await mgr.join_room(conn1, "test_room")
         await mgr.join_room(conn2, "test_room")
 
+        await _flush_send_queues()
         mock_ws1.send_text.reset_mock()
         mock_ws2.send_text.reset_mock()
 
         result = await mgr.broadcast_to_room("test_room", {"type": "test", "data": {}}, exclude=conn1)
 
         assert result == 1
+        await _flush_send_queues()
         mock_ws1.send_text.assert_not_called()
         mock_ws2.send_text.assert_called_once()
 
@@ -362,6 +372,42 @@ class TestConnectionManagerBroadcast:
 
         assert result == 0
 
+    @pytest.mark.asyncio
+    async def test_broadcast_routes_indicators_to_ephemeral_channel(self):
+        """Typing/presence go on the coalescing channel, entity events are streamed."""
+        mgr = ConnectionManager()
+        mock_redis = MagicMock(
+            is_connected=True,
+            publish=AsyncMock(return_value=1),
+            publish_to_stream=AsyncMock(return_value="1-0"),
+        )
+
+        with (
+            patch("app.websocket.manager.redis_service", mock_redis),
+            patch("app.websocket.event_stream.redis_service", mock_redis),
+        ):
+            await mgr.broadcast_to_room("task:1", {"type": MessageType.USER_TYPING, "data": {}})
+            await mgr.broadcast_to_room("task:1", {"type": MessageType.TASK_UPDATED.value, "data": {}})
+
+        assert mock_redis.publish.call_args.args[0] == "ws:broadcast:ephemeral"
+        # Entity events are published together with their replay stream entry
+        channel, envelope, key, _ = mock_redis.publish_to_stream.call_args.args
+        assert (channel, key) == ("ws:broadcast", "ws:stream:task:1")
+        assert envelope["room_id"] == "task:1"
+
+    @pytest.mark.asyncio
+    async def test_room_broadcast_channel_is_lossless(self):
+        """Entity events on ws:broadcast are never dropped under backlog."""
+        mgr = ConnectionManager()
+        mock_redis = MagicMock(subscribe=AsyncMock())
+
+        with patch("app.websocket.manager.redis_service", mock_redis):
+            await mgr.initialize_redis()
+
+        policies = {c.args[0]: c.kwargs.get("policy") for c in mock_redis.subscribe.call_args_list}
+        assert policies["ws:broadcast"].overflow == "block"
+        assert policies["ws:broadcast:ephemeral"].overflow == "coalesce"
+
     @pytest.mark.asyncio
     async def test_broadcast_to_user(self):
         """Test broadcasting to a specific user."""
@@ -380,6 +426,7 @@ class TestConnectionManagerBroadcast:
         result = await mgr.broadcast_to_user(user_id, {"type": "test", "data": {}})
 
         assert result == 2
+        await _flush_send_queues()
         mock_ws1.send_text.assert_called_once()
         mock_ws2.send_text.assert_called_once()
 
@@ -473,6 +520,7 @@ class TestConnectionManagerMessageHandling:
         await mgr.join_room(conn1, "test_room")
         await mgr.join_room(conn2, "test_room")
 
+        await _flush_send_queues()
         mock_ws2.send_text.reset_mock()
 
         await mgr.handle_message(
@@ -483,6 +531,7 @@ class TestConnectionManagerMessageHandling:
             },
         )
 
+        await _flush_send_queues()
         # conn2 should receive typing indicator (via broadcast_to_room -> send_text)
         mock_ws2.send_text.assert_called()
 
@@ -576,6 +625,7 @@ class TestProjectStatusChangedHandler:
         assert result.success is True
         assert result.message_type == "project_status_changed"
 
+        await _flush_send_queues()
         # Verify WebSocket message was sent (broadcast uses send_text with pre-serialized JSON)
         mock_ws.send_text.assert_called()
         call_args = json.loads(mock_ws.send_text.call_args[0][0])
@@ -623,6 +673,7 @@ class TestProjectStatusChangedHandler:
         # Verify broadcast succeeded
         assert result.success is True
 
+        await _flush_send_queues()
         # Verify WebSocket message was sent to project room (broadcast uses send_text)
         mock_ws.send_text.assert_called()
         call_args = json.loads(mock_ws.send_text.call_args[0][0])
@@ -670,6 +721,7 @@ class TestProjectStatusChangedHandler:
         assert result.message_type == "project_status_changed"
 
         # Verify the event includes all necessary data for UI update
+        await _flush_send_queues()
         call_args = json.loads(mock_ws.send_text.call_args[0][0])
         data = call_args["data"]
 
@@ -717,6 +769,7 @@ class TestProjectStatusChangedHandler:
         )
 
         assert result.success is True
+        await _flush_send_queues()
         call_args = json.loads(mock_ws.send_text.call_args[0][0])
         assert call_args["data"]["old_status"] == "Done"
         assert call_args["data"]["new_status"] == "Issue"
@@ -756,6 +809,7 @@ class TestProjectStatusChangedHandler:
         )
 
         assert result.success is True
+        await _flush_send_queues()
         call_args = json.loads(mock_ws.send_text.call_args[0][0])
         assert call_args["data"]["old_status"] == "Issue"
         assert call_args["data"]["new_status"] == "In Progress"
@@ -790,3 +844,74 @@ class TestProjectStatusChangedHandler:
         # Should still succeed, just with 0 recipients
         assert result.success is True
         assert result.recipients == 0
+
+
+class TestJoinRoomsMessage:
+    """Tests for the batched join_rooms message."""
+
+    @pytest.mark.asyncio
+    async def test_join_rooms_authorizes_once(self):
+        """All rooms are authorized in one call; denied rooms get an error each."""
+        from app.websocket.handlers import route_incoming_message
+
+        mgr = ConnectionManager()
+        mock_ws = AsyncMock()
+        connection = await mgr.connect(mock_ws, uuid4())
+        authorizer = AsyncMock(return_value={"project:a": True, "task:b": True, "task:c": False})
+
+        await route_incoming_message(
+            connection,
+            {
+                "type": "join_rooms",
+                "data": {"rooms": [{"room_id": "project:a"}, {"room_id": "task:b"}, {"room_id": "task:c"}]},
+            },
+            connection_manager=mgr,
+            rooms_authorizer=authorizer,
+        )
+
+        authorizer.assert_awaited_once_with(connection.user_id, ["project:a", "task:b", "task:c"])
+        assert connection.rooms == {"project:a", "task:b"}
+        errors = [
+            call.args[0] for call in mock_ws.send_json.call_args_list if call.args[0]["type"] == MessageType.ERROR
+        ]
+        assert [e["data"]["room_id"] for e in errors] == ["task:c"]
+
+    @pytest.mark.asyncio
+    async def test_join_rooms_passes_replay_cursor(self):
+        """Each room's last_event_id is forwarded to join_room."""
+        from app.websocket.handlers import route_incoming_message
+
+        mgr = ConnectionManager()
+        connection = await mgr.connect(AsyncMock(), uuid4())
+
+        with patch.object(mgr, "join_room", new_callable=AsyncMock) as mock_join:
+            await route_incoming_message(
+                connection,
+                {"type": "join_rooms", "data": {"rooms": [{"room_id": "project:a", "last_event_id": "5-0"}]}},
+                connection_manager=mgr,
+                rooms_authorizer=AsyncMock(return_value={"project:a": True}),
+            )
+
+        mock_join.assert_awaited_once_with(connection, "project:a", last_event_id="5-0")
+
+    @pytest.mark.asyncio
+    async def test_join_rooms_rejects_oversized_batch(self):
+        """More than MAX_JOIN_ROOMS rooms is refused without touching authorization."""
+        from app.websocket.handlers import MAX_JOIN_ROOMS, route_incoming_message
+
+        mgr = ConnectionManager()
+        mock_ws = AsyncMock()
+        connection = await mgr.connect(mock_ws, uuid4())
+        authorizer = AsyncMock()
+        rooms = [{"room_id": f"task:{n}"} for n in range(MAX_JOIN_ROOMS + 1)]
+
+        await route_incoming_message(
+            connection,
+            {"type": "join_rooms", "data": {"rooms": rooms}},
+            connection_manager=mgr,
+            rooms_authorizer=authorizer,
+        )
+
+        authorizer.assert_not_called()
+        assert mock_ws.send_json.call_args.args[0]["data"]["error"] == "TOO_MANY_ROOMS"
+        assert connection.rooms == set()
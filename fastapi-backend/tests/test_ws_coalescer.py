@@ -0,0 +1,116 @@
+"""Unit tests for short-window coalescing of room broadcasts.
+
+Covers immediate delivery of the first event per key, latest-state-wins
+for repeats inside the window, order preservation when an uncoalesced
+event flushes the room, window teardown, and the manager's key selection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.websocket.coalescer import RoomEventCoalescer
+from app.websocket.manager import ConnectionManager, MessageType
+
+WINDOW_S = 0.02
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, dict]] = []
+
+    async def publish(self, room_id: str, message: dict, exclude) -> int:
+        self.sent.append((room_id, message))
+        return 1
+
+    def values(self) -> list:
+        return [m["v"] for _, m in self.sent]
+
+
+@pytest.fixture
+def recorder():
+    return _Recorder()
+
+
+class TestRoomEventCoalescer:
+    @pytest.mark.asyncio
+    async def test_first_event_sent_immediately(self, recorder):
+        coalescer = RoomEventCoalescer(recorder.publish)
+
+        await coalescer.submit("project:1", "task-a", {"v": 1}, None, WINDOW_S)
+
+        assert recorder.values() == [1]
+
+    @pytest.mark.asyncio
+    async def test_repeats_in_window_collapse_to_latest(self, recorder):
+        coalescer = RoomEventCoalescer(recorder.publish)
+
+        for v in range(1, 5):
+            await coalescer.submit("project:1", "task-a", {"v": v}, None, WINDOW_S)
+        assert recorder.values() == [1]
+
+        await asyncio.sleep(WINDOW_S * 2)
+        assert recorder.values() == [1, 4]
+        assert coalescer.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_flush_keeps_room_order(self, recorder):
+        coalescer = RoomEventCoalescer(recorder.publish)
+        await coalescer.submit("project:1", "task-a", {"v": 1}, None, WINDOW_S)
+        await coalescer.submit("project:1", "task-a", {"v": 2}, None, WINDOW_S)
+
+        await coalescer.flush("project:1")
+        await recorder.publish("project:1", {"v": "deleted"}, None)
+
+        assert recorder.values() == [1, 2, "deleted"]
+
+    @pytest.mark.asyncio
+    async def test_new_key_flushes_pending_first(self, recorder):
+        coalescer = RoomEventCoalescer(recorder.publish)
+        await coalescer.submit("project:1", "task-a", {"v": "a1"}, None, WINDOW_S)
+        await coalescer.submit("project:1", "task-a", {"v": "a2"}, None, WINDOW_S)
+
+        await coalescer.submit("project:1", "task-b", {"v": "b1"}, None, WINDOW_S)
+
+        assert recorder.values() == ["a1", "a2", "b1"]
+
+    @pytest.mark.asyncio
+    async def test_quiet_window_is_closed(self, recorder):
+        coalescer = RoomEventCoalescer(recorder.publish)
+        await coalescer.submit("project:1", "task-a", {"v": 1}, None, WINDOW_S)
+
+        await asyncio.sleep(WINDOW_S * 3)
+
+        assert coalescer.stats()["open_windows"] == 0
+        await coalescer.submit("project:1", "task-a", {"v": 2}, None, WINDOW_S)
+        assert recorder.values() == [1, 2]
+
+
+class TestManagerCoalescing:
+    @pytest.mark.asyncio
+    async def test_task_moves_coalesce_but_other_events_do_not(self):
+        mgr = ConnectionManager()
+        published: list[str] = []
+
+        async def publish(room_id, message, exclude=None):
+            published.append(message["data"].get("v"))
+            return 0
+
+        task_id = str(uuid4())
+        moved = [{"type": MessageType.TASK_MOVED.value, "data": {"task_id": task_id, "v": v}} for v in range(3)]
+        with (
+            patch.object(mgr, "_publish_to_room", publish),
+            patch.object(mgr._coalescer, "_publish", publish),
+            patch("app.websocket.manager._get_coalesce_window_ms", return_value=20),
+        ):
+            for message in moved:
+                await mgr.broadcast_to_room("project:1", message)
+            await mgr.broadcast_to_room("project:1", {"type": MessageType.COMMENT_ADDED.value, "data": {"v": "c"}})
+            await mgr.broadcast_to_room("project:1", {"type": MessageType.COMMENT_ADDED.value, "data": {"v": "c"}})
+
+        # The comment flushes the pending move first; comments are never coalesced
+        assert published == [0, 2, "c", "c"]
@@ -0,0 +1,94 @@
+"""Unit tests for WebSocket wire encodings.
+
+Covers JSON and MessagePack encoding of the types broadcasts carry, batch
+packing from already-encoded messages, per-encoding caching in Frame, and
+binary delivery to msgpack connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import msgpack
+import pytest
+
+from app.websocket import codec
+from app.websocket.manager import ConnectionManager, MessageType
+
+
+def _message() -> dict:
+    return {
+        "type": MessageType.TASK_UPDATED,
+        "data": {
+            "task_id": uuid4(),
+            "updated_at": datetime(2026, 4, 5, 12, 30, tzinfo=timezone.utc),
+            "title": "Ship it",
+        },
+    }
+
+
+class TestEncodings:
+    def test_json_and_msgpack_decode_to_same_message(self):
+        message = _message()
+
+        from_json = json.loads(codec.encode(message, codec.JSON))
+        from_msgpack = msgpack.unpackb(codec.encode(message, codec.MSGPACK))
+
+        assert from_json == from_msgpack
+        assert from_json["type"] == "task_updated"
+        assert from_json["data"]["task_id"] == str(message["data"]["task_id"])
+        assert from_json["data"]["updated_at"] == "2026-04-05T12:30:00+00:00"
+
+    def test_unsupported_type_raises(self):
+        with pytest.raises(TypeError):
+            codec.encode_msgpack({"data": object()})
+
+    @pytest.mark.parametrize("encoding", codec.ENCODINGS)
+    def test_batch_packs_encoded_messages(self, encoding):
+        messages = [{"type": "test", "data": {"n": n}} for n in range(3)]
+
+        packed = codec.batch(encoding, [codec.encode(m, encoding) for m in messages])
+        decoded = msgpack.unpackb(packed) if encoding == codec.MSGPACK else json.loads(packed)
+
+        assert decoded == {"type": "batch", "events": messages}
+
+
+class TestFrame:
+    def test_encodes_once_per_encoding(self):
+        frame = codec.Frame(_message())
+
+        assert frame.encoded(codec.JSON) is frame.encoded(codec.JSON)
+        assert frame.encoded(codec.MSGPACK) is frame.encoded(codec.MSGPACK)
+        assert isinstance(frame.encoded(codec.JSON), str)
+        assert isinstance(frame.encoded(codec.MSGPACK), bytes)
+
+
+class TestMsgpackConnection:
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_binary_frames_per_encoding(self):
+        mgr = ConnectionManager()
+        json_ws = AsyncMock()
+        msgpack_ws = AsyncMock()
+        await mgr.connect(json_ws, uuid4())
+        await mgr.connect(msgpack_ws, uuid4(), encoding=codec.MSGPACK)
+
+        await mgr.broadcast_to_all({"type": "test", "data": {"n": 1}})
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert json.loads(json_ws.send_text.call_args.args[0]) == {"type": "test", "data": {"n": 1}}
+        assert msgpack.unpackb(msgpack_ws.send_bytes.call_args.args[0]) == {"type": "test", "data": {"n": 1}}
+        msgpack_ws.send_text.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_send_personal_uses_binary_for_msgpack(self):
+        mgr = ConnectionManager()
+        ws = AsyncMock()
+        conn = await mgr.connect(ws, uuid4(), encoding=codec.MSGPACK)
+
+        assert await mgr.send_personal(conn, {"type": "test", "data": {}}) is True
+        assert msgpack.unpackb(ws.send_bytes.call_args.args[0]) == {"type": "test", "data": {}}
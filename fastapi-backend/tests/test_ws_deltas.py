@@ -0,0 +1,155 @@
+"""Unit tests for field-level deltas on task and project update broadcasts.
+
+Covers snapshot diffing between consecutive row_versions, full payloads
+on create and on non-consecutive versions, and merging of coalesced deltas.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+
+from app.websocket.deltas import EntitySnapshots, merge_updates
+from app.websocket.handlers import UpdateAction, handle_task_update
+
+
+class _Manager:
+    """Records room broadcasts; nobody is in the task room."""
+
+    def __init__(self) -> None:
+        self.messages: list[dict] = []
+
+    async def broadcast_to_room(self, room_id, message, exclude=None) -> int:
+        self.messages.append(message)
+        return 1
+
+    def may_have_subscribers(self, room_id) -> bool:
+        return False
+
+
+def _task(task_id: str, **fields) -> dict:
+    return {"id": task_id, "title": "Write docs", "task_rank": "a", "assignee_id": None, "row_version": 1, **fields}
+
+
+class TestEntitySnapshots:
+    @pytest.mark.asyncio
+    async def test_first_broadcast_needs_full_payload(self):
+        snapshots = EntitySnapshots()
+
+        assert await snapshots.record("task", "t1", _task("t1")) is None
+
+    @pytest.mark.asyncio
+    async def test_next_version_yields_changed_fields_only(self):
+        snapshots = EntitySnapshots()
+        await snapshots.record("task", "t1", _task("t1"))
+
+        changes = await snapshots.record("task", "t1", _task("t1", task_rank="b", row_version=2))
+
+        assert changes == {"task_rank": "b", "row_version": 2}
+
+    @pytest.mark.asyncio
+    async def test_version_gap_needs_full_payload(self):
+        snapshots = EntitySnapshots()
+        await snapshots.record("task", "t1", _task("t1"))
+
+        assert await snapshots.record("task", "t1", _task("t1", row_version=3)) is None
+        assert await snapshots.record("task", "t1", _task("t1", row_version=4, title="x")) == {
+            "title": "x",
+            "row_version": 4,
+        }
+
+    @pytest.mark.asyncio
+    async def test_unchanged_version_needs_full_payload(self):
+        snapshots = EntitySnapshots()
+        await snapshots.record("task", "t1", _task("t1"))
+
+        assert await snapshots.record("task", "t1", _task("t1", title="x")) is None
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_swap_needs_full_payload(self):
+        snapshots = EntitySnapshots()
+        await snapshots.record("task", "t1", _task("t1"))
+        await snapshots.record("task", "t1", _task("t1", row_version=3, title="later"))
+
+        assert await snapshots.record("task", "t1", _task("t1", row_version=2, title="earlier")) is None
+
+    @pytest.mark.asyncio
+    async def test_uuid_values_compare_as_serialized(self):
+        snapshots = EntitySnapshots()
+        assignee = uuid4()
+        await snapshots.record("task", "t1", _task("t1", assignee_id=assignee))
+
+        changes = await snapshots.record("task", "t1", _task("t1", assignee_id=str(assignee), row_version=2))
+
+        assert changes == {"row_version": 2}
+
+    @pytest.mark.asyncio
+    async def test_local_snapshots_are_bounded(self):
+        snapshots = EntitySnapshots(max_local=2)
+        for n in range(3):
+            await snapshots.record("task", str(n), _task(str(n)))
+
+        assert snapshots.stats()["local_entries"] == 2
+        assert await snapshots.record("task", "0", _task("0")) is None
+
+
+class TestHandleTaskUpdate:
+    @pytest.mark.asyncio
+    async def test_update_after_create_sends_delta(self):
+        mgr = _Manager()
+        project_id, task_id = str(uuid4()), str(uuid4())
+
+        await handle_task_update(project_id, task_id, UpdateAction.CREATED, _task(task_id), connection_manager=mgr)
+        await handle_task_update(
+            project_id,
+            task_id,
+            UpdateAction.UPDATED,
+            _task(task_id, assignee_id="u1", row_version=2),
+            connection_manager=mgr,
+        )
+
+        created, updated = (m["data"] for m in mgr.messages)
+        assert created["task"]["title"] == "Write docs"
+        assert "task" not in updated
+        assert updated["changes"] == {"assignee_id": "u1", "row_version": 2}
+        assert (updated["base_version"], updated["row_version"]) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_unknown_task_gets_full_payload(self):
+        mgr = _Manager()
+        task_id = str(uuid4())
+
+        await handle_task_update(str(uuid4()), task_id, UpdateAction.UPDATED, _task(task_id), connection_manager=mgr)
+
+        assert mgr.messages[0]["data"]["task"] == _task(task_id)
+
+
+def _delta(base_version: int, **changes) -> dict:
+    data = {"changes": {**changes, "row_version": base_version + 1}}
+    return {"type": "task_updated", "data": {**data, "base_version": base_version, "row_version": base_version + 1}}
+
+
+class TestMergeUpdates:
+    def test_deltas_fold_together(self):
+        merged = merge_updates(_delta(1, task_rank="b"), _delta(2, title="x"))["data"]
+
+        assert merged["changes"] == {"task_rank": "b", "title": "x", "row_version": 3}
+        assert (merged["base_version"], merged["row_version"]) == (1, 3)
+
+    def test_delta_folds_into_pending_full_payload(self):
+        older = {"type": "task_updated", "data": {"task": {"id": "t1", "title": "a", "row_version": 1}}}
+
+        merged = merge_updates(older, _delta(1, title="b"))["data"]
+
+        assert merged == {"task": {"id": "t1", "title": "b", "row_version": 2}}
+
+    def test_non_consecutive_delta_is_not_folded(self):
+        newer = _delta(3, title="x")
+
+        assert merge_updates(_delta(1, task_rank="b"), newer) is newer
+
+    def test_full_payload_wins(self):
+        newer = {"type": "task_updated", "data": {"task": {"id": "t1", "row_version": 3}}}
+
+        assert merge_updates(_delta(1, title="b"), newer) is newer
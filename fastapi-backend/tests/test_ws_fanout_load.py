@@ -0,0 +1,92 @@
+"""Unit tests for the accounting in the WebSocket fan-out load tool.
+
+Covers sequence parsing from full and delta payloads, dropped versus
+superseded (coalesced) events, and exclusion of disconnected sockets.
+"""
+
+from __future__ import annotations
+
+import math
+
+from tests.load.ws_fanout import FanoutStats, percentile
+
+
+def _delta(title: str) -> dict:
+    return {"type": "task_updated", "data": {"changes": {"title": title}, "row_version": 1}}
+
+
+def _full(title: str) -> dict:
+    return {"type": "task_updated", "data": {"task": {"id": "t1", "title": title, "row_version": 2}}}
+
+
+def _stats(sockets: int) -> FanoutStats:
+    stats = FanoutStats(run_id="run1")
+    stats.sockets.update(range(sockets))
+    return stats
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(n) for n in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 99) == 3.0
+
+    def test_empty_is_nan(self):
+        assert math.isnan(percentile([], 50))
+
+
+class TestFanoutStats:
+    def test_events_from_other_runs_are_ignored(self):
+        stats = _stats(1)
+        stats.record_sent(0, "t1", 0.0)
+
+        stats.record_event(0, _delta("ws-fanout other 0"), 0.1)
+        stats.record_event(0, _delta("renamed by hand"), 0.1)
+        stats.record_event(0, {"type": "task_created", "data": {"task": {"title": stats.title(0)}}}, 0.1)
+
+        assert stats.received == {}
+
+    def test_delivered_from_delta_and_full_payloads(self):
+        stats = _stats(2)
+        stats.record_sent(0, "t1", 1.0)
+
+        stats.record_event(0, _delta(stats.title(0)), 1.010)
+        stats.record_event(1, _full(stats.title(0)), 1.030)
+        # Same event again through the task room: first receipt wins
+        stats.record_event(1, _delta(stats.title(0)), 1.050)
+
+        summary = stats.summary()
+        assert summary["events_delivered"] == 2
+        assert summary["events_dropped"] == 0
+        assert summary["delivery_latency_ms"]["max"] == 30.0
+        assert summary["fanout_complete_ms"]["p50"] == 30.0
+
+    def test_coalesced_update_is_superseded_not_dropped(self):
+        stats = _stats(1)
+        stats.record_sent(0, "t1", 1.0)
+        stats.record_sent(1, "t1", 1.001)
+        stats.record_sent(2, "t2", 1.002)
+
+        stats.record_event(0, _delta(stats.title(1)), 1.02)
+
+        summary = stats.summary()
+        assert summary["events_delivered"] == 1
+        assert summary["events_superseded"] == 1
+        assert summary["events_dropped"] == 1
+        # Only seq 1 reached every socket
+        assert summary["fanout_complete_ms"]["max"] == 19.0
+
+    def test_disconnected_sockets_are_not_expected(self):
+        stats = _stats(2)
+        stats.disconnected.add(1)
+        stats.record_sent(0, "t1", 0.0)
+
+        stats.record_event(0, _delta(stats.title(0)), 0.005)
+
+        summary = stats.summary()
+        assert summary["sockets"] == 1
+        assert summary["disconnected"] == 1
+        assert summary["events_expected"] == 1
+        assert summary["events_dropped"] == 0
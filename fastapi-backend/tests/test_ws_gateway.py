@@ -0,0 +1,91 @@
+"""Unit tests for running WebSockets in a separate gateway process.
+
+Covers the gateway app's routes, skipping the socket relay on API workers,
+and publishing secondary-room broadcasts when other processes may hold the
+subscribers.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.websocket import lifecycle
+from app.websocket.manager import ConnectionManager
+
+
+@pytest.fixture
+def realtime_mocks():
+    """Patch Redis and the pub/sub setup hooks used by start_realtime."""
+    mock_redis = MagicMock()
+    mock_redis.connect = AsyncMock()
+    mock_redis.start_listening = AsyncMock()
+    mock_redis.start_health_monitor = AsyncMock()
+    mock_manager = MagicMock()
+    mock_manager.initialize_redis = AsyncMock()
+    with (
+        patch.object(lifecycle, "redis_service", mock_redis),
+        patch.object(lifecycle, "manager", mock_manager),
+        patch("app.websocket.room_auth.setup_room_auth_pubsub", new_callable=AsyncMock),
+        patch("app.services.user_cache_service.setup_user_cache_pubsub", new_callable=AsyncMock),
+    ):
+        yield mock_redis, mock_manager
+
+
+class TestStartRealtime:
+    @pytest.mark.asyncio
+    async def test_relay_subscribes_broadcast_channels(self, realtime_mocks):
+        mock_redis, mock_manager = realtime_mocks
+
+        await lifecycle.start_realtime(relay=True)
+
+        mock_manager.initialize_redis.assert_awaited_once()
+        mock_redis.start_listening.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_api_worker_behind_gateway_skips_relay(self, realtime_mocks):
+        """API workers publish only, so they never subscribe the socket relay."""
+        mock_redis, mock_manager = realtime_mocks
+
+        await lifecycle.start_realtime(relay=False)
+
+        mock_manager.initialize_redis.assert_not_awaited()
+        mock_redis.start_listening.assert_awaited_once()
+        mock_redis.start_health_monitor.assert_awaited_once()
+
+
+class TestMayHaveSubscribers:
+    def test_local_only_uses_room_count(self):
+        mgr = ConnectionManager()
+        with patch("app.websocket.manager.redis_service") as mock_redis:
+            type(mock_redis).is_connected = PropertyMock(return_value=False)
+            assert mgr.may_have_subscribers(f"task:{uuid4()}") is False
+
+    def test_redis_means_other_processes_may_subscribe(self):
+        """A worker without sockets still publishes when Redis is up."""
+        mgr = ConnectionManager()
+        with patch("app.websocket.manager.redis_service") as mock_redis:
+            type(mock_redis).is_connected = PropertyMock(return_value=True)
+            assert mgr.may_have_subscribers(f"task:{uuid4()}") is True
+
+
+class TestGatewayApp:
+    def test_serves_only_websocket_and_health(self):
+        from app.gateway import app
+
+        paths = {route.path for route in app.routes}
+
+        assert paths == {"/ws", "/health"}
+
+    @pytest.mark.asyncio
+    async def test_connection_cap_override(self):
+        """The gateway's own cap replaces websocket.max_global_connections."""
+        mgr = ConnectionManager()
+        mgr.max_connections = 1
+        await mgr.connect(AsyncMock(), uuid4())
+        rejected_ws = AsyncMock()
+
+        assert await mgr.connect(rejected_ws, uuid4()) is None
+        rejected_ws.close.assert_awaited_once()
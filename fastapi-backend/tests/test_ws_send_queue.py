@@ -0,0 +1,161 @@
+"""Unit tests for per-connection WebSocket send queues.
+
+Covers coalescing and shedding of indicators in SendQueue, non-blocking
+fan-out past a stalled client, and slow-consumer eviction on overflow.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.websocket.manager import ConnectionManager, MessageType
+from app.websocket.send_queue import SendQueue
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def _drain(queue: SendQueue) -> list[str]:
+    return [queue.pop() for _ in range(len(queue))]
+
+
+class TestSendQueue:
+    def test_coalesce_replaces_in_place(self):
+        queue = SendQueue(max_size=10)
+        queue.put("typing-a-1", key="a")
+        queue.put("event")
+        queue.put("typing-a-2", key="a")
+
+        assert _drain(queue) == ["typing-a-2", "event"]
+        assert queue.coalesced == 1
+
+    def test_full_queue_sheds_oldest_indicator(self):
+        queue = SendQueue(max_size=3)
+        queue.put("event-1")
+        queue.put("typing-a", key="a")
+        queue.put("typing-b", key="b")
+
+        assert queue.put("event-2") is True
+        assert _drain(queue) == ["event-1", "typing-b", "event-2"]
+        assert queue.shed == 1
+
+    def test_full_queue_without_indicators_rejects(self):
+        queue = SendQueue(max_size=2)
+        queue.put("event-1")
+        queue.put("event-2")
+
+        assert queue.put("event-3") is False
+        assert len(queue) == 2
+
+    def test_closed_queue_rejects(self):
+        queue = SendQueue(max_size=2)
+        queue.put("event-1")
+        queue.close()
+
+        assert queue.put("event-2") is False
+        assert len(queue) == 0
+
+
+def _stalled_ws() -> tuple[AsyncMock, asyncio.Event]:
+    """A socket whose sends block until the returned gate is set."""
+    gate = asyncio.Event()
+    ws = AsyncMock()
+
+    async def send_text(_text):
+        await gate.wait()
+
+    ws.send_text.side_effect = send_text
+    return ws, gate
+
+
+class TestFanout:
+    @pytest.mark.asyncio
+    async def test_stalled_client_does_not_delay_others(self):
+        mgr = ConnectionManager()
+        slow_ws, gate = _stalled_ws()
+        fast_ws = AsyncMock()
+        await mgr.connect(slow_ws, uuid4())
+        await mgr.connect(fast_ws, uuid4())
+
+        for n in range(3):
+            assert await mgr.broadcast_to_all({"type": "test", "data": {"n": n}}) == 2
+        await _settle()
+
+        assert [json.loads(c.args[0])["data"]["n"] for c in fast_ws.send_text.call_args_list] == [0, 1, 2]
+        assert slow_ws.send_text.call_count == 1
+        gate.set()
+        await _settle()
+        assert slow_ws.send_text.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_room_indicators_coalesce_per_sender(self):
+        mgr = ConnectionManager()
+        slow_ws, gate = _stalled_ws()
+        conn = await mgr.connect(slow_ws, uuid4())
+        await mgr.join_room(conn, "task:1", notify_others=False)
+
+        sender = str(uuid4())
+
+        def typing(is_typing: bool) -> dict:
+            return {"type": MessageType.USER_TYPING, "data": {"user_id": sender, "is_typing": is_typing}}
+
+        # Publish-side coalescing off, so every indicator reaches the queue
+        with patch("app.websocket.manager._get_coalesce_window_ms", return_value=0):
+            await mgr.broadcast_to_room("task:1", typing(True))
+            await _settle()  # in flight on the stalled socket
+            await mgr.broadcast_to_room("task:1", typing(False))
+            await mgr.broadcast_to_room("task:1", typing(True))
+
+        assert mgr.send_queue_stats()["coalesced"] == 1
+        gate.set()
+        await _settle()
+        assert slow_ws.send_text.call_count == 2
+
+
+class TestSlowConsumerEviction:
+    @pytest.mark.asyncio
+    async def test_overflow_evicts_connection(self):
+        mgr = ConnectionManager()
+        slow_ws, _gate = _stalled_ws()
+        fast_ws = AsyncMock()
+        with patch("app.websocket.manager._get_send_queue_max", return_value=2):
+            await mgr.connect(slow_ws, uuid4())
+            await mgr.connect(fast_ws, uuid4())
+
+            # n=0 stays in flight on the slow socket, n=1..2 fill its queue
+            for n in range(4):
+                await mgr.broadcast_to_all({"type": "test", "data": {"n": n}})
+                await _settle()
+
+            slow_ws.close.assert_awaited_once_with(code=1013, reason="Slow consumer")
+            assert mgr.total_connections == 1
+            assert mgr.send_queue_stats()["evicted"] == 1
+            assert fast_ws.send_text.call_count == 4
+
+
+class TestBatchFrames:
+    @pytest.mark.asyncio
+    async def test_backlog_sent_as_one_batch_frame(self):
+        mgr = ConnectionManager()
+        ws, gate = _stalled_ws()
+        await mgr.connect(ws, uuid4(), batch_frames=True)
+
+        for n in range(3):
+            await mgr.broadcast_to_all({"type": "test", "data": {"n": n}})
+            await _settle()
+        gate.set()
+        await _settle()
+
+        frames = [json.loads(c.args[0]) for c in ws.send_text.call_args_list]
+        assert frames[0]["data"] == {"n": 0}
+        assert frames[1] == {
+            "type": MessageType.BATCH,
+            "events": [{"type": "test", "data": {"n": 1}}, {"type": "test", "data": {"n": 2}}],
+        }